@@ -5,28 +5,23 @@ Supports Supabase PostgreSQL (production)
 
 import os
 from contextlib import asynccontextmanager
-from pathlib import Path
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
-from dotenv import load_dotenv
+from fastapi.responses import JSONResponse, Response
 from datetime import datetime, timedelta
 from typing import Optional
 
-from models import Base
-from database import engine, get_db
-from routes import auth_router, users_router, rooms_router, payments_router, dashboard_router, guests_router, reservations_router, expenses_router
+from database import get_engine, get_db
+from schema_migrations import ensure_schema
+from idempotency import IdempotencyMiddleware
+from events import EventStreamAwareGZipMiddleware
+from health import HealthMonitor
+from error_handlers import RequestInstrumentationMiddleware
+from profiling import PROFILING_ENABLED, ProfilingMiddleware
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, metrics_authorized, render_metrics
+from routes import auth_router, users_router, rooms_router, payments_router, dashboard_router, guests_router, reservations_router, expenses_router, rates_router, discounts_router, folio_router, reports_router, events_router, sync_router, batch_router, profiles_router
 
-# Load environment - prefer .env.local for development, fall back to .env
-env_local = Path('.env.local')
-if env_local.exists():
-    load_dotenv(env_local)
-else:
-    load_dotenv()
-
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Environment (.env.local / .env) is loaded once, by database.py
 
 
 @asynccontextmanager
@@ -34,12 +29,14 @@ async def lifespan(app: FastAPI):
     """Lifespan context manager for app startup/shutdown"""
     # Startup
     from database import DATABASE_URL
-    Base.metadata.create_all(bind=engine)
-    print(f"Database: {DATABASE_URL}")
+    # One version query when up to date (see schema_migrations.py)
+    schema_version = ensure_schema(get_engine())
+    print(f"Database: {DATABASE_URL} (schema version {schema_version})")
     print(f"Environment: {os.getenv('FLASK_ENV', 'development')}")
+    app.state.health_monitor.start()
     yield
     # Shutdown
-    pass
+    await app.state.health_monitor.stop()
 
 
 def create_app():
@@ -64,98 +61,56 @@ def create_app():
         allow_headers=["*"],  # Allow all headers
     )
 
-    # GZip Compression Middleware - compress responses larger than 1KB
-    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    # Idempotency-Key support for POST (create) endpoints - retried requests
+    # replay the stored response instead of creating duplicates
+    app.add_middleware(IdempotencyMiddleware)
 
-    # Comprehensive health check endpoint
-    @app.get('/health')
-    async def health():
-        """Comprehensive health check endpoint"""
-        from database import DATABASE_URL, SessionLocal
-        from models import User, RoomType, BookingChannel, Setting, Room, Reservation, Payment
-
-        health_data = {
-            'status': 'ok',
-            'timestamp': datetime.utcnow().isoformat(),
-            'environment': os.getenv('FLASK_ENV', 'development'),
-            'database_type': 'postgresql' if 'postgresql' in DATABASE_URL else 'sqlite',
-            'checks': {
-                'database_connection': False,
-                'database_tables': False,
-                'initial_data': False,
-                'api_server': True,
-            },
-            'details': {}
-        }
-
-        # Check database connection
-        try:
-            from sqlalchemy import text
-            db = SessionLocal()
-            db.execute(text('SELECT 1'))
-            db.close()
-            health_data['checks']['database_connection'] = True
-            health_data['details']['database_status'] = 'connected'
-        except Exception as e:
-            health_data['status'] = 'degraded'
-            health_data['details']['database_error'] = str(e)
-
-        # Check tables
-        try:
-            db = SessionLocal()
-            table_counts = {
-                'users': db.query(User).count(),
-                'room_types': db.query(RoomType).count(),
-                'booking_channels': db.query(BookingChannel).count(),
-                'settings': db.query(Setting).count(),
-                'rooms': db.query(Room).count(),
-                'reservations': db.query(Reservation).count(),
-                'payments': db.query(Payment).count(),
-            }
-            db.close()
-            health_data['checks']['database_tables'] = True
-            health_data['details']['table_counts'] = table_counts
-        except Exception as e:
-            health_data['status'] = 'degraded'
-            health_data['details']['tables_error'] = str(e)
-
-        # Check initial data
+    # GZip Compression Middleware - compress responses larger than 1KB
+    # (server-sent event streams are passed through uncompressed)
+    app.add_middleware(EventStreamAwareGZipMiddleware, minimum_size=1000)
+
+    # On-demand profiling of requests flagged by an admin (see profiling.py)
+    if PROFILING_ENABLED:
+        app.add_middleware(ProfilingMiddleware)
+
+    # Request IDs, timing, per-request SQL accounting and sampled access
+    # logging (see error_handlers.py and query_stats.py)
+    app.add_middleware(RequestInstrumentationMiddleware)
+
+    # Prometheus metrics (see metrics.py) - outermost, so latency covers
+    # the whole middleware stack
+    app.add_middleware(MetricsMiddleware)
+
+    # Health probes (see health.py): /livez for liveness, /readyz for
+    # readiness, /health for the deep check served from a background cache
+    from database import DATABASE_URL, SessionLocal
+    app.state.health_monitor = HealthMonitor(SessionLocal, DATABASE_URL)
+
+    @app.get('/livez')
+    async def livez():
+        """Liveness probe - the process is serving requests (no I/O)"""
+        return {'status': 'alive'}
+
+    @app.get('/readyz')
+    def readyz():
+        """Readiness probe - a pooled database connection answers SELECT 1"""
         try:
-            db = SessionLocal()
-            user_count = db.query(User).count()
-            room_type_count = db.query(RoomType).count()
-            booking_channel_count = db.query(BookingChannel).count()
-            setting_count = db.query(Setting).count()
-            db.close()
-
-            has_admin = user_count >= 1
-            has_room_types = room_type_count >= 4
-            has_channels = booking_channel_count >= 5
-            has_settings = setting_count >= 8
-
-            health_data['checks']['initial_data'] = (
-                has_admin and has_room_types and has_channels and has_settings
-            )
-            health_data['details']['data_status'] = {
-                'admin_user': has_admin,
-                'room_types': has_room_types,
-                'booking_channels': has_channels,
-                'settings': has_settings,
-            }
+            app.state.health_monitor.ping()
         except Exception as e:
-            health_data['status'] = 'degraded'
-            health_data['details']['data_error'] = str(e)
+            return JSONResponse(status_code=503, content={'status': 'unavailable', 'error': str(e)})
+        return {'status': 'ready'}
 
-        # Determine overall status
-        all_checks_passed = all(health_data['checks'].values())
-        if all_checks_passed:
-            health_data['status'] = 'healthy'
-        elif any(health_data['checks'].values()):
-            health_data['status'] = 'degraded'
-        else:
-            health_data['status'] = 'unhealthy'
+    @app.get('/health')
+    def health():
+        """Comprehensive health check, refreshed in the background every HEALTH_CHECK_INTERVAL_SECONDS"""
+        return app.state.health_monitor.get()
 
-        return health_data
+    @app.get('/metrics', include_in_schema=False)
+    async def metrics(request: Request):
+        """Prometheus metrics (request latency, in-flight requests, DB pool, token store)"""
+        if not metrics_authorized(request.headers.get('authorization')):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+        return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
 
     # API root endpoint
     @app.get('/api')
@@ -177,6 +132,14 @@ def create_app():
     app.include_router(reservations_router.router, tags=["Reservations"])  # Has own prefix /api/reservations
     app.include_router(payments_router.router, tags=["Payments"])  # Has own prefix /api/payments
     app.include_router(expenses_router.router, prefix="/api/expenses", tags=["Expenses"])
+    app.include_router(rates_router.router, tags=["Rates"])  # Has own prefix /api/rates
+    app.include_router(discounts_router.router, tags=["Discounts"])  # Has own prefix /api/discounts
+    app.include_router(folio_router.router, tags=["Folio"])  # Has own prefix /api/reservations/{id}/folio
+    app.include_router(reports_router.router, tags=["Reports"])  # Has own prefix /api/reports
+    app.include_router(events_router.router, tags=["Events"])  # Has own prefix /api/events
+    app.include_router(sync_router.router, tags=["Sync"])  # Has own prefix /api/sync
+    app.include_router(batch_router.router, tags=["Batch"])  # Has own prefix /api/batch
+    app.include_router(profiles_router.router, tags=["Profiling"])  # Has own prefix /api/profiles
     app.include_router(dashboard_router.router, tags=["Dashboard"])  # Has own prefix /api/dashboard
 
     # Error handlers
@@ -0,0 +1,212 @@
+"""
+Denormalized reservation balances
+
+Reservation.total_paid and Reservation.balance are stored columns kept in
+sync by SQLAlchemy session events instead of summing the payments
+relationship in Python on every read:
+
+- Every flush that creates, updates (amount, reservation, is_refund,
+  is_voided) or deletes a Payment applies the net change to its reservation
+  with an atomic "total_paid = total_paid + delta" UPDATE, in the same
+  transaction as the payment change.
+- A change to Reservation.total_amount recomputes the balance in the UPDATE.
+
+A payment counts towards total_paid when it is neither a refund nor voided
+(same rule as the previous Reservation.calculate_total_paid()).
+
+find_balance_drift() recomputes every reservation with one grouped query
+and reports rows whose stored values differ; scripts/reconcile_balances.py
+wraps it as a command.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from sqlalchemy import event, func, update, bindparam, literal, Numeric, select
+from sqlalchemy.orm import Session, attributes
+
+from models import Payment, Reservation
+
+ZERO = Decimal("0.00")
+
+
+def payment_contribution(amount, is_refund, is_voided) -> Decimal:
+    """Amount a payment adds to its reservation's total_paid"""
+    if amount is None or is_refund or is_voided:
+        return ZERO
+    return Decimal(str(amount))
+
+
+def _committed(obj, attr: str):
+    """Value of an attribute as of the last load/flush"""
+    history = attributes.get_history(obj, attr)
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(obj, attr)
+
+
+def _committed_contribution(payment: Payment) -> Decimal:
+    return payment_contribution(
+        _committed(payment, "amount"),
+        _committed(payment, "is_refund"),
+        _committed(payment, "is_voided"),
+    )
+
+
+def _current_contribution(payment: Payment) -> Decimal:
+    return payment_contribution(payment.amount, payment.is_refund, payment.is_voided)
+
+
+def _track_previous_value(target, value, oldvalue, initiator):
+    return value
+
+
+# active_history makes the ORM load the previous value before an expired
+# attribute is overwritten, so the committed contribution is always known
+for _attr in (Payment.amount, Payment.reservation_id, Payment.is_refund, Payment.is_voided):
+    event.listen(_attr, "set", _track_previous_value, retval=True, active_history=True)
+
+
+@event.listens_for(Session, "before_flush")
+def _prepare_reservation_balances(session, flush_context, instances):
+    """Initialize balances of new reservations and follow total_amount edits"""
+    for obj in session.new:
+        if isinstance(obj, Reservation):
+            if obj.total_paid is None:
+                obj.total_paid = ZERO
+            if obj.balance is None and obj.total_amount is not None:
+                obj.balance = Decimal(str(obj.total_amount)) - Decimal(str(obj.total_paid))
+
+    for obj in session.dirty:
+        if isinstance(obj, Reservation) and attributes.get_history(obj, "total_amount").has_changes():
+            # Use the stored total_paid so concurrent payment postings are not lost
+            obj.balance = literal(Decimal(str(obj.total_amount)), Numeric(12, 2)) - Reservation.total_paid
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_payment_deltas(session, flush_context):
+    """Apply the net payment change of this flush to each affected reservation"""
+    deltas = defaultdict(Decimal)
+
+    for obj in session.new:
+        if isinstance(obj, Payment) and obj.reservation_id is not None:
+            deltas[obj.reservation_id] += _current_contribution(obj)
+
+    for obj in session.deleted:
+        if isinstance(obj, Payment):
+            deltas[_committed(obj, "reservation_id")] -= _committed_contribution(obj)
+
+    for obj in session.dirty:
+        if isinstance(obj, Payment) and session.is_modified(obj, include_collections=False):
+            deltas[_committed(obj, "reservation_id")] -= _committed_contribution(obj)
+            deltas[obj.reservation_id] += _current_contribution(obj)
+
+    changed = {res_id: delta for res_id, delta in deltas.items() if res_id is not None and delta != 0}
+    if not changed:
+        return
+
+    connection = session.connection()
+    table = Reservation.__table__
+    for reservation_id, delta in changed.items():
+        connection.execute(
+            update(table)
+            .where(table.c.id == reservation_id)
+            .values(
+                total_paid=func.coalesce(table.c.total_paid, 0) + delta,
+                balance=table.c.total_amount - (func.coalesce(table.c.total_paid, 0) + delta),
+            )
+        )
+
+    session.info.setdefault("balance_stale_reservations", set()).update(changed)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _expire_stale_balances(session, flush_context):
+    """Make loaded reservations re-read the values written by SQL"""
+    stale = session.info.pop("balance_stale_reservations", None)
+    if not stale:
+        return
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, Reservation) and obj.id in stale:
+            session.expire(obj, ["total_paid", "balance"])
+
+
+# ============== RECONCILIATION ==============
+
+def paid_totals_subquery():
+    """Per-reservation sum of counted payments (one grouped scan of payments)"""
+    return (
+        select(
+            Payment.reservation_id.label("reservation_id"),
+            func.sum(Payment.amount).label("paid"),
+        )
+        .where(
+            func.coalesce(Payment.is_refund, False) == False,
+            func.coalesce(Payment.is_voided, False) == False,
+        )
+        .group_by(Payment.reservation_id)
+        .subquery()
+    )
+
+
+def find_balance_drift(db: Session) -> list:
+    """
+    Recompute total_paid/balance for all reservations in a single query and
+    return the rows whose stored values differ.
+    """
+    paid = paid_totals_subquery()
+    computed_paid = func.coalesce(paid.c.paid, 0)
+    rows = db.execute(
+        select(
+            Reservation.id,
+            Reservation.confirmation_number,
+            Reservation.total_amount,
+            Reservation.total_paid,
+            Reservation.balance,
+            computed_paid.label("computed_paid"),
+        )
+        .select_from(Reservation)
+        .outerjoin(paid, paid.c.reservation_id == Reservation.id)
+    ).all()
+
+    drift = []
+    for row in rows:
+        expected_paid = Decimal(str(row.computed_paid or 0)).quantize(ZERO)
+        expected_balance = (Decimal(str(row.total_amount or 0)) - expected_paid).quantize(ZERO)
+        stored_paid = Decimal(str(row.total_paid)).quantize(ZERO) if row.total_paid is not None else None
+        stored_balance = Decimal(str(row.balance)).quantize(ZERO) if row.balance is not None else None
+        if stored_paid != expected_paid or stored_balance != expected_balance:
+            drift.append({
+                "reservation_id": row.id,
+                "confirmation_number": row.confirmation_number,
+                "stored_total_paid": stored_paid,
+                "expected_total_paid": expected_paid,
+                "stored_balance": stored_balance,
+                "expected_balance": expected_balance,
+            })
+    return drift
+
+
+def fix_balance_drift(db: Session, drift: list) -> int:
+    """Write the expected values for drifted reservations (executemany) and commit"""
+    if not drift:
+        return 0
+
+    table = Reservation.__table__
+    db.connection().execute(
+        update(table)
+        .where(table.c.id == bindparam("reservation_id"))
+        .values(total_paid=bindparam("expected_total_paid"), balance=bindparam("expected_balance")),
+        [
+            {
+                "reservation_id": row["reservation_id"],
+                "expected_total_paid": row["expected_total_paid"],
+                "expected_balance": row["expected_balance"],
+            }
+            for row in drift
+        ],
+    )
+    db.commit()
+    return len(drift)
@@ -0,0 +1,170 @@
+"""
+Batched read-only requests for Hotel Management System
+
+POST /api/batch runs several GET sub-requests (e.g. the four dashboard
+widgets) inside one HTTP request. Sub-requests are dispatched in process
+to the application's routes, one after another, so they share:
+
+- one database session (get_db() hands out the batch's session via
+  database.shared_session), optionally inside a single read-only
+  REPEATABLE READ transaction so every result comes from the same snapshot
+  (PostgreSQL; SQLite has no snapshot isolation for plain reads and runs
+  the sub-requests in the same session only);
+- the caller's Authorization header (each route still runs its own auth
+  dependency, which is an in-memory token lookup);
+- one response, so compression and the outer middleware run once.
+
+Only GET sub-requests to /api/ routes are allowed. Streaming endpoints
+(/api/events) and nested batches are rejected.
+
+GET handlers must not write. In a consistent batch a commit is refused (the
+sub-request fails with 500, as PostgreSQL would refuse it in a READ ONLY
+transaction), and once the snapshot transaction has ended - a failing
+sub-request (an exception or a 5xx response) rolls it back - the remaining
+sub-requests are not run: they get a 409 instead of silently reading outside the snapshot.
+"""
+
+import json
+from typing import Optional
+from urllib.parse import urlsplit
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from starlette.middleware.exceptions import ExceptionMiddleware
+
+from database import shared_session
+
+BATCH_ALLOWED_METHODS = ("GET",)
+BATCH_EXCLUDED_PREFIXES = ("/api/batch", "/api/events")
+SNAPSHOT_KEY = "batch_snapshot"  # Session.info key holding the snapshot transaction
+
+
+class BatchError(ValueError):
+    """Raised for sub-requests that cannot be batched"""
+
+
+def validate_sub_request(method: str, path: str):
+    """Reject anything that is not a read-only /api/ call"""
+    if method.upper() not in BATCH_ALLOWED_METHODS:
+        raise BatchError(f"Only {', '.join(BATCH_ALLOWED_METHODS)} sub-requests can be batched")
+    route_path = urlsplit(path).path
+    if not route_path.startswith("/api/"):
+        raise BatchError(f"Path must start with /api/: {path}")
+    if any(route_path == p or route_path.startswith(p + "/") for p in BATCH_EXCLUDED_PREFIXES):
+        raise BatchError(f"Path cannot be batched: {route_path}")
+
+
+def _dispatcher(app):
+    """The app's routes wrapped only in its exception handlers (no CORS/gzip/idempotency)"""
+    handlers = {key: handler for key, handler in app.exception_handlers.items() if key not in (500, Exception)}
+    return ExceptionMiddleware(app.router, handlers=handlers)
+
+
+def _sub_scope(scope: dict, path: str, authorization: Optional[bytes]) -> dict:
+    parts = urlsplit(path)
+    headers = [(b"accept", b"application/json")]
+    if authorization:
+        headers.append((b"authorization", authorization))
+    return {
+        **scope,
+        "method": "GET",
+        "path": parts.path,
+        "raw_path": parts.path.encode("utf-8"),
+        "query_string": parts.query.encode("utf-8"),
+        "headers": headers,
+    }
+
+
+async def _call(dispatch, scope: dict) -> dict:
+    """Run one sub-request in process and collect its status and body"""
+    response = {"status": 500, "headers": [], "body": []}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            response["body"].append(message.get("body", b""))
+
+    await dispatch(scope, receive, send)
+    return response
+
+
+def _decode_body(headers, body: bytes):
+    content_type = next((v.decode("latin-1") for k, v in headers if k.lower() == b"content-type"), "")
+    if "json" in content_type and body:
+        return json.loads(body)
+    return body.decode("utf-8", errors="replace") if body else None
+
+
+@event.listens_for(Session, "before_commit")
+def _refuse_commit_in_snapshot(session):
+    """Sub-requests of a consistent batch are read-only on every database"""
+    if session.info.get(SNAPSHOT_KEY) is not None:
+        raise BatchError("Sub-requests of a consistent batch cannot write")
+
+
+def _begin_snapshot(db: Session):
+    """Read-only, repeatable-read transaction for the rest of the session's work"""
+    db.info[SNAPSHOT_KEY] = db.begin()
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY"))
+
+
+def _snapshot_active(db: Session) -> bool:
+    snapshot = db.info.get(SNAPSHOT_KEY)
+    return snapshot is not None and snapshot.is_active and db.get_transaction() is snapshot
+
+
+async def run_batch(app, scope: dict, db: Session, sub_requests: list, consistent: bool = False) -> list:
+    """
+    Execute (id, method, path) sub-requests in order against `app` with `db`
+    shared. Returns one {"id", "status", "body"} per sub-request; a failing
+    sub-request does not abort the others, except in a consistent batch,
+    where it ends the snapshot and the sub-requests after it get a 409.
+    """
+    dispatch = _dispatcher(app)
+    authorization = next((v for k, v in scope.get("headers", []) if k.lower() == b"authorization"), None)
+    results = []
+
+    with shared_session(db):
+        if consistent:
+            db.rollback()  # start the snapshot transaction fresh
+            _begin_snapshot(db)
+        try:
+            for request_id, method, path in sub_requests:
+                if consistent and not _snapshot_active(db):
+                    results.append({"id": request_id, "status": 409, "body": {
+                        "detail": "Consistent snapshot was lost after an earlier sub-request failed",
+                    }})
+                    continue
+                try:
+                    validate_sub_request(method, path)
+                except BatchError as e:
+                    results.append({"id": request_id, "status": 400, "body": {"detail": str(e)}})
+                    continue
+
+                try:
+                    response = await _call(dispatch, _sub_scope(scope, path, authorization))
+                except Exception:
+                    db.rollback()
+                    results.append({"id": request_id, "status": 500, "body": {"error": "Internal server error"}})
+                    continue
+
+                results.append({
+                    "id": request_id,
+                    "status": response["status"],
+                    "body": _decode_body(response["headers"], b"".join(response["body"])),
+                })
+                if consistent and response["status"] >= 500:
+                    # A handled database error may have aborted the transaction
+                    db.rollback()
+        finally:
+            if consistent:
+                db.info.pop(SNAPSHOT_KEY, None)
+                db.rollback()
+
+    return results
@@ -3,11 +3,22 @@ Database configuration and session management
 """
 
 import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
+from typing import Optional
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from dotenv import load_dotenv
 
+from metrics import TimedQueuePool
+from query_stats import instrument_engine
+
+import balances  # noqa: F401 - registers the reservation balance session events
+import folio  # noqa: F401 - registers the append-only folio guard
+import sync  # noqa: F401 - registers the delta sync tombstone writer
+
 # Load environment - prefer .env.local for development, fall back to .env
 env_local = Path('.env.local')
 if env_local.exists():
@@ -18,22 +29,76 @@ else:
 # Database configuration
 DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///./hotel.db')
 
-# Create engine and session factory with optimized connection pooling
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
-    pool_pre_ping=True,  # Verify connections before using
-    pool_recycle=3600,  # Recycle connections after 1 hour
-    pool_size=20,  # Maximum number of connections to keep in the pool
-    max_overflow=10,  # Maximum number of connections that can be created beyond pool_size
-    echo=False,  # Set to True for SQL query logging (disable in production)
-)
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """
+    The application engine, created on first use so importing the app does
+    not load the database driver or build the pool (engine connections are
+    only opened by the first query).
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                # Engine with optimized connection pooling
+                _engine = create_engine(
+                    DATABASE_URL,
+                    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
+                    poolclass=TimedQueuePool,  # QueuePool that records checkout wait time (metrics.py)
+                    pool_pre_ping=True,  # Verify connections before using
+                    pool_recycle=3600,  # Recycle connections after 1 hour
+                    pool_size=20,  # Maximum number of connections to keep in the pool
+                    max_overflow=10,  # Maximum number of connections that can be created beyond pool_size
+                    echo=False,  # Set to True for SQL query logging (disable in production)
+                )
+                # Per-request query counts, slow-query log (see query_stats.py)
+                instrument_engine(_engine)
+    return _engine
+
+
+def __getattr__(name):
+    # `from database import engine` keeps working; the engine is built on access
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _LazySessionMaker(sessionmaker):
+    """sessionmaker that binds to get_engine() when the first session is made"""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+SessionLocal = _LazySessionMaker(autocommit=False, autoflush=False)
+
+
+# Session shared by the sub-requests of POST /api/batch (see batch.py)
+_shared_session: ContextVar[Optional[Session]] = ContextVar("shared_session", default=None)
+
+
+@contextmanager
+def shared_session(db: Session):
+    """Make get_db() hand out `db` (without closing it) inside this block"""
+    token = _shared_session.set(db)
+    try:
+        yield db
+    finally:
+        _shared_session.reset(token)
 
 
 def get_db():
     """Dependency to get database session"""
+    shared = _shared_session.get()
+    if shared is not None:
+        yield shared
+        return
+
     db = SessionLocal()
     try:
         yield db
@@ -0,0 +1,330 @@
+"""
+Discount evaluation engine for Hotel Management System
+
+Active discounts are precompiled into an in-memory index keyed by
+(room type, month of stay) plus a lookup by code, so quoting and booking
+only look at the handful of discounts that can apply and evaluate each
+candidate with constant-time checks (validity window, min stay, min amount,
+guest eligibility, remaining usage).
+
+The index is cached per process and rebuilt after DISCOUNT_INDEX_TTL_SECONDS
+or when discounts are changed through the API. Usage limits are enforced at
+booking time with a single conditional UPDATE, so concurrent bookings can
+never redeem a discount more than usage_limit times. Because the index can
+be stale, an auto-applied discount may turn out to be used up only when it
+is redeemed; redeem_best_discount() then moves on to the next best one.
+"""
+
+import json
+import threading
+import time
+from collections import defaultdict
+from datetime import date
+from typing import NamedTuple, Optional
+
+from sqlalchemy import update, or_, func
+from sqlalchemy.orm import Session
+
+from models import Discount, Reservation
+
+DISCOUNT_INDEX_TTL_SECONDS = 60
+
+# Months (from the current month) covered by the date buckets; stays
+# outside the horizon fall back to the per-room-type candidate lists
+DISCOUNT_INDEX_HORIZON_MONTHS = 24
+
+ALL_ROOM_TYPES = None
+
+
+class DiscountError(Exception):
+    """Raised when a requested discount code cannot be applied"""
+
+
+class DiscountUnavailable(DiscountError):
+    """Raised when a requested discount code was used up by another booking"""
+
+
+class CompiledDiscount(NamedTuple):
+    """Immutable, pre-parsed view of a Discount row used by the index"""
+    id: int
+    code: Optional[str]
+    name: str
+    discount_type: str
+    value: float
+    max_amount: Optional[float]
+    valid_from: Optional[date]
+    valid_until: Optional[date]
+    min_stay_nights: Optional[int]
+    min_booking_amount: Optional[float]
+    usage_limit: Optional[int]
+    usage_count: int
+    max_bookings_per_guest: Optional[int]
+    room_type_ids: Optional[frozenset]
+    guest_ids: Optional[frozenset]
+    is_auto_applied: bool
+
+
+def _parse_id_list(raw: Optional[str]) -> Optional[frozenset]:
+    """Parse a JSON array of IDs (None / empty = no restriction)"""
+    if not raw:
+        return None
+    values = json.loads(raw)
+    if not values:
+        return None
+    return frozenset(int(v) for v in values)
+
+
+def _month_key(day: date) -> int:
+    return day.year * 12 + day.month - 1
+
+
+def compile_discount(discount: Discount) -> CompiledDiscount:
+    """Convert a Discount row into its compiled form"""
+    return CompiledDiscount(
+        id=discount.id,
+        code=discount.code.upper() if discount.code else None,
+        name=discount.name,
+        discount_type=discount.discount_type,
+        value=float(discount.discount_value),
+        max_amount=float(discount.max_discount_amount) if discount.max_discount_amount is not None else None,
+        valid_from=discount.valid_from,
+        valid_until=discount.valid_until,
+        min_stay_nights=discount.min_stay_nights,
+        min_booking_amount=float(discount.min_booking_amount) if discount.min_booking_amount is not None else None,
+        usage_limit=discount.usage_limit,
+        usage_count=discount.usage_count or 0,
+        max_bookings_per_guest=discount.max_bookings_per_guest,
+        room_type_ids=_parse_id_list(discount.applicable_room_types),
+        guest_ids=_parse_id_list(discount.applicable_guests),
+        is_auto_applied=bool(discount.is_auto_applied),
+    )
+
+
+class DiscountIndex:
+    """Auto-applied discounts bucketed by room type and month, plus a code lookup"""
+
+    def __init__(self, discounts: list, today: Optional[date] = None):
+        today = today or date.today()
+        self.first_month = _month_key(today)
+        self.last_month = self.first_month + DISCOUNT_INDEX_HORIZON_MONTHS - 1
+        self.by_code = {}
+        self._buckets = defaultdict(list)
+        self._by_room_type = defaultdict(list)
+
+        for discount in discounts:
+            if discount.code:
+                self.by_code[discount.code] = discount
+            if not discount.is_auto_applied:
+                continue
+
+            start = _month_key(discount.valid_from) if discount.valid_from else self.first_month
+            end = _month_key(discount.valid_until) if discount.valid_until else self.last_month
+            room_types = discount.room_type_ids or (ALL_ROOM_TYPES,)
+            for room_type_id in room_types:
+                self._by_room_type[room_type_id].append(discount)
+                for month in range(max(start, self.first_month), min(end, self.last_month) + 1):
+                    self._buckets[(room_type_id, month)].append(discount)
+
+    def candidates(self, room_type_id: int, stay_date: date) -> list:
+        """Auto-applied discounts that may apply to a room type on a date"""
+        month = _month_key(stay_date)
+        if self.first_month <= month <= self.last_month:
+            return self._buckets.get((room_type_id, month), []) + self._buckets.get((ALL_ROOM_TYPES, month), [])
+        return self._by_room_type.get(room_type_id, []) + self._by_room_type.get(ALL_ROOM_TYPES, [])
+
+
+_index_lock = threading.Lock()
+_cached_index = {"index": None, "built_at": 0.0}
+
+
+def build_discount_index(db: Session) -> DiscountIndex:
+    """Compile all active discounts into a fresh index"""
+    compiled = []
+    for discount in db.query(Discount).filter(Discount.status == 'active').all():
+        try:
+            compiled.append(compile_discount(discount))
+        except (ValueError, TypeError):
+            # Malformed applicability JSON - never apply rather than apply everywhere
+            continue
+    return DiscountIndex(compiled)
+
+
+def get_discount_index(db: Session) -> DiscountIndex:
+    """Return the cached discount index, rebuilding it when stale"""
+    with _index_lock:
+        index = _cached_index["index"]
+        if index is None or time.monotonic() - _cached_index["built_at"] > DISCOUNT_INDEX_TTL_SECONDS:
+            index = build_discount_index(db)
+            _cached_index["index"] = index
+            _cached_index["built_at"] = time.monotonic()
+        return index
+
+
+def invalidate_discount_index():
+    """Drop the cached index (call after discounts are created/updated/deleted)"""
+    with _index_lock:
+        _cached_index["index"] = None
+
+
+def ineligibility_reason(
+    discount: CompiledDiscount,
+    room_type_id: int,
+    check_in: date,
+    nights: int,
+    subtotal: float,
+    guest_id: Optional[int] = None,
+) -> Optional[str]:
+    """Constant-time eligibility check; returns None if the discount applies"""
+    if discount.valid_from and check_in < discount.valid_from:
+        return "Discount is not valid yet"
+    if discount.valid_until and check_in > discount.valid_until:
+        return "Discount has expired"
+    if discount.room_type_ids is not None and room_type_id not in discount.room_type_ids:
+        return "Discount does not apply to this room type"
+    if discount.min_stay_nights and nights < discount.min_stay_nights:
+        return f"Discount requires a minimum stay of {discount.min_stay_nights} nights"
+    if discount.min_booking_amount is not None and subtotal < discount.min_booking_amount:
+        return f"Discount requires a minimum booking amount of {discount.min_booking_amount}"
+    if discount.guest_ids is not None and guest_id not in discount.guest_ids:
+        return "Discount is not available for this guest"
+    if discount.usage_limit is not None and discount.usage_count >= discount.usage_limit:
+        return "Discount usage limit reached"
+    return None
+
+
+def discount_amount(discount: CompiledDiscount, subtotal: float) -> float:
+    """Amount taken off a subtotal by a discount"""
+    if discount.discount_type == 'percentage':
+        amount = subtotal * discount.value / 100.0
+        if discount.max_amount is not None:
+            amount = min(amount, discount.max_amount)
+    else:
+        amount = discount.value
+    return round(max(0.0, min(amount, subtotal)), 2)
+
+
+def _guest_bookings_with(db: Session, discount_id: int, guest_id: int) -> int:
+    return db.query(func.count(Reservation.id)).filter(
+        Reservation.discount_id == discount_id,
+        Reservation.guest_id == guest_id,
+        Reservation.status != 'cancelled',
+    ).scalar() or 0
+
+
+def evaluate_discount(
+    db: Session,
+    room_type_id: int,
+    check_in: date,
+    nights: int,
+    subtotal: float,
+    code: Optional[str] = None,
+    guest_id: Optional[int] = None,
+    index: Optional[DiscountIndex] = None,
+    exclude_ids: frozenset = frozenset(),
+) -> Optional[dict]:
+    """
+    Find the best discount for a stay.
+
+    Considers the discount matching code (if given) and every auto-applied
+    discount for the room type and check-in date, except exclude_ids; the
+    one giving the largest amount wins (discounts never stack). Raises
+    DiscountError if an explicit code is unknown or not applicable.
+    """
+    index = index or get_discount_index(db)
+    code = code.strip().upper() if code else None
+    eligible = []
+
+    if code:
+        coded = index.by_code.get(code)
+        if not coded:
+            raise DiscountError(f"Discount code '{code}' is not valid")
+        reason = ineligibility_reason(coded, room_type_id, check_in, nights, subtotal, guest_id)
+        if reason:
+            raise DiscountError(reason)
+        eligible.append(coded)
+
+    for candidate in index.candidates(room_type_id, check_in):
+        if candidate.id in exclude_ids:
+            continue
+        if ineligibility_reason(candidate, room_type_id, check_in, nights, subtotal, guest_id) is None:
+            eligible.append(candidate)
+
+    eligible.sort(key=lambda d: discount_amount(d, subtotal), reverse=True)
+    for discount in eligible:
+        # Per-guest limits need a lookup, so only check the best candidates
+        if guest_id and discount.max_bookings_per_guest:
+            if _guest_bookings_with(db, discount.id, guest_id) >= discount.max_bookings_per_guest:
+                if code and discount.code == code:
+                    raise DiscountError("Guest has already used this discount the maximum number of times")
+                continue
+        return {
+            "discount_id": discount.id,
+            "code": discount.code,
+            "name": discount.name,
+            "discount_type": discount.discount_type,
+            "amount": discount_amount(discount, subtotal),
+            "is_auto_applied": discount.is_auto_applied,
+        }
+    return None
+
+
+def redeem_discount(db: Session, discount_id: int) -> bool:
+    """
+    Atomically consume one use of a discount inside the caller's transaction.
+
+    The conditional UPDATE only succeeds while usage_count < usage_limit, so
+    the database serializes concurrent redemptions. Returns False if the
+    discount is exhausted or no longer active.
+    """
+    result = db.execute(
+        update(Discount)
+        .where(
+            Discount.id == discount_id,
+            Discount.status == 'active',
+            or_(Discount.usage_limit.is_(None), func.coalesce(Discount.usage_count, 0) < Discount.usage_limit),
+        )
+        .values(usage_count=func.coalesce(Discount.usage_count, 0) + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def redeem_best_discount(
+    db: Session,
+    room_type_id: int,
+    check_in: date,
+    nights: int,
+    subtotal: float,
+    code: Optional[str] = None,
+    guest_id: Optional[int] = None,
+) -> Optional[dict]:
+    """
+    Evaluate and redeem the best discount for a booking in the caller's transaction.
+
+    An auto-applied discount found used up at redemption (the cached index
+    lagged behind another booking) is skipped and the next best one is
+    tried, down to no discount. Only the discount the guest asked for by
+    code raises DiscountUnavailable.
+    """
+    code = code.strip().upper() if code else None
+    exhausted = set()
+    while True:
+        discount = evaluate_discount(db, room_type_id, check_in, nights, subtotal, code=code,
+                                     guest_id=guest_id, exclude_ids=frozenset(exhausted))
+        if discount is None or redeem_discount(db, discount["discount_id"]):
+            return discount
+
+        invalidate_discount_index()
+        if code and discount["code"] == code:
+            raise DiscountUnavailable(f"Discount '{discount['name']}' is no longer available")
+        exhausted.add(discount["discount_id"])
+
+
+def release_discount(db: Session, discount_id: int):
+    """Give back one use of a discount (e.g. when a reservation is cancelled)"""
+    db.execute(
+        update(Discount)
+        .where(Discount.id == discount_id, Discount.usage_count > 0)
+        .values(usage_count=Discount.usage_count - 1)
+        .execution_options(synchronize_session=False)
+    )
@@ -6,6 +6,7 @@ import os
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from datetime import datetime, timedelta
 from typing import Generator
 
@@ -17,7 +18,8 @@ def test_db_engine():
     """Create test database engine"""
     engine = create_engine(
         TEST_SQLALCHEMY_DATABASE_URL,
-        connect_args={"check_same_thread": False}
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,  # Share the in-memory DB with TestClient worker threads
     )
 
     # Create tables
@@ -40,6 +42,14 @@ def db_session(test_db_engine):
     Base.metadata.drop_all(bind=test_db_engine)
     Base.metadata.create_all(bind=test_db_engine)
 
+    # Process-wide caches must not leak between test databases
+    from discounts import invalidate_discount_index
+    from idempotency import idempotency_store
+    from reports import invalidate_pnl_cache
+    invalidate_discount_index()
+    idempotency_store.clear()
+    invalidate_pnl_cache()
+
     session = TestingSessionLocal()
     yield session
     session.close()
@@ -121,6 +131,21 @@ def user_token(client, db_session):
     return {"token": token, "user": regular_user}
 
 
+@pytest.fixture
+def auth_headers(client, db_session):
+    """Create a receptionist user and return Authorization headers for it"""
+    from models import User
+    from security import create_access_token
+
+    user = User(username="frontdesk", email="frontdesk@hotel.test", role="user", password_hash="x")
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+
+    token = create_access_token(user.id, user.username)
+    return {"Authorization": f"Bearer {token}"}
+
+
 @pytest.fixture
 def room_type_data(db_session):
     """Create test room types"""
@@ -0,0 +1,108 @@
+"""
+Tests for stored reservation balances
+Covers incremental total_paid/balance maintenance and drift reconciliation
+"""
+
+import pytest
+from datetime import date
+
+
+@pytest.fixture
+def reservation(db_session):
+    """Create a reservation with a total of 1,000,000"""
+    import balances  # noqa: F401 - registers the session events
+    from models import User, Guest, RoomType, Reservation
+
+    user = User(username="cashier", password_hash="x", full_name="Cashier")
+    guest = Guest(full_name="Jane Doe", id_type="passport", id_number="X1")
+    room_type = RoomType(name="Standard", code="STD", default_rate=500000)
+    db_session.add_all([user, guest, room_type])
+    db_session.flush()
+
+    reservation = Reservation(
+        confirmation_number="RES-BAL-1", guest_id=guest.id, room_type_id=room_type.id,
+        check_in_date=date(2030, 3, 4), check_out_date=date(2030, 3, 6),
+        rate_per_night=500000, number_of_nights=2, subtotal=1000000,
+        total_amount=1000000, created_by=user.id,
+    )
+    db_session.add(reservation)
+    db_session.commit()
+    return reservation
+
+
+def _pay(db_session, reservation, amount, **kwargs):
+    from models import Payment
+
+    payment = Payment(reservation_id=reservation.id, payment_date=date(2030, 3, 4),
+                      amount=amount, payment_method="cash", **kwargs)
+    db_session.add(payment)
+    db_session.commit()
+    return payment
+
+
+class TestStoredBalances:
+    """Test incremental balance maintenance"""
+
+    def test_new_reservation_starts_unpaid(self, db_session, reservation):
+        assert reservation.calculate_total_paid() == 0
+        assert reservation.calculate_balance() == 1000000
+
+    def test_payments_update_balance(self, db_session, reservation):
+        """Payments add to total_paid; refunds do not"""
+        _pay(db_session, reservation, 300000)
+        _pay(db_session, reservation, 200000)
+        _pay(db_session, reservation, 50000, is_refund=True)
+
+        assert reservation.calculate_total_paid() == 500000
+        assert reservation.calculate_balance() == 500000
+
+    def test_void_edit_and_delete(self, db_session, reservation):
+        """Voiding, editing and deleting payments are all reflected"""
+        first = _pay(db_session, reservation, 300000)
+        second = _pay(db_session, reservation, 200000)
+
+        first.is_voided = True
+        db_session.commit()
+        assert reservation.calculate_total_paid() == 200000
+
+        second.amount = 250000
+        db_session.commit()
+        assert reservation.calculate_total_paid() == 250000
+
+        db_session.delete(second)
+        db_session.commit()
+        assert reservation.calculate_total_paid() == 0
+        assert reservation.calculate_balance() == 1000000
+
+    def test_total_amount_change_recomputes_balance(self, db_session, reservation):
+        _pay(db_session, reservation, 400000)
+
+        reservation.total_amount = 900000
+        db_session.commit()
+
+        assert reservation.calculate_balance() == 500000
+
+
+class TestBalanceReconciliation:
+    """Test drift detection and repair"""
+
+    def test_detects_and_fixes_drift(self, db_session, reservation):
+        from sqlalchemy import update
+        from models import Reservation
+        from balances import find_balance_drift, fix_balance_drift
+
+        _pay(db_session, reservation, 300000)
+        assert find_balance_drift(db_session) == []
+
+        # Simulate a write that bypassed the ORM
+        db_session.execute(update(Reservation).values(total_paid=0, balance=1000000))
+        db_session.commit()
+
+        drift = find_balance_drift(db_session)
+        assert len(drift) == 1
+        assert drift[0]["expected_total_paid"] == 300000
+
+        assert fix_balance_drift(db_session, drift) == 1
+        assert find_balance_drift(db_session) == []
+        db_session.refresh(reservation)
+        assert reservation.calculate_balance() == 700000
@@ -0,0 +1,109 @@
+"""
+Tests for POST /api/batch
+Covers dashboard-style batches, per-sub-request errors and read-only enforcement
+"""
+
+
+class TestBatchEndpoint:
+    """Test batched sub-requests"""
+
+    def test_dashboard_batch(self, client, auth_headers):
+        response = client.post("/api/batch", headers=auth_headers, json={"requests": [
+            {"id": "today", "path": "/api/dashboard/today"},
+            {"id": "metrics", "path": "/api/dashboard/metrics"},
+            {"path": "/api/rooms?limit=5&fields=room_number"},
+        ], "consistent": True})
+        assert response.status_code == 200
+        results = response.json()["responses"]
+
+        assert [r["id"] for r in results] == ["today", "metrics", "2"]
+        assert all(r["status"] == 200 for r in results), results
+        assert "arrivals_today" in results[0]["body"]
+        assert results[2]["body"]["rooms"] == []
+
+        direct = client.get("/api/dashboard/today", headers=auth_headers).json()
+        assert results[0]["body"] == direct
+
+    def test_failing_sub_request_does_not_fail_batch(self, client, auth_headers):
+        response = client.post("/api/batch", headers=auth_headers, json={"requests": [
+            {"id": "missing", "path": "/api/guests/999999"},
+            {"id": "bad", "path": "/api/guests?fields=nope"},
+            {"id": "ok", "path": "/api/guests"},
+        ]})
+        statuses = {r["id"]: r["status"] for r in response.json()["responses"]}
+        assert statuses == {"missing": 404, "bad": 400, "ok": 200}
+
+    def test_only_read_only_api_calls(self, client, auth_headers):
+        response = client.post("/api/batch", headers=auth_headers, json={"requests": [
+            {"id": "write", "method": "DELETE", "path": "/api/guests/1"},
+            {"id": "nested", "path": "/api/batch"},
+            {"id": "stream", "path": "/api/events"},
+            {"id": "outside", "path": "/health"},
+        ]})
+        assert {r["id"]: r["status"] for r in response.json()["responses"]} == {
+            "write": 400, "nested": 400, "stream": 400, "outside": 400,
+        }
+
+    def test_sub_requests_use_caller_credentials(self, client):
+        response = client.post("/api/batch", json={"requests": [{"path": "/api/guests"}]})
+        assert response.status_code in (401, 403)
+
+    def test_shared_session(self):
+        from database import get_db, shared_session
+
+        marker = object()
+        with shared_session(marker):
+            generator = get_db()
+            assert next(generator) is marker
+
+        generator = get_db()
+        assert next(generator) is not marker
+        generator.close()
+
+
+class TestConsistentBatch:
+    """Test the snapshot of consistent batches"""
+
+    def test_sync_in_consistent_batch(self, client, db_session, auth_headers):
+        """GET /api/sync is read-only, so it keeps the snapshot for the sub-requests after it"""
+        from datetime import datetime, timedelta
+        from models import SyncTombstone
+        from sync import SYNC_TOMBSTONE_RETENTION_DAYS
+
+        db_session.add(SyncTombstone(table_name="guests", row_id=1,
+                                     deleted_at=datetime.utcnow() - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS + 1)))
+        db_session.commit()
+
+        response = client.post("/api/batch", headers=auth_headers, json={"requests": [
+            {"id": "sync", "path": "/api/sync"},
+            {"id": "today", "path": "/api/dashboard/today"},
+            {"id": "guests", "path": "/api/guests"},
+        ], "consistent": True})
+        results = response.json()["responses"]
+        assert [r["status"] for r in results] == [200, 200, 200], results
+        assert results[0]["body"]["reset"] is True
+        assert db_session.query(SyncTombstone).count() == 1
+
+    def test_write_in_consistent_batch_is_refused(self, client, auth_headers, monkeypatch):
+        """A sub-request that commits fails, and the rest of the batch is not run outside the snapshot"""
+        import routes.sync_router as sync_router
+
+        def committing_collect_changes(db, since, cursor):
+            db.commit()
+
+        monkeypatch.setattr(sync_router, "collect_changes", committing_collect_changes)
+        response = client.post("/api/batch", headers=auth_headers, json={"requests": [
+            {"id": "guests", "path": "/api/guests"},
+            {"id": "sync", "path": "/api/sync"},
+            {"id": "today", "path": "/api/dashboard/today"},
+        ], "consistent": True})
+        statuses = {r["id"]: r["status"] for r in response.json()["responses"]}
+        assert statuses == {"guests": 200, "sync": 500, "today": 409}
+
+        # Without consistent=true there is no snapshot to lose
+        response = client.post("/api/batch", headers=auth_headers, json={"requests": [
+            {"id": "sync", "path": "/api/sync"},
+            {"id": "today", "path": "/api/dashboard/today"},
+        ]})
+        statuses = {r["id"]: r["status"] for r in response.json()["responses"]}
+        assert statuses["today"] == 200
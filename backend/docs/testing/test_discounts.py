@@ -0,0 +1,211 @@
+"""
+Tests for the discount rule engine
+Covers the discount index, eligibility rules, code/auto selection and usage limits
+"""
+
+import pytest
+from datetime import date, timedelta
+
+
+@pytest.fixture
+def room_type(db_session):
+    from models import RoomType
+
+    room_type = RoomType(name="Standard", code="STD", default_rate=500000)
+    db_session.add(room_type)
+    db_session.commit()
+    return room_type
+
+
+class TestDiscountEngine:
+    """Test discount evaluation"""
+
+    def test_auto_discount_respects_min_stay(self, db_session, room_type):
+        """Auto-applied discounts only apply when their rules match"""
+        from models import Discount
+        from discounts import evaluate_discount
+
+        db_session.add(Discount(
+            name="Long stay", discount_type="percentage", discount_value=10,
+            min_stay_nights=5, is_auto_applied=True, status="active",
+        ))
+        db_session.commit()
+
+        check_in = date.today() + timedelta(days=3)
+        assert evaluate_discount(db_session, room_type.id, check_in, 2, 1000000) is None
+
+        discount = evaluate_discount(db_session, room_type.id, check_in, 5, 2500000)
+        assert discount["amount"] == 250000
+        assert discount["is_auto_applied"] is True
+
+    def test_best_discount_wins_and_room_type_filter(self, db_session, room_type):
+        """The largest applicable discount is selected; room type lists are honored"""
+        from models import Discount
+        from discounts import evaluate_discount
+
+        db_session.add_all([
+            Discount(name="Small", discount_type="fixed_amount", discount_value=50000,
+                     is_auto_applied=True, status="active"),
+            Discount(name="Capped", discount_type="percentage", discount_value=50,
+                     max_discount_amount=100000, is_auto_applied=True, status="active"),
+            Discount(name="Other type", discount_type="fixed_amount", discount_value=900000,
+                     applicable_room_types=f"[{room_type.id + 1}]", is_auto_applied=True, status="active"),
+        ])
+        db_session.commit()
+
+        discount = evaluate_discount(db_session, room_type.id, date.today(), 2, 1000000)
+        assert discount["name"] == "Capped"
+        assert discount["amount"] == 100000
+
+    def test_invalid_code_raises(self, db_session, room_type):
+        """Unknown or expired codes are rejected with a reason"""
+        from models import Discount
+        from discounts import DiscountError, evaluate_discount
+
+        db_session.add(Discount(
+            name="Old promo", code="OLD", discount_type="fixed_amount", discount_value=10000,
+            valid_until=date.today() - timedelta(days=1), status="active",
+        ))
+        db_session.commit()
+
+        with pytest.raises(DiscountError):
+            evaluate_discount(db_session, room_type.id, date.today(), 1, 500000, code="NOPE")
+        with pytest.raises(DiscountError, match="expired"):
+            evaluate_discount(db_session, room_type.id, date.today(), 1, 500000, code="old")
+
+    def test_redeem_enforces_usage_limit(self, db_session, room_type):
+        """The conditional update never exceeds usage_limit"""
+        from models import Discount
+        from discounts import redeem_discount, release_discount
+
+        discount = Discount(name="One-off", code="ONCE", discount_type="fixed_amount",
+                            discount_value=10000, usage_limit=1, usage_count=0, status="active")
+        db_session.add(discount)
+        db_session.commit()
+
+        assert redeem_discount(db_session, discount.id) is True
+        assert redeem_discount(db_session, discount.id) is False
+
+        release_discount(db_session, discount.id)
+        assert redeem_discount(db_session, discount.id) is True
+
+
+class TestDiscountBooking:
+    """Test discounts applied through the API"""
+
+    def test_reservation_with_code(self, client, db_session, auth_headers, room_type):
+        """Booking with a code sets discount_id and consumes one use"""
+        from models import Discount, Guest, Room
+
+        discount = Discount(name="Welcome", code="WELCOME", discount_type="percentage",
+                            discount_value=20, usage_limit=1, usage_count=0, status="active")
+        guest = Guest(full_name="Jane Doe", id_type="passport", id_number="X1")
+        db_session.add_all([discount, guest, Room(room_number="101", room_type_id=room_type.id),
+                            Room(room_number="102", room_type_id=room_type.id)])
+        db_session.commit()
+        discount_id = discount.id
+
+        check_in = date.today() + timedelta(days=7)
+        payload = {
+            "guest_id": guest.id,
+            "room_type_id": room_type.id,
+            "check_in_date": check_in.isoformat(),
+            "check_out_date": (check_in + timedelta(days=2)).isoformat(),
+            "discount_code": "welcome",
+        }
+
+        response = client.post("/api/reservations", json=payload, headers=auth_headers)
+        assert response.status_code == 201
+        data = response.json()
+        assert data["discount_id"] == discount_id
+        assert data["discount_amount"] == 200000
+        assert data["total_amount"] == 800000
+
+        # Limit reached - the second booking is refused
+        response = client.post("/api/reservations", json=payload, headers=auth_headers)
+        assert response.status_code in (400, 409)
+
+    def test_exhausted_auto_discount_falls_back(self, client, db_session, auth_headers, room_type):
+        """An auto discount used up behind the cached index is skipped, not a failed booking"""
+        from models import Discount, Guest, Room
+        from discounts import get_discount_index
+
+        best = Discount(name="Flash sale", discount_type="fixed_amount", discount_value=300000,
+                        usage_limit=1, usage_count=0, is_auto_applied=True, status="active")
+        fallback = Discount(name="Member rate", discount_type="fixed_amount", discount_value=50000,
+                            usage_limit=1, usage_count=0, is_auto_applied=True, status="active")
+        guest = Guest(full_name="Jane Doe", id_type="passport", id_number="X1")
+        db_session.add_all([best, fallback, guest] + [
+            Room(room_number=str(100 + i), room_type_id=room_type.id) for i in range(3)
+        ])
+        db_session.commit()
+
+        get_discount_index(db_session)  # cached while both still have a use left
+        # Another process books the last use of the best one
+        best.usage_count = 1
+        db_session.commit()
+        fallback_id = fallback.id
+
+        check_in = date.today() + timedelta(days=7)
+        payload = {
+            "guest_id": guest.id,
+            "room_type_id": room_type.id,
+            "check_in_date": check_in.isoformat(),
+            "check_out_date": (check_in + timedelta(days=2)).isoformat(),
+        }
+        response = client.post("/api/reservations", json=payload, headers=auth_headers)
+        assert response.status_code == 201
+        assert response.json()["discount_id"] == fallback_id
+        assert response.json()["total_amount"] == 950000
+
+        # Both used up: the booking goes through without a discount
+        response = client.post("/api/reservations", json=payload, headers=auth_headers)
+        assert response.status_code == 201
+        assert response.json()["discount_id"] is None
+        assert response.json()["total_amount"] == 1000000
+
+    def test_exhausted_requested_code_conflicts(self, client, db_session, auth_headers, room_type):
+        """A code the guest asked for that was used up elsewhere is reported with 409"""
+        from models import Discount, Guest, Room
+        from discounts import get_discount_index
+
+        discount = Discount(name="Welcome", code="WELCOME", discount_type="fixed_amount",
+                            discount_value=100000, usage_limit=1, usage_count=0, status="active")
+        guest = Guest(full_name="Jane Doe", id_type="passport", id_number="X1")
+        db_session.add_all([discount, guest, Room(room_number="101", room_type_id=room_type.id)])
+        db_session.commit()
+
+        get_discount_index(db_session)
+        discount.usage_count = 1
+        db_session.commit()
+
+        check_in = date.today() + timedelta(days=7)
+        response = client.post("/api/reservations", json={
+            "guest_id": guest.id,
+            "room_type_id": room_type.id,
+            "check_in_date": check_in.isoformat(),
+            "check_out_date": (check_in + timedelta(days=2)).isoformat(),
+            "discount_code": "welcome",
+        }, headers=auth_headers)
+        assert response.status_code == 409
+
+    def test_quote_includes_discount(self, client, db_session, auth_headers, room_type):
+        """Quotes report the applied discount and discounted total"""
+        from models import Discount
+
+        db_session.add(Discount(name="Promo", discount_type="fixed_amount", discount_value=100000,
+                                is_auto_applied=True, status="active"))
+        db_session.commit()
+
+        check_in = date.today() + timedelta(days=7)
+        response = client.get(
+            "/api/rates/quote",
+            params={"check_in_date": check_in.isoformat(),
+                    "check_out_date": (check_in + timedelta(days=1)).isoformat()},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        quote = response.json()["quotes"][0]
+        assert quote["discount"]["name"] == "Promo"
+        assert quote["total_amount"] == 400000
@@ -0,0 +1,115 @@
+"""
+Tests for the live event broker and SSE stream
+Covers filtering, overflow, Last-Event-ID replay and events published by routers
+"""
+
+import asyncio
+from datetime import date, timedelta
+
+
+class TestEventBroker:
+    """Test fan-out and per-connection filters"""
+
+    def test_type_and_room_filters(self):
+        from events import EventBroker
+
+        broker = EventBroker()
+        rooms = broker.subscribe(types=["room"], room_ids=[1])
+        everything = broker.subscribe()
+
+        broker.publish("room.status_changed", {"room_id": 1, "status": "occupied"})
+        broker.publish("room.status_changed", {"room_id": 2, "status": "occupied"})
+        broker.publish("payment.posted", {"payment_id": 5})
+
+        assert rooms.queue.qsize() == 1
+        assert everything.queue.qsize() == 3
+
+    def test_slow_consumer_gets_overflow(self):
+        from events import EventBroker, STREAM_OVERFLOW
+
+        broker = EventBroker()
+        subscription = broker.subscribe()
+        subscription.queue = asyncio.Queue(maxsize=2)
+        for i in range(3):
+            broker.publish("payment.posted", {"payment_id": i})
+
+        assert subscription.queue.qsize() == 1
+        assert subscription.queue.get_nowait()["type"] == STREAM_OVERFLOW
+
+    def test_resume_from_last_event_id(self):
+        from events import EventBroker
+
+        broker = EventBroker()
+        first = broker.publish("payment.posted", {"payment_id": 1})
+        broker.publish("payment.posted", {"payment_id": 2})
+
+        subscription = broker.subscribe(last_event_id=first["id"])
+        assert subscription.queue.get_nowait()["data"] == {"payment_id": 2}
+
+    async def test_stream_frames_and_unsubscribe(self):
+        from events import EventBroker, event_stream
+
+        broker = EventBroker()
+        subscription = broker.subscribe()
+        stream = event_stream(subscription, broker, keepalive_seconds=0.01)
+
+        assert (await stream.__anext__()).startswith("retry:")
+        assert await stream.__anext__() == ": keepalive\n\n"
+
+        broker.publish("room.status_changed", {"room_id": 3})
+        frame = await stream.__anext__()
+        assert "event: room.status_changed\n" in frame and '"room_id": 3' in frame
+
+        await stream.aclose()
+        assert broker.connection_count == 0
+
+
+class TestRouterEvents:
+    """Test events emitted by the routers"""
+
+    def test_booking_and_payment_publish_events(self, client, db_session, auth_headers):
+        from events import broker
+        from models import Guest, Room, RoomType
+
+        room_type = RoomType(name="Standard", code="STD", default_rate=500000)
+        db_session.add(room_type)
+        db_session.flush()
+        guest = Guest(full_name="Jane Doe", id_type="passport", id_number="X1")
+        db_session.add_all([guest, Room(room_number="101", room_type_id=room_type.id)])
+        db_session.commit()
+
+        subscription = broker.subscribe(types=["reservation.created", "payment"])
+        try:
+            check_in = date.today() + timedelta(days=3)
+            reservation = client.post("/api/reservations", json={
+                "guest_id": guest.id, "room_type_id": room_type.id,
+                "check_in_date": check_in.isoformat(),
+                "check_out_date": (check_in + timedelta(days=1)).isoformat(),
+            }, headers=auth_headers).json()
+            client.post("/api/payments", json={
+                "reservation_id": reservation["id"], "amount": 100000,
+                "payment_date": date.today().isoformat(), "payment_method": "cash",
+            }, headers=auth_headers)
+
+            events = [subscription.queue.get_nowait() for _ in range(subscription.queue.qsize())]
+            assert [e["type"] for e in events] == ["reservation.created", "payment.posted"]
+            assert events[1]["data"]["reservation_id"] == reservation["id"]
+        finally:
+            broker.unsubscribe(subscription)
+
+    def test_stream_requires_token(self, client):
+        assert client.get("/api/events").status_code == 401
+
+    def test_stream_ticket_is_single_use(self, client, auth_headers):
+        ticket = client.post("/api/events/ticket", headers=auth_headers).json()["ticket"]
+        # types=weather is rejected after authentication, so the stream is never opened
+        assert client.get("/api/events", params={"ticket": ticket, "types": "weather"}).status_code == 400
+        assert client.get("/api/events", params={"ticket": ticket, "types": "weather"}).status_code == 401
+
+    def test_session_token_not_accepted_in_url(self, client, auth_headers):
+        token = auth_headers["Authorization"].split()[1]
+        assert client.get("/api/events", params={"access_token": token}).status_code == 401
+
+    def test_unknown_type_rejected(self, client, auth_headers):
+        response = client.get("/api/events", params={"types": "weather"}, headers=auth_headers)
+        assert response.status_code == 400
@@ -0,0 +1,67 @@
+"""
+Tests for bulk expense import
+Covers batch validation, per-row errors, atomic mode and dry runs
+"""
+
+
+CSV_DATA = """Date,Category,Amount,Description
+2030-01-05,utilities,"1,250,000",Electricity
+2030-01-06,Cleaning,300000,
+2030-01-07,parking,10000,Unknown category
+not-a-date,supplies,5000,
+2030-01-08,repairs,-5,Negative
+2030-02-01,taxes,900000,Quarterly tax
+"""
+
+
+def _upload(client, headers, data=CSV_DATA, **params):
+    return client.post(
+        "/api/expenses/import",
+        params=params,
+        files={"file": ("expenses.csv", data.encode(), "text/csv")},
+        headers=headers,
+    )
+
+
+class TestExpenseImport:
+    """Test the bulk import endpoint"""
+
+    def test_imports_valid_rows_and_reports_errors(self, client, db_session, auth_headers):
+        from models import Expense
+
+        response = _upload(client, auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["total_rows"], data["imported"], data["invalid"]) == (6, 3, 3)
+        assert [e["line"] for e in data["errors"]] == [4, 5, 6]
+        assert "category" in data["errors"][0]["error"]
+
+        expenses = db_session.query(Expense).order_by(Expense.date).all()
+        assert [e.category for e in expenses] == ["utilities", "cleaning", "taxes"]
+        assert float(expenses[0].amount) == 1250000
+
+    def test_atomic_mode_and_dry_run(self, client, db_session, auth_headers):
+        from models import Expense
+
+        response = _upload(client, auth_headers, skip_invalid="false")
+        assert response.json()["imported"] == 0
+
+        response = _upload(client, auth_headers, dry_run="true")
+        assert response.json()["valid"] == 3
+        assert db_session.query(Expense).count() == 0
+
+    def test_semicolon_file_across_batches(self, client, db_session, auth_headers, monkeypatch):
+        from models import Expense
+        from routes import expenses_router
+
+        monkeypatch.setattr(expenses_router, "IMPORT_BATCH_SIZE", 7)
+        rows = "".join(f"2030-03-{(i % 28) + 1:02d};supplies;{1000 + i}\n" for i in range(50))
+        response = _upload(client, auth_headers, data="date;category;amount\n" + rows)
+
+        assert response.json()["imported"] == 50
+        assert db_session.query(Expense).count() == 50
+
+    def test_missing_columns(self, client, auth_headers):
+        response = _upload(client, auth_headers, data="date,amount\n2030-01-01,10\n")
+        assert response.status_code == 400
@@ -0,0 +1,231 @@
+"""
+Tests for the append-only folio ledger
+Covers running balances, append-only enforcement, reversals and API postings
+"""
+
+import pytest
+from datetime import date, timedelta
+
+
+@pytest.fixture
+def booking(client, db_session, auth_headers):
+    """Create a 2-night reservation through the API (1,000,000 total)"""
+    from models import Guest, Room, RoomType
+
+    room_type = RoomType(name="Standard", code="STD", default_rate=500000)
+    db_session.add(room_type)
+    db_session.flush()
+    guest = Guest(full_name="Jane Doe", id_type="passport", id_number="X1")
+    db_session.add_all([guest, Room(room_number="101", room_type_id=room_type.id)])
+    db_session.commit()
+
+    check_in = date.today() + timedelta(days=5)
+    response = client.post(
+        "/api/reservations",
+        json={
+            "guest_id": guest.id,
+            "room_type_id": room_type.id,
+            "check_in_date": check_in.isoformat(),
+            "check_out_date": (check_in + timedelta(days=2)).isoformat(),
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+class TestFolioLedger:
+    """Test ledger posting rules"""
+
+    def test_running_balance(self, db_session, booking):
+        """Each entry carries the balance after it; the latest is the current balance"""
+        from folio import post_entry, folio_balance
+
+        post_entry(db_session, booking, "charge", 75000, category="minibar")
+        post_entry(db_session, booking, "payment", 500000)
+        entry = post_entry(db_session, booking, "adjustment", -25000)
+        db_session.commit()
+
+        assert entry.sequence == 4
+        assert float(entry.running_balance) == 550000
+        assert folio_balance(db_session, booking) == 550000
+
+    def test_entries_are_append_only(self, db_session, booking):
+        """Posted entries cannot be modified or deleted"""
+        from models import FolioEntry
+        from folio import FolioError
+
+        entry = db_session.query(FolioEntry).filter(FolioEntry.reservation_id == booking).first()
+        entry.amount = 1
+        with pytest.raises(FolioError):
+            db_session.flush()
+        db_session.rollback()
+
+        db_session.delete(entry)
+        with pytest.raises(FolioError):
+            db_session.flush()
+        db_session.rollback()
+
+    def test_invalid_postings(self, db_session, booking):
+        from folio import FolioError, post_entry
+
+        with pytest.raises(FolioError):
+            post_entry(db_session, booking, "charge", -10)
+        with pytest.raises(FolioError):
+            post_entry(db_session, booking, "tip", 10)
+
+
+class TestFolioAPI:
+    """Test folio endpoints and router postings"""
+
+    def test_booking_and_payments_are_posted(self, client, auth_headers, booking):
+        """Room charge, payment and payment void all appear in the folio"""
+        response = client.post(
+            "/api/payments",
+            json={"reservation_id": booking, "amount": 400000, "payment_date": "2030-01-01",
+                  "payment_method": "cash"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 201
+        payment_id = response.json()["payment"]["id"]
+
+        response = client.put(f"/api/payments/{payment_id}", json={"is_voided": True}, headers=auth_headers)
+        assert response.status_code == 200
+
+        folio = client.get(f"/api/reservations/{booking}/folio", headers=auth_headers).json()
+        assert [e["entry_type"] for e in folio["entries"]] == ["charge", "payment", "adjustment"]
+        assert [e["running_balance"] for e in folio["entries"]] == [1000000, 600000, 1000000]
+        assert folio["balance"] == 1000000
+
+    def test_post_charge_and_reverse(self, client, auth_headers, booking):
+        response = client.post(
+            f"/api/reservations/{booking}/folio",
+            json={"entry_type": "charge", "amount": 120000, "category": "restaurant"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 201
+        entry = response.json()["entry"]
+        assert entry["running_balance"] == 1120000
+
+        response = client.post(f"/api/reservations/{booking}/folio/{entry['id']}/reverse", headers=auth_headers)
+        assert response.status_code == 201
+        assert response.json()["entry"]["running_balance"] == 1000000
+
+        # A second reversal is refused
+        response = client.post(f"/api/reservations/{booking}/folio/{entry['id']}/reverse", headers=auth_headers)
+        assert response.status_code == 400
+
+    def test_charge_counts_towards_stay_balance(self, client, auth_headers, booking):
+        """A folio charge is read from the ledger; the reservation total stays the room charge"""
+        response = client.post(
+            f"/api/reservations/{booking}/folio",
+            json={"entry_type": "charge", "amount": 120000, "category": "minibar"},
+            headers=auth_headers,
+        )
+        balance = client.get(f"/api/reservations/{booking}/balance", headers=auth_headers).json()
+        assert balance["total_amount"] == 1000000
+        assert balance["extra_charges"] == 120000
+        assert balance["balance"] == balance["folio_balance"] == 1120000
+
+        entry_id = response.json()["entry"]["id"]
+        client.post(f"/api/reservations/{booking}/folio/{entry_id}/reverse", headers=auth_headers)
+        balance = client.get(f"/api/reservations/{booking}/balance", headers=auth_headers).json()
+        assert balance["extra_charges"] == 0
+        assert balance["balance"] == balance["folio_balance"] == 1000000
+
+    def test_charge_is_insert_only(self, db_session, booking):
+        """Posting a charge neither locks nor updates the reservation row"""
+        from sqlalchemy import event
+        from folio import record_posting
+
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.upper())
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            record_posting(db_session, booking, "charge", 45000, category="restaurant")
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        db_session.commit()
+
+        assert not [s for s in statements if s.startswith("UPDATE") or "FOR UPDATE" in s]
+        assert [s.split()[0] for s in statements if not s.startswith("SELECT")] == ["INSERT"]
+
+    def test_extra_charges_in_receivables_aging(self, db_session, booking):
+        from folio import record_posting
+        from models import Reservation
+        from reports import ar_aging_summary
+
+        db_session.query(Reservation).filter(Reservation.id == booking).update({"status": "checked_in"})
+        record_posting(db_session, booking, "charge", 80000, category="late_checkout")
+        db_session.commit()
+
+        assert ar_aging_summary(db_session)["total_outstanding"] == 1080000
+
+    def test_folio_payment_and_refund_create_payments(self, client, auth_headers, booking):
+        """Payments and refunds posted to the folio are recorded as payments"""
+        response = client.post(
+            f"/api/reservations/{booking}/folio",
+            json={"entry_type": "payment", "amount": 600000, "payment_method": "credit_card"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 201
+        payment_entry = response.json()["entry"]
+        client.post(
+            f"/api/reservations/{booking}/folio",
+            json={"entry_type": "refund", "amount": 100000, "description": "Overcharge"},
+            headers=auth_headers,
+        )
+
+        payments = client.get(f"/api/payments?reservation_id={booking}", headers=auth_headers).json()
+        amounts = sorted(p["amount"] for p in payments["payments"])
+        assert amounts == [-100000, 600000]
+        balance = client.get(f"/api/reservations/{booking}/balance", headers=auth_headers).json()
+        assert balance["total_paid"] == 500000
+        assert balance["balance"] == balance["folio_balance"] == 500000
+
+        # Reversing the payment voids it
+        response = client.post(
+            f"/api/reservations/{booking}/folio/{payment_entry['id']}/reverse", headers=auth_headers)
+        assert response.status_code == 201
+        payment = client.get(f"/api/payments/{payment_entry['payment_id']}", headers=auth_headers).json()["payment"]
+        assert payment["is_voided"] is True
+        balance = client.get(f"/api/reservations/{booking}/balance", headers=auth_headers).json()
+        assert balance["total_paid"] == -100000
+        assert balance["balance"] == balance["folio_balance"] == 1100000
+
+    def test_invalid_payment_method_rejected(self, client, auth_headers, booking):
+        response = client.post(
+            f"/api/reservations/{booking}/folio",
+            json={"entry_type": "payment", "amount": 1000, "payment_method": "barter"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 400
+
+    def test_sequence_collision_is_retried(self, client, auth_headers, booking, monkeypatch):
+        """A posting whose sequence number was taken concurrently is retried instead of failing"""
+        import folio
+
+        latest_entry = folio.latest_entry
+        calls = {"count": 0}
+
+        def stale_latest_entry(db, reservation_id):
+            # First attempt sees the folio before the booking charge, as a racing request would
+            calls["count"] += 1
+            if calls["count"] == 1:
+                return None
+            return latest_entry(db, reservation_id)
+
+        monkeypatch.setattr(folio, "latest_entry", stale_latest_entry)
+        response = client.post(
+            f"/api/reservations/{booking}/folio",
+            json={"entry_type": "charge", "amount": 50000},
+            headers=auth_headers,
+        )
+        assert response.status_code == 201
+        assert calls["count"] == 2
+        assert response.json()["entry"]["sequence"] == 2
+        assert response.json()["entry"]["running_balance"] == 1050000
@@ -0,0 +1,96 @@
+"""
+Tests for the liveness, readiness and cached deep health probes
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+def probe_client(client, test_db_engine):
+    """Client whose readiness ping and deep check use the test database, not the app's engine"""
+    from health import HealthMonitor
+
+    client.app.state.health_monitor = HealthMonitor(sessionmaker(bind=test_db_engine), "sqlite:///:memory:")
+    return client
+
+
+class TestProbes:
+    """Test /livez, /readyz and /health"""
+
+    def test_livez(self, client):
+        response = client.get("/livez")
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+
+    def test_readyz(self, probe_client):
+        response = probe_client.get("/readyz")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
+    def test_readyz_unavailable(self, client, tmp_path):
+        from health import HealthMonitor
+
+        engine = create_engine(f"sqlite:///{tmp_path}/missing/hotel.db")
+        client.app.state.health_monitor = HealthMonitor(sessionmaker(bind=engine), "sqlite://")
+        response = client.get("/readyz")
+        assert response.status_code == 503
+        assert response.json()["status"] == "unavailable"
+
+    def test_health_is_served_from_cache(self, probe_client):
+        first = probe_client.get("/health").json()
+        second = probe_client.get("/health").json()
+        assert first["checks"]["api_server"] is True
+        assert second["timestamp"] == first["timestamp"]
+
+
+class TestHealthMonitor:
+    """Test the deep check and its cache"""
+
+    def test_deep_check_runs_two_statements(self, db_session, test_db_engine):
+        from health import compute_health
+        from models import RoomType
+
+        db_session.add(RoomType(name="Standard", code="STD", default_rate=500000))
+        db_session.commit()
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+        event.listen(test_db_engine, "before_cursor_execute", listener)
+        try:
+            result = compute_health(sessionmaker(bind=test_db_engine), "sqlite:///:memory:")
+        finally:
+            event.remove(test_db_engine, "before_cursor_execute", listener)
+
+        assert len(statements) == 2
+        assert result["details"]["table_counts"]["room_types"] == 1
+        assert result["checks"]["database_tables"] is True
+        assert result["status"] == "degraded"  # no initial data seeded
+
+    def test_cache_until_stale(self, test_db_engine):
+        from health import HealthMonitor
+
+        monitor = HealthMonitor(sessionmaker(bind=test_db_engine), "sqlite:///:memory:", interval=60)
+        first = monitor.get()
+        assert monitor.get()["timestamp"] == first["timestamp"]
+
+        monitor._computed_at -= 121  # background task two intervals behind
+        assert monitor.get()["cached_age_seconds"] == 0
+
+    async def test_background_refresh(self, test_db_engine):
+        from health import HealthMonitor
+
+        monitor = HealthMonitor(sessionmaker(bind=test_db_engine), "sqlite:///:memory:", interval=0.05)
+        monitor.start()
+        try:
+            for _ in range(100):
+                if monitor._result is not None:
+                    break
+                await asyncio.sleep(0.02)
+            assert monitor._result is not None
+        finally:
+            await monitor.stop()
+        assert monitor._task is None
@@ -0,0 +1,150 @@
+"""
+Tests for Idempotency-Key handling on create endpoints
+Covers replay, body mismatch, in-flight detection, expiry and the size bound
+"""
+
+import time
+from datetime import date, timedelta
+
+
+def _booking_payload(db_session):
+    from models import Guest, Room, RoomType
+
+    room_type = RoomType(name="Standard", code="STD", default_rate=500000)
+    db_session.add(room_type)
+    db_session.flush()
+    guest = Guest(full_name="Jane Doe", id_type="passport", id_number="X1")
+    db_session.add_all([guest, Room(room_number="101", room_type_id=room_type.id),
+                        Room(room_number="102", room_type_id=room_type.id)])
+    db_session.commit()
+
+    check_in = date.today() + timedelta(days=5)
+    return {
+        "guest_id": guest.id,
+        "room_type_id": room_type.id,
+        "check_in_date": check_in.isoformat(),
+        "check_out_date": (check_in + timedelta(days=2)).isoformat(),
+    }
+
+
+class TestIdempotentCreates:
+    """Test the middleware through the API"""
+
+    def test_retry_returns_cached_response(self, client, db_session, auth_headers):
+        """A retried booking is replayed, not created twice"""
+        from models import Reservation
+
+        payload = _booking_payload(db_session)
+        headers = {**auth_headers, "Idempotency-Key": "booking-1"}
+
+        first = client.post("/api/reservations", json=payload, headers=headers)
+        second = client.post("/api/reservations", json=payload, headers=headers)
+
+        assert first.status_code == second.status_code == 201
+        assert second.json() == first.json()
+        assert second.headers["idempotent-replayed"] == "true"
+        assert db_session.query(Reservation).count() == 1
+
+    def test_key_reuse_with_different_body(self, client, db_session, auth_headers):
+        payload = _booking_payload(db_session)
+        headers = {**auth_headers, "Idempotency-Key": "booking-2"}
+
+        assert client.post("/api/reservations", json=payload, headers=headers).status_code == 201
+        payload["adults"] = 1
+        assert client.post("/api/reservations", json=payload, headers=headers).status_code == 422
+
+    def test_requests_without_key_are_not_deduplicated(self, client, db_session, auth_headers):
+        from models import Reservation
+
+        payload = _booking_payload(db_session)
+        client.post("/api/reservations", json=payload, headers=auth_headers)
+        client.post("/api/reservations", json=payload, headers=auth_headers)
+
+        assert db_session.query(Reservation).count() == 2
+
+    def test_oversized_body_rejected(self, client, db_session, auth_headers):
+        """Keyed requests are buffered, so their body is capped"""
+        from idempotency import IDEMPOTENCY_MAX_BODY_BYTES
+        from models import Reservation
+
+        payload = _booking_payload(db_session)
+        payload["special_requests"] = "x" * IDEMPOTENCY_MAX_BODY_BYTES
+        headers = {**auth_headers, "Idempotency-Key": "booking-3"}
+
+        assert client.post("/api/reservations", json=payload, headers=headers).status_code == 413
+        assert db_session.query(Reservation).count() == 0
+
+
+class TestIdempotencyStore:
+    """Test the bounded store"""
+
+    def test_in_flight_and_completion(self):
+        from idempotency import IdempotencyStore, IN_FLIGHT
+
+        store = IdempotencyStore()
+        assert store.begin("k", "body") is None
+        assert store.begin("k", "body").state == IN_FLIGHT
+
+        store.complete("k", 201, [], b"{}")
+        assert store.begin("k", "body").status == 201
+
+        store.release("k")
+        assert store.begin("k", "body") is None
+
+    def test_expiry_and_bound(self):
+        from idempotency import IdempotencyStore
+
+        store = IdempotencyStore(max_keys=2, ttl_seconds=0.05)
+        for key in ("a", "b", "c"):
+            store.begin(key, "body")
+        assert len(store) == 2
+        assert store.begin("a", "body") is None  # evicted, so claimable again
+
+        time.sleep(0.06)
+        assert store.begin("b", "body") is None
+
+    def test_hit_refreshes_recency(self):
+        """Eviction is least recently used, not first in"""
+        from idempotency import IdempotencyStore
+
+        store = IdempotencyStore(max_keys=2)
+        store.begin("a", "body")
+        store.begin("b", "body")
+        assert store.begin("a", "body") is not None  # hit: "a" becomes the most recently used
+        store.begin("c", "body")
+
+        assert store.begin("a", "body") is not None
+        assert store.begin("b", "body") is None  # "b" was evicted
+
+
+class TestIdempotencyBodyLimit:
+    """Test the body cap of the middleware without a Content-Length header"""
+
+    def test_streamed_body_over_limit(self):
+        import asyncio
+        from idempotency import IdempotencyMiddleware, IdempotencyStore
+
+        called = []
+
+        async def app(scope, receive, send):
+            called.append(scope)
+
+        messages = [{"type": "http.request", "body": b"x" * 600, "more_body": True},
+                    {"type": "http.request", "body": b"x" * 600, "more_body": False}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        store = IdempotencyStore()
+        middleware = IdempotencyMiddleware(app, store=store, max_body_bytes=1000)
+        scope = {"type": "http", "method": "POST", "path": "/api/guests",
+                 "headers": [(b"idempotency-key", b"k1")]}
+        asyncio.run(middleware(scope, receive, send))
+
+        assert called == []
+        assert sent[0]["status"] == 413
+        assert len(store) == 0
@@ -0,0 +1,85 @@
+"""
+Tests for the load test harness (scripts/load_test.py)
+"""
+
+import importlib.util
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPT = Path(__file__).parent.parent.parent / "scripts" / "load_test.py"
+
+
+def _load_module():
+    spec = importlib.util.spec_from_file_location("load_test", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestLoadTestReport:
+    """Test the in-process run and the JSON report"""
+
+    def test_in_process_run_reports_every_scenario(self, tmp_path):
+        output = tmp_path / "report.json"
+        result = subprocess.run(
+            [sys.executable, str(SCRIPT), "--database-url", f"sqlite:///{tmp_path}/load.db",
+             "--requests", "200", "--concurrency", "4", "--output", str(output)],
+            cwd=SCRIPT.parent.parent, capture_output=True, text=True, timeout=300,
+        )
+        assert result.returncode == 0, result.stderr[-2000:]
+
+        report = json.loads(output.read_text())
+        assert report["run"]["target"] == "in-process"
+        assert report["total"]["requests"] == 200
+        assert set(report["endpoints"]) == {
+            "GET /api/dashboard/summary", "GET /api/dashboard/today", "GET /api/guests?search",
+            "GET /api/reservations/availability", "POST /api/payments", "POST /api/reservations",
+            "POST /api/reservations/{id}/check-in", "POST /api/reservations/{id}/check-out",
+        }
+        for label, stats in report["endpoints"].items():
+            latency = stats["latency_ms"]
+            assert latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"], label
+            assert not any(code.startswith("5") or code == "error" for code in stats["status_codes"]), label
+
+    def test_compare_against_earlier_report(self, tmp_path):
+        database = f"sqlite:///{tmp_path}/load.db"
+        base = [sys.executable, str(SCRIPT), "--database-url", database, "--requests", "40",
+                "--concurrency", "2", "--mix", "availability=1,dashboard=1"]
+        before, after = tmp_path / "before.json", tmp_path / "after.json"
+        assert subprocess.run(base + ["--output", str(before)], cwd=SCRIPT.parent.parent,
+                              capture_output=True, timeout=300).returncode == 0
+        result = subprocess.run(base + ["--output", str(after), "--compare", str(before)],
+                                cwd=SCRIPT.parent.parent, capture_output=True, text=True, timeout=300)
+        assert result.returncode == 0, result.stderr[-2000:]
+        assert "Compared with" in result.stdout
+        assert set(json.loads(after.read_text())["endpoints"]) <= {
+            "GET /api/reservations/availability", "GET /api/dashboard/today", "GET /api/dashboard/summary",
+        }
+
+
+class TestLoadTestHelpers:
+    """Test percentile and workload mix parsing"""
+
+    def test_nearest_rank_percentile(self):
+        load_test = _load_module()
+        values = list(range(1, 101))
+        assert load_test.percentile(values, 50) == 50
+        assert load_test.percentile(values, 95) == 95
+        assert load_test.percentile(values, 99) == 99
+        assert load_test.percentile([7], 99) == 7
+        assert load_test.percentile([], 50) == 0.0
+
+    def test_mix_overrides_default_weights(self):
+        import argparse
+
+        import pytest
+
+        load_test = _load_module()
+        assert load_test.parse_mix("") == load_test.WORKLOAD
+        assert load_test.parse_mix("availability=3,check_in=1") == {"availability": 3.0, "check_in": 1.0}
+        with pytest.raises(argparse.ArgumentTypeError):
+            load_test.parse_mix("teleport=1")
+        with pytest.raises(argparse.ArgumentTypeError):
+            load_test.parse_mix("availability=0")
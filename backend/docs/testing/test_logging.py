@@ -0,0 +1,96 @@
+"""
+Tests for the queue-based structured logging pipeline
+"""
+
+import json
+import logging
+import queue
+import sys
+import time
+from logging.handlers import QueueListener
+
+
+def _record(level=logging.INFO, msg="message", **extra):
+    return logging.makeLogRecord({"name": "hotel_management", "levelno": level,
+                                  "levelname": logging.getLevelName(level), "msg": msg, **extra})
+
+
+class SlowHandler(logging.Handler):
+    """Sink that takes `delay` seconds per record"""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+        self.records = []
+
+    def emit(self, record):
+        time.sleep(self.delay)
+        self.records.append(self.format(record))
+
+
+class TestBoundedQueueHandler:
+    """Test the drop policy and record preparation"""
+
+    def test_info_dropped_above_high_water(self):
+        from error_handlers import BoundedQueueHandler
+
+        handler = BoundedQueueHandler(queue.Queue(maxsize=10), high_water=0.5)
+        for _ in range(8):
+            handler.handle(_record())
+        assert handler.queue.qsize() == 5
+        assert handler.dropped == 3
+
+        # Warnings still get the remaining room, then are dropped too
+        for _ in range(7):
+            handler.handle(_record(logging.WARNING))
+        assert handler.queue.qsize() == 10
+        assert handler.dropped == 5
+
+    def test_prepare_keeps_message_extras_and_exception(self):
+        from error_handlers import BoundedQueueHandler, StructuredFormatter
+
+        handler = BoundedQueueHandler(queue.Queue(maxsize=10))
+        try:
+            raise ValueError("bad rate")
+        except ValueError:
+            record = _record(logging.ERROR, "Rate %s failed", args=("STD",), exc_info=sys.exc_info(), request_id="r-1")
+
+        prepared = handler.prepare(record)
+        assert prepared.exc_info is None
+        data = json.loads(StructuredFormatter().format(prepared))
+        assert data["message"] == "Rate STD failed"
+        assert data["request_id"] == "r-1"
+        assert data["exception"]["type"] == "ValueError"
+        assert "bad rate" in data["exception"]["traceback"]
+
+
+class TestNonBlockingPipeline:
+    """Test that a slow sink does not slow the caller"""
+
+    def test_caller_does_not_wait_for_slow_sink(self):
+        from error_handlers import BoundedQueueHandler, StructuredFormatter
+
+        sink = SlowHandler(delay=0.2)
+        sink.setFormatter(StructuredFormatter())
+        handler = BoundedQueueHandler(queue.Queue(maxsize=100))
+        listener = QueueListener(handler.queue, sink, respect_handler_level=True)
+        test_logger = logging.getLogger("hotel_management.test_pipeline")
+        test_logger.propagate = False
+        test_logger.addHandler(handler)
+        listener.start()
+        try:
+            started = time.perf_counter()
+            for i in range(5):
+                test_logger.warning("Slow sink %d", i, extra={"request_id": f"r-{i}"})
+            assert time.perf_counter() - started < 0.1
+        finally:
+            listener.stop()  # drains the queue
+            test_logger.removeHandler(handler)
+
+        assert len(sink.records) == 5
+        assert json.loads(sink.records[0])["request_id"] == "r-0"
+
+    def test_metrics_export_queue_state(self, client):
+        body = client.get("/metrics").text
+        assert "log_queue_depth" in body
+        assert "log_records_dropped_total" in body
@@ -0,0 +1,78 @@
+"""
+Tests for the Prometheus metrics endpoint and collectors
+"""
+
+from sqlalchemy import create_engine, text
+
+
+class TestMetricsEndpoint:
+    """Test GET /metrics"""
+
+    def test_exposition_format(self, client):
+        client.get("/livez")
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+        assert "# TYPE http_request_duration_seconds histogram" in body
+        assert 'http_requests_total{method="GET",route="/livez",status="200"}' in body
+        assert "# TYPE auth_active_tokens gauge" in body
+
+    def test_route_template_label(self, client, auth_headers):
+        from metrics import REQUESTS_TOTAL
+
+        before = REQUESTS_TOTAL.value("GET", "/api/reservations/{reservation_id}", "404")
+        client.get("/api/reservations/999999", headers=auth_headers)
+        client.get("/api/reservations/999998", headers=auth_headers)
+        assert REQUESTS_TOTAL.value("GET", "/api/reservations/{reservation_id}", "404") == before + 2
+
+    def test_unmatched_paths_share_one_label(self, client):
+        from metrics import REQUESTS_TOTAL
+
+        before = REQUESTS_TOTAL.value("GET", "<unmatched>", "404")
+        client.get("/no/such/path")
+        client.get("/another/missing/path")
+        assert REQUESTS_TOTAL.value("GET", "<unmatched>", "404") == before + 2
+
+    def test_in_flight_returns_to_zero(self, client):
+        from metrics import REQUESTS_IN_FLIGHT
+
+        client.get("/livez")
+        client.get("/no/such/path")
+        assert REQUESTS_IN_FLIGHT.value("GET") == 0
+
+    def test_token_required_when_configured(self, client, monkeypatch):
+        import metrics
+
+        monkeypatch.setattr(metrics, "METRICS_TOKEN", "scrape-secret")
+        assert client.get("/metrics").status_code == 401
+        response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+        assert response.status_code == 200
+
+
+class TestCollectors:
+    """Test the histogram and pool instrumentation"""
+
+    def test_histogram_buckets_are_cumulative(self):
+        from metrics import Histogram
+
+        histogram = Histogram("test_seconds", "Test histogram", ("route",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, "/a")
+        histogram.observe(0.1, "/a")
+        histogram.observe(3.0, "/a")
+        lines = histogram.render()
+        assert 'test_seconds_bucket{route="/a",le="0.1"} 2' in lines
+        assert 'test_seconds_bucket{route="/a",le="1.0"} 2' in lines
+        assert 'test_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+        assert 'test_seconds_count{route="/a"} 3' in lines
+        assert histogram.value("/a") == (3, 3.15)
+
+    def test_pool_wait_is_recorded(self, tmp_path):
+        from metrics import POOL_WAIT, TimedQueuePool
+
+        engine = create_engine(f"sqlite:///{tmp_path}/pool.db", poolclass=TimedQueuePool)
+        count_before, _ = POOL_WAIT.value()
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        engine.dispose()
+        assert POOL_WAIT.value()[0] == count_before + 1
@@ -0,0 +1,138 @@
+"""
+Tests for the chunked, resumable database migration (scripts/migrate_to_postgres.py)
+
+No PostgreSQL server is needed: SQLite targets take the executemany path,
+everything else (planning, dependency order, checkpoints, checksums) is shared.
+"""
+
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+SCRIPTS = Path(__file__).parent.parent.parent / "scripts"
+SCRIPT = SCRIPTS / "migrate_to_postgres.py"
+
+
+def _load_module():
+    spec = importlib.util.spec_from_file_location("migrate_to_postgres", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def source_url(tmp_path):
+    url = f"sqlite:///{tmp_path}/source.db"
+    result = subprocess.run(
+        [sys.executable, str(SCRIPTS / "generate_synthetic_data.py"), "--database-url", url, "--rooms", "10",
+         "--guests", "120", "--reservations", "300", "--payments", "500", "--years", "1"],
+        cwd=SCRIPTS.parent, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    with create_engine(url).begin() as connection:
+        # NULLs, empty strings and quotes must survive the copy
+        connection.execute(text("UPDATE guests SET email = NULL WHERE id = 1"))
+        connection.execute(text("UPDATE guests SET notes = '' WHERE id = 2"))
+        connection.execute(text("UPDATE guests SET full_name = 'O''Brien, \"Jr\"' WHERE id = 3"))
+    return url
+
+
+def _migrate(source_url, target_url, *extra):
+    return subprocess.run(
+        [sys.executable, str(SCRIPT), "--source", source_url, "--target", target_url, "--chunk-size", "64", *extra],
+        cwd=SCRIPTS.parent, capture_output=True, text=True,
+    )
+
+
+def _dump(url):
+    with create_engine(url).connect() as connection:
+        return {table: connection.execute(text(f"SELECT * FROM {table} ORDER BY id")).all()
+                for table in ("users", "room_types", "rooms", "guests", "reservations", "payments")}
+
+
+class TestMigration:
+    """Test copy, verification and refusal to overwrite"""
+
+    def test_copies_every_row_and_verifies(self, source_url, tmp_path):
+        target_url = f"sqlite:///{tmp_path}/target.db"
+        result = _migrate(source_url, target_url, "--workers", "4")
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "Source and target match" in result.stdout
+        assert _dump(target_url) == _dump(source_url)
+        assert not inspect(create_engine(target_url)).has_table("data_migration_progress")
+
+    def test_verify_only_detects_changed_rows(self, source_url, tmp_path):
+        target_url = f"sqlite:///{tmp_path}/target.db"
+        assert _migrate(source_url, target_url).returncode == 0
+        with create_engine(target_url).begin() as connection:
+            connection.execute(text("UPDATE payments SET amount = amount + 1 WHERE id = 42"))
+
+        result = _migrate(source_url, target_url, "--verify-only")
+        assert result.returncode == 1
+        assert "❌ payments" in result.stdout
+        assert "✅ reservations" in result.stdout
+
+    def test_refuses_filled_target_without_truncate(self, source_url, tmp_path):
+        target_url = f"sqlite:///{tmp_path}/target.db"
+        assert _migrate(source_url, target_url).returncode == 0
+
+        result = _migrate(source_url, target_url)
+        assert result.returncode != 0
+        assert "--truncate" in result.stderr
+        assert _migrate(source_url, target_url, "--truncate").returncode == 0
+        assert _dump(target_url) == _dump(source_url)
+
+
+class TestResume:
+    """Test that an interrupted migration continues from its checkpoints"""
+
+    def test_resume_after_failure(self, source_url, tmp_path, monkeypatch):
+        migration = _load_module()
+        source = migration.create(source_url, 3)
+        target = migration.create(f"sqlite:///{tmp_path}/target.db", 3)
+
+        write_rows = migration.write_rows
+        calls = {"payments": 0}
+
+        def failing_write(connection, table, columns, rows):
+            if table.name == "payments":
+                calls["payments"] += 1
+                if calls["payments"] == 4:
+                    raise RuntimeError("connection lost")
+            write_rows(connection, table, columns, rows)
+
+        monkeypatch.setattr(migration, "write_rows", failing_write)
+        with pytest.raises(RuntimeError):
+            migration.migrate(source, target, workers=2, chunk_size=64)
+
+        with target.connect() as connection:
+            progress = {row.table_name: row for row in connection.execute(
+                text("SELECT table_name, last_id, rows_copied, completed_at FROM data_migration_progress"))}
+            assert progress["reservations"].completed_at is not None
+            assert progress["payments"].completed_at is None
+            assert progress["payments"].rows_copied == 3 * 64  # the failed chunk was rolled back
+            assert connection.execute(text("SELECT COUNT(*) FROM payments")).scalar() == 3 * 64
+
+        monkeypatch.setattr(migration, "write_rows", write_rows)
+        assert migration.migrate(source, target, workers=2, chunk_size=64)
+        assert _dump(str(target.url)) == _dump(source_url)
+
+
+class TestCanonicalValues:
+    """Test the dialect-independent values checksums are computed from"""
+
+    def test_numeric_boolean_and_null(self):
+        from sqlalchemy import Numeric
+        from decimal import Decimal
+
+        migration = _load_module()
+        money = Numeric(12, 2)
+        assert migration._canonical(500000.0, money) == migration._canonical(Decimal("500000.00"), money)
+        assert migration._canonical(True, None) == "t"
+        assert migration._canonical(None, None) != migration._canonical("", None)
+        assert migration._copy_field(None) == r"\N"
+        assert migration._copy_field('say "hi"') == '"say ""hi"""'
@@ -0,0 +1,154 @@
+"""
+Tests for the rate calendar and stay pricing engine
+Covers weekday/season rules, per-date overrides, quotes and reservation pricing
+"""
+
+import pytest
+from datetime import date, timedelta
+
+
+@pytest.fixture
+def room_types(db_session):
+    """Create two priced room types"""
+    from models import RoomType
+
+    standard = RoomType(name="Standard", code="STD", default_rate=500000)
+    deluxe = RoomType(name="Deluxe", code="DLX", default_rate=800000)
+    db_session.add_all([standard, deluxe])
+    db_session.commit()
+    return standard, deluxe
+
+
+class TestPricingEngine:
+    """Test nightly rate resolution"""
+
+    def test_default_rate_when_no_rules(self, db_session, room_types):
+        """Stays without rules are priced at the default rate"""
+        from pricing import price_stay
+
+        standard, _ = room_types
+        quote = price_stay(db_session, standard, date(2030, 3, 4), date(2030, 3, 7))
+
+        assert quote["number_of_nights"] == 3
+        assert quote["subtotal"] == 1500000
+        assert [n["date"] for n in quote["nightly_rates"]] == ["2030-03-04", "2030-03-05", "2030-03-06"]
+
+    def test_weekday_rule_and_override(self, db_session, room_types):
+        """Weekday rules apply on matching nights; calendar overrides win"""
+        from models import RateRule, RateCalendar
+        from pricing import price_stay
+
+        standard, _ = room_types
+        # 2030-03-08 is a Friday, 2030-03-09 a Saturday
+        db_session.add(RateRule(
+            name="Weekend", room_type_id=standard.id, days_of_week="4,5",
+            adjustment_type="percentage", adjustment_value=20,
+        ))
+        db_session.add(RateCalendar(room_type_id=standard.id, stay_date=date(2030, 3, 9), rate=1000000))
+        db_session.commit()
+
+        quote = price_stay(db_session, standard, date(2030, 3, 7), date(2030, 3, 10))
+        rates = [n["rate"] for n in quote["nightly_rates"]]
+
+        assert rates == [500000, 600000, 1000000]
+        assert quote["subtotal"] == 2100000
+
+    def test_higher_priority_rule_wins(self, db_session, room_types):
+        """Overlapping rules resolve by priority"""
+        from models import RateRule
+        from pricing import price_stay
+
+        standard, _ = room_types
+        db_session.add_all([
+            RateRule(name="High season", start_date=date(2030, 7, 1), end_date=date(2030, 8, 31),
+                     adjustment_type="fixed_amount", adjustment_value=100000, priority=1),
+            RateRule(name="Festival", room_type_id=standard.id, start_date=date(2030, 7, 10),
+                     end_date=date(2030, 7, 10), adjustment_type="fixed_rate",
+                     adjustment_value=900000, priority=5),
+        ])
+        db_session.commit()
+
+        quote = price_stay(db_session, standard, date(2030, 7, 9), date(2030, 7, 12))
+
+        assert [n["rate"] for n in quote["nightly_rates"]] == [600000, 900000, 600000]
+
+    def test_rate_override_is_flat(self, db_session, room_types):
+        """A negotiated rate is charged flat for every night"""
+        from pricing import price_stay
+
+        standard, _ = room_types
+        quote = price_stay(db_session, standard, date(2030, 3, 4), date(2030, 3, 6), rate_override=450000)
+
+        assert quote["subtotal"] == 900000
+        assert quote["average_rate"] == 450000
+
+
+class TestRatesAPI:
+    """Test the quote endpoint and calendar-priced reservations"""
+
+    def test_quote_all_room_types(self, client, db_session, auth_headers, room_types):
+        """One call prices every active room type"""
+        response = client.get(
+            "/api/rates/quote",
+            params={"check_in_date": "2030-03-04", "check_out_date": "2030-03-06"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        quotes = {q["room_type_code"]: q for q in response.json()["quotes"]}
+        assert quotes["STD"]["subtotal"] == 1000000
+        assert quotes["DLX"]["subtotal"] == 1600000
+
+    def test_quote_rejects_inverted_range(self, client, auth_headers, room_types):
+        """Check-out must be after check-in"""
+        response = client.get(
+            "/api/rates/quote",
+            params={"check_in_date": "2030-03-06", "check_out_date": "2030-03-04"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 400
+
+    def test_rule_with_inverted_dates_rejected(self, client, auth_headers, room_types):
+        """A rule's end_date cannot be before its start_date, on create or update"""
+        rule = {"name": "High season", "start_date": "2030-07-31", "end_date": "2030-07-01",
+                "adjustment_type": "percentage", "adjustment_value": 20}
+        assert client.post("/api/rates/rules", json=rule, headers=auth_headers).status_code == 400
+
+        rule["end_date"] = "2030-07-31"  # one-day rules are fine
+        response = client.post("/api/rates/rules", json=rule, headers=auth_headers)
+        assert response.status_code == 201
+        rule_id = response.json()["rule"]["id"]
+
+        response = client.put(f"/api/rates/rules/{rule_id}", json={"end_date": "2030-07-30"}, headers=auth_headers)
+        assert response.status_code == 400
+
+    def test_create_reservation_is_priced_by_engine(self, client, db_session, auth_headers, room_types):
+        """Reservation totals come from the rate calendar, not the client"""
+        from models import Guest, Room, RateCalendar
+
+        standard, _ = room_types
+        guest = Guest(full_name="Jane Doe", id_type="passport", id_number="X1")
+        db_session.add_all([guest, Room(room_number="101", room_type_id=standard.id)])
+        check_in = date.today() + timedelta(days=10)
+        db_session.add(RateCalendar(room_type_id=standard.id, stay_date=check_in, rate=700000))
+        db_session.commit()
+
+        response = client.post(
+            "/api/reservations",
+            json={
+                "guest_id": guest.id,
+                "room_type_id": standard.id,
+                "check_in_date": check_in.isoformat(),
+                "check_out_date": (check_in + timedelta(days=2)).isoformat(),
+                "discount_amount": 200000,
+                "total_amount": 1,
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["subtotal"] == 1200000
+        assert data["total_amount"] == 1000000
+        assert data["rate_per_night"] == 600000
@@ -0,0 +1,105 @@
+"""
+Tests for admin-only on-demand request profiling
+"""
+
+import time
+
+import pytest
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    import profiling
+
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path / "profiles"))
+    return tmp_path / "profiles"
+
+
+def _token(db_session, username, role):
+    from models import User
+    from security import create_access_token
+
+    user = User(username=username, email=f"{username}@hotel.test", role=role, password_hash="x")
+    db_session.add(user)
+    db_session.commit()
+    return {"Authorization": f"Bearer {create_access_token(user.id, user.username, user.role)}"}
+
+
+def _busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestSamplingProfiler:
+    """Test stack collection"""
+
+    def test_collects_stacks_of_busy_threads(self):
+        from profiling import SamplingProfiler
+
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start()
+        _busy_wait(0.1)
+        profiler.stop()
+
+        folded = profiler.folded()
+        assert profiler.sample_count > 0
+        busy_line = next(line for line in folded.splitlines() if "_busy_wait" in line)
+        stack, count = busy_line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert stack.split(";")[0] == "MainThread"
+
+
+class TestProfilingMiddleware:
+    """Test the admin-only profiling switch and the profile endpoints"""
+
+    def test_admin_request_is_profiled(self, client, db_session, profile_dir):
+        headers = _token(db_session, "night_manager", "admin")
+        response = client.get("/api/rooms", headers={**headers, "X-Profile": "1"})
+        assert response.status_code == 200
+        profile_id = response.headers["x-profile-id"]
+
+        listing = client.get("/api/profiles", headers=headers).json()
+        assert listing["total"] == 1
+        profile = listing["profiles"][0]
+        assert profile["id"] == profile_id
+        assert profile["path"] == "/api/rooms"
+        assert profile["status_code"] == 200
+        assert profile["username"] == "night_manager"
+
+        download = client.get(f"/api/profiles/{profile_id}", headers=headers)
+        assert download.status_code == 200
+        assert download.headers["content-type"].startswith("text/plain")
+
+    def test_query_flag(self, client, db_session, profile_dir):
+        headers = _token(db_session, "night_manager", "admin")
+        response = client.get("/api/rooms?profile=1", headers=headers)
+        assert "x-profile-id" in response.headers
+
+    def test_non_admin_cannot_profile(self, client, db_session, profile_dir):
+        headers = _token(db_session, "checkin_clerk", "user")
+        response = client.get("/api/rooms", headers={**headers, "X-Profile": "1"})
+        assert response.status_code == 403
+        assert client.get("/api/profiles", headers=headers).status_code == 403
+        assert not profile_dir.exists()
+
+    def test_unflagged_requests_are_not_profiled(self, client, db_session, profile_dir):
+        headers = _token(db_session, "night_manager", "admin")
+        response = client.get("/api/rooms", headers=headers)
+        assert "x-profile-id" not in response.headers
+        assert not profile_dir.exists()
+
+    def test_download_rejects_unknown_ids(self, client, db_session, profile_dir):
+        headers = _token(db_session, "night_manager", "admin")
+        assert client.get("/api/profiles/..%2F..%2Fapp.py", headers=headers).status_code == 404
+        assert client.get("/api/profiles/20260101T000000000000Z-deadbeef", headers=headers).status_code == 404
+
+    def test_old_profiles_are_pruned(self, client, db_session, profile_dir, monkeypatch):
+        import profiling
+
+        monkeypatch.setattr(profiling, "PROFILE_MAX_FILES", 2)
+        headers = _token(db_session, "night_manager", "admin")
+        ids = [client.get("/livez", headers={**headers, "X-Profile": "1"}).headers["x-profile-id"] for _ in range(3)]
+        stored = [p["id"] for p in client.get("/api/profiles", headers=headers).json()["profiles"]]
+        assert len(stored) == 2
+        assert ids[0] not in stored
@@ -0,0 +1,96 @@
+"""
+Tests for per-request SQL accounting, the slow-query log and EXPLAIN capture
+"""
+
+import json
+import logging
+
+from sqlalchemy import create_engine, text
+
+
+class TestRequestAccounting:
+    """Test the X-DB-* response headers"""
+
+    def test_headers_count_queries(self, client, auth_headers, test_db_engine):
+        from query_stats import instrument_engine
+
+        instrument_engine(test_db_engine)
+        response = client.get("/api/rooms", headers=auth_headers)
+        assert response.status_code == 200
+        assert int(response.headers["x-db-query-count"]) >= 1
+        assert float(response.headers["x-db-time-ms"]) >= 0
+
+    def test_no_queries_without_database_work(self, client):
+        response = client.get("/livez")
+        assert response.headers["x-db-query-count"] == "0"
+
+    def test_stats_outside_request_are_not_recorded(self, tmp_path):
+        from query_stats import current_stats, instrument_engine
+
+        engine = instrument_engine(create_engine(f"sqlite:///{tmp_path}/stats.db"))
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        assert current_stats() is None
+
+
+class TestSlowQueries:
+    """Test the slow-query log and plan capture"""
+
+    def test_slow_query_logged_with_parameters(self, tmp_path, monkeypatch, caplog):
+        import query_stats
+
+        monkeypatch.setattr(query_stats, "SLOW_QUERY_MS", 0)
+        engine = query_stats.instrument_engine(create_engine(f"sqlite:///{tmp_path}/slow.db"))
+        with caplog.at_level(logging.WARNING, logger="hotel_management.sql"):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT :value"), {"value": 42})
+
+        record = next(r for r in caplog.records if r.name == "hotel_management.sql")
+        assert record.statement == "SELECT ?"
+        assert "42" in record.parameters
+
+    def test_explain_sqlite_plan(self, tmp_path):
+        from query_stats import explain
+
+        engine = create_engine(f"sqlite:///{tmp_path}/plan.db")
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE stays (id INTEGER PRIMARY KEY, guest TEXT)"))
+        raw = engine.raw_connection()
+        try:
+            plan = explain(raw, "sqlite", "SELECT * FROM stays WHERE guest = ?", ("Budi",))
+            assert plan and "stays" in plan[0]
+            assert explain(raw, "sqlite", "DELETE FROM stays", ()) is None
+        finally:
+            raw.close()
+
+    def test_slow_select_plan_written_to_file(self, tmp_path, monkeypatch):
+        import query_stats
+
+        monkeypatch.setattr(query_stats, "SLOW_QUERY_MS", 0)
+        monkeypatch.setattr(query_stats, "EXPLAIN_SLOW_QUERIES", True)
+        monkeypatch.setattr(query_stats, "EXPLAIN_LOG_FILE", str(tmp_path / "plans" / "plans.log"))
+        monkeypatch.setattr(query_stats, "_plan_logger", None)
+
+        engine = query_stats.instrument_engine(create_engine(f"sqlite:///{tmp_path}/plans.db"))
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        plan_logger = query_stats._plan_logger
+        for handler in plan_logger.handlers:
+            handler.close()
+        plan_logger.handlers = []
+
+        entry = json.loads((tmp_path / "plans" / "plans.log").read_text().splitlines()[0])
+        assert entry["statement"] == "SELECT 1"
+        assert entry["plan"]
+
+
+class TestStructuredLog:
+    """Test that extra fields reach the structured log line"""
+
+    def test_extra_fields_are_formatted(self):
+        from error_handlers import StructuredFormatter
+
+        record = logging.makeLogRecord({"msg": "Response", "db_queries": 3, "db_time_ms": 1.5})
+        data = json.loads(StructuredFormatter().format(record))
+        assert data["db_queries"] == 3
+        assert data["db_time_ms"] == 1.5
@@ -0,0 +1,139 @@
+"""
+Tests for bank statement reconciliation
+Covers reference matching, fuzzy fallback, ambiguity and the upload endpoint
+"""
+
+import io
+from datetime import date
+
+import pytest
+
+
+@pytest.fixture
+def payments(db_session):
+    """Bank transfers recorded at the front desk (reservation 1)"""
+    from models import Payment
+
+    rows = [
+        Payment(reservation_id=1, payment_date=date(2030, 5, 1), amount=1500000,
+                payment_method="bank_transfer", reference_number="TRF-0001"),
+        Payment(reservation_id=1, payment_date=date(2030, 5, 2), amount=750000,
+                payment_method="e_wallet", transaction_id="EW99812"),
+        Payment(reservation_id=1, payment_date=date(2030, 5, 3), amount=500000,
+                payment_method="bank_transfer"),
+        Payment(reservation_id=1, payment_date=date(2030, 5, 3), amount=300000,
+                payment_method="bank_transfer"),
+        Payment(reservation_id=1, payment_date=date(2030, 5, 3), amount=300000,
+                payment_method="bank_transfer"),
+        Payment(reservation_id=1, payment_date=date(2030, 5, 3), amount=900000,
+                payment_method="cash"),
+    ]
+    db_session.add_all(rows)
+    db_session.commit()
+    return [p.id for p in rows]
+
+
+STATEMENT = """Date,Amount,Reference,Description
+2030-05-02,"1,500,000.00",trf 0001,Transfer from J DOE
+03/05/2030,750000,,OVO payment EW99812
+2030-05-04,500000,,Transfer
+2030-05-03,300000,,Transfer
+2030-05-03,900000,,Cash deposit
+not-a-date,100,,Broken
+"""
+
+
+class TestReconciliation:
+    """Test the matching engine"""
+
+    def test_matching_rules(self, db_session, payments):
+        from reconciliation import read_statement, reconcile
+
+        lines, errors = read_statement(io.StringIO(STATEMENT))
+        result = reconcile(db_session, lines)
+
+        matched = {m["line"]: (m["payment_id"], m["rule"]) for m in result["matched"]}
+        assert matched[2] == (payments[0], "reference")
+        assert matched[3] == (payments[1], "reference")  # reference found in the description
+        assert matched[4] == (payments[2], "amount_date")
+
+        # Two identical transfers on the same day cannot be told apart
+        assert result["ambiguous"] == [{"line": 5, "candidate_payment_ids": sorted(payments[3:5])}]
+        # Cash payments are not reconciled against the bank statement
+        assert [u["line"] for u in result["unmatched"]] == [6]
+        assert [e["line"] for e in errors] == [7]
+
+    def test_payment_matched_once(self, db_session, payments):
+        from reconciliation import read_statement, reconcile
+
+        statement = "date,amount,reference\n2030-05-01,1500000,TRF-0001\n2030-05-01,1500000,TRF-0001\n"
+        result = reconcile(db_session, read_statement(io.StringIO(statement))[0])
+
+        assert len(result["matched"]) == 1
+        assert [u["line"] for u in result["unmatched"]] == [3]
+
+    def test_amount_tolerance(self, db_session, payments):
+        from reconciliation import read_statement, reconcile
+
+        statement = "date,amount,description\n2030-05-04,497500,Transfer less fee\n"
+        lines = read_statement(io.StringIO(statement))[0]
+
+        assert reconcile(db_session, lines)["matched"] == []
+        assert reconcile(db_session, lines, amount_tolerance=5000)["matched"][0]["payment_id"] == payments[2]
+
+    def test_missing_columns(self):
+        from reconciliation import ReconciliationError, read_statement
+
+        with pytest.raises(ReconciliationError):
+            read_statement(io.StringIO("when,how much\n2030-05-01,10\n"))
+
+
+class TestReconciliationAPI:
+    """Test the upload endpoint"""
+
+    def test_upload_statement(self, client, auth_headers, payments):
+        response = client.post(
+            "/api/payments/reconcile",
+            files={"file": ("statement.csv", STATEMENT.encode(), "text/csv")},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        summary = response.json()["summary"]
+        assert summary == {"lines": 5, "matched": 3, "ambiguous": 1, "unmatched": 1,
+                           "unmatched_payments": 2, "errors": 1}
+
+
+class TestReconciliationScale:
+    """Test the fuzzy pass with many payments of the same amount"""
+
+    def test_thousands_of_equal_amount_payments(self, db_session):
+        """Matched payments leave the candidates, so every line finds its own payment quickly"""
+        import time
+        from datetime import timedelta
+        from models import Payment
+        from reconciliation import read_statement, reconcile
+
+        start = date(2030, 1, 1)
+        rows = [
+            Payment(reservation_id=1, payment_date=start + timedelta(days=i), amount=250000,
+                    payment_method="bank_transfer")
+            for i in range(5000)
+        ]
+        db_session.add_all(rows)
+        db_session.commit()
+
+        # One transfer a day, all of the same amount; the statement lists them newest first
+        statement = "date,amount,description\n" + "".join(
+            f"{start + timedelta(days=i)},250000,Transfer\n" for i in reversed(range(5000))
+        )
+        lines = read_statement(io.StringIO(statement))[0]
+
+        started = time.perf_counter()
+        result = reconcile(db_session, lines)
+        elapsed = time.perf_counter() - started
+
+        assert len(result["matched"]) == 5000
+        assert result["ambiguous"] == result["unmatched"] == result["unmatched_payments"] == []
+        assert sorted(m["payment_id"] for m in result["matched"]) == sorted(p.id for p in rows)
+        assert elapsed < 1, f"reconciling took {elapsed:.2f}s"
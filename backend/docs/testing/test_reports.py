@@ -0,0 +1,194 @@
+"""
+Tests for database-computed financial reports
+Covers accounts-receivable aging buckets, streamed detail rows and P&L caching
+"""
+
+import pytest
+from datetime import date, timedelta
+
+
+AS_OF = date(2030, 6, 30)
+
+
+@pytest.fixture
+def ar_reservations(db_session):
+    """Reservations with various balances and ages relative to AS_OF"""
+    from models import User, Guest, RoomType, Reservation, Payment
+
+    user = User(username="cashier", password_hash="x")
+    guest = Guest(full_name="Jane Doe", id_type="passport", id_number="X1")
+    room_type = RoomType(name="Standard", code="STD", default_rate=500000)
+    db_session.add_all([user, guest, room_type])
+    db_session.flush()
+
+    def reservation(conf, status, check_out_days_ago, total, paid=0):
+        check_out = AS_OF - timedelta(days=check_out_days_ago)
+        res = Reservation(
+            confirmation_number=conf, guest_id=guest.id, room_type_id=room_type.id,
+            check_in_date=check_out - timedelta(days=2), check_out_date=check_out,
+            rate_per_night=total / 2, subtotal=total, total_amount=total,
+            status=status, created_by=user.id,
+        )
+        db_session.add(res)
+        db_session.flush()
+        if paid:
+            db_session.add(Payment(reservation_id=res.id, payment_date=check_out, amount=paid,
+                                   payment_method="cash"))
+        return res
+
+    reservation("RECENT", "checked_out", 10, 1000000, paid=400000)  # 600,000 in 0-30
+    reservation("MONTH2", "checked_out", 45, 500000)  # 500,000 in 31-60
+    reservation("OLD", "checked_out", 120, 300000)  # 300,000 in 90+
+    reservation("PAID", "checked_out", 70, 800000, paid=800000)  # settled - excluded
+    reservation("INHOUSE", "checked_in", -1, 900000)  # in house since 1 day ago - 0-30
+    reservation("FUTURE", "confirmed", -10, 700000)  # not receivable yet - excluded
+    db_session.commit()
+
+
+class TestARAging:
+    """Test the aging report"""
+
+    def test_summary_buckets(self, db_session, ar_reservations):
+        from reports import ar_aging_summary
+
+        summary = ar_aging_summary(db_session, AS_OF)
+
+        assert summary["buckets"]["0_30"] == {"count": 2, "amount": 1500000}
+        assert summary["buckets"]["31_60"] == {"count": 1, "amount": 500000}
+        assert summary["buckets"]["61_90"] == {"count": 0, "amount": 0}
+        assert summary["buckets"]["90_plus"] == {"count": 1, "amount": 300000}
+        assert summary["total_outstanding"] == 2300000
+
+    def test_endpoint_streams_rows(self, client, auth_headers, ar_reservations):
+        response = client.get("/api/reports/ar-aging", params={"as_of": AS_OF.isoformat()}, headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["summary"]["total_count"] == 4
+        assert [r["confirmation_number"] for r in data["rows"]] == ["OLD", "MONTH2", "RECENT", "INHOUSE"]
+        assert data["rows"][0]["age_days"] == 120
+
+    def test_csv_bucket_filter(self, client, auth_headers, ar_reservations):
+        response = client.get(
+            "/api/reports/ar-aging",
+            params={"as_of": AS_OF.isoformat(), "bucket": "90_plus", "format": "csv"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        lines = response.text.strip().splitlines()
+        assert lines[0].startswith("reservation_id,")
+        assert len(lines) == 2 and ",OLD," in lines[1]
+
+
+@pytest.fixture
+def ledger(db_session):
+    """Payments and expenses over three months of 2030"""
+    from datetime import datetime
+    from models import User, Guest, RoomType, Reservation, Payment, Expense
+
+    user = User(username="owner", password_hash="x")
+    guest = Guest(full_name="Jane Doe", id_type="passport", id_number="X1")
+    standard = RoomType(name="Standard", code="STD", default_rate=500000)
+    deluxe = RoomType(name="Deluxe", code="DLX", default_rate=800000)
+    db_session.add_all([user, guest, standard, deluxe])
+    db_session.flush()
+
+    reservations = {}
+    for room_type in (standard, deluxe):
+        res = Reservation(
+            confirmation_number=f"PNL-{room_type.code}", guest_id=guest.id, room_type_id=room_type.id,
+            check_in_date=date(2030, 1, 10), check_out_date=date(2030, 1, 12),
+            rate_per_night=1, subtotal=1, total_amount=1, created_by=user.id,
+        )
+        db_session.add(res)
+        reservations[room_type.code] = res
+    db_session.flush()
+
+    db_session.add_all([
+        Payment(reservation_id=reservations["STD"].id, payment_date=date(2030, 1, 10), amount=1000000,
+                payment_method="cash"),
+        Payment(reservation_id=reservations["DLX"].id, payment_date=date(2030, 1, 20), amount=1600000,
+                payment_method="bank_transfer"),
+        Payment(reservation_id=reservations["DLX"].id, payment_date=date(2030, 1, 21), amount=100000,
+                payment_method="bank_transfer", is_refund=True),
+        Payment(reservation_id=reservations["STD"].id, payment_date=date(2030, 2, 3), amount=500000,
+                payment_method="cash", is_voided=True),
+        Payment(reservation_id=reservations["STD"].id, payment_date=date(2030, 3, 3), amount=700000,
+                payment_method="cash"),
+        Expense(date=datetime(2030, 1, 5), category="utilities", amount=300000),
+        Expense(date=datetime(2030, 1, 31, 23, 0), category="cleaning", amount=200000),
+        Expense(date=datetime(2030, 2, 14), category="repairs", amount=400000),
+    ])
+    db_session.commit()
+
+
+class TestProfitAndLoss:
+    """Test the P&L report and its closed-period cache"""
+
+    def test_monthly_breakdown(self, db_session, ledger):
+        from reports import profit_and_loss
+
+        report = profit_and_loss(db_session, date(2030, 1, 15), date(2030, 3, 1), today=date(2030, 6, 1))
+        january, february, march = report["periods"]
+
+        assert report["from"] == "2030-01-01" and report["to"] == "2030-03-31"
+        assert january["revenue"] == {
+            "total": 2500000,
+            "by_room_type": {"DLX": 1500000, "STD": 1000000},
+            "by_payment_method": {"bank_transfer": 1500000, "cash": 1000000},
+        }
+        assert january["expenses"] == {"total": 500000, "by_category": {"cleaning": 200000, "utilities": 300000}}
+        assert february["net_profit"] == -400000
+        assert march["revenue"]["total"] == 700000
+        assert report["totals"]["net_profit"] == 2300000
+
+    def test_quarter_rollup(self, db_session, ledger):
+        from reports import profit_and_loss
+
+        report = profit_and_loss(db_session, date(2030, 1, 1), date(2030, 3, 31), "quarter", today=date(2030, 6, 1))
+
+        assert [p["period"] for p in report["periods"]] == ["2030-Q1"]
+        assert report["periods"][0]["net_profit"] == 2300000
+
+    def test_closed_months_cached_until_backdated_change(self, db_session, ledger):
+        from datetime import datetime
+        from models import Expense
+        from reports import profit_and_loss
+
+        profit_and_loss(db_session, date(2030, 1, 1), date(2030, 1, 31), today=date(2030, 6, 1))
+
+        # Cached: a raw insert that bypasses the ORM is not seen
+        db_session.execute(Expense.__table__.insert().values(
+            date=datetime(2030, 1, 2), category="supplies", amount=50000))
+        db_session.commit()
+        report = profit_and_loss(db_session, date(2030, 1, 1), date(2030, 1, 31), today=date(2030, 6, 1))
+        assert report["totals"]["expenses"] == 500000
+
+        # An ORM write to that month invalidates it
+        db_session.add(Expense(date=datetime(2030, 1, 3), category="supplies", amount=25000))
+        db_session.commit()
+        report = profit_and_loss(db_session, date(2030, 1, 1), date(2030, 1, 31), today=date(2030, 6, 1))
+        assert report["totals"]["expenses"] == 575000
+
+    def test_new_current_month_expense_keeps_closed_months_cached(self, db_session, ledger):
+        from datetime import datetime
+        from models import Expense
+        from reports import _pnl_month_cache, profit_and_loss
+
+        profit_and_loss(db_session, date(2030, 1, 1), date(2030, 1, 31), today=date(2030, 6, 1))
+        assert (2030, 1) in _pnl_month_cache
+
+        db_session.add(Expense(date=datetime(2030, 6, 1), category="supplies", amount=25000))
+        db_session.commit()
+        assert (2030, 1) in _pnl_month_cache
+
+    def test_endpoint_validation(self, client, auth_headers, ledger):
+        response = client.get("/api/reports/pnl", params={"from": "2030-01-01", "to": "2030-02-28"},
+                              headers=auth_headers)
+        assert response.status_code == 200
+        assert [p["period"] for p in response.json()["periods"]] == ["2030-01", "2030-02"]
+
+        response = client.get("/api/reports/pnl", params={"from": "2030-01-01", "to": "2030-02-28", "granularity": "week"},
+                              headers=auth_headers)
+        assert response.status_code == 400
@@ -0,0 +1,98 @@
+"""
+Tests for the pure ASGI request instrumentation middleware
+"""
+
+import logging
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+
+def _app(**options):
+    from error_handlers import RequestInstrumentationMiddleware
+
+    app = FastAPI()
+    app.add_middleware(RequestInstrumentationMiddleware, **options)
+
+    @app.get("/ok")
+    async def ok():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk {i}\n"
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    return app
+
+
+def _access_log(caplog):
+    return [r for r in caplog.records if r.name == "hotel_management" and hasattr(r, "request_id")]
+
+
+class TestRequestInstrumentation:
+    """Test request IDs, timing headers and access logging"""
+
+    def test_headers_on_app_responses(self, client):
+        response = client.get("/livez")
+        assert len(response.headers["x-request-id"]) == 32
+        assert float(response.headers["x-process-time"]) >= 0
+        assert response.headers["x-db-query-count"] == "0"
+
+    def test_request_id_is_propagated(self):
+        client = TestClient(_app())
+        assert client.get("/ok", headers={"X-Request-ID": "desk-7.42"}).headers["x-request-id"] == "desk-7.42"
+        # Malformed IDs are replaced, not echoed
+        assert client.get("/ok", headers={"X-Request-ID": "bad id\n"}).headers["x-request-id"] != "bad id\n"
+
+    def test_one_log_line_per_request(self, caplog):
+        client = TestClient(_app())
+        with caplog.at_level(logging.INFO, logger="hotel_management"):
+            client.get("/ok?page=2")
+        records = _access_log(caplog)
+        assert len(records) == 1
+        assert records[0].status_code == 200
+        assert records[0].query_string == "page=2"
+        assert records[0].db_queries == 0
+
+    def test_credentials_in_query_string_are_not_logged(self, client, auth_headers, caplog):
+        from error_handlers import StructuredFormatter
+
+        ticket = client.post("/api/events/ticket", headers=auth_headers).json()["ticket"]
+        session_token = auth_headers["Authorization"].split()[1]
+        with caplog.at_level(logging.INFO, logger="hotel_management"):
+            client.get("/api/events", params={"ticket": ticket, "types": "weather"})
+            client.get("/api/events", params={"access_token": session_token, "page": 2})
+        records = [r for r in _access_log(caplog) if r.method == "GET"]
+        assert [r.query_string for r in records] == [
+            "ticket=[REDACTED]&types=weather", "access_token=[REDACTED]&page=2",
+        ]
+        lines = "".join(StructuredFormatter().format(r) for r in records)
+        assert ticket not in lines and session_token not in lines
+
+    def test_sampling_keeps_errors_and_slow_requests(self, caplog):
+        client = TestClient(_app(sample_rate=0.0), raise_server_exceptions=False)
+        with caplog.at_level(logging.INFO, logger="hotel_management"):
+            client.get("/ok")
+            client.get("/boom")
+        records = _access_log(caplog)
+        assert [r.levelname for r in records] == ["ERROR"]
+
+        slow_client = TestClient(_app(sample_rate=0.0, slow_request_seconds=0.0))
+        caplog.clear()
+        with caplog.at_level(logging.INFO, logger="hotel_management"):
+            slow_client.get("/ok")
+        assert [r.levelname for r in _access_log(caplog)] == ["WARNING"]
+
+    def test_streaming_response_passes_through(self):
+        response = TestClient(_app()).get("/stream")
+        assert response.status_code == 200
+        assert response.text == "chunk 0\nchunk 1\nchunk 2\n"
+        assert "x-request-id" in response.headers
@@ -0,0 +1,132 @@
+"""
+Tests for the versioned migration runner
+Covers SQL splitting, version discovery and the startup version check
+"""
+
+import pytest
+from sqlalchemy import create_engine, event, inspect
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    yield engine
+    engine.dispose()
+
+
+class TestSplitStatements:
+    """Test splitting SQL scripts into statements"""
+
+    def test_respects_quotes_comments_and_dollar_bodies(self):
+        from schema_migrations import split_statements
+
+        sql = """
+        -- comment; not a statement
+        INSERT INTO t (a) VALUES ('x;y'), ('it''s');
+        CREATE FUNCTION f() RETURNS TRIGGER AS $$
+        BEGIN
+            RAISE EXCEPTION 'no; updates';
+        END;
+        $$ LANGUAGE plpgsql;
+        DO $body$ BEGIN PERFORM 1; END $body$;
+        """
+        statements = split_statements(sql)
+
+        assert len(statements) == 3
+        assert statements[0].endswith("('it''s')")
+        assert "RAISE EXCEPTION 'no; updates';" in statements[1]
+        assert statements[2].startswith("DO $body$")
+
+    def test_repo_migrations_are_discovered_in_order(self):
+        from schema_migrations import discover_migrations, latest_version
+
+        versions = [m.version for m in discover_migrations()]
+        assert versions == sorted(versions) and versions[0] == 1
+        assert latest_version() == versions[-1]
+
+    def test_duplicate_versions_rejected(self, tmp_path):
+        from schema_migrations import MigrationError, discover_migrations
+
+        (tmp_path / "001_a.sql").write_text("SELECT 1;")
+        (tmp_path / "01_b.sql").write_text("SELECT 1;")
+        with pytest.raises(MigrationError):
+            discover_migrations(tmp_path)
+
+
+class TestEnsureSchema:
+    """Test the startup schema check"""
+
+    def test_fresh_sqlite_database_is_created_and_stamped(self, file_engine):
+        from schema_migrations import current_version, ensure_schema, latest_version
+
+        assert current_version(file_engine) is None
+        assert ensure_schema(file_engine) == latest_version()
+        assert current_version(file_engine) == latest_version()
+        assert inspect(file_engine).has_table("reservations")
+
+    def test_up_to_date_database_needs_one_query(self, file_engine):
+        from schema_migrations import ensure_schema
+
+        ensure_schema(file_engine)
+        statements = []
+        event.listen(file_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        ensure_schema(file_engine)
+        assert len(statements) == 1 and "schema_migrations" in statements[0]
+
+    def test_new_migration_file_is_stamped(self, file_engine, tmp_path):
+        from schema_migrations import current_version, ensure_schema, pending_migrations
+
+        migrations = tmp_path / "migrations"
+        migrations.mkdir()
+        (migrations / "001_initial.sql").write_text("SELECT 1;")
+        assert ensure_schema(file_engine, migrations) == 1
+
+        (migrations / "002_more.sql").write_text("SELECT 1;")
+        assert [m.version for m in pending_migrations(file_engine, migrations)] == [2]
+        ensure_schema(file_engine, migrations)
+        assert current_version(file_engine) == 2
+
+    def test_baseline(self, file_engine):
+        from schema_migrations import applied_versions, baseline
+
+        baseline(file_engine, 3)
+        assert applied_versions(file_engine) == {1, 2, 3}
+
+    def test_unversioned_sqlite_database_is_refused(self, file_engine):
+        """A pre-migrations database is not stamped as latest while it lacks new columns"""
+        from sqlalchemy import text
+        from schema_migrations import MigrationError, current_version, ensure_schema
+
+        with file_engine.begin() as connection:
+            connection.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR(50))"))
+
+        with pytest.raises(MigrationError, match="no schema_migrations"):
+            ensure_schema(file_engine)
+        assert current_version(file_engine) is None
+
+    def test_sqlite_database_missing_model_columns_is_refused(self, file_engine, tmp_path):
+        from sqlalchemy import text
+        from schema_migrations import MigrationError, current_version, ensure_schema, stamp
+
+        migrations = tmp_path / "migrations"
+        migrations.mkdir()
+        (migrations / "001_initial.sql").write_text("SELECT 1;")
+        with file_engine.begin() as connection:
+            connection.execute(text("CREATE TABLE reservations (id INTEGER PRIMARY KEY)"))
+        stamp(file_engine, [])  # schema_migrations exists, nothing applied yet
+
+        with pytest.raises(MigrationError, match="missing model columns"):
+            ensure_schema(file_engine, migrations)
+        assert current_version(file_engine) == 0
+
+    def test_postgresql_behind_latest_fails_fast(self, file_engine, monkeypatch):
+        """Without AUTO_MIGRATE startup stops instead of running on an old schema"""
+        from schema_migrations import MigrationError, ensure_schema
+
+        monkeypatch.delenv("AUTO_MIGRATE", raising=False)
+        monkeypatch.setattr(file_engine.dialect, "name", "postgresql")
+        with pytest.raises(MigrationError, match="run_migrations.py"):
+            ensure_schema(file_engine)
+        assert not inspect(file_engine).has_table("reservations")
@@ -0,0 +1,181 @@
+"""
+Tests for the direct-to-JSON list serializers
+Each Core column set must encode to the same JSON as the ORM formatter it replaces
+"""
+
+import json
+from datetime import date, datetime
+
+
+def _seed(db_session):
+    from models import Guest, Payment, Reservation, Room, RoomType, User
+
+    user = User(username="checkin_clerk", email="fd@example.com", full_name="Front Desk", role="user")
+    user.set_password("secret123")
+    room_type = RoomType(name="Deluxe", code="DLX", default_rate=750000, amenities="wifi,tv")
+    db_session.add_all([user, room_type])
+    db_session.flush()
+
+    rooms = [
+        Room(room_number="201", floor=2, room_type_id=room_type.id),
+        Room(room_number="202", floor=2, room_type_id=room_type.id, custom_rate=900000, notes="Sea view"),
+    ]
+    guests = [
+        Guest(full_name="Jane Doe", id_type="passport", id_number="X1", birth_date=date(1990, 5, 17), is_vip=True),
+        Guest(full_name="John Roe", email="john@example.com"),
+    ]
+    db_session.add_all(rooms + guests)
+    db_session.flush()
+
+    reservations = [
+        Reservation(confirmation_number="SER001", guest_id=guests[0].id, room_type_id=room_type.id,
+                    room_id=rooms[0].id, check_in_date=date(2026, 3, 1), check_out_date=date(2026, 3, 3),
+                    rate_per_night=750000, number_of_nights=2, subtotal=1500000, total_amount=1500000,
+                    status="checked_in", checked_in_by=user.id, checked_in_at=datetime(2026, 3, 1, 14, 5, 30),
+                    created_by=user.id),
+        Reservation(confirmation_number="SER002", guest_id=guests[1].id, room_type_id=room_type.id,
+                    check_in_date=date(2026, 4, 1), check_out_date=date(2026, 4, 2), rate_per_night=750000,
+                    subtotal=750000, total_amount=750000, created_by=user.id),
+    ]
+    db_session.add_all(reservations)
+    db_session.flush()
+    db_session.add(Payment(reservation_id=reservations[0].id, payment_date=date(2026, 3, 1), amount=500000.5,
+                           payment_method="cash", reference_number="R-1", created_by=user.id))
+    db_session.commit()
+
+
+def _encoded(value):
+    from serializers import dumps
+
+    return json.loads(dumps(value))
+
+
+class TestColumnSetsMatchOrm:
+    """Test Core rows against to_dict() / _format_room_response()"""
+
+    def test_rooms(self, db_session):
+        from models import Room
+        from routes.rooms_router import _format_room_response
+        from serializers import fetch_rows, select_rooms
+
+        _seed(db_session)
+        expected = [_format_room_response(r) for r in db_session.query(Room).order_by(Room.id)]
+        assert _encoded(fetch_rows(db_session, select_rooms().order_by(Room.id))) == _encoded(expected)
+
+    def test_guests(self, db_session):
+        from models import Guest
+        from serializers import fetch_rows, select_guests
+
+        _seed(db_session)
+        expected = [g.to_dict() for g in db_session.query(Guest).order_by(Guest.id)]
+        assert _encoded(fetch_rows(db_session, select_guests().order_by(Guest.id))) == _encoded(expected)
+
+    def test_reservations(self, db_session):
+        from models import Reservation
+        from serializers import fetch_rows, select_reservations
+
+        _seed(db_session)
+        expected = [r.to_dict() for r in db_session.query(Reservation).order_by(Reservation.id)]
+        rows = fetch_rows(db_session, select_reservations().order_by(Reservation.id))
+        assert _encoded(rows) == _encoded(expected)
+        assert rows[0]["checked_in_by_name"] == "checkin_clerk" and rows[1]["room_number"] is None
+
+    def test_payments(self, db_session):
+        from models import Payment
+        from serializers import fetch_rows, select_payments
+
+        _seed(db_session)
+        expected = [p.to_dict() for p in db_session.query(Payment).order_by(Payment.id)]
+        assert _encoded(fetch_rows(db_session, select_payments().order_by(Payment.id))) == _encoded(expected)
+
+    def test_expenses(self, db_session):
+        from models import Expense
+        from serializers import fetch_rows, select_expenses
+
+        db_session.add_all([
+            Expense(date=datetime(2026, 3, 2, 9, 30), category="utilities", amount=125000.25, description="Power"),
+            Expense(date=datetime(2026, 3, 5), category="supplies", amount=40000),
+        ])
+        db_session.commit()
+        expected = [e.to_dict() for e in db_session.query(Expense).order_by(Expense.id)]
+        assert _encoded(fetch_rows(db_session, select_expenses().order_by(Expense.id))) == _encoded(expected)
+
+
+class TestListEndpoints:
+    """Test the list endpoints served through FastJSONResponse"""
+
+    def test_list_payloads(self, client, db_session, auth_headers):
+        _seed(db_session)
+
+        rooms = client.get("/api/rooms?limit=1000", headers=auth_headers).json()
+        assert rooms["total"] == 2 and rooms["rooms"][1]["nightly_rate"] == 900000
+
+        guests = client.get("/api/guests?is_vip=true", headers=auth_headers).json()
+        assert guests["total"] == 1 and guests["guests"][0]["birth_date"] == "1990-05-17"
+
+        reservations = client.get("/api/reservations?status=checked_in", headers=auth_headers).json()
+        assert reservations["total"] == 1
+        assert reservations["reservations"][0]["checked_in_at"] == "2026-03-01T14:05:30"
+        assert reservations["reservations"][0]["balance"] == 999999.5
+
+        payments = client.get("/api/payments", headers=auth_headers).json()
+        assert payments["payments"][0]["amount"] == 500000.5
+
+    def test_payment_status_filter(self, client, db_session, auth_headers):
+        """?status= maps onto the refund/void flags; payments have no status column"""
+        from models import Payment
+
+        _seed(db_session)
+        payment = db_session.query(Payment).one()
+        db_session.add_all([
+            Payment(reservation_id=payment.reservation_id, payment_date=date(2026, 3, 2), amount=100000,
+                    payment_method="cash", is_refund=True, created_by=payment.created_by),
+            Payment(reservation_id=payment.reservation_id, payment_date=date(2026, 3, 2), amount=200000,
+                    payment_method="cash", is_voided=True, created_by=payment.created_by),
+        ])
+        db_session.commit()
+
+        amounts = {}
+        for status in ("active", "refund", "voided"):
+            response = client.get(f"/api/payments?status={status}", headers=auth_headers)
+            assert response.status_code == 200, status
+            data = response.json()
+            assert data["total"] == len(data["payments"])
+            amounts[status] = [p["amount"] for p in data["payments"]]
+        assert amounts == {"active": [500000.5], "refund": [100000], "voided": [200000]}
+
+        response = client.get("/api/payments?status=paid", headers=auth_headers)
+        assert response.status_code == 400
+
+class TestSparseFieldsets:
+    """Test ?fields= narrowing of projection and joins"""
+
+    def test_unrequested_joins_are_skipped(self):
+        from serializers import select_reservations, select_rooms
+
+        assert str(select_reservations("confirmation_number,status")).count("JOIN") == 0
+        statement = str(select_reservations("guest_name,status"))
+        assert statement.count("JOIN") == 1 and "guests" in statement
+        assert str(select_reservations()).count("JOIN") == 3
+        assert "JOIN" not in str(select_rooms("room_number,status"))
+
+    def test_fields_parameter(self, client, db_session, auth_headers):
+        _seed(db_session)
+
+        response = client.get("/api/reservations?fields=status,guest_name,confirmation_number", headers=auth_headers)
+        assert response.status_code == 200
+        row = response.json()["reservations"][0]
+        assert list(row) == ["id", "confirmation_number", "guest_name", "status"]
+        assert row["guest_name"] == "Jane Doe"
+
+        rooms = client.get("/api/rooms?fields=room_number", headers=auth_headers).json()["rooms"]
+        assert rooms[0] == {"id": rooms[0]["id"], "room_number": "201"}
+
+        for path in ("/api/guests", "/api/payments", "/api/expenses"):
+            response = client.get(f"{path}?fields=id", headers=auth_headers)
+            assert response.status_code == 200, path
+
+    def test_unknown_field_rejected(self, client, auth_headers):
+        response = client.get("/api/guests?fields=full_name,password_hash", headers=auth_headers)
+        assert response.status_code == 400
+        assert "password_hash" in response.json()["detail"]
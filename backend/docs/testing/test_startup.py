@@ -0,0 +1,30 @@
+"""
+Tests for the API cold-start budget
+Runs scripts/check_import_time.py (python -X importtime) in fresh processes
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[2]
+
+
+class TestStartupBudget:
+    """Test import time and lazily loaded modules"""
+
+    def test_import_within_budget(self):
+        result = subprocess.run(
+            [sys.executable, "scripts/check_import_time.py", "--runs", "3", "--top", "0"],
+            cwd=BACKEND, capture_output=True, text=True,
+        )
+        assert result.returncode == 0, result.stdout + result.stderr
+
+    def test_lazy_session_factory_binds_on_first_session(self):
+        from database import SessionLocal, get_engine
+
+        db = SessionLocal()
+        try:
+            assert db.get_bind() is get_engine()
+        finally:
+            db.close()
@@ -0,0 +1,192 @@
+"""
+Tests for delta sync (GET /api/sync)
+Covers tokens, changed rows, tombstones, full-snapshot resets and paging
+"""
+
+from datetime import datetime, timedelta
+
+
+class TestSyncTokens:
+    """Test token encoding"""
+
+    def test_round_trip(self):
+        from sync import decode_token, encode_token
+
+        moment = datetime(2026, 3, 1, 12, 30, 15, 123456)
+        assert decode_token(encode_token(moment)) == moment
+
+    def test_invalid_token_rejected(self, client, auth_headers):
+        response = client.get("/api/sync?since=not-a-token", headers=auth_headers)
+        assert response.status_code == 400
+
+    def test_invalid_cursor_rejected(self, client, auth_headers):
+        response = client.get("/api/sync?cursor=1:2:bookings:3", headers=auth_headers)
+        assert response.status_code == 400
+
+
+def _seed(db_session):
+    from models import Guest, Room, RoomType
+
+    room_type = RoomType(name="Standard", code="STD", default_rate=500000)
+    db_session.add(room_type)
+    db_session.flush()
+    rooms = [Room(room_number=str(100 + i), room_type_id=room_type.id) for i in range(3)]
+    guest = Guest(full_name="Jane Doe", id_type="passport", id_number="X1")
+    db_session.add_all(rooms + [guest])
+    db_session.commit()
+    return rooms, guest
+
+
+class TestSyncEndpoint:
+    """Test changes and deletions since a token"""
+
+    def test_first_sync_is_full_snapshot(self, client, db_session, auth_headers):
+        rooms, guest = _seed(db_session)
+        guest_id = guest.id
+        response = client.get("/api/sync", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+
+        assert data["reset"] is True
+        assert len(data["changes"]["rooms"]) == len(rooms)
+        assert data["changes"]["rooms"][0]["room_type"] is not None
+        assert [g["id"] for g in data["changes"]["guests"]] == [guest_id]
+        assert data["deleted"]["guests"] == []
+
+    def test_only_changes_since_token(self, client, db_session, auth_headers):
+        from models import Guest
+        from sync import encode_token
+
+        rooms_data, _ = _seed(db_session)
+        stale = datetime.utcnow() - timedelta(hours=1)
+        db_session.query(Guest).update({Guest.updated_at: stale})
+        for room in rooms_data:
+            room.updated_at = stale
+        db_session.commit()
+        room_id = rooms_data[0].id
+        token = encode_token(stale + timedelta(minutes=30))
+
+        rooms_data[0].status = "out_of_order"
+        db_session.commit()
+
+        data = client.get(f"/api/sync?since={token}", headers=auth_headers).json()
+        assert data["reset"] is False
+        assert [r["id"] for r in data["changes"]["rooms"]] == [room_id]
+        assert data["changes"]["rooms"][0]["status"] == "out_of_order"
+        assert data["changes"]["guests"] == []
+        assert data["token"] > token
+
+    def test_deleted_rows_return_tombstones(self, client, db_session, auth_headers):
+        from models import Guest
+
+        guest = Guest(full_name="Temp Guest", id_type="passport", id_number="T1")
+        db_session.add(guest)
+        db_session.commit()
+        guest_id = guest.id
+
+        token = client.get("/api/sync", headers=auth_headers).json()["token"]
+        response = client.delete(f"/api/guests/{guest_id}", headers=auth_headers)
+        assert response.status_code == 200
+
+        data = client.get(f"/api/sync?since={token}", headers=auth_headers).json()
+        assert data["deleted"]["guests"] == [guest_id]
+        assert data["changes"]["guests"] == []
+
+    def test_token_older_than_retention_resets(self, client, db_session, auth_headers):
+        from sync import SYNC_TOMBSTONE_RETENTION_DAYS, encode_token
+
+        _seed(db_session)
+        token = encode_token(datetime.utcnow() - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS + 1))
+        data = client.get(f"/api/sync?since={token}", headers=auth_headers).json()
+        assert data["reset"] is True
+        assert len(data["changes"]["guests"]) == 1
+
+    def test_prune_expired_tombstones(self, db_session):
+        from models import SyncTombstone
+        from sync import SYNC_TOMBSTONE_RETENTION_DAYS, prune_tombstones
+
+        now = datetime.utcnow()
+        db_session.add_all([
+            SyncTombstone(table_name="guests", row_id=1,
+                          deleted_at=now - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS + 1)),
+            SyncTombstone(table_name="guests", row_id=2, deleted_at=now),
+        ])
+        db_session.commit()
+
+        assert prune_tombstones(db_session, now) == 1
+        assert [t.row_id for t in db_session.query(SyncTombstone)] == [2]
+
+    def test_sync_request_does_not_prune(self, client, db_session, auth_headers):
+        """GET /api/sync is read-only; pruning is left to the maintenance script"""
+        from models import SyncTombstone
+        from sync import SYNC_TOMBSTONE_RETENTION_DAYS
+
+        db_session.add(SyncTombstone(table_name="guests", row_id=1,
+                                     deleted_at=datetime.utcnow() - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS + 1)))
+        db_session.commit()
+
+        assert client.get("/api/sync", headers=auth_headers).status_code == 200
+        assert db_session.query(SyncTombstone).count() == 1
+
+
+class TestSyncPaging:
+    """Test keyset paging of snapshots and deltas"""
+
+    def _pages(self, client, auth_headers, first_url):
+        pages = [client.get(first_url, headers=auth_headers).json()]
+        while pages[-1]["cursor"]:
+            pages.append(client.get(f"/api/sync?cursor={pages[-1]['cursor']}", headers=auth_headers).json())
+        return pages
+
+    def test_snapshot_is_paged(self, client, db_session, auth_headers, monkeypatch):
+        import sync
+
+        rooms, guest = _seed(db_session)
+        room_ids = [room.id for room in rooms]
+        guest_id = guest.id
+        monkeypatch.setattr(sync, "SYNC_PAGE_SIZE", 2)
+
+        pages = self._pages(client, auth_headers, "/api/sync")
+        assert len(pages) == 2
+        assert all(page["reset"] is True for page in pages)
+        assert [page["token"] is None for page in pages] == [True, False]
+        assert [len(page["changes"]["rooms"]) for page in pages] == [2, 1]
+        assert [r["id"] for page in pages for r in page["changes"]["rooms"]] == room_ids
+        assert [g["id"] for page in pages for g in page["changes"]["guests"]] == [guest_id]
+
+    def test_token_comes_from_first_page(self, client, db_session, auth_headers, monkeypatch):
+        """Rows written while the pages are read are picked up by the next sync"""
+        import sync
+        from models import Guest
+
+        _seed(db_session)
+        monkeypatch.setattr(sync, "SYNC_PAGE_SIZE", 2)
+        first = client.get("/api/sync", headers=auth_headers).json()
+
+        late = Guest(full_name="Late Guest", id_type="passport", id_number="L1")
+        db_session.add(late)
+        db_session.commit()
+        late_id = late.id
+
+        pages = [first] + self._pages(client, auth_headers, f"/api/sync?cursor={first['cursor']}")
+        token = pages[-1]["token"]
+        started_at, _, _, _ = sync.decode_cursor(first["cursor"])
+        assert sync.decode_token(token) == started_at - timedelta(seconds=sync.SYNC_OVERLAP_SECONDS)
+
+        monkeypatch.setattr(sync, "SYNC_PAGE_SIZE", 1000)
+        data = client.get(f"/api/sync?since={token}", headers=auth_headers).json()
+        assert late_id in [g["id"] for g in data["changes"]["guests"]]
+
+    def test_delta_is_paged(self, client, db_session, auth_headers, monkeypatch):
+        import sync
+        from sync import encode_token
+
+        rooms, _ = _seed(db_session)
+        room_ids = [room.id for room in rooms]
+        token = encode_token(datetime.utcnow() - timedelta(minutes=30))
+        monkeypatch.setattr(sync, "SYNC_PAGE_SIZE", 1)
+
+        pages = self._pages(client, auth_headers, f"/api/sync?since={token}")
+        assert all(page["reset"] is False for page in pages)
+        assert [r["id"] for page in pages for r in page["changes"]["rooms"]] == room_ids
+        assert pages[-1]["token"] is not None
@@ -0,0 +1,72 @@
+"""
+Tests for the synthetic data generator (scripts/generate_synthetic_data.py)
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+SCRIPT = Path(__file__).parent.parent.parent / "scripts" / "generate_synthetic_data.py"
+SIZES = ["--rooms", "12", "--guests", "150", "--reservations", "400", "--payments", "700", "--years", "1",
+         "--batch-size", "64"]
+
+
+def _generate(database_url, *extra):
+    return subprocess.run(
+        [sys.executable, str(SCRIPT), "--database-url", database_url, *SIZES, *extra],
+        cwd=SCRIPT.parent.parent, capture_output=True, text=True,
+    )
+
+
+def _dump(engine):
+    with engine.connect() as connection:
+        return [
+            connection.execute(text(f"SELECT * FROM {table} ORDER BY id")).all()
+            for table in ("rooms", "guests", "reservations", "payments")
+        ]
+
+
+class TestSyntheticData:
+    """Test sizes, determinism and consistency of generated data"""
+
+    def test_exact_sizes_and_consistent_balances(self, tmp_path):
+        from balances import find_balance_drift
+
+        url = f"sqlite:///{tmp_path}/synthetic.db"
+        result = _generate(url)
+        assert result.returncode == 0, result.stderr
+
+        engine = create_engine(url)
+        with engine.connect() as connection:
+            counts = {table: connection.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+                      for table in ("rooms", "guests", "reservations", "payments")}
+            assert counts == {"rooms": 12, "guests": 150, "reservations": 400, "payments": 700}
+            assert connection.execute(text(
+                "SELECT COUNT(*) FROM reservations WHERE check_out_date <= check_in_date OR total_amount <= 0"
+            )).scalar() == 0
+            # 400 stays over 12 rooms fit in a year: no double-booked room-nights
+            assert connection.execute(text(
+                "SELECT COUNT(*) FROM reservations a JOIN reservations b ON a.room_id = b.room_id "
+                "AND a.id < b.id AND a.check_in_date < b.check_out_date AND b.check_in_date < a.check_out_date"
+            )).scalar() == 0
+        with Session(engine) as db:
+            assert find_balance_drift(db) == []
+
+    def test_same_seed_same_rows(self, tmp_path):
+        first, second, other = (f"sqlite:///{tmp_path}/{name}.db" for name in ("a", "b", "c"))
+        assert _generate(first).returncode == 0
+        assert _generate(second).returncode == 0
+        assert _generate(other, "--seed", "7").returncode == 0
+
+        assert _dump(create_engine(first)) == _dump(create_engine(second))
+        assert _dump(create_engine(first)) != _dump(create_engine(other))
+
+    def test_refuses_non_empty_database(self, tmp_path):
+        url = f"sqlite:///{tmp_path}/synthetic.db"
+        assert _generate(url).returncode == 0
+        result = _generate(url)
+        assert result.returncode != 0
+        assert "not empty" in result.stdout + result.stderr
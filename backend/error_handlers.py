@@ -3,25 +3,59 @@ Comprehensive error handling and logging for Hotel Management System API
 Phase 8 Task 8.3: Error Handling & Logging
 """
 
+import atexit
+import copy
 import logging
 import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+import uuid
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from query_stats import QUERY_COUNT_HEADER, QUERY_TIME_HEADER, start_request
+from security import redact_query_string
+
 
 # ============== LOGGING CONFIGURATION ==============
 
+# Records wait in a bounded queue and are formatted and written by a
+# listener thread, so a slow console or disk never blocks a request
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Above this fill ratio INFO/DEBUG records are dropped to keep room for
+# warnings and errors
+LOG_QUEUE_HIGH_WATER = float(os.getenv("LOG_QUEUE_HIGH_WATER", "0.8"))
+
+# Attributes every LogRecord has; anything else was passed with extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_traceback_formatter = logging.Formatter()
+
+
+def _exception_data(exc_info) -> dict:
+    return {
+        "type": exc_info[0].__name__,
+        "message": str(exc_info[1]),
+        "traceback": _traceback_formatter.formatException(exc_info)
+    }
+
+
 class StructuredFormatter(logging.Formatter):
     """Structured logging formatter for better log analysis"""
 
     def format(self, record):
         log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
+            # When the record was created, not when the listener writes it
+            "timestamp": datetime.utcfromtimestamp(record.created).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -30,43 +64,111 @@ class StructuredFormatter(logging.Formatter):
             "line": record.lineno,
         }
 
+        # Add fields passed with extra={...} (including "exception" for
+        # records prepared by BoundedQueueHandler)
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                log_data[key] = value
+
         # Add exception info if present
         if record.exc_info:
-            log_data["exception"] = {
-                "type": record.exc_info[0].__name__,
-                "message": str(record.exc_info[1]),
-                "traceback": self.formatException(record.exc_info)
-            }
+            log_data["exception"] = _exception_data(record.exc_info)
+
+        return json.dumps(log_data, default=str)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Puts records on a bounded queue without ever blocking the caller.
+
+    Above the high-water mark INFO and DEBUG records are dropped; when the
+    queue is full every record is dropped. Drops are counted in `dropped`
+    (exported as log_records_dropped_total by metrics.py). Formatting is
+    left to the listener thread: only the message and exception are
+    resolved here.
+    """
+
+    def __init__(self, log_queue: queue.Queue, high_water: float = None):
+        super().__init__(log_queue)
+        ratio = LOG_QUEUE_HIGH_WATER if high_water is None else high_water
+        self.high_water = int(log_queue.maxsize * ratio) if log_queue.maxsize > 0 else 0
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def _drop(self):
+        with self._dropped_lock:
+            self.dropped += 1
+
+    def enqueue(self, record):
+        if self.high_water and record.levelno < logging.WARNING and self.queue.qsize() >= self.high_water:
+            self._drop()
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._drop()
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Traceback objects must not outlive the request; keep the text
+            record.exception = _exception_data(record.exc_info)
+            record.exc_info = None
+            record.exc_text = None
+        return record
+
+
+log_queue_handler = None
+_log_listener = None
+
 
-        return json.dumps(log_data)
+def stop_logging():
+    """Flush queued records and stop the listener thread"""
+    global _log_listener
+    if _log_listener is not None:
+        try:
+            _log_listener.stop()
+        except queue.Full:
+            pass  # no room for the stop sentinel; the listener is a daemon thread
+        _log_listener = None
 
 
 def setup_logging():
     """Configure logging for the application"""
+    global log_queue_handler, _log_listener
+
     # Create logger
     logger = logging.getLogger("hotel_management")
     logger.setLevel(logging.DEBUG)
 
-    # Remove default handlers
+    # Remove default handlers (and stop a previous listener)
     logger.handlers = []
+    stop_logging()
 
     # Console handler (INFO level)
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     console_formatter = StructuredFormatter()
     console_handler.setFormatter(console_formatter)
+    sink_handlers = [console_handler]
 
     # File handler (DEBUG level)
     try:
         file_handler = logging.FileHandler("logs/api.log")
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(console_formatter)
-        logger.addHandler(file_handler)
+        sink_handlers.append(file_handler)
     except (FileNotFoundError, PermissionError):
         # If logs directory doesn't exist, just use console
         pass
 
-    logger.addHandler(console_handler)
+    # The logger only enqueues; the listener thread formats and writes
+    log_queue_handler = BoundedQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+    logger.addHandler(log_queue_handler)
+    _log_listener = QueueListener(log_queue_handler.queue, *sink_handlers, respect_handler_level=True)
+    _log_listener.start()
 
     # Log startup
     logger.info("Logging configured successfully")
@@ -75,6 +177,7 @@ def setup_logging():
 
 
 logger = setup_logging()
+atexit.register(stop_logging)
 
 
 # ============== CUSTOM EXCEPTIONS ==============
@@ -372,88 +475,98 @@ def create_exception_handlers(app: FastAPI):
 
 # ============== LOGGING MIDDLEWARE ==============
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log all HTTP requests and responses"""
-
-    async def dispatch(self, request: Request, call_next):
-        """Log request and response"""
-        # Generate request ID
-        request_id = request.headers.get("X-Request-ID", str(datetime.utcnow().timestamp()))
+# Fraction of successful, fast requests written to the access log; errors
+# and slow requests are always logged
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_SECONDS", "1.0"))
+
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+def _request_id(headers) -> str:
+    """Client-supplied X-Request-ID if well-formed, else a new one"""
+    for key, value in headers:
+        if key == b"x-request-id":
+            candidate = value.decode("latin-1")
+            if _REQUEST_ID.match(candidate):
+                return candidate
+            break
+    return uuid.uuid4().hex
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Request IDs, timing, SQL accounting and access logging in one pure ASGI
+    middleware (no per-request task or body re-streaming, so streaming
+    responses pass through untouched).
+
+    Response headers: X-Request-ID, X-Process-Time (seconds until the
+    response started) and X-DB-Query-Count / X-DB-Time-Ms (query_stats.py).
+    One log line is written when the response is complete: every error and
+    slow request (>= SLOW_REQUEST_SECONDS), and LOG_SAMPLE_RATE of the rest.
+    The request ID is also available as request.state.request_id.
+    """
+
+    def __init__(self, app, sample_rate: float = None, slow_request_seconds: float = None):
+        self.app = app
+        self.sample_rate = LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.slow_request_seconds = SLOW_REQUEST_SECONDS if slow_request_seconds is None else slow_request_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _request_id(scope["headers"])
+        scope.setdefault("state", {})["request_id"] = request_id
+        stats = start_request()
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Queries made while a streaming body is sent are not included
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", request_id.encode("latin-1")),
+                    (b"x-process-time", f"{time.perf_counter() - started:.6f}".encode("latin-1")),
+                    (QUERY_COUNT_HEADER, str(stats.count).encode("latin-1")),
+                    (QUERY_TIME_HEADER, f"{stats.duration * 1000:.2f}".encode("latin-1")),
+                ]
+            await send(message)
 
-        # Log request
-        logger.info(
-            f"Request: {request.method} {request.url.path}",
-            extra={
-                "request_id": request_id,
-                "method": request.method,
-                "path": request.url.path,
-                "query_params": dict(request.query_params),
-                "client": request.client.host if request.client else "unknown"
-            }
-        )
-
-        # Get response
         try:
-            response = await call_next(request)
-
-            # Log response
-            logger.info(
-                f"Response: {request.method} {request.url.path} - {response.status_code}",
-                extra={
-                    "request_id": request_id,
-                    "method": request.method,
-                    "path": request.url.path,
-                    "status_code": response.status_code,
-                    "client": request.client.host if request.client else "unknown"
-                }
-            )
-
-            return response
-
+            await self.app(scope, receive, send_wrapper)
         except Exception as exc:
-            # Log error
-            logger.error(
-                f"Request Error: {request.method} {request.url.path} - {str(exc)[:100]}",
-                exc_info=exc,
-                extra={
-                    "request_id": request_id,
-                    "method": request.method,
-                    "path": request.url.path,
-                    "client": request.client.host if request.client else "unknown"
-                }
-            )
+            self._log(scope, request_id, status_code, time.perf_counter() - started, stats, exc)
             raise
-
-
-class PerformanceLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log request performance"""
-
-    async def dispatch(self, request: Request, call_next):
-        """Log request performance metrics"""
-        import time
-
-        start_time = time.time()
-
-        response = await call_next(request)
-
-        process_time = time.time() - start_time
-
-        # Log slow requests (>1 second)
-        if process_time > 1.0:
-            logger.warning(
-                f"Slow Request: {request.method} {request.url.path} took {process_time:.2f}s",
-                extra={
-                    "method": request.method,
-                    "path": request.url.path,
-                    "process_time": process_time,
-                    "status_code": response.status_code
-                }
-            )
-
-        # Add performance header
-        response.headers["X-Process-Time"] = str(process_time)
-
-        return response
+        self._log(scope, request_id, status_code, time.perf_counter() - started, stats)
+
+    def _log(self, scope, request_id: str, status_code: int, process_time: float, stats, exc: Exception = None):
+        slow = process_time >= self.slow_request_seconds
+        if exc is None and status_code < 500 and not slow and self.sample_rate < 1.0 \
+                and random.random() >= self.sample_rate:
+            return
+
+        method, path = scope["method"], scope["path"]
+        client = scope.get("client")
+        extra = {
+            "request_id": request_id,
+            "method": method,
+            "path": path,
+            "query_string": redact_query_string(scope.get("query_string", b"")),
+            "status_code": status_code,
+            "process_time": round(process_time, 6),
+            "client": client[0] if client else "unknown",
+            **stats.as_dict(),
+        }
+        if exc is not None:
+            logger.error(f"Request Error: {method} {path} - {str(exc)[:100]}", exc_info=exc, extra=extra)
+        elif slow:
+            logger.warning(f"Slow Request: {method} {path} took {process_time:.2f}s", extra=extra)
+        else:
+            logger.info(f"Response: {method} {path} - {status_code}", extra=extra)
 
 
 # ============== LOGGING UTILITIES ==============
@@ -0,0 +1,176 @@
+"""
+Live event broker for Hotel Management System
+
+Routers publish domain events (room status changes, check-ins/outs, new
+reservations, payment postings) after their transaction commits; the
+GET /api/events server-sent events stream fans them out to connected
+clients instead of each browser tab polling the dashboard and rooms
+endpoints.
+
+Each connection is a Subscription with its own bounded asyncio.Queue and
+filters (event types / room IDs), so an idle connection costs one waiting
+task and a small queue. publish() never blocks: a client that falls
+QUEUE_SIZE events behind gets its queue replaced by a single
+"stream.overflow" event telling it to refetch. The last HISTORY_SIZE events
+are kept so reconnecting clients can resume from Last-Event-ID.
+
+The broker is per process; with several workers, each worker only streams
+events published by its own requests.
+"""
+
+import asyncio
+import json
+import threading
+from collections import deque
+from datetime import datetime
+from itertools import count
+from typing import Iterable, Optional
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware
+
+QUEUE_SIZE = 100
+HISTORY_SIZE = 1000
+KEEPALIVE_SECONDS = 15
+
+ROOM_STATUS_CHANGED = "room.status_changed"
+RESERVATION_CREATED = "reservation.created"
+RESERVATION_CHECKED_IN = "reservation.checked_in"
+RESERVATION_CHECKED_OUT = "reservation.checked_out"
+RESERVATION_CANCELLED = "reservation.cancelled"
+PAYMENT_POSTED = "payment.posted"
+STREAM_OVERFLOW = "stream.overflow"
+
+EVENT_TYPES = (
+    ROOM_STATUS_CHANGED, RESERVATION_CREATED, RESERVATION_CHECKED_IN,
+    RESERVATION_CHECKED_OUT, RESERVATION_CANCELLED, PAYMENT_POSTED,
+)
+
+
+def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class Subscription:
+    """One connected client: a bounded queue plus its filters"""
+
+    def __init__(self, types: Optional[Iterable[str]] = None, room_ids: Optional[Iterable[int]] = None,
+                 queue_size: int = QUEUE_SIZE):
+        # "room" matches "room.status_changed"; None = everything
+        self.types = tuple(types) if types else None
+        self.room_ids = frozenset(room_ids) if room_ids else None
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.loop = _current_loop()
+
+    def matches(self, event: dict) -> bool:
+        if self.types and not any(event["type"] == t or event["type"].startswith(t + ".") for t in self.types):
+            return False
+        if self.room_ids is not None:
+            room_id = event["data"].get("room_id")
+            if room_id is not None and room_id not in self.room_ids:
+                return False
+        return True
+
+    def deliver(self, event: dict):
+        """Queue an event (must run on the subscription's loop)"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow consumer: drop the backlog and ask it to resync
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"id": event["id"], "type": STREAM_OVERFLOW, "data": {},
+                                   "timestamp": event["timestamp"]})
+
+
+class EventBroker:
+    """In-process fan-out of published events to matching subscriptions"""
+
+    def __init__(self, history_size: int = HISTORY_SIZE):
+        self._subscriptions = set()
+        self._history = deque(maxlen=history_size)
+        self._ids = count(1)
+        self._lock = threading.Lock()
+
+    def subscribe(self, types=None, room_ids=None, last_event_id: Optional[int] = None) -> Subscription:
+        """Register a subscription, pre-filled with missed events after last_event_id"""
+        subscription = Subscription(types, room_ids)
+        with self._lock:
+            self._subscriptions.add(subscription)
+            missed = [e for e in self._history if last_event_id is not None and e["id"] > last_event_id]
+        for event in missed:
+            if subscription.matches(event):
+                subscription.deliver(event)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    @property
+    def connection_count(self) -> int:
+        return len(self._subscriptions)
+
+    def publish(self, event_type: str, data: dict) -> dict:
+        """Send an event to every matching subscription (safe from any thread)"""
+        with self._lock:
+            event = {
+                "id": next(self._ids),
+                "type": event_type,
+                "data": data,
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+            self._history.append(event)
+            subscriptions = list(self._subscriptions)
+
+        loop = _current_loop()
+        for subscription in subscriptions:
+            if not subscription.matches(event):
+                continue
+            if subscription.loop is None or subscription.loop is loop:
+                subscription.deliver(event)
+            elif not subscription.loop.is_closed():
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+        return event
+
+
+broker = EventBroker()
+
+
+def format_sse(event: dict) -> str:
+    """Serialize an event in text/event-stream format"""
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+async def event_stream(subscription: Subscription, event_broker: Optional[EventBroker] = None,
+                       keepalive_seconds: float = KEEPALIVE_SECONDS):
+    """Yield SSE frames for a subscription until the client disconnects"""
+    event_broker = event_broker or broker
+    try:
+        yield "retry: 3000\n: connected\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=keepalive_seconds)
+            except asyncio.TimeoutError:
+                # Comment line keeps proxies from closing idle connections
+                yield ": keepalive\n\n"
+                continue
+            yield format_sse(event)
+    finally:
+        event_broker.unsubscribe(subscription)
+
+
+class EventStreamAwareGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that leaves event streams alone: gzip buffers small
+    chunks, which would hold SSE frames back until the buffer fills.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and "text/event-stream" in Headers(scope=scope).get("accept", ""):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
@@ -0,0 +1,241 @@
+"""
+Append-only folio ledger for Hotel Management System
+
+Every charge, payment, refund, adjustment and deposit posted to a stay is a
+new FolioEntry row; entries are never updated or deleted (corrections are
+posted as reversing adjustments). Each entry stores a per-reservation
+sequence number and the running balance after it, so:
+
+- the current balance of a stay is one lookup of the latest entry via the
+  (reservation_id, sequence) unique index, and
+- posting a charge (minibar, restaurant, late checkout...) is a single
+  insert, with no read-modify-write (or lock) of the reservation row.
+
+Concurrent postings to one folio are serialized by the unique index: the
+loser of a race for a sequence number fails with IntegrityError and the
+caller retries its unit of work (see routes/folio_router.py).
+
+Amounts are stored signed by their effect on the balance: charges and
+refunds increase it, payments and deposits decrease it, adjustments carry
+their own sign.
+
+Routers that change a reservation or its payments post the matching entry
+themselves, so the folio mirrors Reservation.total_amount - total_paid.
+Entries posted directly to the folio (POST /api/reservations/{id}/folio) go
+through record_posting():
+
+- charges and adjustments live only in the folio; the stay balance is read
+  from the latest entry (stay_balance(), latest_balances_subquery())
+- payments, deposits and refunds also create a Payment row (a refund is a
+  negative adjustment payment), so balances.py, reconciliation and the
+  revenue reports see them
+"""
+
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from models import FolioEntry, Payment, Reservation
+
+ENTRY_TYPES = ("charge", "payment", "refund", "adjustment", "deposit")
+
+# Sign applied to the (positive) amount supplied for each entry type
+ENTRY_SIGNS = {"charge": 1, "refund": 1, "payment": -1, "deposit": -1}
+
+# Entry types written through as Payment rows, with their payment_type
+PAYMENT_ENTRY_TYPES = {"payment": "full", "deposit": "deposit", "refund": "adjustment"}
+PAYMENT_METHODS = ("cash", "credit_card", "debit_card", "bank_transfer", "e_wallet", "other")
+
+ZERO = Decimal("0.00")
+
+
+class FolioError(Exception):
+    """Raised for invalid folio postings or attempts to modify the ledger"""
+
+
+@event.listens_for(Session, "before_flush")
+def _enforce_append_only(session, flush_context, instances):
+    """Reject updates and deletes of posted folio entries"""
+    for obj in session.dirty:
+        if isinstance(obj, FolioEntry) and session.is_modified(obj, include_collections=False):
+            raise FolioError("Folio entries are append-only; post an adjustment instead")
+    for obj in session.deleted:
+        if isinstance(obj, FolioEntry):
+            raise FolioError("Folio entries are append-only; post an adjustment instead")
+
+
+def latest_entry(db: Session, reservation_id: int) -> Optional[FolioEntry]:
+    """Most recent entry of a reservation's folio (None if nothing was posted)"""
+    return (
+        db.query(FolioEntry)
+        .filter(FolioEntry.reservation_id == reservation_id)
+        .order_by(FolioEntry.sequence.desc())
+        .first()
+    )
+
+
+def folio_balance(db: Session, reservation_id: int) -> float:
+    """Current folio balance of a reservation"""
+    latest = latest_entry(db, reservation_id)
+    return float(latest.running_balance) if latest else 0.0
+
+
+def signed_amount(entry_type: str, amount) -> Decimal:
+    """Effect of a posting on the balance"""
+    if entry_type not in ENTRY_TYPES:
+        raise FolioError(f"entry_type must be one of: {', '.join(ENTRY_TYPES)}")
+
+    amount = Decimal(str(amount)).quantize(ZERO)
+    if entry_type == "adjustment":
+        if amount == 0:
+            raise FolioError("Adjustment amount cannot be zero")
+        return amount
+    if amount <= 0:
+        raise FolioError("Amount must be greater than 0")
+    return amount * ENTRY_SIGNS[entry_type]
+
+
+def post_entry(
+    db: Session,
+    reservation_id: int,
+    entry_type: str,
+    amount,
+    description: Optional[str] = None,
+    category: Optional[str] = None,
+    payment_id: Optional[int] = None,
+    reverses_entry_id: Optional[int] = None,
+    posted_by: Optional[int] = None,
+) -> FolioEntry:
+    """
+    Append an entry to a reservation's folio inside the caller's transaction.
+
+    amount is positive for every type except adjustment, whose sign is its
+    effect on the balance. The caller commits; a concurrent posting that
+    takes the same sequence number fails on the unique constraint instead
+    of corrupting the running balance, and the caller retries.
+    """
+    delta = signed_amount(entry_type, amount)
+    previous = latest_entry(db, reservation_id)
+
+    entry = FolioEntry(
+        reservation_id=reservation_id,
+        sequence=previous.sequence + 1 if previous else 1,
+        entry_type=entry_type,
+        category=category,
+        description=description,
+        amount=delta,
+        running_balance=(Decimal(str(previous.running_balance)) if previous else ZERO) + delta,
+        payment_id=payment_id,
+        reverses_entry_id=reverses_entry_id,
+        posted_by=posted_by,
+    )
+    db.add(entry)
+    db.flush()
+    return entry
+
+
+def reverse_entry(db: Session, entry: FolioEntry, reason: Optional[str] = None,
+                  posted_by: Optional[int] = None) -> FolioEntry:
+    """Post an adjustment cancelling an earlier entry"""
+    if entry.reverses_entry_id is not None:
+        raise FolioError("Reversal entries cannot be reversed")
+    already = db.query(FolioEntry.id).filter(FolioEntry.reverses_entry_id == entry.id).first()
+    if already:
+        raise FolioError(f"Folio entry {entry.id} has already been reversed")
+
+    return post_entry(
+        db,
+        entry.reservation_id,
+        "adjustment",
+        -Decimal(str(entry.amount)),
+        description=reason or f"Reversal of entry #{entry.sequence}",
+        category=entry.category,
+        payment_id=entry.payment_id,
+        reverses_entry_id=entry.id,
+        posted_by=posted_by,
+    )
+
+
+# ============== DIRECT POSTINGS ==============
+
+def stay_balance(db: Session, reservation: Reservation) -> float:
+    """Balance of a stay: the latest folio entry, or total_amount - total_paid for stays without a folio"""
+    latest = latest_entry(db, reservation.id)
+    return float(latest.running_balance) if latest else reservation.calculate_balance()
+
+
+def latest_balances_subquery():
+    """reservation_id -> running balance of its latest folio entry (subquery for report joins)"""
+    latest = (
+        select(FolioEntry.reservation_id, func.max(FolioEntry.sequence).label("sequence"))
+        .group_by(FolioEntry.reservation_id)
+        .subquery()
+    )
+    return (
+        select(FolioEntry.reservation_id, FolioEntry.running_balance.label("balance"))
+        .join(latest, (latest.c.reservation_id == FolioEntry.reservation_id)
+              & (latest.c.sequence == FolioEntry.sequence))
+        .subquery()
+    )
+
+
+def record_posting(
+    db: Session,
+    reservation_id: int,
+    entry_type: str,
+    amount,
+    description: Optional[str] = None,
+    category: Optional[str] = None,
+    payment_method: Optional[str] = None,
+    posted_by: Optional[int] = None,
+) -> FolioEntry:
+    """
+    Post a folio entry in the caller's transaction. Charges and adjustments
+    are a single insert; payments, deposits and refunds are also recorded
+    as a Payment.
+    """
+    delta = signed_amount(entry_type, amount)
+
+    if entry_type not in PAYMENT_ENTRY_TYPES:
+        return post_entry(db, reservation_id, entry_type, amount,
+                          description=description, category=category, posted_by=posted_by)
+
+    payment_method = payment_method or "other"
+    if payment_method not in PAYMENT_METHODS:
+        raise FolioError(f"payment_method must be one of: {', '.join(PAYMENT_METHODS)}")
+    payment = Payment(
+        reservation_id=reservation_id,
+        payment_date=date.today(),
+        amount=-delta,  # positive for payments and deposits, negative for refunds
+        payment_method=payment_method,
+        payment_type=PAYMENT_ENTRY_TYPES[entry_type],
+        notes=description,
+        refund_reason=description if entry_type == "refund" else None,
+        created_by=posted_by,
+    )
+    db.add(payment)
+    db.flush()  # balances.py applies it to total_paid/balance
+    return post_entry(db, reservation_id, entry_type, amount, description=description,
+                      category=category or payment_method, payment_id=payment.id, posted_by=posted_by)
+
+
+def reverse_posting(db: Session, entry: FolioEntry, reason: Optional[str] = None,
+                    posted_by: Optional[int] = None) -> FolioEntry:
+    """Reverse an entry, voiding its payment if it recorded one"""
+    if entry.category == "payment_correction":
+        raise FolioError("Payment corrections follow their payment; update or delete the payment instead")
+
+    payment = None
+    if entry.entry_type in PAYMENT_ENTRY_TYPES and entry.payment_id is not None:
+        payment = db.query(Payment).filter(Payment.id == entry.payment_id).first()
+        if payment is None or payment.is_voided:
+            raise FolioError(f"Payment #{entry.payment_id} was already deleted or voided")
+
+    adjustment = reverse_entry(db, entry, reason=reason, posted_by=posted_by)
+    if payment is not None:
+        payment.is_voided = True
+        db.flush()
+    return adjustment
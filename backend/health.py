@@ -0,0 +1,157 @@
+"""
+Health probes for Hotel Management System
+
+- GET /livez: the process is up and serving requests (no I/O), for
+  liveness probes and the container HEALTHCHECK.
+- GET /readyz: a connection can be checked out of the pool and answers
+  SELECT 1, for readiness / startup probes.
+- GET /health: the deep check (connection, table counts, initial data).
+  It is computed by a background task every HEALTH_CHECK_INTERVAL_SECONDS
+  in one session and one statement, and served from cache, so frequent
+  probes never run COUNT(*) queries themselves.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, select, text
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv("HEALTH_CHECK_INTERVAL_SECONDS", "30"))
+
+# Minimum rows for the initial data check
+INITIAL_DATA_MINIMUMS = {"users": 1, "room_types": 4, "booking_channels": 5, "settings": 8}
+
+
+def _table_counts_statement():
+    from models import BookingChannel, Payment, Reservation, Room, RoomType, Setting, User
+
+    tables = {
+        "users": User, "room_types": RoomType, "booking_channels": BookingChannel, "settings": Setting,
+        "rooms": Room, "reservations": Reservation, "payments": Payment,
+    }
+    return select(*(
+        select(func.count()).select_from(model).scalar_subquery().label(name) for name, model in tables.items()
+    ))
+
+
+def compute_health(session_factory, database_url: str) -> dict:
+    """Run the deep health check (one session, SELECT 1 plus one counting statement)"""
+    health_data = {
+        'status': 'ok',
+        'timestamp': datetime.utcnow().isoformat(),
+        'environment': os.getenv('FLASK_ENV', 'development'),
+        'database_type': 'postgresql' if 'postgresql' in database_url else 'sqlite',
+        'checks': {
+            'database_connection': False,
+            'database_tables': False,
+            'initial_data': False,
+            'api_server': True,
+        },
+        'details': {}
+    }
+
+    db = session_factory()
+    try:
+        try:
+            db.execute(text('SELECT 1'))
+            health_data['checks']['database_connection'] = True
+            health_data['details']['database_status'] = 'connected'
+        except Exception as e:
+            health_data['details']['database_error'] = str(e)
+            raise
+
+        try:
+            table_counts = dict(db.execute(_table_counts_statement()).one()._mapping)
+            health_data['checks']['database_tables'] = True
+            health_data['details']['table_counts'] = table_counts
+        except Exception as e:
+            health_data['details']['tables_error'] = str(e)
+            raise
+
+        data_status = {
+            'admin_user': table_counts['users'] >= INITIAL_DATA_MINIMUMS['users'],
+            'room_types': table_counts['room_types'] >= INITIAL_DATA_MINIMUMS['room_types'],
+            'booking_channels': table_counts['booking_channels'] >= INITIAL_DATA_MINIMUMS['booking_channels'],
+            'settings': table_counts['settings'] >= INITIAL_DATA_MINIMUMS['settings'],
+        }
+        health_data['checks']['initial_data'] = all(data_status.values())
+        health_data['details']['data_status'] = data_status
+    except Exception:
+        db.rollback()
+    finally:
+        db.close()
+
+    # Determine overall status
+    if all(health_data['checks'].values()):
+        health_data['status'] = 'healthy'
+    elif any(health_data['checks'].values()):
+        health_data['status'] = 'degraded'
+    else:
+        health_data['status'] = 'unhealthy'
+    return health_data
+
+
+class HealthMonitor:
+    """Deep health result refreshed in the background and served from cache"""
+
+    def __init__(self, session_factory, database_url: str, interval: float = HEALTH_CHECK_INTERVAL_SECONDS):
+        self.session_factory = session_factory
+        self.database_url = database_url
+        self.interval = interval
+        self._result: Optional[dict] = None
+        self._computed_at = 0.0  # time.monotonic() of the cached result
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def refresh(self) -> dict:
+        """Recompute and cache the deep check (blocking)"""
+        result = compute_health(self.session_factory, self.database_url)
+        with self._lock:
+            self._result, self._computed_at = result, time.monotonic()
+        return result
+
+    def ping(self) -> None:
+        """Readiness check: raise if no pooled connection can run SELECT 1"""
+        with self.session_factory() as session:
+            session.execute(text("SELECT 1"))
+
+    def get(self) -> dict:
+        """
+        The cached result with its age. Computed inline only when there is
+        none yet or the background task has fallen two intervals behind.
+        """
+        with self._lock:
+            result, computed_at = self._result, self._computed_at
+        if result is None or time.monotonic() - computed_at > 2 * self.interval:
+            result = self.refresh()
+            computed_at = self._computed_at
+        return {**result, 'cached_age_seconds': round(time.monotonic() - computed_at, 1)}
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception:
+                logger.exception("Background health check failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Start the background refresh task on the running loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,244 @@
+"""
+Idempotency-Key support for create endpoints
+
+Clients on unreliable networks (front-desk tablets on hotel Wi-Fi) may send
+the same POST more than once. When a POST carries an ``Idempotency-Key``
+header, IdempotencyMiddleware:
+
+- executes the handler for the first request and stores its response,
+- replays the stored response for repeats of the same key (same user,
+  path and body) without executing the handler again,
+- answers 409 while the first request is still in flight, and
+- answers 422 if the key is reused with a different body.
+
+Responses with a 5xx status (and requests that raise) are not stored, so the
+client may retry them. Keys are scoped to the caller's Authorization header,
+expire after IDEMPOTENCY_TTL_SECONDS and the store holds at most
+IDEMPOTENCY_MAX_KEYS entries (least recently used evicted first).
+
+The body of a keyed request is buffered to fingerprint it, so it is capped at
+IDEMPOTENCY_MAX_BODY_BYTES; larger keyed requests are answered with 413
+(send them without the header to skip idempotency).
+
+The store is in-process; deployments with several worker processes need
+sticky routing per client or a shared store with the same interface.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from starlette.responses import JSONResponse
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", 24 * 60 * 60))
+IDEMPOTENCY_MAX_KEYS = int(os.getenv("IDEMPOTENCY_MAX_KEYS", 10000))
+MAX_KEY_LENGTH = 255
+MAX_CACHED_BODY_BYTES = 1024 * 1024
+IDEMPOTENCY_MAX_BODY_BYTES = int(os.getenv("IDEMPOTENCY_MAX_BODY_BYTES", 1024 * 1024))
+
+IN_FLIGHT = "in_flight"
+COMPLETED = "completed"
+
+
+class IdempotencyRecord:
+    """State of one idempotency key"""
+    __slots__ = ("fingerprint", "state", "status", "headers", "body", "expires_at")
+
+    def __init__(self, fingerprint: str, expires_at: float):
+        self.fingerprint = fingerprint
+        self.state = IN_FLIGHT
+        self.status = None
+        self.headers = None
+        self.body = None
+        self.expires_at = expires_at
+
+
+class IdempotencyStore:
+    """Bounded, thread-safe LRU map of idempotency keys with expiry"""
+
+    def __init__(self, max_keys: int = IDEMPOTENCY_MAX_KEYS, ttl_seconds: int = IDEMPOTENCY_TTL_SECONDS):
+        self.max_keys = max_keys
+        self.ttl_seconds = ttl_seconds
+        self._records = OrderedDict()
+        self._lock = threading.Lock()
+
+    def begin(self, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        """
+        Claim a key. Returns None if the caller should execute the request,
+        otherwise the existing record (in flight or completed).
+        """
+        now = time.monotonic()
+        with self._lock:
+            record = self._records.get(key)
+            if record is not None and record.expires_at > now:
+                self._records.move_to_end(key)
+                return record
+
+            self._records[key] = IdempotencyRecord(fingerprint, now + self.ttl_seconds)
+            self._records.move_to_end(key)
+            self._evict(now)
+            return None
+
+    def complete(self, key: str, status: int, headers: list, body: bytes):
+        """Store the response of a claimed key"""
+        with self._lock:
+            record = self._records.get(key)
+            if record is not None:
+                record.state = COMPLETED
+                record.status = status
+                record.headers = headers
+                record.body = body
+
+    def release(self, key: str):
+        """Forget a claimed key so the request can be retried"""
+        with self._lock:
+            self._records.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def __len__(self):
+        return len(self._records)
+
+    def _evict(self, now: float):
+        # Entries are kept in order of last use, so the least recently used (and
+        # usually the expired) ones sit at the front; an expired entry behind a
+        # live one is ignored by begin() until it reaches the front
+        while self._records:
+            oldest_key, oldest = next(iter(self._records.items()))
+            if oldest.expires_at > now and len(self._records) <= self.max_keys:
+                break
+            del self._records[oldest_key]
+
+
+idempotency_store = IdempotencyStore()
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class IdempotencyMiddleware:
+    """ASGI middleware applying Idempotency-Key semantics to POST requests"""
+
+    def __init__(self, app, store: Optional[IdempotencyStore] = None,
+                 max_body_bytes: int = IDEMPOTENCY_MAX_BODY_BYTES):
+        self.app = app
+        self.store = store or idempotency_store
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        idempotency_key = _header(scope, IDEMPOTENCY_HEADER.encode())
+        if idempotency_key is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            await JSONResponse(
+                status_code=400,
+                content={"detail": f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters"},
+            )(scope, receive, send)
+            return
+
+        # Buffer the body (up to max_body_bytes) to fingerprint it, then replay it to the application
+        content_length = _header(scope, b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body_bytes:
+            await self._body_too_large(scope, receive, send)
+            return
+
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_bytes:
+                await self._body_too_large(scope, receive, send)
+                return
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+
+        caller = hashlib.sha256((_header(scope, b"authorization") or "").encode()).hexdigest()
+        key = f"{caller}:{scope['path']}:{idempotency_key}"
+        fingerprint = hashlib.sha256(body).hexdigest()
+
+        record = self.store.begin(key, fingerprint)
+        if record is not None:
+            await self._respond_existing(record, fingerprint, scope, receive, send)
+            return
+
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        response = {"status": None, "headers": [], "body": []}
+
+        async def capture_send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except BaseException:
+            self.store.release(key)
+            raise
+
+        response_body = b"".join(response["body"])
+        if response["status"] is None or response["status"] >= 500 or len(response_body) > MAX_CACHED_BODY_BYTES:
+            self.store.release(key)
+        else:
+            self.store.complete(key, response["status"], response["headers"], response_body)
+
+    async def _body_too_large(self, scope, receive, send):
+        await JSONResponse(
+            status_code=413,
+            content={"detail": f"Requests with an Idempotency-Key are limited to {self.max_body_bytes} bytes"},
+        )(scope, receive, send)
+
+    async def _respond_existing(self, record, fingerprint, scope, receive, send):
+        if record.fingerprint != fingerprint:
+            await JSONResponse(
+                status_code=422,
+                content={"detail": "Idempotency-Key was already used with a different request body"},
+            )(scope, receive, send)
+            return
+
+        if record.state == IN_FLIGHT:
+            await JSONResponse(
+                status_code=409,
+                content={"detail": "A request with this Idempotency-Key is still being processed"},
+                headers={"Retry-After": "1"},
+            )(scope, receive, send)
+            return
+
+        await send({
+            "type": "http.response.start",
+            "status": record.status,
+            "headers": record.headers + [(b"idempotent-replayed", b"true")],
+        })
+        await send({"type": "http.response.body", "body": record.body})
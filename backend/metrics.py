@@ -0,0 +1,302 @@
+"""
+Prometheus metrics for Hotel Management System
+
+GET /metrics serves the Prometheus text format (0.0.4) with:
+
+- http_request_duration_seconds: latency histogram per method, route
+  template (/api/reservations/{reservation_id}, not the concrete path, so
+  label cardinality is bounded by the number of routes) and status
+- http_requests_total: request counter per method, route and status
+- http_requests_in_flight: requests currently being served, per method
+- db_pool_*: SQLAlchemy pool size, checked-out and overflow connections
+  (read at scrape time) and a histogram of the time spent waiting for a
+  pooled connection (TimedQueuePool)
+- auth_active_tokens: size of the in-memory token store (security.py)
+- log_queue_depth / log_records_dropped_total: the queue-based logging
+  pipeline (error_handlers.py)
+
+Collection is designed to run on every request: MetricsMiddleware is a
+pure ASGI middleware that does one perf_counter() pair, a bisect and a few
+locked dict updates per request; pool and token gauges cost nothing until
+scraped. Metrics are per process; with several workers each one is
+scraped (or aggregated) separately.
+
+Set METRICS_TOKEN to require `Authorization: Bearer <token>` on /metrics.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from sqlalchemy.pool import QueuePool
+
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Prometheus client defaults, seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base metric; `callback` (if given) supplies an unlabelled value at scrape time"""
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), callback=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _header(self) -> list:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+    def render(self) -> list:
+        if self.callback is not None:
+            try:
+                value = self.callback()
+            except Exception:
+                return self._header()  # e.g. the engine is not created yet
+            return self._header() + [f"{self.name} {_format_value(value)}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = self._header()
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+    def value(self, *labels):
+        with self._lock:
+            return self._values.get(labels, 0)
+
+
+class Counter(_Metric):
+    """Monotonic counter"""
+    type_name = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that goes up and down"""
+    type_name = "gauge"
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram (counts are stored per bucket, summed on render)"""
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, amount: float, *labels):
+        index = bisect_left(self.buckets, amount)  # le is inclusive
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                # [per-bucket counts (+Inf last), sum]
+                series = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += amount
+
+    def value(self, *labels):
+        """(count, sum) of one series"""
+        with self._lock:
+            series = self._values.get(labels)
+            return (sum(series[0]), series[1]) if series else (0, 0.0)
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._values.items())
+        lines = self._header()
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Ordered collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUEST_LATENCY = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds", ("method", "route", "status"),
+))
+REQUESTS_TOTAL = registry.register(Counter(
+    "http_requests_total", "HTTP requests served", ("method", "route", "status"),
+))
+REQUESTS_IN_FLIGHT = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served", ("method",),
+))
+POOL_WAIT = registry.register(Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled database connection", buckets=POOL_WAIT_BUCKETS,
+))
+
+
+def _pool():
+    # Only report once the app has created its engine (see database.get_engine)
+    import database
+
+    if database._engine is None:
+        raise LookupError("engine not created")
+    return database._engine.pool
+
+
+registry.register(Gauge("db_pool_size", "Configured pool size", callback=lambda: _pool().size()))
+registry.register(Gauge(
+    "db_pool_checked_out", "Connections currently checked out of the pool", callback=lambda: _pool().checkedout(),
+))
+registry.register(Gauge(
+    "db_pool_overflow", "Connections open beyond pool_size (negative while the pool is filling)",
+    callback=lambda: _pool().overflow(),
+))
+
+
+def _active_tokens() -> int:
+    from security import active_tokens
+
+    return len(active_tokens)
+
+
+registry.register(Gauge("auth_active_tokens", "Tokens in the in-memory token store", callback=_active_tokens))
+
+
+def _log_queue_handler():
+    from error_handlers import log_queue_handler
+
+    return log_queue_handler
+
+
+registry.register(Gauge(
+    "log_queue_depth", "Log records waiting for the logging thread", callback=lambda: _log_queue_handler().queue.qsize(),
+))
+registry.register(Counter(
+    "log_records_dropped_total", "Log records dropped by the bounded log queue",
+    callback=lambda: _log_queue_handler().dropped,
+))
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waits for a connection"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - started)
+
+
+def _route_templates(app) -> dict:
+    """endpoint -> route path template, built once per app"""
+    templates = getattr(app.state, "metrics_route_templates", None)
+    if templates is None:
+        templates = {}
+        for route in app.routes:
+            endpoint = getattr(route, "endpoint", None)
+            if endpoint is not None:
+                templates.setdefault(endpoint, route.path)
+        app.state.metrics_route_templates = templates
+    return templates
+
+
+class MetricsMiddleware:
+    """Per-request latency, status and in-flight accounting (pure ASGI)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_holder = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_FLIGHT.dec(method)
+            # The router stores the matched endpoint in the (shared) scope
+            endpoint = scope.get("endpoint")
+            route = UNMATCHED_ROUTE
+            if endpoint is not None and "app" in scope:
+                route = _route_templates(scope["app"]).get(endpoint, UNMATCHED_ROUTE)
+            status = str(status_holder[0])
+            REQUEST_LATENCY.observe(elapsed, method, route, status)
+            REQUESTS_TOTAL.inc(method, route, status)
+
+
+def metrics_authorized(authorization) -> bool:
+    """True when METRICS_TOKEN is unset or the header carries it"""
+    return not METRICS_TOKEN or authorization == f"Bearer {METRICS_TOKEN}"
+
+
+def render_metrics() -> str:
+    return registry.render()
@@ -0,0 +1,44 @@
+-- Hotel Management System - Rate Calendar
+-- Supabase PostgreSQL Migration
+-- Status: Nightly rate rules and per-date overrides for the pricing engine
+
+-- ============================================================================
+-- TABLE: rate_rules (Seasonal / weekday pricing rules)
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS rate_rules (
+    id SERIAL PRIMARY KEY,
+    room_type_id INTEGER,
+    name VARCHAR(100) NOT NULL,
+    start_date DATE,
+    end_date DATE,
+    days_of_week VARCHAR(20),
+    adjustment_type VARCHAR(20) NOT NULL
+        CHECK(adjustment_type IN ('fixed_rate', 'percentage', 'fixed_amount')),
+    adjustment_value DECIMAL(12,2) NOT NULL,
+    priority INTEGER DEFAULT 0,
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (room_type_id) REFERENCES room_types(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS ix_rate_rules_room_type_id ON rate_rules(room_type_id);
+CREATE INDEX IF NOT EXISTS ix_rate_rules_is_active ON rate_rules(is_active);
+CREATE INDEX IF NOT EXISTS idx_rate_rules_dates ON rate_rules(start_date, end_date);
+
+-- ============================================================================
+-- TABLE: rate_calendar (Explicit per-date rate overrides)
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS rate_calendar (
+    id SERIAL PRIMARY KEY,
+    room_type_id INTEGER NOT NULL,
+    stay_date DATE NOT NULL,
+    rate DECIMAL(12,2) NOT NULL,
+    notes VARCHAR(255),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_rate_calendar_type_date UNIQUE (room_type_id, stay_date),
+    FOREIGN KEY (room_type_id) REFERENCES room_types(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_rate_calendar_date ON rate_calendar(stay_date);
@@ -0,0 +1,22 @@
+-- Hotel Management System - Denormalized Reservation Balances
+-- Supabase PostgreSQL Migration
+-- Status: Stores total_paid/balance on reservations (maintained by the API)
+
+ALTER TABLE IF EXISTS reservations
+ADD COLUMN IF NOT EXISTS total_paid DECIMAL(12,2) DEFAULT 0,
+ADD COLUMN IF NOT EXISTS balance DECIMAL(12,2);
+
+-- Backfill from existing payments (refunds and voided payments do not count)
+UPDATE reservations r
+SET total_paid = COALESCE(p.paid, 0),
+    balance = r.total_amount - COALESCE(p.paid, 0)
+FROM (
+    SELECT res.id AS reservation_id, SUM(pay.amount) AS paid
+    FROM reservations res
+    LEFT JOIN payments pay
+        ON pay.reservation_id = res.id
+        AND NOT COALESCE(pay.is_refund, FALSE)
+        AND NOT COALESCE(pay.is_voided, FALSE)
+    GROUP BY res.id
+) p
+WHERE p.reservation_id = r.id;
@@ -0,0 +1,54 @@
+-- Hotel Management System - Folio Ledger
+-- Supabase PostgreSQL Migration
+-- Status: Append-only ledger of charges and payments per reservation
+
+-- ============================================================================
+-- TABLE: folio_entries (Append-only, running balance per reservation)
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS folio_entries (
+    id SERIAL PRIMARY KEY,
+    reservation_id INTEGER NOT NULL,
+    sequence INTEGER NOT NULL,
+    entry_type VARCHAR(20) NOT NULL
+        CHECK(entry_type IN ('charge', 'payment', 'refund', 'adjustment', 'deposit')),
+    category VARCHAR(30),
+    description VARCHAR(255),
+    amount DECIMAL(12,2) NOT NULL,
+    running_balance DECIMAL(12,2) NOT NULL,
+    payment_id INTEGER,
+    reverses_entry_id INTEGER,
+    posted_by INTEGER,
+    posted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_folio_entries_reservation_sequence UNIQUE (reservation_id, sequence),
+    FOREIGN KEY (reservation_id) REFERENCES reservations(id),
+    FOREIGN KEY (reverses_entry_id) REFERENCES folio_entries(id),
+    FOREIGN KEY (posted_by) REFERENCES users(id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_folio_entries_payment_id ON folio_entries(payment_id);
+
+-- Reject UPDATE/DELETE at the database level as well (corrections are new entries)
+CREATE OR REPLACE FUNCTION folio_entries_append_only() RETURNS TRIGGER AS $$
+BEGIN
+    RAISE EXCEPTION 'folio_entries is append-only';
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_folio_entries_append_only ON folio_entries;
+CREATE TRIGGER trg_folio_entries_append_only
+    BEFORE UPDATE OR DELETE ON folio_entries
+    FOR EACH ROW EXECUTE FUNCTION folio_entries_append_only();
+
+-- ============================================================================
+-- BACKFILL: opening charge and paid-to-date entries for existing reservations
+-- ============================================================================
+INSERT INTO folio_entries (reservation_id, sequence, entry_type, category, description, amount, running_balance)
+SELECT r.id, 1, 'charge', 'room', 'Opening balance (room charges)', r.total_amount, r.total_amount
+FROM reservations r
+WHERE NOT EXISTS (SELECT 1 FROM folio_entries f WHERE f.reservation_id = r.id);
+
+INSERT INTO folio_entries (reservation_id, sequence, entry_type, category, description, amount, running_balance)
+SELECT r.id, 2, 'payment', 'opening', 'Payments to date', -r.total_paid, r.total_amount - r.total_paid
+FROM reservations r
+WHERE COALESCE(r.total_paid, 0) > 0
+  AND NOT EXISTS (SELECT 1 FROM folio_entries f WHERE f.reservation_id = r.id AND f.sequence = 2);
@@ -0,0 +1,23 @@
+-- Hotel Management System - Delta Sync
+-- Supabase PostgreSQL Migration
+-- Status: updated_at indexes and deletion tombstones for GET /api/sync
+
+-- ============================================================================
+-- INDEXES: updated_at cursor on synced tables
+-- ============================================================================
+CREATE INDEX IF NOT EXISTS ix_rooms_updated_at ON rooms(updated_at);
+CREATE INDEX IF NOT EXISTS ix_guests_updated_at ON guests(updated_at);
+CREATE INDEX IF NOT EXISTS ix_reservations_updated_at ON reservations(updated_at);
+CREATE INDEX IF NOT EXISTS ix_payments_updated_at ON payments(updated_at);
+
+-- ============================================================================
+-- TABLE: sync_tombstones (Rows deleted from synced tables)
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS sync_tombstones (
+    id SERIAL PRIMARY KEY,
+    table_name VARCHAR(50) NOT NULL,
+    row_id INTEGER NOT NULL,
+    deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_sync_tombstones_deleted_at ON sync_tombstones(deleted_at);
@@ -4,27 +4,31 @@ Designed for Supabase PostgreSQL
 Created: November 8, 2025
 """
 
+import json
 from datetime import datetime, date
 from typing import Optional
 from sqlalchemy import (
     Column, Integer, String, Text, DateTime, Boolean,
-    ForeignKey, Numeric, Date, CheckConstraint, Index
+    ForeignKey, Numeric, Date, CheckConstraint, Index, UniqueConstraint
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
-import bcrypt
 
 Base = declarative_base()
 
 
 def hash_password(password: str) -> str:
     """Hash a password for storage using bcrypt"""
+    import bcrypt  # loaded on first use, not at app startup
+
     salt = bcrypt.gensalt(rounds=12)
     return bcrypt.hashpw(password.encode(), salt).decode()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its bcrypt hash"""
+    import bcrypt
+
     try:
         return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
     except Exception:
@@ -153,7 +157,7 @@ class Room(Base):
     custom_rate = Column(Numeric(12, 2))  # Room-level rate override
     is_active = Column(Boolean, default=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  # Delta sync cursor (sync.py)
 
     __table_args__ = (
         CheckConstraint("status IN ('available', 'occupied', 'out_of_order')"),
@@ -290,7 +294,7 @@ class Guest(Base):
     is_vip = Column(Boolean, default=False)
     preferred_room_type_id = Column(Integer, ForeignKey("room_types.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  # Delta sync cursor (sync.py)
 
     # Relationships
     preferred_room_type = relationship("RoomType", back_populates="guests_preferred")
@@ -378,6 +382,8 @@ class Reservation(Base):
     discount_amount = Column(Numeric(12, 2), default=0)
     discount_id = Column(Integer, ForeignKey("discounts.id"))
     total_amount = Column(Numeric(12, 2), nullable=False)
+    total_paid = Column(Numeric(12, 2), default=0)  # Maintained by balances.py on every payment change
+    balance = Column(Numeric(12, 2))  # total_amount - total_paid, maintained by balances.py
     deposit_amount = Column(Numeric(12, 2), default=0)  # Security/holding deposit (refundable at checkout)
     special_requests = Column(Text)
     status = Column(String(20), default='confirmed', index=True)  # confirmed, checked_in, checked_out, cancelled
@@ -390,12 +396,13 @@ class Reservation(Base):
     deposit_returned_at = Column(DateTime)  # When deposit was settled/returned
     is_archived = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  # Delta sync cursor (sync.py)
 
     __table_args__ = (
         CheckConstraint("status IN ('confirmed', 'checked_in', 'checked_out', 'cancelled')"),
         Index("idx_reservations_dates", "check_in_date", "check_out_date"),
         Index("idx_reservations_guest_dates", "guest_id", "check_in_date", "check_out_date"),
+        Index("idx_reservations_discount_guest", "discount_id", "guest_id"),
     )
 
     # Relationships
@@ -411,14 +418,14 @@ class Reservation(Base):
     payments = relationship("Payment", back_populates="reservation")
 
     def calculate_total_paid(self) -> float:
-        """Calculate total amount paid for this reservation"""
-        total = sum(float(p.amount) for p in self.payments if not p.is_refund and not p.is_voided)
-        return total
+        """Total amount paid for this reservation (stored, see balances.py)"""
+        return float(self.total_paid) if self.total_paid is not None else 0.0
 
     def calculate_balance(self) -> float:
-        """Calculate remaining balance"""
-        total_paid = self.calculate_total_paid()
-        return float(self.total_amount) - total_paid
+        """Remaining balance (stored, see balances.py)"""
+        if self.balance is not None:
+            return float(self.balance)
+        return float(self.total_amount) - self.calculate_total_paid()
 
     def to_dict(self):
         """Convert reservation to dictionary"""
@@ -438,6 +445,7 @@ class Reservation(Base):
             "number_of_nights": self.number_of_nights,
             "subtotal": float(self.subtotal) if self.subtotal else 0,
             "discount_amount": float(self.discount_amount) if self.discount_amount else 0,
+            "discount_id": self.discount_id,
             "total_amount": float(self.total_amount) if self.total_amount else 0,
             "deposit_amount": float(self.deposit_amount) if self.deposit_amount else 0,
             "special_requests": self.special_requests,
@@ -479,7 +487,7 @@ class Payment(Base):
     is_voided = Column(Boolean, default=False)
     has_proof = Column(Boolean, default=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  # Delta sync cursor (sync.py)
 
     __table_args__ = (
         CheckConstraint("payment_method IN ('cash', 'credit_card', 'debit_card', 'bank_transfer', 'e_wallet', 'other')"),
@@ -582,7 +590,7 @@ class Setting(Base):
 
 
 # ============================================================================
-# MODEL 9: Discount (V1.1+ - Created but not used in v1.0)
+# MODEL 9: Discount (evaluated by discounts.py)
 # ============================================================================
 class Discount(Base):
     __tablename__ = "discounts"
@@ -615,6 +623,31 @@ class Discount(Base):
         Index("idx_discounts_dates", "valid_from", "valid_until"),
     )
 
+    def to_dict(self):
+        """Convert discount to dictionary"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "code": self.code,
+            "description": self.description,
+            "discount_type": self.discount_type,
+            "discount_value": float(self.discount_value) if self.discount_value is not None else 0,
+            "max_discount_amount": float(self.max_discount_amount) if self.max_discount_amount is not None else None,
+            "applicable_room_types": json.loads(self.applicable_room_types) if self.applicable_room_types else None,
+            "applicable_guests": json.loads(self.applicable_guests) if self.applicable_guests else None,
+            "valid_from": self.valid_from.isoformat() if self.valid_from else None,
+            "valid_until": self.valid_until.isoformat() if self.valid_until else None,
+            "usage_limit": self.usage_limit,
+            "usage_count": self.usage_count or 0,
+            "min_stay_nights": self.min_stay_nights,
+            "min_booking_amount": float(self.min_booking_amount) if self.min_booking_amount is not None else None,
+            "max_bookings_per_guest": self.max_bookings_per_guest,
+            "status": self.status,
+            "is_auto_applied": self.is_auto_applied,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
     def __repr__(self):
         return f"<Discount(id={self.id}, code={self.code}, type={self.discount_type})>"
 
@@ -689,6 +722,159 @@ class Expense(Base):
         return f"<Expense(id={self.id}, category={self.category}, amount={self.amount})>"
 
 
+# ============================================================================
+# MODEL 12: RateRule (Seasonal / weekday pricing rules)
+# ============================================================================
+class RateRule(Base):
+    __tablename__ = "rate_rules"
+
+    id = Column(Integer, primary_key=True)
+    room_type_id = Column(Integer, ForeignKey("room_types.id"), index=True)  # NULL = all room types
+    name = Column(String(100), nullable=False)
+    start_date = Column(Date)  # NULL = open-ended
+    end_date = Column(Date)  # Inclusive, NULL = open-ended
+    days_of_week = Column(String(20))  # Comma separated, 0=Monday .. 6=Sunday, NULL = every day
+    adjustment_type = Column(String(20), nullable=False)  # fixed_rate, percentage, fixed_amount
+    adjustment_value = Column(Numeric(12, 2), nullable=False)
+    priority = Column(Integer, default=0)  # Higher priority wins when rules overlap
+    is_active = Column(Boolean, default=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        CheckConstraint("adjustment_type IN ('fixed_rate', 'percentage', 'fixed_amount')"),
+        Index("idx_rate_rules_dates", "start_date", "end_date"),
+    )
+
+    # Relationships
+    room_type = relationship("RoomType")
+
+    def get_weekdays(self) -> Optional[list]:
+        """Parse days_of_week into a list of weekday numbers (None = every day)"""
+        if not self.days_of_week:
+            return None
+        return [int(d) for d in self.days_of_week.split(",") if d.strip() != ""]
+
+    def to_dict(self):
+        """Convert rate rule to dictionary"""
+        return {
+            "id": self.id,
+            "room_type_id": self.room_type_id,
+            "name": self.name,
+            "start_date": self.start_date.isoformat() if self.start_date else None,
+            "end_date": self.end_date.isoformat() if self.end_date else None,
+            "days_of_week": self.get_weekdays(),
+            "adjustment_type": self.adjustment_type,
+            "adjustment_value": float(self.adjustment_value) if self.adjustment_value is not None else 0,
+            "priority": self.priority,
+            "is_active": self.is_active,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+    def __repr__(self):
+        return f"<RateRule(id={self.id}, name={self.name}, type={self.adjustment_type})>"
+
+
+# ============================================================================
+# MODEL 13: RateCalendar (Explicit per-date rate overrides)
+# ============================================================================
+class RateCalendar(Base):
+    __tablename__ = "rate_calendar"
+
+    id = Column(Integer, primary_key=True)
+    room_type_id = Column(Integer, ForeignKey("room_types.id"), nullable=False)
+    stay_date = Column(Date, nullable=False)
+    rate = Column(Numeric(12, 2), nullable=False)
+    notes = Column(String(255))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("room_type_id", "stay_date", name="uq_rate_calendar_type_date"),
+        Index("idx_rate_calendar_date", "stay_date"),
+    )
+
+    # Relationships
+    room_type = relationship("RoomType")
+
+    def to_dict(self):
+        """Convert rate calendar entry to dictionary"""
+        return {
+            "id": self.id,
+            "room_type_id": self.room_type_id,
+            "stay_date": self.stay_date.isoformat() if self.stay_date else None,
+            "rate": float(self.rate) if self.rate is not None else 0,
+            "notes": self.notes,
+        }
+
+    def __repr__(self):
+        return f"<RateCalendar(room_type_id={self.room_type_id}, date={self.stay_date}, rate={self.rate})>"
+
+
+# ============================================================================
+# MODEL 14: FolioEntry (Append-only reservation ledger, see folio.py)
+# ============================================================================
+class FolioEntry(Base):
+    __tablename__ = "folio_entries"
+
+    id = Column(Integer, primary_key=True)
+    reservation_id = Column(Integer, ForeignKey("reservations.id"), nullable=False)
+    sequence = Column(Integer, nullable=False)  # 1, 2, 3... per reservation
+    entry_type = Column(String(20), nullable=False)  # charge, payment, refund, adjustment, deposit
+    category = Column(String(30))  # room, minibar, restaurant, late_checkout, discount, ...
+    description = Column(String(255))
+    amount = Column(Numeric(12, 2), nullable=False)  # Signed effect on the balance (charges +, payments -)
+    running_balance = Column(Numeric(12, 2), nullable=False)  # Folio balance after this entry
+    payment_id = Column(Integer, index=True)  # No FK: the ledger outlives deleted payments
+    reverses_entry_id = Column(Integer, ForeignKey("folio_entries.id"))
+    posted_by = Column(Integer, ForeignKey("users.id"))
+    posted_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Also serves the "latest entry of a reservation" lookup
+        UniqueConstraint("reservation_id", "sequence", name="uq_folio_entries_reservation_sequence"),
+    )
+
+    # Relationships
+    reservation = relationship("Reservation")
+
+    def to_dict(self):
+        """Convert folio entry to dictionary"""
+        return {
+            "id": self.id,
+            "reservation_id": self.reservation_id,
+            "sequence": self.sequence,
+            "entry_type": self.entry_type,
+            "category": self.category,
+            "description": self.description,
+            "amount": float(self.amount) if self.amount is not None else 0,
+            "running_balance": float(self.running_balance) if self.running_balance is not None else 0,
+            "payment_id": self.payment_id,
+            "reverses_entry_id": self.reverses_entry_id,
+            "posted_by": self.posted_by,
+            "posted_at": self.posted_at.isoformat() if self.posted_at else None,
+        }
+
+    def __repr__(self):
+        return f"<FolioEntry(reservation_id={self.reservation_id}, seq={self.sequence}, type={self.entry_type}, amount={self.amount})>"
+
+
+# ============================================================================
+# MODEL 15: SyncTombstone (Deleted rows for delta sync, see sync.py)
+# ============================================================================
+class SyncTombstone(Base):
+    __tablename__ = "sync_tombstones"
+
+    id = Column(Integer, primary_key=True)
+    table_name = Column(String(50), nullable=False)
+    row_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<SyncTombstone(table={self.table_name}, row_id={self.row_id}, deleted_at={self.deleted_at})>"
+
+
 # Database instance for compatibility
 class DBInstance:
     pass
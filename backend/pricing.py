@@ -0,0 +1,190 @@
+"""
+Stay pricing engine for Hotel Management System
+
+Prices stays night by night from the rate calendar. For every
+(room type, night) the effective rate is resolved as:
+1. An explicit RateCalendar override for that room type and date
+2. The highest-priority active RateRule matching the date and weekday
+3. The room type's default_rate
+
+Stays are priced per room type: reservations are booked by type and the
+room (with its custom_rate) is only assigned at check-in.
+
+Nights are represented as NumPy datetime64[D] arrays and rates as a
+(room types x nights) matrix, so pricing a stay - or every room type for a
+date range - is a handful of vectorized operations instead of a Python loop
+per night.
+
+NumPy is imported inside the functions that use it, so importing this
+module (and the routers that use it) does not load NumPy until the first
+stay is priced; the module-level import is for type checkers only.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from models import RoomType, RateRule, RateCalendar
+
+if TYPE_CHECKING:
+    import numpy as np
+
+ADJUSTMENT_TYPES = ("fixed_rate", "percentage", "fixed_amount")
+
+
+def stay_nights(check_in: date, check_out: date) -> np.ndarray:
+    """Return the nights of a stay (check-in inclusive, check-out exclusive)"""
+    import numpy as np
+
+    return np.arange(np.datetime64(check_in, "D"), np.datetime64(check_out, "D"), dtype="datetime64[D]")
+
+
+def night_weekdays(nights: np.ndarray) -> np.ndarray:
+    """Weekday number (0=Monday .. 6=Sunday) for each night"""
+    import numpy as np
+
+    # Day 0 of the epoch (1970-01-01) was a Thursday
+    return (nights.astype(np.int64) + 3) % 7
+
+
+def _adjusted_rates(base: np.ndarray, rule: RateRule) -> np.ndarray:
+    """Apply a rule's adjustment to an array of base rates"""
+    import numpy as np
+
+    value = float(rule.adjustment_value)
+    if rule.adjustment_type == "fixed_rate":
+        return np.full_like(base, value)
+    if rule.adjustment_type == "percentage":
+        return base * (1 + value / 100.0)
+    return base + value
+
+
+def build_rate_matrix(
+    db: Session,
+    room_types: list,
+    check_in: date,
+    check_out: date,
+) -> np.ndarray:
+    """
+    Build the nightly rate matrix for the given room types.
+
+    Returns an array of shape (len(room_types), nights) holding the
+    effective rate of each room type on each night of the stay.
+    """
+    import numpy as np
+
+    nights = stay_nights(check_in, check_out)
+    type_ids = [rt.id for rt in room_types]
+    row_index = {type_id: i for i, type_id in enumerate(type_ids)}
+
+    base = np.array([float(rt.default_rate or 0) for rt in room_types], dtype=np.float64)
+    matrix = np.repeat(base[:, None], len(nights), axis=1)
+
+    if not type_ids or len(nights) == 0:
+        return matrix
+
+    # Seasonal / weekday rules, applied lowest priority first so the
+    # highest-priority matching rule determines the final rate
+    rules = db.query(RateRule).filter(
+        RateRule.is_active == True,
+        or_(RateRule.room_type_id.is_(None), RateRule.room_type_id.in_(type_ids)),
+        or_(RateRule.start_date.is_(None), RateRule.start_date < check_out),
+        or_(RateRule.end_date.is_(None), RateRule.end_date >= check_in),
+    ).order_by(RateRule.priority.asc(), RateRule.id.asc()).all()
+
+    weekdays = night_weekdays(nights)
+    all_rows = np.arange(len(type_ids))
+    for rule in rules:
+        mask = np.ones(len(nights), dtype=bool)
+        if rule.start_date:
+            mask &= nights >= np.datetime64(rule.start_date, "D")
+        if rule.end_date:
+            mask &= nights <= np.datetime64(rule.end_date, "D")
+        days = rule.get_weekdays()
+        if days is not None:
+            mask &= np.isin(weekdays, days)
+
+        cols = np.flatnonzero(mask)
+        if cols.size == 0:
+            continue
+
+        rows = all_rows if rule.room_type_id is None else np.array([row_index[rule.room_type_id]])
+        matrix[np.ix_(rows, cols)] = _adjusted_rates(base[rows], rule)[:, None]
+
+    # Explicit per-date overrides always win
+    overrides = db.query(
+        RateCalendar.room_type_id, RateCalendar.stay_date, RateCalendar.rate
+    ).filter(
+        RateCalendar.room_type_id.in_(type_ids),
+        RateCalendar.stay_date >= check_in,
+        RateCalendar.stay_date < check_out,
+    ).all()
+
+    if overrides:
+        rows = np.array([row_index[type_id] for type_id, _, _ in overrides])
+        cols = np.array([(stay_date - check_in).days for _, stay_date, _ in overrides])
+        matrix[rows, cols] = np.array([float(rate) for _, _, rate in overrides])
+
+    return np.round(np.maximum(matrix, 0), 2)
+
+
+def _format_quote(room_type: RoomType, nights: np.ndarray, rates: np.ndarray) -> dict:
+    """Format one row of the rate matrix as a stay quote"""
+    number_of_nights = int(len(nights))
+    subtotal = round(float(rates.sum()), 2)
+    return {
+        "room_type_id": room_type.id,
+        "room_type_code": room_type.code,
+        "room_type_name": room_type.name,
+        "number_of_nights": number_of_nights,
+        "nightly_rates": [
+            {"date": str(night), "rate": float(rate)}
+            for night, rate in zip(nights, rates)
+        ],
+        "subtotal": subtotal,
+        "average_rate": round(subtotal / number_of_nights, 2) if number_of_nights else 0.0,
+    }
+
+
+def price_stay(
+    db: Session,
+    room_type: RoomType,
+    check_in: date,
+    check_out: date,
+    rate_override: Optional[float] = None,
+) -> dict:
+    """
+    Price a single stay for one room type.
+
+    If rate_override is given (e.g. a negotiated rate) every night is
+    charged at that flat rate and the calendar is not consulted.
+    """
+    import numpy as np
+
+    nights = stay_nights(check_in, check_out)
+    if rate_override is not None:
+        rates = np.full(len(nights), round(float(rate_override), 2))
+    else:
+        rates = build_rate_matrix(db, [room_type], check_in, check_out)[0]
+    return _format_quote(room_type, nights, rates)
+
+
+def quote_room_types(
+    db: Session,
+    check_in: date,
+    check_out: date,
+    room_type_ids: Optional[list] = None,
+) -> list:
+    """Price a stay for every active room type (or the given ones) in one pass"""
+    query = db.query(RoomType).filter(RoomType.is_active == True)
+    if room_type_ids:
+        query = query.filter(RoomType.id.in_(room_type_ids))
+    room_types = query.order_by(RoomType.id).all()
+
+    nights = stay_nights(check_in, check_out)
+    matrix = build_rate_matrix(db, room_types, check_in, check_out)
+    return [_format_quote(rt, nights, matrix[i]) for i, rt in enumerate(room_types)]
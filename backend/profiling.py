@@ -0,0 +1,229 @@
+"""
+On-demand request profiling for Hotel Management System
+
+An admin adds `X-Profile: 1` (or `?profile=1`) to a request. ProfilingMiddleware
+then checks the bearer token's role and runs the request under a sampling
+profiler: a background thread records the Python stacks of busy threads
+every PROFILE_SAMPLE_INTERVAL seconds (the event loop thread and the
+thread-pool workers running sync endpoints; threads idle in select() or a
+queue wait are skipped). Stacks are wall-clock, so time spent waiting for
+the database shows up under the query that waited.
+
+Each profile is written to PROFILE_DIR as:
+
+- <id>.folded: collapsed stacks ("frame;frame;frame count" per line), the
+  input format of flamegraph.pl, speedscope and inferno
+- <id>.json: method, path, status, duration, sample count and user
+
+The response carries the id in X-Profile-Id; GET /api/profiles lists
+profiles and GET /api/profiles/{id} downloads one (admin only). Only the
+newest PROFILE_MAX_FILES profiles are kept.
+
+Requests without the flag only pay for the header check; with
+PROFILING_ENABLED=false the middleware is not installed at all. Samples
+include every busy thread, so on a loaded instance stacks of concurrent
+requests appear too.
+"""
+
+import asyncio
+import json
+import os
+import re
+import sys
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from starlette.responses import JSONResponse
+
+from security import redact_query_string, verify_token
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "true").lower() == "true"
+PROFILE_DIR = os.getenv("PROFILE_DIR", "logs/profiles")
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.002"))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY_FLAG = re.compile(rb"(?:^|&)profile=(?:1|true)(?:&|$)")
+PROFILE_ID_HEADER = b"x-profile-id"
+
+_PROFILE_ID = re.compile(r"^[0-9TZ]+-[0-9a-f]{8}$")
+
+# A thread whose innermost frame is in one of these files is waiting, not working
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Collects collapsed stacks of busy threads until stopped"""
+
+    def __init__(self, interval: float = None):
+        self.interval = PROFILE_SAMPLE_INTERVAL if interval is None else interval
+        self.samples = Counter()
+        self.sample_count = 0
+        self._stopped = threading.Event()
+        self._thread = None
+        self._thread_names = {}
+
+    def _thread_name(self, thread_id: int) -> str:
+        name = self._thread_names.get(thread_id)
+        if name is None:
+            self._thread_names = {t.ident: t.name for t in threading.enumerate()}
+            name = self._thread_names.get(thread_id, f"thread-{thread_id}")
+        return name
+
+    def sample(self):
+        """Record one sample of every busy thread except the sampler"""
+        own = threading.get_ident()
+        self.sample_count += 1
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own or os.path.basename(frame.f_code.co_filename) in _IDLE_FILES:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.append(self._thread_name(thread_id))
+            self.samples[";".join(reversed(stack))] += 1
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def folded(self) -> str:
+        """Collapsed stacks, one "stack count" line each"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+# ============== PROFILE STORE ==============
+
+def new_profile_id() -> str:
+    return f"{datetime.utcnow():%Y%m%dT%H%M%S%fZ}-{uuid.uuid4().hex[:8]}"  # sorts by time
+
+
+def save_profile(profile_id: str, profiler: SamplingProfiler, metadata: dict):
+    directory = Path(PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / f"{profile_id}.folded").write_text(profiler.folded())
+    (directory / f"{profile_id}.json").write_text(json.dumps({
+        "id": profile_id,
+        "samples": profiler.sample_count,
+        "sample_interval": profiler.interval,
+        **metadata,
+    }))
+    _prune(directory)
+
+
+def _prune(directory: Path):
+    """Keep the newest PROFILE_MAX_FILES profiles (ids sort by time)"""
+    ids = sorted(path.stem for path in directory.glob("*.json"))
+    for profile_id in ids[:-PROFILE_MAX_FILES] if PROFILE_MAX_FILES > 0 else ids:
+        for suffix in (".json", ".folded"):
+            (directory / f"{profile_id}{suffix}").unlink(missing_ok=True)
+
+
+def list_profiles() -> list:
+    """Metadata of stored profiles, newest first"""
+    directory = Path(PROFILE_DIR)
+    if not directory.is_dir():
+        return []
+    profiles = []
+    for path in sorted(directory.glob("*.json"), reverse=True):
+        try:
+            profiles.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue  # being written or pruned
+    return profiles
+
+
+def profile_path(profile_id: str) -> Optional[Path]:
+    """Path of a stored profile's collapsed stacks, None if there is none"""
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    path = Path(PROFILE_DIR) / f"{profile_id}.folded"
+    return path if path.is_file() else None
+
+
+# ============== MIDDLEWARE ==============
+
+def _profile_requested(scope) -> bool:
+    for key, value in scope["headers"]:
+        if key == PROFILE_HEADER:
+            return value.strip().lower() in (b"1", b"true")
+    return bool(PROFILE_QUERY_FLAG.search(scope.get("query_string", b"")))
+
+
+def _admin_user(scope) -> Optional[dict]:
+    for key, value in scope["headers"]:
+        if key == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return None
+            user = verify_token(token.strip())
+            return user if user and user.get("role") == "admin" else None
+    return None
+
+
+class ProfilingMiddleware:
+    """Profile requests flagged by an admin (pure ASGI)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _profile_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        user = _admin_user(scope)
+        if user is None:
+            response = JSONResponse(status_code=403, content={"detail": "Profiling requires an admin token"})
+            await response(scope, receive, send)
+            return
+
+        profile_id = new_profile_id()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (PROFILE_ID_HEADER, profile_id.encode("latin-1")),
+                ]
+            await send(message)
+
+        profiler = SamplingProfiler()
+        started = datetime.utcnow()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            metadata = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "query_string": redact_query_string(scope.get("query_string", b"")),
+                "status_code": status_code,
+                "started_at": started.isoformat(),
+                "duration_ms": round((datetime.utcnow() - started).total_seconds() * 1000, 2),
+                "request_id": scope.get("state", {}).get("request_id"),
+                "username": user.get("username"),
+            }
+            await asyncio.to_thread(save_profile, profile_id, profiler, metadata)
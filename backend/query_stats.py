@@ -0,0 +1,190 @@
+"""
+Per-request SQL accounting for Hotel Management System
+
+Engine event hooks (instrument_engine, installed on the app engine by
+database.get_engine) time every cursor execution and:
+
+- add it to the current request's QueryStats (query count and total DB
+  time), which RequestInstrumentationMiddleware (error_handlers.py)
+  returns as X-DB-Query-Count and X-DB-Time-Ms response headers and adds
+  to the structured access log - an endpoint issuing one query per row
+  (N+1) shows up as a large count;
+- log statements slower than SLOW_QUERY_MS (default 200) with their
+  parameters to the hotel_management.sql logger;
+- with EXPLAIN_SLOW_QUERIES=true, capture the plan of slow SELECTs
+  (EXPLAIN on PostgreSQL, EXPLAIN QUERY PLAN on SQLite) as JSON lines in
+  the rotating file EXPLAIN_LOG_FILE (default logs/slow_query_plans.log).
+
+Request stats live in a context variable, so sync endpoints running in the
+thread pool (which copies the context) add to the same object.
+"""
+
+import json
+import logging
+import os
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Optional
+
+from sqlalchemy import event
+
+logger = logging.getLogger("hotel_management.sql")
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+EXPLAIN_SLOW_QUERIES = os.getenv("EXPLAIN_SLOW_QUERIES", "false").lower() == "true"
+EXPLAIN_LOG_FILE = os.getenv("EXPLAIN_LOG_FILE", "logs/slow_query_plans.log")
+EXPLAIN_LOG_MAX_BYTES = 5 * 1024 * 1024
+EXPLAIN_LOG_BACKUPS = 5
+MAX_LOGGED_PARAMETERS = 500  # characters of repr(parameters) in the slow-query log
+
+QUERY_COUNT_HEADER = b"x-db-query-count"
+QUERY_TIME_HEADER = b"x-db-time-ms"
+
+_TIMER_KEY = "query_stats_started"
+_EXPLAINABLE = ("SELECT", "WITH")
+
+
+class QueryStats:
+    """Queries issued and time spent in the database during one request"""
+    __slots__ = ("count", "duration")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0  # seconds
+
+    def record(self, duration: float):
+        self.count += 1
+        self.duration += duration
+
+    def as_dict(self) -> dict:
+        return {"db_queries": self.count, "db_time_ms": round(self.duration * 1000, 2)}
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_stats() -> Optional[QueryStats]:
+    """Stats of the request being served, or None outside a request"""
+    return _current.get()
+
+
+def start_request() -> QueryStats:
+    stats = QueryStats()
+    _current.set(stats)
+    return stats
+
+
+# ============== ENGINE HOOKS ==============
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_TIMER_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info[_TIMER_KEY].pop()
+    duration = time.perf_counter() - started
+
+    stats = _current.get()
+    if stats is not None:
+        stats.record(duration)
+
+    if duration * 1000 >= SLOW_QUERY_MS:
+        logger.warning(
+            f"Slow Query: {duration * 1000:.1f} ms",
+            extra={
+                "duration_ms": round(duration * 1000, 2),
+                "statement": statement,
+                "parameters": repr(parameters)[:MAX_LOGGED_PARAMETERS],
+            }
+        )
+        if EXPLAIN_SLOW_QUERIES and not executemany:
+            capture_plan(conn, cursor, statement, parameters, duration)
+
+
+def _handle_error(exception_context):
+    # Drop the timer of a statement that raised
+    timers = exception_context.connection.info.get(_TIMER_KEY) if exception_context.connection else None
+    if timers:
+        timers.pop()
+
+
+def instrument_engine(engine):
+    """Install the accounting hooks on `engine` (idempotent)"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    return engine
+
+
+# ============== EXPLAIN CAPTURE ==============
+
+_plan_logger = None
+
+
+def _get_plan_logger():
+    global _plan_logger
+    if _plan_logger is None:
+        plan_logger = logging.getLogger("hotel_management.sql.plans")
+        plan_logger.propagate = False
+        plan_logger.setLevel(logging.INFO)
+        directory = os.path.dirname(EXPLAIN_LOG_FILE)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handler = RotatingFileHandler(EXPLAIN_LOG_FILE, maxBytes=EXPLAIN_LOG_MAX_BYTES, backupCount=EXPLAIN_LOG_BACKUPS)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        plan_logger.addHandler(handler)
+        _plan_logger = plan_logger
+    return _plan_logger
+
+
+def explain(dbapi_connection, dialect_name: str, statement: str, parameters) -> Optional[list]:
+    """
+    Plan of a SELECT as a list of lines, run on a raw DB-API cursor (no
+    engine events). On PostgreSQL it runs inside a savepoint so a failed
+    EXPLAIN cannot abort the caller's transaction. None for other statements.
+    """
+    if not statement.lstrip()[:6].upper().startswith(_EXPLAINABLE):
+        return None
+    postgresql = dialect_name == "postgresql"
+    prefix = "EXPLAIN " if postgresql else "EXPLAIN QUERY PLAN "
+
+    cursor = dbapi_connection.cursor()
+    try:
+        if postgresql:
+            cursor.execute("SAVEPOINT query_stats_explain")
+        try:
+            cursor.execute(prefix + statement, parameters)
+            rows = cursor.fetchall()
+        except Exception:
+            if postgresql:
+                cursor.execute("ROLLBACK TO SAVEPOINT query_stats_explain")
+            raise
+        if postgresql:
+            cursor.execute("RELEASE SAVEPOINT query_stats_explain")
+    finally:
+        cursor.close()
+
+    # PostgreSQL: one text column per plan line; SQLite: (id, parent, notused, detail)
+    return [str(row[0]) if postgresql else str(row[-1]) for row in rows]
+
+
+def capture_plan(conn, cursor, statement: str, parameters, duration: float):
+    """Write the plan of a slow statement to the rotating plan log"""
+    try:
+        plan = explain(cursor.connection, conn.dialect.name, statement, parameters)
+    except Exception as e:
+        logger.debug(f"EXPLAIN failed: {e}")
+        return
+    if plan is None:
+        return
+    _get_plan_logger().info(json.dumps({
+        "timestamp": datetime.utcnow().isoformat(),
+        "duration_ms": round(duration * 1000, 2),
+        "statement": statement,
+        "parameters": repr(parameters)[:MAX_LOGGED_PARAMETERS],
+        "plan": plan,
+    }))
+
@@ -0,0 +1,277 @@
+"""
+Bank statement reconciliation for Hotel Management System
+
+Matches lines of a bank/e-wallet statement export (CSV) against recorded
+payments:
+
+1. The statement is read as a stream, one CSV row at a time, into compact
+   tuples (amounts in integer cents).
+2. Candidate payments in the statement's date range (widened by the date
+   window) are loaded with a single column-only query and indexed in hash
+   maps by normalized reference_number / transaction_id.
+3. Exact pass: each line's reference (or any reference-like token of its
+   description) is looked up in the hash map and filtered by equal amount
+   and date window.
+4. Fuzzy pass: the remaining payments are bucketed by (amount, date). Each
+   line still unmatched looks at the amounts within amount_tolerance (bisect
+   over the distinct amounts) and, for each, at the days of the date window
+   nearest first. A matched payment is removed from its bucket, so the pass
+   stays linear however many payments share an amount.
+
+A payment is matched to at most one line. Lines with several equally good
+candidates are reported as ambiguous rather than guessed.
+"""
+
+import csv
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models import Payment
+
+RECONCILED_PAYMENT_METHODS = ("bank_transfer", "e_wallet")
+
+# Accepted header names (lower-case) for each statement field
+COLUMN_ALIASES = {
+    "date": ("date", "transaction_date", "value_date", "posting_date", "tanggal"),
+    "amount": ("amount", "credit", "credit_amount", "value", "jumlah"),
+    "reference": ("reference", "reference_number", "ref", "transaction_id", "trx_id"),
+    "description": ("description", "remarks", "narrative", "details", "keterangan"),
+}
+
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d", "%d.%m.%Y")
+
+_NON_ALNUM = re.compile(r"[^A-Z0-9]")
+_TOKEN = re.compile(r"[A-Za-z0-9\-/]{4,}")
+
+
+class ReconciliationError(Exception):
+    """Raised when a statement cannot be read"""
+
+
+class StatementLine(NamedTuple):
+    line_number: int
+    date: date
+    cents: int
+    reference: str
+    description: str
+
+
+class PaymentRow(NamedTuple):
+    id: int
+    reservation_id: int
+    payment_date: date
+    cents: int
+    reference_number: Optional[str]
+    transaction_id: Optional[str]
+
+
+def normalize_reference(value: Optional[str]) -> str:
+    """Upper-case a reference and drop separators ("trf-123 45" -> "TRF12345")"""
+    return _NON_ALNUM.sub("", value.upper()) if value else ""
+
+
+def to_cents(value) -> int:
+    """Parse an amount ("1,250,000.00", "1250000", Decimal) into integer cents"""
+    text = str(value).strip().replace(",", "").replace(" ", "")
+    try:
+        return int((Decimal(text) * 100).to_integral_value())
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {value!r}")
+
+
+def parse_statement_date(value: str) -> date:
+    value = value.strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value[:10], fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date: {value!r}")
+
+
+def _resolve_columns(fieldnames) -> dict:
+    lookup = {name.strip().lower(): name for name in fieldnames or []}
+    columns = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        columns[field] = next((lookup[a] for a in aliases if a in lookup), None)
+    if not columns["date"] or not columns["amount"]:
+        raise ReconciliationError("Statement must have a date and an amount column")
+    if not columns["reference"] and not columns["description"]:
+        raise ReconciliationError("Statement must have a reference or description column")
+    return columns
+
+
+def read_statement(stream: Iterable[str]):
+    """
+    Stream a CSV statement. Returns (lines, errors); rows that cannot be
+    parsed and non-positive amounts (debits) are reported in errors.
+    """
+    reader = csv.DictReader(stream)
+    columns = _resolve_columns(reader.fieldnames)
+    lines, errors = [], []
+
+    for line_number, row in enumerate(reader, start=2):
+        try:
+            cents = to_cents(row[columns["amount"]])
+            posted_on = parse_statement_date(row[columns["date"]])
+        except (ValueError, TypeError, AttributeError) as e:
+            errors.append({"line": line_number, "error": str(e)})
+            continue
+        if cents <= 0:
+            errors.append({"line": line_number, "error": "Not a credit (amount <= 0)"})
+            continue
+        lines.append(StatementLine(
+            line_number,
+            posted_on,
+            cents,
+            (row.get(columns["reference"]) or "").strip() if columns["reference"] else "",
+            (row.get(columns["description"]) or "").strip() if columns["description"] else "",
+        ))
+    return lines, errors
+
+
+def load_candidate_payments(db: Session, start: date, end: date, methods=RECONCILED_PAYMENT_METHODS) -> list:
+    """Column-only fetch of non-voided, non-refund payments in a date range"""
+    rows = db.execute(
+        select(
+            Payment.id, Payment.reservation_id, Payment.payment_date, Payment.amount,
+            Payment.reference_number, Payment.transaction_id,
+        ).where(
+            Payment.payment_date >= start,
+            Payment.payment_date <= end,
+            Payment.payment_method.in_(methods),
+            Payment.is_voided.isnot(True),
+            Payment.is_refund.isnot(True),
+        )
+    ).all()
+    return [PaymentRow(r.id, r.reservation_id, r.payment_date, to_cents(r.amount),
+                       r.reference_number, r.transaction_id) for r in rows]
+
+
+def _line_references(line: StatementLine) -> list:
+    """Reference keys to probe: the reference column, then description tokens"""
+    keys = []
+    if line.reference:
+        keys.append(normalize_reference(line.reference))
+    for token in _TOKEN.findall(line.description):
+        key = normalize_reference(token)
+        if len(key) >= 4 and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def _match_entry(line: StatementLine, payment: PaymentRow, rule: str) -> dict:
+    return {
+        "line": line.line_number,
+        "date": line.date.isoformat(),
+        "amount": line.cents / 100,
+        "reference": line.reference or line.description,
+        "payment_id": payment.id,
+        "reservation_id": payment.reservation_id,
+        "payment_date": payment.payment_date.isoformat(),
+        "payment_amount": payment.cents / 100,
+        "rule": rule,
+    }
+
+
+def reconcile(
+    db: Session,
+    lines: list,
+    date_window_days: int = 3,
+    amount_tolerance: float = 0,
+    methods=RECONCILED_PAYMENT_METHODS,
+) -> dict:
+    """Match statement lines to payments; see module docstring"""
+    result = {"matched": [], "ambiguous": [], "unmatched": [], "unmatched_payments": []}
+    if not lines:
+        return result
+
+    window = timedelta(days=date_window_days)
+    tolerance = to_cents(amount_tolerance)
+    payments = load_candidate_payments(
+        db, min(l.date for l in lines) - window, max(l.date for l in lines) + window, methods,
+    )
+
+    by_reference = defaultdict(list)
+    for payment in payments:
+        for ref in {normalize_reference(payment.reference_number), normalize_reference(payment.transaction_id)}:
+            if ref:
+                by_reference[ref].append(payment)
+
+    used = set()
+    remaining = []
+
+    # Pass 1: hash join on reference, confirmed by amount and date window
+    for line in lines:
+        candidates = {}
+        for key in _line_references(line):
+            for payment in by_reference.get(key, ()):
+                if (payment.id not in used and payment.cents == line.cents
+                        and abs(payment.payment_date - line.date) <= window):
+                    candidates[payment.id] = payment
+            if candidates:
+                break
+
+        if len(candidates) == 1:
+            payment = next(iter(candidates.values()))
+            used.add(payment.id)
+            result["matched"].append(_match_entry(line, payment, "reference"))
+        elif candidates:
+            result["ambiguous"].append({"line": line.line_number, "candidate_payment_ids": sorted(candidates)})
+        else:
+            remaining.append(line)
+
+    # Pass 2: amount (within tolerance) + nearest date among unused payments
+    buckets = defaultdict(dict)  # (cents, date) -> {payment id: payment}, insertion ordered
+    for payment in payments:
+        if payment.id not in used:
+            buckets[(payment.cents, payment.payment_date)][payment.id] = payment
+    amounts = sorted({cents for cents, _ in buckets})
+    offsets = sorted(range(-date_window_days, date_window_days + 1), key=abs)  # nearest day first
+
+    for line in remaining:
+        best, best_distance = [], None
+        for i in range(bisect_left(amounts, line.cents - tolerance), len(amounts)):
+            cents = amounts[i]
+            if cents > line.cents + tolerance:
+                break
+            for offset in offsets:
+                if best_distance is not None and abs(offset) > best_distance[0].days:
+                    break
+                day = line.date + timedelta(days=offset)
+                bucket = buckets.get((cents, day))
+                if not bucket:
+                    continue
+                distance = (abs(day - line.date), abs(cents - line.cents))
+                if best_distance is None or distance < best_distance:
+                    best, best_distance = list(bucket.values()), distance
+                elif distance == best_distance:
+                    best.extend(bucket.values())
+
+        if len(best) == 1:
+            payment = best[0]
+            used.add(payment.id)
+            bucket = buckets[(payment.cents, payment.payment_date)]
+            del bucket[payment.id]
+            if not bucket:
+                del buckets[(payment.cents, payment.payment_date)]
+            result["matched"].append(_match_entry(line, payment, "amount_date"))
+        elif best:
+            result["ambiguous"].append({"line": line.line_number, "candidate_payment_ids": sorted(p.id for p in best)})
+        else:
+            result["unmatched"].append({
+                "line": line.line_number,
+                "date": line.date.isoformat(),
+                "amount": line.cents / 100,
+                "reference": line.reference or line.description,
+            })
+
+    result["unmatched_payments"] = sorted(p.id for p in payments if p.id not in used)
+    return result
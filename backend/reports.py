@@ -0,0 +1,345 @@
+"""
+Financial reports for Hotel Management System
+
+Report queries aggregate in the database and return compact rows; the
+routers in routes/reports_router.py only format (and stream) them.
+
+Accounts-receivable aging
+-------------------------
+Balances of checked-out and in-house reservations are computed in one
+statement: reservations LEFT JOIN the per-reservation payment totals
+(balances.paid_totals_subquery()) and the latest folio entry
+(folio.latest_balances_subquery()), whose running balance - including
+extra charges posted to the folio - wins over total_amount - paid. A reservation's age runs from its
+check-out date (checked out) or check-in date (in house). Bucket edges are
+compared as dates, so the same SQL works on SQLite and PostgreSQL.
+
+Profit and loss
+---------------
+Revenue (payments by room type and payment method, refunds negative) and
+expenses (by category) are aggregated per calendar month in two grouped
+queries; quarters and years are rolled up from the months. Months before
+the current one are closed and cached per process. A backdated payment or
+expense (or a room type change of a reservation) invalidates the affected
+cached months when its transaction commits.
+"""
+
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import case, event, extract, func, literal, select
+from sqlalchemy.orm import Session, attributes
+
+from balances import paid_totals_subquery
+from folio import latest_balances_subquery
+from models import Expense, Guest, Payment, Reservation, RoomType
+
+AR_STATUSES = ("checked_in", "checked_out")
+
+# (bucket key, max age in days); the last bucket is open-ended
+AR_AGING_BUCKETS = (("0_30", 30), ("31_60", 60), ("61_90", 90), ("90_plus", None))
+
+
+def _ar_balances(as_of: date):
+    """Per-reservation balance, age basis date and bucket (subquery)"""
+    paid = paid_totals_subquery()
+    paid_amount = func.coalesce(paid.c.paid, 0)
+    folio = latest_balances_subquery()
+    basis_date = case(
+        (Reservation.status == "checked_out", Reservation.check_out_date),
+        else_=Reservation.check_in_date,
+    )
+
+    whens = []
+    for key, max_days in AR_AGING_BUCKETS:
+        if max_days is not None:
+            whens.append((basis_date >= as_of - timedelta(days=max_days), literal(key)))
+    bucket = case(*whens, else_=literal(AR_AGING_BUCKETS[-1][0]))
+
+    return (
+        select(
+            Reservation.id.label("reservation_id"),
+            Reservation.confirmation_number,
+            Reservation.guest_id,
+            Reservation.status,
+            Reservation.check_in_date,
+            Reservation.check_out_date,
+            Reservation.total_amount,
+            paid_amount.label("total_paid"),
+            func.coalesce(folio.c.balance, Reservation.total_amount - paid_amount).label("balance"),
+            basis_date.label("basis_date"),
+            bucket.label("bucket"),
+        )
+        .select_from(Reservation)
+        .outerjoin(paid, paid.c.reservation_id == Reservation.id)
+        .outerjoin(folio, folio.c.reservation_id == Reservation.id)
+        .where(Reservation.status.in_(AR_STATUSES))
+        .subquery()
+    )
+
+
+def ar_aging_summary(db: Session, as_of: Optional[date] = None) -> dict:
+    """Outstanding count and amount per aging bucket (one grouped query)"""
+    as_of = as_of or date.today()
+    balances = _ar_balances(as_of)
+    rows = db.execute(
+        select(balances.c.bucket, func.count().label("count"), func.sum(balances.c.balance).label("amount"))
+        .where(balances.c.balance > 0)
+        .group_by(balances.c.bucket)
+    ).all()
+
+    by_bucket = {row.bucket: row for row in rows}
+    buckets = {}
+    for key, _ in AR_AGING_BUCKETS:
+        row = by_bucket.get(key)
+        buckets[key] = {
+            "count": row.count if row else 0,
+            "amount": round(float(row.amount), 2) if row else 0.0,
+        }
+
+    return {
+        "as_of": as_of.isoformat(),
+        "buckets": buckets,
+        "total_count": sum(b["count"] for b in buckets.values()),
+        "total_outstanding": round(sum(b["amount"] for b in buckets.values()), 2),
+    }
+
+
+def iter_ar_aging_rows(db: Session, as_of: Optional[date] = None, bucket: Optional[str] = None,
+                       batch_size: int = 500):
+    """Yield outstanding reservations oldest first, fetched in batches"""
+    as_of = as_of or date.today()
+    balances = _ar_balances(as_of)
+    query = (
+        select(balances, Guest.full_name.label("guest_name"))
+        .join(Guest, Guest.id == balances.c.guest_id)
+        .where(balances.c.balance > 0)
+        .order_by(balances.c.basis_date, balances.c.reservation_id)
+    )
+    if bucket:
+        query = query.where(balances.c.bucket == bucket)
+
+    result = db.execute(query.execution_options(yield_per=batch_size))
+    for row in result:
+        yield {
+            "reservation_id": row.reservation_id,
+            "confirmation_number": row.confirmation_number,
+            "guest_id": row.guest_id,
+            "guest_name": row.guest_name,
+            "status": row.status,
+            "check_in_date": row.check_in_date.isoformat(),
+            "check_out_date": row.check_out_date.isoformat(),
+            "total_amount": float(row.total_amount),
+            "total_paid": float(row.total_paid),
+            "balance": float(row.balance),
+            "age_days": max(0, (as_of - row.basis_date).days),
+            "bucket": row.bucket,
+        }
+
+
+# ============== PROFIT AND LOSS ==============
+
+PNL_GRANULARITIES = ("month", "quarter", "year")
+
+_pnl_cache_lock = threading.Lock()
+_pnl_month_cache = {}  # (year, month) -> month data, closed months only
+ALL_MONTHS = "all"
+
+
+def _months(start: date, end: date) -> list:
+    """(year, month) keys from start's month to end's month inclusive"""
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _month_bounds(year: int, month: int):
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end - timedelta(days=1)
+
+
+def _empty_month() -> dict:
+    return {"by_room_type": defaultdict(float), "by_payment_method": defaultdict(float),
+            "by_category": defaultdict(float)}
+
+
+def _query_months(db: Session, start: date, end: date) -> dict:
+    """Aggregate revenue and expenses per month between two dates (two queries)"""
+    data = defaultdict(_empty_month)
+
+    year = extract("year", Payment.payment_date)
+    month = extract("month", Payment.payment_date)
+    signed_amount = case((Payment.is_refund.is_(True), -Payment.amount), else_=Payment.amount)
+    revenue = db.execute(
+        select(year.label("year"), month.label("month"), RoomType.code.label("room_type"),
+               Payment.payment_method, func.sum(signed_amount).label("amount"))
+        .select_from(Payment)
+        .join(Reservation, Reservation.id == Payment.reservation_id)
+        .outerjoin(RoomType, RoomType.id == Reservation.room_type_id)
+        .where(Payment.payment_date >= start, Payment.payment_date <= end, Payment.is_voided.isnot(True))
+        .group_by(year, month, RoomType.code, Payment.payment_method)
+    ).all()
+    for row in revenue:
+        month_data = data[(int(row.year), int(row.month))]
+        month_data["by_room_type"][row.room_type or "unknown"] += float(row.amount)
+        month_data["by_payment_method"][row.payment_method] += float(row.amount)
+
+    year = extract("year", Expense.date)
+    month = extract("month", Expense.date)
+    expenses = db.execute(
+        select(year.label("year"), month.label("month"), Expense.category,
+               func.sum(Expense.amount).label("amount"))
+        .where(Expense.date >= datetime.combine(start, datetime.min.time()),
+               Expense.date < datetime.combine(end + timedelta(days=1), datetime.min.time()))
+        .group_by(year, month, Expense.category)
+    ).all()
+    for row in expenses:
+        data[(int(row.year), int(row.month))]["by_category"][row.category] += float(row.amount)
+
+    return data
+
+
+def _month_data(db: Session, months: list, today: date) -> dict:
+    """Month data for the requested months, served from the cache when closed"""
+    current = (today.year, today.month)
+    with _pnl_cache_lock:
+        result = {key: _pnl_month_cache[key] for key in months if key in _pnl_month_cache}
+
+    missing = [key for key in months if key not in result]
+    if missing:
+        queried = _query_months(db, _month_bounds(*missing[0])[0], _month_bounds(*missing[-1])[1])
+        with _pnl_cache_lock:
+            for key in missing:
+                month_data = queried.get(key) or _empty_month()
+                result[key] = month_data
+                if key < current:
+                    _pnl_month_cache[key] = month_data
+    return result
+
+
+def _period_key(year: int, month: int, granularity: str) -> str:
+    if granularity == "year":
+        return str(year)
+    if granularity == "quarter":
+        return f"{year}-Q{(month - 1) // 3 + 1}"
+    return f"{year}-{month:02d}"
+
+
+def _rounded(values: dict) -> dict:
+    return {key: round(value, 2) for key, value in sorted(values.items())}
+
+
+def profit_and_loss(db: Session, start: date, end: date, granularity: str = "month",
+                    today: Optional[date] = None) -> dict:
+    """
+    Revenue, expenses and net profit per period. The range is widened to
+    whole months so every month is either fully included or not at all.
+    """
+    today = today or date.today()
+    months = _months(start, end)
+    month_data = _month_data(db, months, today)
+
+    periods = {}
+    for year, month in months:
+        key = _period_key(year, month, granularity)
+        period = periods.get(key)
+        if period is None:
+            period = periods[key] = {"period": key, "start": _month_bounds(year, month)[0], **_empty_month()}
+        period["end"] = _month_bounds(year, month)[1]
+        source = month_data[(year, month)]
+        for breakdown in ("by_room_type", "by_payment_method", "by_category"):
+            for name, amount in source[breakdown].items():
+                period[breakdown][name] += amount
+
+    result = []
+    for period in periods.values():
+        revenue = sum(period["by_room_type"].values())
+        expenses = sum(period["by_category"].values())
+        result.append({
+            "period": period["period"],
+            "start": period["start"].isoformat(),
+            "end": period["end"].isoformat(),
+            "closed": period["end"] < date(today.year, today.month, 1),
+            "revenue": {
+                "total": round(revenue, 2),
+                "by_room_type": _rounded(period["by_room_type"]),
+                "by_payment_method": _rounded(period["by_payment_method"]),
+            },
+            "expenses": {"total": round(expenses, 2), "by_category": _rounded(period["by_category"])},
+            "net_profit": round(revenue - expenses, 2),
+        })
+
+    total_revenue = sum(p["revenue"]["total"] for p in result)
+    total_expenses = sum(p["expenses"]["total"] for p in result)
+    return {
+        "from": _month_bounds(*months[0])[0].isoformat(),
+        "to": _month_bounds(*months[-1])[1].isoformat(),
+        "granularity": granularity,
+        "periods": result,
+        "totals": {
+            "revenue": round(total_revenue, 2),
+            "expenses": round(total_expenses, 2),
+            "net_profit": round(total_revenue - total_expenses, 2),
+        },
+    }
+
+
+def invalidate_pnl_cache(months=ALL_MONTHS):
+    """Drop cached months (an iterable of (year, month), or everything)"""
+    with _pnl_cache_lock:
+        if months == ALL_MONTHS:
+            _pnl_month_cache.clear()
+        else:
+            for key in months:
+                _pnl_month_cache.pop(key, None)
+
+
+def _changed_months(obj, attr: str, is_new: bool = False):
+    """Months touched by an object's date attribute, or ALL_MONTHS if unknown"""
+    history = attributes.get_history(obj, attr)
+    if is_new:
+        return {(value.year, value.month) for value in history.added if value is not None}
+    if history.has_changes() and not history.deleted:
+        return ALL_MONTHS  # updated, and the previous value was never loaded
+    values = list(history.added) + list(history.deleted) + list(history.unchanged)
+    return {(value.year, value.month) for value in values if value is not None}
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_pnl_changes(session, flush_context):
+    pending = session.info.setdefault("pnl_changed_months", set())
+    if pending == ALL_MONTHS:
+        return
+    new = set(session.new)
+    for obj in list(new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Payment):
+            months = _changed_months(obj, "payment_date", obj in new)
+        elif isinstance(obj, Expense):
+            months = _changed_months(obj, "date", obj in new)
+        elif isinstance(obj, Reservation) and obj not in new \
+                and attributes.get_history(obj, "room_type_id").has_changes():
+            months = ALL_MONTHS
+        else:
+            continue
+        if months == ALL_MONTHS:
+            session.info["pnl_changed_months"] = ALL_MONTHS
+            return
+        pending.update(months)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_pnl_on_commit(session):
+    months = session.info.pop("pnl_changed_months", None)
+    if months:
+        invalidate_pnl_cache(months)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pnl_changes(session):
+    session.info.pop("pnl_changed_months", None)
@@ -28,7 +28,7 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
         )
 
     # Create access token
-    access_token = create_access_token(user.id, user.username)
+    access_token = create_access_token(user.id, user.username, user.role)
 
     return {
         "access_token": access_token,
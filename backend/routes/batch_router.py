@@ -0,0 +1,38 @@
+"""
+Batch Request Routes
+
+Collapses several read-only calls into one round trip (see batch.py):
+- POST /api/batch - Run GET sub-requests with one session and one response
+"""
+
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+
+from batch import run_batch
+from database import get_db
+from schemas import BatchRequest
+from security import get_current_user
+
+router = APIRouter(prefix="/api/batch", tags=["Batch"])
+
+
+@router.post("")
+async def batch(
+    payload: BatchRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Execute up to 20 GET sub-requests and return all results together.
+
+    Each result is {"id", "status", "body"} in request order; a failing
+    sub-request does not fail the batch. With consistent=true all
+    sub-requests read from one read-only snapshot transaction.
+    """
+    sub_requests = [
+        (sub.id if sub.id is not None else str(index), sub.method, sub.path)
+        for index, sub in enumerate(payload.requests)
+    ]
+    results = await run_batch(request.app, request.scope, db, sub_requests, consistent=payload.consistent)
+    return {"responses": results}
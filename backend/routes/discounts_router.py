@@ -0,0 +1,161 @@
+"""
+Discount Management Routes
+
+Handles discount rules evaluated by the discount engine (discounts.py):
+- GET /api/discounts - List discounts
+- GET /api/discounts/{id} - Get discount details
+- POST /api/discounts - Create discount
+- PUT /api/discounts/{id} - Update discount
+- DELETE /api/discounts/{id} - Delete discount
+"""
+
+import json
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from database import get_db
+from discounts import invalidate_discount_index
+from models import Discount
+from schemas import DiscountCreate, DiscountUpdate
+from security import get_current_user
+
+router = APIRouter(prefix="/api/discounts", tags=["Discounts"])
+
+DISCOUNT_TYPES = ("percentage", "fixed_amount")
+DISCOUNT_STATUSES = ("active", "inactive", "expired")
+
+
+def _normalize_discount_fields(db: Session, data: dict, discount_id: Optional[int] = None):
+    """Validate discount fields and convert them to column values in place"""
+    if "discount_type" in data and data["discount_type"] not in DISCOUNT_TYPES:
+        raise HTTPException(status_code=400, detail=f"discount_type must be one of: {', '.join(DISCOUNT_TYPES)}")
+
+    if "status" in data and data["status"] not in DISCOUNT_STATUSES:
+        raise HTTPException(status_code=400, detail=f"status must be one of: {', '.join(DISCOUNT_STATUSES)}")
+
+    if data.get("discount_type") == "percentage" and data.get("discount_value", 0) > 100:
+        raise HTTPException(status_code=400, detail="Percentage discounts cannot exceed 100")
+
+    if data.get("code"):
+        data["code"] = data["code"].strip().upper()
+        existing = db.query(Discount).filter(Discount.code == data["code"]).first()
+        if existing and existing.id != discount_id:
+            raise HTTPException(status_code=400, detail=f"Discount code {data['code']} already exists")
+
+    for field in ("valid_from", "valid_until"):
+        if data.get(field):
+            try:
+                data[field] = datetime.fromisoformat(data[field]).date()
+            except (ValueError, TypeError):
+                raise HTTPException(status_code=400, detail=f"Invalid {field} format. Use YYYY-MM-DD")
+
+    for field in ("applicable_room_types", "applicable_guests"):
+        if field in data:
+            data[field] = json.dumps(data[field]) if data[field] else None
+
+
+@router.get("")
+async def list_discounts(
+    status: Optional[str] = Query(None, description="Filter by status: active, inactive, expired"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """List all discounts"""
+    query = db.query(Discount)
+    if status:
+        query = query.filter(Discount.status == status)
+
+    return {"discounts": [d.to_dict() for d in query.order_by(Discount.id).all()]}
+
+
+@router.get("/{discount_id}")
+async def get_discount(
+    discount_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Get a specific discount"""
+    discount = db.query(Discount).filter(Discount.id == discount_id).first()
+    if not discount:
+        raise HTTPException(status_code=404, detail=f"Discount with ID {discount_id} not found")
+
+    return {"discount": discount.to_dict()}
+
+
+@router.post("", status_code=201)
+async def create_discount(
+    discount_data: DiscountCreate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Create a discount.
+
+    Auto-applied discounts are considered for every matching quote and
+    booking; discounts with a code apply when the code is supplied.
+    The largest applicable discount wins (discounts do not stack).
+    """
+    data = discount_data.model_dump()
+    _normalize_discount_fields(db, data)
+
+    discount = Discount(**data, created_by=current_user.get("user_id"))
+    db.add(discount)
+    db.commit()
+    db.refresh(discount)
+    invalidate_discount_index()
+
+    return {"message": "Discount created successfully", "discount": discount.to_dict()}
+
+
+@router.put("/{discount_id}")
+async def update_discount(
+    discount_id: int,
+    discount_data: DiscountUpdate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Update a discount"""
+    discount = db.query(Discount).filter(Discount.id == discount_id).first()
+    if not discount:
+        raise HTTPException(status_code=404, detail=f"Discount with ID {discount_id} not found")
+
+    update_data = discount_data.model_dump(exclude_unset=True)
+    update_data.setdefault("discount_type", discount.discount_type)
+    update_data.setdefault("discount_value", float(discount.discount_value))
+    _normalize_discount_fields(db, update_data, discount_id)
+
+    for field, value in update_data.items():
+        setattr(discount, field, value)
+
+    db.commit()
+    db.refresh(discount)
+    invalidate_discount_index()
+
+    return {"message": "Discount updated successfully", "discount": discount.to_dict()}
+
+
+@router.delete("/{discount_id}")
+async def delete_discount(
+    discount_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Delete a discount (deactivates it if reservations already reference it)"""
+    discount = db.query(Discount).filter(Discount.id == discount_id).first()
+    if not discount:
+        raise HTTPException(status_code=404, detail=f"Discount with ID {discount_id} not found")
+
+    if discount.usage_count:
+        discount.status = 'inactive'
+        message = f"Discount {discount_id} has been used and was deactivated instead of deleted"
+    else:
+        db.delete(discount)
+        message = f"Discount {discount_id} deleted successfully"
+
+    db.commit()
+    invalidate_discount_index()
+
+    return {"message": message}
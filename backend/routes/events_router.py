@@ -0,0 +1,63 @@
+"""
+Live Event Routes
+
+Server-sent events for dashboards and room boards (see events.py):
+- GET /api/events - Stream room status, reservation and payment events
+- POST /api/events/ticket - Single-use ticket for EventSource clients
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from events import EVENT_TYPES, broker, event_stream
+from security import STREAM_TICKET_SECONDS, create_stream_ticket, get_current_user, get_stream_user
+
+router = APIRouter(prefix="/api/events", tags=["Events"])
+
+
+@router.get("")
+async def stream_events(
+    types: Optional[str] = Query(None, description="Comma-separated event types or prefixes, e.g. room,payment.posted"),
+    room_ids: Optional[str] = Query(None, description="Comma-separated room IDs (events without a room always pass)"),
+    last_event_id: Optional[int] = Header(None, alias="Last-Event-ID"),
+    current_user: dict = Depends(get_stream_user),
+):
+    """
+    Stream live events as text/event-stream.
+
+    Event types: room.status_changed, reservation.created,
+    reservation.checked_in, reservation.checked_out, reservation.cancelled,
+    payment.posted. A stream.overflow event means the client fell behind
+    and should refetch. Reconnecting clients resume from Last-Event-ID.
+
+    Authenticate with the Authorization header or, for EventSource, a
+    ?ticket= from POST /api/events/ticket.
+    """
+    type_filter = [t.strip() for t in types.split(",") if t.strip()] if types else None
+    if type_filter:
+        unknown = [t for t in type_filter if not any(e == t or e.startswith(t + ".") for e in EVENT_TYPES)]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown event types: {', '.join(unknown)}")
+
+    try:
+        room_filter = [int(r) for r in room_ids.split(",") if r.strip()] if room_ids else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="room_ids must be comma-separated integers")
+
+    subscription = broker.subscribe(type_filter, room_filter, last_event_id)
+    return StreamingResponse(
+        event_stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/ticket")
+async def create_ticket(current_user: dict = Depends(get_current_user)):
+    """
+    Single-use ticket for opening one stream with EventSource (which cannot
+    send an Authorization header): GET /api/events?ticket=...
+    """
+    return {"ticket": create_stream_ticket(current_user), "expires_in": STREAM_TICKET_SECONDS}
@@ -2,14 +2,20 @@
 Expense management routes
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import csv
+import io
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 from typing import Optional
 
 from models import Expense
+from reports import invalidate_pnl_cache
 from schemas import ExpenseCreate, ExpenseUpdate, ExpenseResponse
 from security import get_current_user
+from serializers import FastJSONResponse, fetch_rows, select_expenses
 from database import get_db
 from validators import (
     validate_expense_category,
@@ -19,6 +25,10 @@ from validators import (
 
 router = APIRouter()
 
+IMPORT_BATCH_SIZE = 1000
+IMPORT_MAX_REPORTED_ERRORS = 1000
+IMPORT_REQUIRED_COLUMNS = ("date", "category", "amount")
+
 
 @router.get("", response_model=dict)
 async def get_expenses(
@@ -27,33 +37,34 @@ async def get_expenses(
     end_date: Optional[str] = Query(None),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,date,category,amount (default: all)"),
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all expenses with optional filtering and pagination"""
-    query = db.query(Expense)
+    """Get all expenses with optional filtering and pagination; ?fields= narrows the columns"""
+    filters = []
 
     if category:
-        query = query.filter(Expense.category == category)
+        filters.append(Expense.category == category)
     if start_date:
         start = datetime.fromisoformat(start_date)
-        query = query.filter(Expense.date >= start)
+        filters.append(Expense.date >= start)
     if end_date:
         end = datetime.fromisoformat(end_date)
-        query = query.filter(Expense.date <= end)
+        filters.append(Expense.date <= end)
 
     # Get total count with filters applied
-    total = query.count()
+    total = db.query(Expense).filter(*filters).count()
 
-    # Apply pagination
-    expenses = query.offset(skip).limit(limit).all()
+    # Column-only page serialized straight to JSON (see serializers.py)
+    expenses = fetch_rows(db, select_expenses(fields).where(*filters).order_by(Expense.id).offset(skip).limit(limit))
 
-    return {
-        "expenses": [expense.to_dict() for expense in expenses],
+    return FastJSONResponse({
+        "expenses": expenses,
         "total": total,
         "skip": skip,
         "limit": limit
-    }
+    })
 
 
 @router.get("/{expense_id}", response_model=dict)
@@ -171,3 +182,108 @@ async def delete_expense(
     db.commit()
 
     return {"message": "Expense deleted"}
+
+
+# ============== BULK IMPORT ==============
+
+def _validate_expense_row(row: dict) -> dict:
+    """Validate one CSV row with the same rules as create_expense"""
+    amount_text = (row.get("amount") or "").strip().replace(",", "")
+    try:
+        amount = float(amount_text)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Expense amount is not a number: {row.get('amount')!r}")
+    if amount <= 0:
+        raise HTTPException(status_code=400, detail="Expense amount must be greater than 0")
+
+    expense_date = validate_date((row.get("date") or "").strip(), "Expense date")
+    return {
+        "date": expense_date,
+        "category": validate_expense_category((row.get("category") or "").strip()),
+        "amount": validate_amount(amount, "Expense amount"),
+        "description": (row.get("description") or "").strip() or None,
+        "receipt_url": (row.get("receipt_url") or "").strip() or None,
+    }
+
+
+@router.post("/import", response_model=dict)
+def import_expenses(
+    file: UploadFile = File(..., description="CSV with date, category, amount[, description, receipt_url] columns"),
+    dry_run: bool = Query(False, description="Validate only, insert nothing"),
+    skip_invalid: bool = Query(True, description="Insert valid rows even if some rows are invalid"),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk import expenses from a CSV file (comma, semicolon or tab separated).
+
+    The upload is read as a stream and validated in batches of
+    IMPORT_BATCH_SIZE rows with the same category/amount/date rules as
+    create_expense; valid rows of each batch are inserted with one
+    executemany. All batches share one transaction: with
+    skip_invalid=false any invalid row rolls back the whole import.
+
+    **Returns**: valid/imported/invalid counts and a per-row error report
+    """
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        sample = stream.read(4096)
+        stream.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+
+        reader = csv.DictReader(stream, dialect=dialect)
+        reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+        missing = [column for column in IMPORT_REQUIRED_COLUMNS if column not in reader.fieldnames]
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Missing required columns: {', '.join(missing)}")
+
+        valid, invalid, total = 0, 0, 0
+        errors = []
+        months = set()
+        batch = []
+
+        def flush_batch():
+            if batch and not dry_run:
+                db.execute(insert(Expense), batch)
+            batch.clear()
+
+        for line_number, row in enumerate(reader, start=2):
+            total += 1
+            try:
+                values = _validate_expense_row(row)
+            except HTTPException as e:
+                invalid += 1
+                if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+                    errors.append({"line": line_number, "error": e.detail})
+                continue
+
+            batch.append(values)
+            months.add((values["date"].year, values["date"].month))
+            valid += 1
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                flush_batch()
+        flush_batch()
+    finally:
+        stream.detach()
+
+    if dry_run or (invalid and not skip_invalid):
+        db.rollback()
+        imported = 0
+    else:
+        db.commit()
+        imported = valid
+        # Core inserts bypass the ORM events that keep the P&L cache fresh
+        invalidate_pnl_cache(months)
+
+    return {
+        "message": "Dry run completed" if dry_run else "Expense import completed",
+        "total_rows": total,
+        "valid": valid,
+        "imported": imported,
+        "invalid": invalid,
+        "errors": errors,
+        "errors_truncated": invalid > len(errors),
+    }
@@ -0,0 +1,140 @@
+"""
+Reservation Folio Routes
+
+Append-only ledger of charges and payments per stay (see folio.py):
+- GET /api/reservations/{id}/folio - List folio entries and current balance
+- POST /api/reservations/{id}/folio - Post a charge/payment/refund/adjustment/deposit
+- POST /api/reservations/{id}/folio/{entry_id}/reverse - Reverse an entry
+
+Charges and adjustments posted here are insert-only; payments, deposits
+and refunds are also recorded as payments (folio.record_posting). A posting
+that loses the race for a sequence number is retried.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from database import get_db
+from events import broker, PAYMENT_POSTED
+from folio import PAYMENT_ENTRY_TYPES, FolioError, folio_balance, record_posting, reverse_posting
+from models import FolioEntry, Reservation
+from schemas import FolioEntryCreate, FolioReversal
+from security import get_current_user
+
+router = APIRouter(prefix="/api/reservations", tags=["Folio"])
+
+# Attempts at a posting whose sequence number was taken by a concurrent one
+POSTING_ATTEMPTS = 3
+
+
+def _get_reservation_id(db: Session, reservation_id: int) -> int:
+    exists = db.query(Reservation.id).filter(Reservation.id == reservation_id).first()
+    if not exists:
+        raise HTTPException(status_code=404, detail=f"Reservation with ID {reservation_id} not found")
+    return reservation_id
+
+
+def _with_retry(db: Session, posting):
+    """Run and commit a posting, retrying when a concurrent posting took its sequence number"""
+    for attempt in range(POSTING_ATTEMPTS):
+        try:
+            entry = posting()
+            db.commit()
+            return entry
+        except FolioError as e:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=str(e))
+        except IntegrityError:
+            db.rollback()
+    raise HTTPException(status_code=409, detail="The folio is being updated concurrently, please retry")
+
+
+@router.get("/{reservation_id}/folio")
+async def get_folio(
+    reservation_id: int,
+    since_sequence: Optional[int] = Query(None, ge=0, description="Only entries after this sequence number"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Get the folio of a reservation.
+
+    **Returns**: Entries in posting order and the current balance
+    (the running balance of the latest entry).
+    """
+    _get_reservation_id(db, reservation_id)
+
+    query = db.query(FolioEntry).filter(FolioEntry.reservation_id == reservation_id)
+    if since_sequence is not None:
+        query = query.filter(FolioEntry.sequence > since_sequence)
+    entries = query.order_by(FolioEntry.sequence).all()
+
+    return {
+        "reservation_id": reservation_id,
+        "balance": folio_balance(db, reservation_id),
+        "entries": [e.to_dict() for e in entries],
+    }
+
+
+@router.post("/{reservation_id}/folio", status_code=201)
+async def post_folio_entry(
+    reservation_id: int,
+    entry_data: FolioEntryCreate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Post an entry to a reservation's folio.
+
+    Charges and adjustments (minibar, restaurant, late checkout...) are a
+    single insert and count towards the stay balance from the folio;
+    payments, deposits and refunds are also recorded as payments
+    (payment_method defaults to "other").
+    """
+    _get_reservation_id(db, reservation_id)
+
+    entry = _with_retry(db, lambda: record_posting(
+        db, reservation_id, entry_data.entry_type, entry_data.amount,
+        description=entry_data.description, category=entry_data.category,
+        payment_method=entry_data.payment_method, posted_by=current_user.get("user_id"),
+    ))
+    db.refresh(entry)
+
+    if entry.entry_type in PAYMENT_ENTRY_TYPES:
+        broker.publish(PAYMENT_POSTED, {
+            "payment_id": entry.payment_id,
+            "reservation_id": reservation_id,
+            "amount": -float(entry.amount),
+            "payment_method": entry_data.payment_method or "other",
+            "payment_type": PAYMENT_ENTRY_TYPES[entry.entry_type],
+        })
+
+    return {"message": "Folio entry posted successfully", "entry": entry.to_dict()}
+
+
+@router.post("/{reservation_id}/folio/{entry_id}/reverse", status_code=201)
+async def reverse_folio_entry(
+    reservation_id: int,
+    entry_id: int,
+    reversal: Optional[FolioReversal] = None,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Cancel an entry by posting an opposite adjustment (voiding its payment, if any)"""
+    entry = db.query(FolioEntry).filter(
+        FolioEntry.id == entry_id,
+        FolioEntry.reservation_id == reservation_id,
+    ).first()
+    if not entry:
+        raise HTTPException(status_code=404, detail=f"Folio entry {entry_id} not found for reservation {reservation_id}")
+
+    adjustment = _with_retry(db, lambda: reverse_posting(
+        db, entry, reason=reversal.reason if reversal else None,
+        posted_by=current_user.get("user_id"),
+    ))
+    db.refresh(adjustment)
+
+    return {"message": "Folio entry reversed successfully", "entry": adjustment.to_dict()}
@@ -11,6 +11,8 @@ Handles all guest-related endpoints:
 - GET /api/guests/{id}/photos - Get guest's ID photos
 """
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
@@ -20,6 +22,7 @@ from database import get_db
 from models import Guest, RoomType, GuestImage, User
 from schemas import GuestCreate, GuestUpdate, GuestResponse, GuestListResponse, GuestImageResponse
 from security import get_current_user
+from serializers import FastJSONResponse, fetch_rows, select_guests
 
 router = APIRouter(prefix="/api/guests", tags=["Guests"])
 
@@ -109,6 +112,7 @@ async def list_guests(
     limit: int = Query(10, ge=1, le=100, description="Maximum number of guests to return"),
     is_vip: bool = Query(None, description="Filter by VIP status"),
     search: str = Query(None, description="Search by full name or email"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,full_name,phone (default: all)"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
@@ -120,19 +124,20 @@ async def list_guests(
     - limit: Maximum number of guests to return (default: 10, max: 100)
     - is_vip: Filter by VIP status (true/false)
     - search: Search by guest name or email (partial match)
+    - fields: Comma-separated columns to return (id is always included)
 
     **Returns:** List of guests with total count and pagination info
     """
-    query = db.query(Guest)
+    filters = []
 
     # Apply VIP filter if provided
     if is_vip is not None:
-        query = query.filter(Guest.is_vip == is_vip)
+        filters.append(Guest.is_vip == is_vip)
 
     # Apply search filter if provided
     if search:
         search_term = f"%{search}%"
-        query = query.filter(
+        filters.append(
             or_(
                 Guest.full_name.ilike(search_term),
                 Guest.email.ilike(search_term)
@@ -140,20 +145,17 @@ async def list_guests(
         )
 
     # Get total count before pagination
-    total = query.count()
-
-    # Apply pagination
-    guests = query.offset(skip).limit(limit).all()
+    total = db.query(Guest).filter(*filters).count()
 
-    # Convert to dictionaries
-    guests_data = [guest.to_dict() for guest in guests]
+    # Column-only query serialized straight to JSON (see serializers.py)
+    guests_data = fetch_rows(db, select_guests(fields).where(*filters).order_by(Guest.id).offset(skip).limit(limit))
 
-    return {
+    return FastJSONResponse({
         "guests": guests_data,
         "total": total,
         "skip": skip,
         "limit": limit
-    }
+    })
 
 
 # ============== UPDATE GUEST ==============
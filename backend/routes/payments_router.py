@@ -7,11 +7,17 @@ Handles all payment-related endpoints:
 - GET /api/payments/{id} - Get payment details
 - PUT /api/payments/{id} - Update payment
 - DELETE /api/payments/{id} - Delete/void payment
+- POST /api/payments/reconcile - Match a bank statement export against payments
+
+Every payment change is also posted to the reservation's append-only folio
+(folio.py); edits and deletions appear there as adjustments.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import io
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile
 from sqlalchemy.orm import Session
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional
 from decimal import Decimal
 
@@ -19,39 +25,57 @@ from models import Payment, Reservation
 from schemas import PaymentCreate, PaymentUpdate
 from security import get_current_user
 from database import get_db
+from balances import payment_contribution
+from folio import post_entry
+from events import broker, PAYMENT_POSTED
+from serializers import FastJSONResponse, fetch_rows, select_payments
+from reconciliation import RECONCILED_PAYMENT_METHODS, ReconciliationError, read_statement, reconcile
 
 router = APIRouter(prefix="/api/payments", tags=["Payments"])
 
+# ?status= values; payments have no status column, only the refund/void flags
+PAYMENT_STATUS_FILTERS = {
+    "active": (Payment.is_voided.isnot(True), Payment.is_refund.isnot(True)),
+    "refund": (Payment.is_voided.isnot(True), Payment.is_refund.is_(True)),
+    "voided": (Payment.is_voided.is_(True),),
+}
+
 
 @router.get("", response_model=dict)
 async def get_payments(
     reservation_id: Optional[int] = Query(None),
-    status_filter: Optional[str] = Query(None, alias="status"),
+    status_filter: Optional[str] = Query(None, alias="status", description="active, refund or voided"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,payment_date,amount (default: all)"),
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all payments with optional filtering and pagination"""
-    query = db.query(Payment)
+    """Get all payments with optional filtering and pagination; ?fields= narrows the columns"""
+    filters = []
 
     if reservation_id:
-        query = query.filter(Payment.reservation_id == reservation_id)
+        filters.append(Payment.reservation_id == reservation_id)
     if status_filter:
-        query = query.filter(Payment.status == status_filter)
+        if status_filter not in PAYMENT_STATUS_FILTERS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid status: {status_filter}. Available: {', '.join(PAYMENT_STATUS_FILTERS)}",
+            )
+        filters.extend(PAYMENT_STATUS_FILTERS[status_filter])
 
     # Get total count with filters applied
-    total = query.count()
+    total = db.query(Payment).filter(*filters).count()
 
-    # Apply pagination
-    payments = query.offset(skip).limit(limit).all()
+    # Column-only page serialized straight to JSON (see serializers.py)
+    payments = fetch_rows(db, select_payments(fields).where(*filters).order_by(Payment.id).offset(skip).limit(limit))
 
-    return {
-        "payments": [payment.to_dict() for payment in payments],
+    return FastJSONResponse({
+        "payments": payments,
         "total": total,
         "skip": skip,
         "limit": limit
-    }
+    })
 
 
 @router.get("/{payment_id}", response_model=dict)
@@ -102,22 +126,41 @@ async def create_payment(
             detail=f"Reservation with ID {payment_data.reservation_id} not found"
         )
 
+    try:
+        payment_date = datetime.fromisoformat(payment_data.payment_date).date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid payment_date format. Use YYYY-MM-DD")
+
     # Create payment
     payment = Payment(
         reservation_id=payment_data.reservation_id,
         amount=payment_data.amount,
         payment_method=payment_data.payment_method,
         payment_type=payment_data.payment_type,
-        payment_date=payment_data.payment_date,
+        payment_date=payment_date,
         reference_number=payment_data.reference_number,
         notes=payment_data.notes,
         created_by=current_user.get("user_id")
     )
 
     db.add(payment)
+    db.flush()
+    post_entry(
+        db, payment.reservation_id, "payment", payment.amount, category=payment.payment_method,
+        description=f"Payment #{payment.id} ({payment.payment_type or 'full'})",
+        payment_id=payment.id, posted_by=current_user.get("user_id"),
+    )
     db.commit()
     db.refresh(payment)
 
+    broker.publish(PAYMENT_POSTED, {
+        "payment_id": payment.id,
+        "reservation_id": payment.reservation_id,
+        "amount": float(payment.amount),
+        "payment_method": payment.payment_method,
+        "payment_type": payment.payment_type,
+    })
+
     return {
         "message": "Payment recorded successfully",
         "payment": payment.to_dict()
@@ -140,14 +183,30 @@ async def update_payment(
             detail="Payment not found"
         )
 
-    # Update fields
+    previous_reservation_id = payment.reservation_id
+    previous_contribution = payment_contribution(payment.amount, payment.is_refund, payment.is_voided)
+
+    # Update fields (amount/is_refund/is_voided/reservation_id changes are
+    # applied to the reservation balance on flush, see balances.py)
     for field, value in payment_data.items():
+        if field in ("id", "created_at", "updated_at"):
+            continue
         if value is not None and hasattr(payment, field):
             setattr(payment, field, value)
 
-    # Set paid_at if status is being set to paid
-    if payment_data.get("status") == "paid" and payment.status != "paid":
-        payment.paid_at = datetime.now(timezone.utc)
+    # The folio keeps the original posting; post the net change as adjustments
+    contribution = payment_contribution(payment.amount, payment.is_refund, payment.is_voided)
+    corrections = {previous_reservation_id: previous_contribution}
+    if payment.reservation_id != previous_reservation_id:
+        corrections[payment.reservation_id] = Decimal("0")
+    corrections[payment.reservation_id] -= contribution
+    for reservation_id, difference in corrections.items():
+        if difference:
+            post_entry(
+                db, reservation_id, "adjustment", difference, category="payment_correction",
+                description=f"Payment #{payment.id} updated", payment_id=payment.id,
+                posted_by=current_user.get("user_id"),
+            )
 
     db.commit()
     db.refresh(payment)
@@ -173,7 +232,62 @@ async def delete_payment(
             detail="Payment not found"
         )
 
+    contribution = payment_contribution(payment.amount, payment.is_refund, payment.is_voided)
+    if contribution:
+        post_entry(
+            db, payment.reservation_id, "adjustment", contribution, category="payment_correction",
+            description=f"Payment #{payment.id} deleted", posted_by=current_user.get("user_id"),
+        )
+
     db.delete(payment)
     db.commit()
 
     return {"message": "Payment deleted successfully"}
+
+
+# ============== BANK STATEMENT RECONCILIATION ==============
+
+@router.post("/reconcile", response_model=dict)
+def reconcile_statement(
+    file: UploadFile = File(..., description="Statement CSV (date, amount, reference and/or description columns)"),
+    date_window_days: int = Query(3, ge=0, le=31, description="Max days between statement and payment date"),
+    amount_tolerance: float = Query(0, ge=0, description="Max amount difference for fuzzy matches"),
+    payment_methods: str = Query(",".join(RECONCILED_PAYMENT_METHODS), description="Comma-separated payment methods"),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Reconcile a bank / e-wallet statement against recorded payments.
+
+    Lines are matched by reference (reference_number / transaction_id,
+    confirmed by amount and date window), then by amount and nearest date.
+    The upload is read as a stream; this is a sync endpoint so the matching
+    runs in the threadpool instead of blocking the event loop.
+
+    **Returns**: matched lines (with rule), ambiguous lines (with candidate
+    payment IDs), unmatched lines, unmatched payment IDs and unreadable rows
+    """
+    methods = tuple(m.strip() for m in payment_methods.split(",") if m.strip())
+
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        lines, errors = read_statement(stream)
+    except ReconciliationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        stream.detach()
+
+    result = reconcile(db, lines, date_window_days, amount_tolerance, methods)
+
+    return {
+        "summary": {
+            "lines": len(lines),
+            "matched": len(result["matched"]),
+            "ambiguous": len(result["ambiguous"]),
+            "unmatched": len(result["unmatched"]),
+            "unmatched_payments": len(result["unmatched_payments"]),
+            "errors": len(errors),
+        },
+        **result,
+        "errors": errors,
+    }
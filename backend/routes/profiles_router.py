@@ -0,0 +1,35 @@
+"""
+Request Profile Routes
+
+Profiles captured by ProfilingMiddleware for requests sent with
+`X-Profile: 1` (see profiling.py). Admin only:
+- GET /api/profiles - Stored profiles, newest first
+- GET /api/profiles/{profile_id} - Download collapsed stacks (flame graph input)
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+
+from profiling import list_profiles, profile_path
+from security import require_admin
+
+router = APIRouter(prefix="/api/profiles", tags=["Profiling"])
+
+
+@router.get("")
+def get_profiles(current_user: dict = Depends(require_admin)):
+    """Metadata of captured profiles (method, path, status, duration, samples)"""
+    profiles = list_profiles()
+    return {"profiles": profiles, "total": len(profiles)}
+
+
+@router.get("/{profile_id}")
+def download_profile(profile_id: str, current_user: dict = Depends(require_admin)):
+    """
+    Collapsed stacks of one profile ("frame;frame count" per line), for
+    flamegraph.pl, speedscope or inferno.
+    """
+    path = profile_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=path.name)
@@ -0,0 +1,343 @@
+"""
+Rate Calendar & Pricing Routes
+
+Handles nightly rates and stay quotes:
+- GET /api/rates/quote - Price a stay for all room types in one call
+- GET /api/rates/calendar - Resolved nightly rates for a room type and date range
+- PUT /api/rates/calendar - Set explicit nightly rates for a date range
+- DELETE /api/rates/calendar - Remove explicit nightly rates for a date range
+- GET /api/rates/rules - List seasonal / weekday rate rules
+- POST /api/rates/rules - Create rate rule
+- PUT /api/rates/rules/{id} - Update rate rule
+- DELETE /api/rates/rules/{id} - Delete rate rule
+"""
+
+from datetime import datetime, date, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from database import get_db
+from discounts import DiscountError, evaluate_discount, get_discount_index
+from models import RoomType, RateRule, RateCalendar
+from pricing import ADJUSTMENT_TYPES, build_rate_matrix, stay_nights, quote_room_types
+from schemas import RateRuleCreate, RateRuleUpdate, RateCalendarSet
+from security import get_current_user
+
+router = APIRouter(prefix="/api/rates", tags=["Rates"])
+
+# Longest date range accepted by quote/calendar endpoints
+MAX_RANGE_DAYS = 366
+
+
+def _parse_date(value: Optional[str], field_name: str) -> Optional[date]:
+    """Parse an ISO date string, raising 400 on bad input"""
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value).date()
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail=f"Invalid {field_name} format. Use YYYY-MM-DD")
+
+
+def _parse_range(start: str, end: str, start_name: str, end_name: str, inclusive: bool = False) -> tuple:
+    """Parse and validate a date range"""
+    start_date = _parse_date(start, start_name)
+    end_date = _parse_date(end, end_name)
+    if inclusive:
+        end_date = end_date + timedelta(days=1)
+    if end_date <= start_date:
+        raise HTTPException(status_code=400, detail=f"{end_name} must be after {start_name}")
+    if (end_date - start_date).days > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_RANGE_DAYS} days")
+    return start_date, end_date
+
+
+def _validate_rule_fields(db: Session, data: dict, rule: Optional[RateRule] = None):
+    """Validate and normalize rate rule fields in place (against `rule` when updating one)"""
+    if "adjustment_type" in data and data["adjustment_type"] not in ADJUSTMENT_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"adjustment_type must be one of: {', '.join(ADJUSTMENT_TYPES)}"
+        )
+
+    if data.get("room_type_id"):
+        if not db.query(RoomType).filter(RoomType.id == data["room_type_id"]).first():
+            raise HTTPException(status_code=404, detail=f"Room type with ID {data['room_type_id']} not found")
+
+    if "start_date" in data:
+        data["start_date"] = _parse_date(data["start_date"], "start_date")
+    if "end_date" in data:
+        data["end_date"] = _parse_date(data["end_date"], "end_date")
+
+    # Both dates are inclusive, so a one-day rule has start_date == end_date
+    start_date = data.get("start_date", rule.start_date if rule else None)
+    end_date = data.get("end_date", rule.end_date if rule else None)
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="end_date cannot be before start_date")
+
+    if "days_of_week" in data:
+        days = data["days_of_week"]
+        if days is not None:
+            if any(d < 0 or d > 6 for d in days):
+                raise HTTPException(status_code=400, detail="days_of_week values must be between 0 (Monday) and 6 (Sunday)")
+            data["days_of_week"] = ",".join(str(d) for d in sorted(set(days)))
+
+
+# ============== STAY QUOTE ==============
+
+@router.get("/quote")
+async def get_rate_quote(
+    check_in_date: str = Query(..., description="Check-in date (YYYY-MM-DD)"),
+    check_out_date: str = Query(..., description="Check-out date (YYYY-MM-DD)"),
+    room_type_id: Optional[int] = Query(None, description="Limit the quote to one room type"),
+    discount_code: Optional[str] = Query(None, description="Discount code to apply"),
+    guest_id: Optional[int] = Query(None, description="Guest ID (for guest-specific discounts)"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Price a stay for every active room type in a single call.
+
+    **Query Parameters:**
+    - check_in_date: Check-in date (YYYY-MM-DD)
+    - check_out_date: Check-out date (YYYY-MM-DD)
+    - room_type_id: Optional room type filter
+    - discount_code: Optional discount code
+    - guest_id: Optional guest ID for guest-restricted discounts
+
+    **Returns:** Per room type nightly rates, subtotal, best applicable
+    discount and total
+    """
+    check_in, check_out = _parse_range(check_in_date, check_out_date, "check_in_date", "check_out_date")
+
+    quotes = quote_room_types(db, check_in, check_out, [room_type_id] if room_type_id else None)
+    if room_type_id and not quotes:
+        raise HTTPException(status_code=404, detail=f"Room type with ID {room_type_id} not found")
+
+    index = get_discount_index(db)
+    for quote in quotes:
+        try:
+            discount = evaluate_discount(
+                db, quote["room_type_id"], check_in, quote["number_of_nights"], quote["subtotal"],
+                code=discount_code, guest_id=guest_id, index=index,
+            )
+            quote["discount_error"] = None
+        except DiscountError as e:
+            # A code may be valid for some room types only - report per quote
+            discount = evaluate_discount(
+                db, quote["room_type_id"], check_in, quote["number_of_nights"], quote["subtotal"],
+                guest_id=guest_id, index=index,
+            )
+            quote["discount_error"] = str(e)
+        quote["discount"] = discount
+        quote["discount_amount"] = discount["amount"] if discount else 0.0
+        quote["total_amount"] = round(quote["subtotal"] - quote["discount_amount"], 2)
+
+    return {
+        "check_in_date": check_in.isoformat(),
+        "check_out_date": check_out.isoformat(),
+        "number_of_nights": (check_out - check_in).days,
+        "quotes": quotes,
+    }
+
+
+# ============== RATE CALENDAR ==============
+
+@router.get("/calendar")
+async def get_rate_calendar(
+    room_type_id: int = Query(..., description="Room type ID"),
+    start_date: str = Query(..., description="First date (YYYY-MM-DD)"),
+    end_date: str = Query(..., description="Last date, inclusive (YYYY-MM-DD)"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Get the resolved nightly rate for each date in a range.
+
+    **Returns:** One entry per date with the effective rate and whether it
+    comes from an explicit calendar override
+    """
+    room_type = db.query(RoomType).filter(RoomType.id == room_type_id).first()
+    if not room_type:
+        raise HTTPException(status_code=404, detail=f"Room type with ID {room_type_id} not found")
+
+    start, end = _parse_range(start_date, end_date, "start_date", "end_date", inclusive=True)
+
+    rates = build_rate_matrix(db, [room_type], start, end)[0]
+    overridden = {
+        stay_date for (stay_date,) in db.query(RateCalendar.stay_date).filter(
+            RateCalendar.room_type_id == room_type_id,
+            RateCalendar.stay_date >= start,
+            RateCalendar.stay_date < end,
+        )
+    }
+
+    return {
+        "room_type_id": room_type_id,
+        "room_type_name": room_type.name,
+        "default_rate": float(room_type.default_rate) if room_type.default_rate else 0,
+        "days": [
+            {
+                "date": str(night),
+                "rate": float(rate),
+                "is_override": night.item() in overridden,
+            }
+            for night, rate in zip(stay_nights(start, end), rates)
+        ],
+    }
+
+
+@router.put("/calendar")
+async def set_rate_calendar(
+    calendar_data: RateCalendarSet,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Set an explicit nightly rate for every date in a range (inclusive).
+    Existing overrides in the range are replaced.
+    """
+    room_type = db.query(RoomType).filter(RoomType.id == calendar_data.room_type_id).first()
+    if not room_type:
+        raise HTTPException(status_code=404, detail=f"Room type with ID {calendar_data.room_type_id} not found")
+
+    start, end = _parse_range(calendar_data.start_date, calendar_data.end_date, "start_date", "end_date", inclusive=True)
+
+    existing = {
+        entry.stay_date: entry
+        for entry in db.query(RateCalendar).filter(
+            RateCalendar.room_type_id == calendar_data.room_type_id,
+            RateCalendar.stay_date >= start,
+            RateCalendar.stay_date < end,
+        )
+    }
+
+    for night in stay_nights(start, end):
+        stay_date = night.item()
+        entry = existing.get(stay_date)
+        if entry:
+            entry.rate = calendar_data.rate
+            entry.notes = calendar_data.notes
+        else:
+            db.add(RateCalendar(
+                room_type_id=calendar_data.room_type_id,
+                stay_date=stay_date,
+                rate=calendar_data.rate,
+                notes=calendar_data.notes,
+            ))
+
+    db.commit()
+
+    return {
+        "message": f"Rate set for {(end - start).days} night(s)",
+        "room_type_id": calendar_data.room_type_id,
+        "start_date": start.isoformat(),
+        "end_date": (end - timedelta(days=1)).isoformat(),
+        "rate": calendar_data.rate,
+    }
+
+
+@router.delete("/calendar")
+async def clear_rate_calendar(
+    room_type_id: int = Query(..., description="Room type ID"),
+    start_date: str = Query(..., description="First date (YYYY-MM-DD)"),
+    end_date: str = Query(..., description="Last date, inclusive (YYYY-MM-DD)"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Remove explicit nightly rates in a date range (rules and default rate apply again)"""
+    start, end = _parse_range(start_date, end_date, "start_date", "end_date", inclusive=True)
+
+    deleted = db.query(RateCalendar).filter(
+        RateCalendar.room_type_id == room_type_id,
+        RateCalendar.stay_date >= start,
+        RateCalendar.stay_date < end,
+    ).delete(synchronize_session=False)
+    db.commit()
+
+    return {"message": f"Removed {deleted} rate override(s)"}
+
+
+# ============== RATE RULES ==============
+
+@router.get("/rules")
+async def list_rate_rules(
+    room_type_id: Optional[int] = Query(None, description="Filter by room type ID"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """List seasonal / weekday rate rules, highest priority first"""
+    query = db.query(RateRule)
+    if room_type_id:
+        query = query.filter(RateRule.room_type_id == room_type_id)
+
+    rules = query.order_by(RateRule.priority.desc(), RateRule.id.asc()).all()
+    return {"rules": [rule.to_dict() for rule in rules]}
+
+
+@router.post("/rules", status_code=201)
+async def create_rate_rule(
+    rule_data: RateRuleCreate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Create a rate rule.
+
+    **Adjustment types:**
+    - fixed_rate: Nightly rate is set to adjustment_value
+    - percentage: Default rate is adjusted by adjustment_value percent (e.g. 20 or -15)
+    - fixed_amount: adjustment_value is added to the default rate
+    """
+    data = rule_data.model_dump()
+    _validate_rule_fields(db, data)
+
+    rule = RateRule(**data)
+    db.add(rule)
+    db.commit()
+    db.refresh(rule)
+
+    return {"message": "Rate rule created successfully", "rule": rule.to_dict()}
+
+
+@router.put("/rules/{rule_id}")
+async def update_rate_rule(
+    rule_id: int,
+    rule_data: RateRuleUpdate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Update a rate rule"""
+    rule = db.query(RateRule).filter(RateRule.id == rule_id).first()
+    if not rule:
+        raise HTTPException(status_code=404, detail=f"Rate rule with ID {rule_id} not found")
+
+    update_data = rule_data.model_dump(exclude_unset=True)
+    _validate_rule_fields(db, update_data, rule)
+
+    for field, value in update_data.items():
+        setattr(rule, field, value)
+
+    db.commit()
+    db.refresh(rule)
+
+    return {"message": "Rate rule updated successfully", "rule": rule.to_dict()}
+
+
+@router.delete("/rules/{rule_id}")
+async def delete_rate_rule(
+    rule_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Delete a rate rule"""
+    rule = db.query(RateRule).filter(RateRule.id == rule_id).first()
+    if not rule:
+        raise HTTPException(status_code=404, detail=f"Rate rule with ID {rule_id} not found")
+
+    db.delete(rule)
+    db.commit()
+
+    return {"message": f"Rate rule {rule_id} deleted successfully"}
@@ -0,0 +1,122 @@
+"""
+Financial Report Routes
+
+Reports are aggregated in the database (see reports.py):
+- GET /api/reports/ar-aging - Accounts-receivable aging (summary + streamed detail)
+- GET /api/reports/pnl - Profit and loss per month/quarter/year
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from database import get_db
+from reports import AR_AGING_BUCKETS, PNL_GRANULARITIES, ar_aging_summary, iter_ar_aging_rows, profit_and_loss
+from security import get_current_user
+
+router = APIRouter(prefix="/api/reports", tags=["Reports"])
+
+AR_AGING_CSV_COLUMNS = (
+    "reservation_id", "confirmation_number", "guest_id", "guest_name", "status",
+    "check_in_date", "check_out_date", "total_amount", "total_paid", "balance", "age_days", "bucket",
+)
+
+
+def _parse_date(value: Optional[str], field: str):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {field} format. Use YYYY-MM-DD")
+
+
+def _stream_json(summary: dict, rows):
+    """Emit {"summary": ..., "rows": [...]} one row at a time"""
+    yield '{"summary": ' + json.dumps(summary) + ', "rows": ['
+    for i, row in enumerate(rows):
+        yield (", " if i else "") + json.dumps(row)
+    yield "]}"
+
+
+def _stream_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=AR_AGING_CSV_COLUMNS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+@router.get("/ar-aging")
+async def get_ar_aging(
+    as_of: Optional[str] = Query(None, description="Aging date (YYYY-MM-DD), default today"),
+    bucket: Optional[str] = Query(None, description="Only rows of one bucket: 0_30, 31_60, 61_90, 90_plus"),
+    format: str = Query("json", description="json or csv"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Accounts-receivable aging for checked-out and in-house reservations.
+
+    Balances (total minus counted payments) are computed in one grouped
+    query and bucketed by age: 0-30, 31-60, 61-90 and 90+ days since
+    check-out (or check-in for guests still in house).
+
+    **Returns**: JSON with the bucket summary followed by the streamed detail
+    rows (oldest first), or the detail rows as CSV with format=csv
+    """
+    as_of_date = _parse_date(as_of, "as_of") or datetime.now().date()
+    bucket_keys = [key for key, _ in AR_AGING_BUCKETS]
+    if bucket and bucket not in bucket_keys:
+        raise HTTPException(status_code=400, detail=f"bucket must be one of: {', '.join(bucket_keys)}")
+    if format not in ("json", "csv"):
+        raise HTTPException(status_code=400, detail="format must be json or csv")
+
+    rows = iter_ar_aging_rows(db, as_of_date, bucket)
+    if format == "csv":
+        return StreamingResponse(
+            _stream_csv(rows),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="ar-aging-{as_of_date.isoformat()}.csv"'},
+        )
+
+    summary = ar_aging_summary(db, as_of_date)
+    return StreamingResponse(_stream_json(summary, rows), media_type="application/json")
+
+
+@router.get("/pnl")
+async def get_profit_and_loss(
+    from_date: Optional[str] = Query(None, alias="from", description="Start date (YYYY-MM-DD), default Jan 1 this year"),
+    to_date: Optional[str] = Query(None, alias="to", description="End date (YYYY-MM-DD), default today"),
+    granularity: str = Query("month", description="month, quarter or year"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Profit and loss: revenue (payments, by room type and payment method)
+    minus expenses (by category) per period.
+
+    The range is widened to whole months. Closed months (before the
+    current one) are served from a cache.
+    """
+    today = datetime.now().date()
+    start = _parse_date(from_date, "from") or today.replace(month=1, day=1)
+    end = _parse_date(to_date, "to") or today
+    if end < start:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if (end.year - start.year) * 12 + end.month - start.month >= 120:
+        raise HTTPException(status_code=400, detail="Date range cannot exceed 10 years")
+    if granularity not in PNL_GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"granularity must be one of: {', '.join(PNL_GRANULARITIES)}")
+
+    return profit_and_loss(db, start, end, granularity, today)
@@ -10,8 +10,14 @@ Handles all reservation-related endpoints:
 - DELETE /api/reservations/{id} - Cancel reservation
 - POST /api/reservations/{id}/check-in - Guest check-in with receptionist tracking
 - POST /api/reservations/{id}/check-out - Guest check-out
+
+Room charges, discounts and total changes are posted to the folio ledger
+(folio.py, routes/folio_router.py). Status changes are published to the
+live event stream (events.py) after commit.
 """
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
@@ -24,6 +30,14 @@ from schemas import (
     ReservationListResponse
 )
 from security import get_current_user
+from serializers import FastJSONResponse, fetch_rows, select_reservations
+from pricing import price_stay
+from discounts import DiscountError, DiscountUnavailable, redeem_best_discount, release_discount
+from folio import post_entry, folio_balance, stay_balance
+from events import (
+    broker, RESERVATION_CREATED, RESERVATION_CANCELLED, RESERVATION_CHECKED_IN,
+    RESERVATION_CHECKED_OUT, ROOM_STATUS_CHANGED,
+)
 
 router = APIRouter(prefix="/api/reservations", tags=["Reservations"])
 
@@ -112,7 +126,11 @@ async def create_reservation(
     - room_type_id: Room type ID
     - check_in_date: Check-in date (YYYY-MM-DD)
     - check_out_date: Check-out date (YYYY-MM-DD)
-    - rate_per_night: Rate per night
+
+    **Pricing:** subtotal and total_amount are computed from the rate calendar
+    (GET /api/rates/quote). Pass rate_per_night only to charge a flat
+    negotiated rate instead. Auto-applied discounts and discount_code are
+    evaluated by the discount engine.
 
     **Returns:** Created reservation with confirmation number
     """
@@ -162,6 +180,30 @@ async def create_reservation(
             detail=f"No available rooms of type '{room_type.name}' for the selected dates ({check_in} to {check_out})"
         )
 
+    # Price the stay night by night from the rate calendar
+    # (a supplied rate_per_night is treated as a flat negotiated rate)
+    quote = price_stay(db, room_type, check_in, check_out, rate_override=reservation_data.rate_per_night)
+
+    # Apply the best discount rule (auto-applied or by code); a manual
+    # discount_amount is only used when no rule applies. The discount is
+    # consumed atomically in this transaction and rolled back if the booking fails.
+    try:
+        discount = redeem_best_discount(
+            db, room_type.id, check_in, quote["number_of_nights"], quote["subtotal"],
+            code=reservation_data.discount_code, guest_id=guest.id,
+        )
+    except DiscountUnavailable as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except DiscountError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if discount:
+        discount_id = discount["discount_id"]
+        discount_amount = discount["amount"]
+    else:
+        discount_id = None
+        discount_amount = min(reservation_data.discount_amount, quote["subtotal"])
+
     # Create new reservation
     import secrets
     confirmation_number = secrets.token_hex(5).upper()
@@ -170,22 +212,48 @@ async def create_reservation(
         confirmation_number=confirmation_number,
         guest_id=reservation_data.guest_id,
         room_type_id=reservation_data.room_type_id,
-        check_in_date=reservation_data.check_in_date,
-        check_out_date=reservation_data.check_out_date,
+        check_in_date=check_in,
+        check_out_date=check_out,
         adults=reservation_data.adults,
         children=reservation_data.children,
-        rate_per_night=reservation_data.rate_per_night,
-        subtotal=reservation_data.subtotal,
-        discount_amount=reservation_data.discount_amount,
-        total_amount=reservation_data.total_amount,
+        rate_per_night=quote["average_rate"],
+        number_of_nights=quote["number_of_nights"],
+        subtotal=quote["subtotal"],
+        discount_amount=discount_amount,
+        discount_id=discount_id,
+        total_amount=round(quote["subtotal"] - discount_amount, 2),
         deposit_amount=reservation_data.deposit_amount,
         special_requests=reservation_data.special_requests,
         created_by=current_user.get("user_id"),
     )
     db.add(new_reservation)
+    db.flush()
+
+    # Opening folio entries, in the same transaction as the booking
+    post_entry(
+        db, new_reservation.id, "charge", quote["subtotal"], category="room",
+        description=f"Room charges ({quote['number_of_nights']} nights)",
+        posted_by=current_user.get("user_id"),
+    )
+    if discount_amount > 0:
+        post_entry(
+            db, new_reservation.id, "adjustment", -discount_amount, category="discount",
+            description=f"Discount: {discount['name']}" if discount else "Discount",
+            posted_by=current_user.get("user_id"),
+        )
+
     db.commit()
     db.refresh(new_reservation)
 
+    broker.publish(RESERVATION_CREATED, {
+        "reservation_id": new_reservation.id,
+        "confirmation_number": new_reservation.confirmation_number,
+        "guest_id": new_reservation.guest_id,
+        "room_type_id": new_reservation.room_type_id,
+        "check_in_date": new_reservation.check_in_date.isoformat(),
+        "check_out_date": new_reservation.check_out_date.isoformat(),
+    })
+
     return new_reservation.to_dict()
 
 
@@ -197,6 +265,7 @@ async def list_reservations(
     limit: int = Query(10, ge=1, le=100),
     status: str = Query(None, description="Filter by status: confirmed, checked_in, checked_out, cancelled"),
     guest_id: int = Query(None, description="Filter by guest ID"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,confirmation_number,guest_name,status (default: all)"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
@@ -208,28 +277,32 @@ async def list_reservations(
     - limit: Maximum number of records to return
     - status: Filter by reservation status
     - guest_id: Filter by guest ID
+    - fields: Comma-separated columns to return (id is always included);
+      guest_name, room_number and checked_in_by_name are only joined when requested
 
     **Returns:** List of reservations with pagination info
     """
-    query = db.query(Reservation)
+    filters = []
 
     if status:
-        query = query.filter(Reservation.status == status)
+        filters.append(Reservation.status == status)
 
     if guest_id:
-        query = query.filter(Reservation.guest_id == guest_id)
+        filters.append(Reservation.guest_id == guest_id)
 
-    total = query.count()
-    reservations = query.offset(skip).limit(limit).all()
+    total = db.query(Reservation).filter(*filters).count()
 
-    reservations_data = [res.to_dict() for res in reservations]
+    # Guest name, room number and check-in user are joined in SQL (see serializers.py)
+    reservations_data = fetch_rows(
+        db, select_reservations(fields).where(*filters).order_by(Reservation.id).offset(skip).limit(limit)
+    )
 
-    return {
+    return FastJSONResponse({
         "reservations": reservations_data,
         "total": total,
         "skip": skip,
         "limit": limit
-    }
+    })
 
 
 # ============== GET SINGLE RESERVATION ==============
@@ -280,9 +353,19 @@ async def update_reservation(
 
     # Update only provided fields
     update_data = reservation_data.model_dump(exclude_unset=True)
+    previous_total = float(reservation.total_amount)
     for field, value in update_data.items():
         setattr(reservation, field, value)
 
+    # Total changes are posted to the folio as an adjustment
+    if update_data.get("total_amount") is not None:
+        difference = round(float(update_data["total_amount"]) - previous_total, 2)
+        if difference:
+            post_entry(
+                db, reservation.id, "adjustment", difference, category="room",
+                description="Reservation total changed", posted_by=current_user.get("user_id"),
+            )
+
     reservation.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(reservation)
@@ -311,10 +394,15 @@ async def cancel_reservation(
     if not reservation:
         raise HTTPException(status_code=404, detail=f"Reservation with ID {reservation_id} not found")
 
+    if reservation.status != 'cancelled' and reservation.discount_id:
+        release_discount(db, reservation.discount_id)
+
     reservation.status = 'cancelled'
     reservation.updated_at = datetime.utcnow()
     db.commit()
 
+    broker.publish(RESERVATION_CANCELLED, {"reservation_id": reservation_id, "room_id": reservation.room_id})
+
     return {"message": f"Reservation {reservation_id} cancelled successfully"}
 
 
@@ -380,18 +468,29 @@ async def check_in_guest(
     reservation.checked_in_by = current_user.get("user_id")  # Store receptionist ID
 
     # Update room status to occupied (prevents double-booking)
+    previous_room_status = room.status
     room.status = 'occupied'
 
     db.commit()
     db.refresh(reservation)
 
+    broker.publish(RESERVATION_CHECKED_IN, {
+        "reservation_id": reservation_id,
+        "confirmation_number": reservation.confirmation_number,
+        "room_id": room_id,
+    })
+    broker.publish(ROOM_STATUS_CHANGED, {
+        "room_id": room_id, "room_number": room.room_number,
+        "status": "occupied", "previous_status": previous_room_status,
+    })
+
     # Get receptionist info for response
     receptionist = db.query(User).filter(User.id == current_user.get("user_id")).first()
     receptionist_name = receptionist.username if receptionist else "Unknown"
 
     # Calculate payment status
     total_paid = reservation.calculate_total_paid()
-    balance = reservation.calculate_balance()
+    balance = stay_balance(db, reservation)
     if balance <= 0:
         payment_status = "fully_paid"
     elif total_paid > 0:
@@ -453,7 +552,7 @@ async def check_out_guest(
 
     # Calculate final balance
     total_paid = reservation.calculate_total_paid()
-    balance = reservation.calculate_balance()
+    balance = stay_balance(db, reservation)
     deposit_amount = float(reservation.deposit_amount) if reservation.deposit_amount else 0.0
 
     # Deposit settlement logic
@@ -484,14 +583,27 @@ async def check_out_guest(
     reservation.deposit_returned_at = datetime.utcnow()  # Mark deposit as processed
 
     # Update room status
+    room = None
     if reservation.room_id:
         room = db.query(Room).filter(Room.id == reservation.room_id).first()
         if room:
+            previous_room_status = room.status
             room.status = 'available'
 
     db.commit()
     db.refresh(reservation)
 
+    broker.publish(RESERVATION_CHECKED_OUT, {
+        "reservation_id": reservation_id,
+        "confirmation_number": reservation.confirmation_number,
+        "room_id": reservation.room_id,
+    })
+    if room:
+        broker.publish(ROOM_STATUS_CHANGED, {
+            "room_id": room.id, "room_number": room.room_number,
+            "status": "available", "previous_status": previous_room_status,
+        })
+
     return {
         "message": "Guest checked out successfully",
         "reservation_id": reservation_id,
@@ -522,6 +634,8 @@ async def get_reservation_balance(
 
     **Returns**:
     - Balance details including total, paid, and remaining amount
+      (the balance is read from the folio, so it includes extra charges
+      posted there; extra_charges is their net amount)
     - Deposit information: amount held and return status
     - Final balance after deposit is applied (for checkout)
     """
@@ -532,7 +646,7 @@ async def get_reservation_balance(
 
     total_amount = float(reservation.total_amount)
     total_paid = reservation.calculate_total_paid()
-    balance = reservation.calculate_balance()
+    balance = stay_balance(db, reservation)
     deposit_amount = float(reservation.deposit_amount) if reservation.deposit_amount else 0.0
 
     # Determine payment status
@@ -552,10 +666,12 @@ async def get_reservation_balance(
         "guest_name": reservation.guest.full_name,
         "total_amount": total_amount,
         "total_paid": total_paid,
+        "extra_charges": round(balance - (total_amount - total_paid), 2),
         "balance": balance,
         "deposit_amount": deposit_amount,
         "deposit_returned_at": reservation.deposit_returned_at.isoformat() if reservation.deposit_returned_at else None,
         "final_balance_after_deposit": final_balance_after_deposit,
+        "folio_balance": folio_balance(db, reservation_id),
         "payment_status": payment_status,
         "reservation_status": reservation.status,
     }
@@ -2,6 +2,8 @@
 Room management routes
 """
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session, joinedload
 
@@ -9,6 +11,8 @@ from models import Room, RoomType
 from schemas import RoomCreate, RoomUpdate
 from security import get_current_user
 from database import get_db
+from events import broker, ROOM_STATUS_CHANGED
+from serializers import FastJSONResponse, fetch_rows, select_rooms
 from validators import (
     validate_room_number,
     validate_floor,
@@ -72,24 +76,23 @@ async def get_rooms(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000,
                        description="Maximum number of records to return"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,room_number,status (default: all)"),
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all rooms with pagination"""
+    """Get all rooms with pagination; ?fields= narrows the columns (and joins)"""
     # Get total count for pagination metadata
     total = db.query(Room).count()
 
-    # Query rooms with room_type relationship loaded
-    rooms = (db.query(Room)
-             .options(joinedload(Room.room_type))
-             .offset(skip).limit(limit).all())
+    # Column-only query with the room type joined in SQL (see serializers.py)
+    rooms = fetch_rows(db, select_rooms(fields).order_by(Room.id).offset(skip).limit(limit))
 
-    return {
-        "rooms": [_format_room_response(room) for room in rooms],
+    return FastJSONResponse({
+        "rooms": rooms,
         "total": total,
         "skip": skip,
         "limit": limit
-    }
+    })
 
 
 @router.get("/{room_id}", response_model=dict)
@@ -243,12 +246,19 @@ async def update_room(
         update_data["custom_rate"] = update_data.pop("monthly_rate")
 
     # Update fields
+    previous_status = room.status
     for field, value in update_data.items():
         setattr(room, field, value)
 
     db.commit()
     db.refresh(room)
 
+    if room.status != previous_status:
+        broker.publish(ROOM_STATUS_CHANGED, {
+            "room_id": room.id, "room_number": room.room_number,
+            "status": room.status, "previous_status": previous_status,
+        })
+
     return {
         "message": "Room updated successfully",
         "room": _format_room_response(room)
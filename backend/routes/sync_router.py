@@ -0,0 +1,48 @@
+"""
+Delta Sync Routes
+
+Incremental refresh for frontend stores (see sync.py):
+- GET /api/sync - Rooms, reservations, guests and payments changed since a token
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from database import get_db
+from security import get_current_user
+from serializers import FastJSONResponse
+from sync import InvalidSyncToken, collect_changes, decode_token
+
+router = APIRouter(prefix="/api/sync", tags=["Sync"])
+
+
+@router.get("")
+def get_changes(
+    since: Optional[str] = Query(None, description="Token from the previous sync; omit for a full snapshot"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page of this sync"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Rows created or updated since the token, plus IDs deleted since then.
+
+    Rows use the same format as the list endpoints. Store the returned token
+    and pass it as `since` next time. Apply changes as upserts: rows changed
+    around the token boundary can be returned twice.
+
+    Results are paged: while `cursor` is set, request `?cursor=<cursor>` for
+    the next page (since is then ignored); the last page has cursor=null and
+    the token.
+
+    **Returns**: {"token", "cursor", "reset", "changes": {store: [rows]}, "deleted": {store: [ids]}};
+    with reset=true (first sync or token too old) the pages together are a
+    full snapshot and the client should replace its stores. Read-only:
+    expired tombstones are pruned by scripts/prune_sync_tombstones.py.
+    """
+    try:
+        since_at = decode_token(since) if since and not cursor else None
+        return FastJSONResponse(collect_changes(db, since_at, cursor))
+    except InvalidSyncToken as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,80 +1,72 @@
 #!/usr/bin/env python3
 """
 Database migration runner for Supabase
-Executes SQL migration files against the database
+Applies pending SQL migration files and records them in schema_migrations
+(see schema_migrations.py)
+
+Usage:
+    python run_migrations.py                 # apply pending migrations
+    python run_migrations.py --status        # show applied / pending versions
+    python run_migrations.py --baseline 9    # mark 001..009 as applied (existing databases)
 """
 
+import argparse
 import os
 import sys
-from pathlib import Path
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine
 
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
+from schema_migrations import (  # noqa: E402
+    baseline, current_version, discover_migrations, pending_migrations, upgrade,
+)
+
 DATABASE_URL = os.getenv('DATABASE_URL')
 
 if not DATABASE_URL:
     print("ERROR: DATABASE_URL environment variable not set")
     sys.exit(1)
 
-def run_migrations():
-    """Run all SQL migration files in order"""
-    migrations_dir = Path(__file__).parent / 'migrations'
-    migration_files = sorted(migrations_dir.glob('*.sql'))
-
-    if not migration_files:
-        print("No migration files found")
-        return
-
-    engine = create_engine(DATABASE_URL)
-
-    with engine.connect() as connection:
-        for migration_file in migration_files:
-            print(f"\nRunning: {migration_file.name}")
-            print("-" * 60)
 
-            with open(migration_file, 'r') as f:
-                sql = f.read()
+def show_status(engine):
+    """Print applied and pending migrations"""
+    pending = {m.version for m in pending_migrations(engine)}
+    print(f"Schema version: {current_version(engine)}")
+    for migration in discover_migrations():
+        state = "pending" if migration.version in pending else "applied"
+        print(f"  {migration.version:03d}_{migration.name}: {state}")
 
-            try:
-                # Handle PostgreSQL procedural blocks (DO $$ ... $$;)
-                # Split by $$ to separate blocks, then recombine properly
-                import re
 
-                # First, handle DO blocks specially
-                do_blocks = re.findall(r'DO\s*\$\$[\s\S]*?\$\$\s*;', sql, re.IGNORECASE)
-                for block in do_blocks:
-                    if block.strip():
-                        connection.execute(text(block))
+def run_migrations(engine):
+    """Apply all pending migration files in order"""
+    applied = upgrade(engine)
+    if not applied:
+        print("Database is up to date")
+    for version in applied:
+        print(f"✓ Applied migration {version:03d}")
 
-                # Remove DO blocks from sql for normal statement processing
-                remaining_sql = sql
-                for block in do_blocks:
-                    remaining_sql = remaining_sql.replace(block, '')
-
-                # Split remaining by ; to handle multiple statements
-                statements = [s.strip() for s in remaining_sql.split(';') if s.strip()]
-                for statement in statements:
-                    # Skip comment-only statements
-                    if statement and not statement.startswith('--'):
-                        connection.execute(text(statement))
-
-                connection.commit()
-                print(f"✓ {migration_file.name} completed successfully")
-            except Exception as e:
-                print(f"✗ Error in {migration_file.name}: {e}")
-                connection.rollback()
-                raise
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Apply versioned SQL migrations")
+    parser.add_argument("--status", action="store_true", help="Show applied and pending migrations")
+    parser.add_argument("--baseline", type=int, metavar="VERSION",
+                        help="Mark migrations up to VERSION as applied without running them")
+    args = parser.parse_args()
+
+    engine = create_engine(DATABASE_URL)
     try:
-        run_migrations()
-        print("\n" + "=" * 60)
-        print("All migrations completed successfully!")
-        print("=" * 60)
+        if args.status:
+            show_status(engine)
+        elif args.baseline is not None:
+            stamped = baseline(engine, args.baseline)
+            print(f"✓ Marked {len(stamped)} migration(s) as applied")
+        else:
+            run_migrations(engine)
+            print("\n" + "=" * 60)
+            print("All migrations completed successfully!")
+            print("=" * 60)
     except Exception as e:
         print("\n" + "=" * 60)
         print(f"Migration failed: {e}")
@@ -0,0 +1,240 @@
+"""
+Versioned schema migrations for Hotel Management System
+
+migrations/NNN_name.sql files are applied in order and recorded in the
+schema_migrations table (one row per applied version), so app startup only
+needs one query - SELECT max(version) - instead of reflecting every table
+with Base.metadata.create_all().
+
+- PostgreSQL: pending SQL files are applied by `python run_migrations.py`
+  (or at startup with AUTO_MIGRATE=true), each in its own transaction
+  together with its version row. A database created before this table
+  existed is marked as migrated up to a version with
+  `python run_migrations.py --baseline N`.
+- Other dialects (the SQLite development/test database): the SQL files are
+  PostgreSQL-only, so the schema is created from the models and stamped
+  with the latest version. create_all() cannot add columns to existing
+  tables, so a database that has tables but no schema_migrations, or that
+  still lacks model columns, is refused: delete it to rebuild it from the
+  models.
+
+A PostgreSQL database behind the latest version (or never stamped) stops
+startup with MigrationError unless AUTO_MIGRATE=true, instead of serving
+requests against a schema missing newer columns and indexes.
+"""
+
+import logging
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, insert, select, text
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False, default=datetime.utcnow),
+)
+
+_FILE_NAME = re.compile(r"^(\d+)_(.+)\.sql$")
+_DOLLAR_QUOTE = re.compile(r"\$[A-Za-z_]*\$")
+
+
+class MigrationError(RuntimeError):
+    """Raised when migrations cannot be applied"""
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    path: Path
+
+
+def discover_migrations(directory: Path = MIGRATIONS_DIR) -> list:
+    """Migration files sorted by version"""
+    migrations = []
+    for path in directory.glob("*.sql"):
+        match = _FILE_NAME.match(path.name)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), path))
+    migrations.sort()
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise MigrationError(f"Duplicate migration versions in {directory}")
+    return migrations
+
+
+def latest_version(directory: Path = MIGRATIONS_DIR) -> int:
+    migrations = discover_migrations(directory)
+    return migrations[-1].version if migrations else 0
+
+
+def split_statements(sql: str) -> list:
+    """
+    Split a SQL script on semicolons outside quotes, comments and
+    dollar-quoted bodies (DO $$ ... $$, CREATE FUNCTION ... AS $$ ... $$).
+    """
+    statements, current = [], []
+    i, length = 0, len(sql)
+    while i < length:
+        char = sql[i]
+        if sql.startswith("--", i):
+            end = sql.find("\n", i)
+            i = length if end == -1 else end + 1
+            current.append("\n")
+            continue
+        if char == "'":
+            end = i + 1
+            while True:
+                end = sql.find("'", end)
+                if end == -1 or not sql.startswith("''", end):
+                    break
+                end += 2
+            end = length if end == -1 else end + 1
+            current.append(sql[i:end])
+            i = end
+            continue
+        if char == "$":
+            match = _DOLLAR_QUOTE.match(sql, i)
+            if match:
+                end = sql.find(match.group(0), match.end())
+                end = length if end == -1 else end + len(match.group(0))
+                current.append(sql[i:end])
+                i = end
+                continue
+        if char == ";":
+            statement = "".join(current).strip()
+            if statement:
+                statements.append(statement)
+            current = []
+        else:
+            current.append(char)
+        i += 1
+
+    statement = "".join(current).strip()
+    if statement:
+        statements.append(statement)
+    return statements
+
+
+def current_version(engine) -> Optional[int]:
+    """Highest applied version, 0 for an empty table, None if the table does not exist"""
+    with engine.connect() as connection:
+        try:
+            return connection.execute(select(func.max(schema_migrations.c.version))).scalar() or 0
+        except DBAPIError:
+            connection.rollback()
+            return None
+
+
+def applied_versions(engine) -> set:
+    with engine.connect() as connection:
+        if not inspect(connection).has_table("schema_migrations"):
+            return set()
+        return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def stamp(engine, migrations: list):
+    """Record migrations as applied without running them"""
+    _metadata.create_all(engine)
+    already = applied_versions(engine)
+    rows = [{"version": m.version, "name": m.name, "applied_at": datetime.utcnow()}
+            for m in migrations if m.version not in already]
+    if rows:
+        with engine.begin() as connection:
+            connection.execute(insert(schema_migrations), rows)
+    return [row["version"] for row in rows]
+
+
+def baseline(engine, version: int, directory: Path = MIGRATIONS_DIR) -> list:
+    """Mark every migration up to `version` as applied (existing databases)"""
+    return stamp(engine, [m for m in discover_migrations(directory) if m.version <= version])
+
+
+def pending_migrations(engine, directory: Path = MIGRATIONS_DIR) -> list:
+    applied = applied_versions(engine)
+    return [m for m in discover_migrations(directory) if m.version not in applied]
+
+
+def _refuse_unversioned(engine, remedy: str):
+    """Raise if the database has model tables but no schema_migrations"""
+    with engine.connect() as connection:
+        inspector = inspect(connection)
+        if not inspector.has_table("schema_migrations") and inspector.has_table("users"):
+            raise MigrationError(f"Database has tables but no schema_migrations; {remedy}")
+
+
+def _check_model_columns(engine, metadata):
+    """Raise if create_all() left existing tables without columns the models define"""
+    with engine.connect() as connection:
+        inspector = inspect(connection)
+        missing = [
+            f"{table.name}.{column.name}"
+            for table in metadata.sorted_tables
+            for column in table.columns
+            if column.name not in {c["name"] for c in inspector.get_columns(table.name)}
+        ]
+    if missing:
+        raise MigrationError(
+            f"Database is missing model columns ({', '.join(missing[:10])}); "
+            "delete it to rebuild it from the models"
+        )
+
+
+def upgrade(engine, directory: Path = MIGRATIONS_DIR) -> list:
+    """Apply pending migrations; returns the versions applied"""
+    if engine.dialect.name != "postgresql":
+        # SQL files are PostgreSQL-only: build the schema from the models instead
+        from models import Base
+
+        _refuse_unversioned(engine, "delete it to rebuild it from the models")
+        Base.metadata.create_all(bind=engine)
+        _check_model_columns(engine, Base.metadata)
+        return stamp(engine, discover_migrations(directory))
+
+    _refuse_unversioned(
+        engine, "mark the migrations it already has with `python run_migrations.py --baseline N` first",
+    )
+
+    _metadata.create_all(engine)
+    applied = []
+    for migration in pending_migrations(engine, directory):
+        logger.info("Applying migration %03d_%s", migration.version, migration.name)
+        with engine.begin() as connection:
+            for statement in split_statements(migration.path.read_text()):
+                connection.execute(text(statement))
+            connection.execute(insert(schema_migrations).values(
+                version=migration.version, name=migration.name, applied_at=datetime.utcnow(),
+            ))
+        applied.append(migration.version)
+    return applied
+
+
+def ensure_schema(engine, directory: Path = MIGRATIONS_DIR) -> Optional[int]:
+    """
+    Startup check: one version query when the database is up to date.
+    Returns the schema version the app runs against.
+    """
+    latest = latest_version(directory)
+    version = current_version(engine)
+    if version is not None and version >= latest:
+        return version
+
+    if engine.dialect.name != "postgresql" or os.getenv("AUTO_MIGRATE", "false").lower() == "true":
+        upgrade(engine, directory)
+        return latest
+
+    raise MigrationError(
+        f"Database schema is at version {version}, latest is {latest}; "
+        "run `python run_migrations.py` (or start with AUTO_MIGRATE=true)"
+    )
@@ -3,7 +3,7 @@ Pydantic schemas for request/response validation
 """
 
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -591,10 +591,11 @@ class ReservationCreate(BaseModel):
     check_out_date: str  # ISO format: YYYY-MM-DD
     adults: int = Field(default=1, ge=1)
     children: int = Field(default=0, ge=0)
-    rate_per_night: float = Field(..., gt=0)
-    subtotal: float = Field(..., ge=0)
-    discount_amount: float = Field(default=0.0, ge=0)
-    total_amount: float = Field(..., gt=0)
+    rate_per_night: Optional[float] = Field(None, gt=0)  # Flat negotiated rate; omit to price from the rate calendar
+    subtotal: Optional[float] = Field(None, ge=0)  # Ignored - computed by the pricing engine
+    discount_amount: float = Field(default=0.0, ge=0)  # Manual discount, used only when no discount rule applies
+    discount_code: Optional[str] = Field(None, max_length=20)
+    total_amount: Optional[float] = Field(None, gt=0)  # Ignored - computed by the pricing engine
     deposit_amount: float = Field(default=0.0, ge=0)  # Security deposit (refundable at checkout)
     special_requests: Optional[str] = None
 
@@ -607,10 +608,7 @@ class ReservationCreate(BaseModel):
                 "check_out_date": "2025-11-13",
                 "adults": 2,
                 "children": 1,
-                "rate_per_night": 500000,
-                "subtotal": 1500000,
                 "discount_amount": 100000,
-                "total_amount": 1400000,
                 "deposit_amount": 500000,
                 "special_requests": "Late check-in, breakfast included"
             }
@@ -655,6 +653,7 @@ class ReservationResponse(BaseModel):
     rate_per_night: float
     subtotal: float
     discount_amount: float
+    discount_id: Optional[int] = None
     total_amount: float
     deposit_amount: float
     special_requests: Optional[str] = None
@@ -718,6 +717,175 @@ class ReservationListResponse(BaseModel):
         }
 
 
+# ============== RATE SCHEMAS ==============
+
+class RateRuleCreate(BaseModel):
+    """Seasonal / weekday rate rule creation schema"""
+    name: str = Field(..., min_length=1, max_length=100)
+    room_type_id: Optional[int] = None  # NULL applies to all room types
+    start_date: Optional[str] = None  # ISO format: YYYY-MM-DD
+    end_date: Optional[str] = None  # ISO format: YYYY-MM-DD (inclusive)
+    days_of_week: Optional[list[int]] = None  # 0=Monday .. 6=Sunday
+    adjustment_type: str = Field(..., max_length=20)  # fixed_rate, percentage, fixed_amount
+    adjustment_value: float
+    priority: int = 0
+    is_active: bool = True
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "name": "Weekend uplift",
+                "room_type_id": 2,
+                "start_date": "2025-12-01",
+                "end_date": "2026-01-31",
+                "days_of_week": [4, 5],
+                "adjustment_type": "percentage",
+                "adjustment_value": 20,
+                "priority": 10
+            }
+        }
+
+
+class RateRuleUpdate(BaseModel):
+    """Rate rule update schema"""
+    name: Optional[str] = Field(None, min_length=1, max_length=100)
+    room_type_id: Optional[int] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    days_of_week: Optional[list[int]] = None
+    adjustment_type: Optional[str] = Field(None, max_length=20)
+    adjustment_value: Optional[float] = None
+    priority: Optional[int] = None
+    is_active: Optional[bool] = None
+
+
+class RateCalendarSet(BaseModel):
+    """Set an explicit nightly rate for a room type over a date range"""
+    room_type_id: int
+    start_date: str  # ISO format: YYYY-MM-DD
+    end_date: str  # ISO format: YYYY-MM-DD (inclusive)
+    rate: float = Field(..., ge=0)
+    notes: Optional[str] = Field(None, max_length=255)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "room_type_id": 2,
+                "start_date": "2025-12-24",
+                "end_date": "2025-12-26",
+                "rate": 950000,
+                "notes": "Christmas"
+            }
+        }
+
+
+# ============== DISCOUNT SCHEMAS ==============
+
+class DiscountCreate(BaseModel):
+    """Discount creation schema"""
+    name: str = Field(..., min_length=1, max_length=100)
+    code: Optional[str] = Field(None, max_length=20)  # Omit for auto-applied promotions without a code
+    description: Optional[str] = None
+    discount_type: str = Field(..., max_length=20)  # percentage, fixed_amount
+    discount_value: float = Field(..., gt=0)
+    max_discount_amount: Optional[float] = Field(None, gt=0)
+    applicable_room_types: Optional[list[int]] = None  # Room type IDs, omit for all
+    applicable_guests: Optional[list[int]] = None  # Guest IDs, omit for all
+    valid_from: Optional[str] = None  # ISO format: YYYY-MM-DD (check-in date)
+    valid_until: Optional[str] = None  # ISO format: YYYY-MM-DD (check-in date, inclusive)
+    usage_limit: Optional[int] = Field(None, ge=1)
+    min_stay_nights: Optional[int] = Field(None, ge=1)
+    min_booking_amount: Optional[float] = Field(None, ge=0)
+    max_bookings_per_guest: Optional[int] = Field(None, ge=1)
+    status: str = Field(default="active", max_length=20)  # active, inactive, expired
+    is_auto_applied: bool = False
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "name": "Long stay",
+                "discount_type": "percentage",
+                "discount_value": 10,
+                "max_discount_amount": 1000000,
+                "min_stay_nights": 7,
+                "is_auto_applied": True
+            }
+        }
+
+
+class DiscountUpdate(BaseModel):
+    """Discount update schema"""
+    name: Optional[str] = Field(None, min_length=1, max_length=100)
+    code: Optional[str] = Field(None, max_length=20)
+    description: Optional[str] = None
+    discount_type: Optional[str] = Field(None, max_length=20)
+    discount_value: Optional[float] = Field(None, gt=0)
+    max_discount_amount: Optional[float] = Field(None, gt=0)
+    applicable_room_types: Optional[list[int]] = None
+    applicable_guests: Optional[list[int]] = None
+    valid_from: Optional[str] = None
+    valid_until: Optional[str] = None
+    usage_limit: Optional[int] = Field(None, ge=1)
+    min_stay_nights: Optional[int] = Field(None, ge=1)
+    min_booking_amount: Optional[float] = Field(None, ge=0)
+    max_bookings_per_guest: Optional[int] = Field(None, ge=1)
+    status: Optional[str] = Field(None, max_length=20)
+    is_auto_applied: Optional[bool] = None
+
+
+# ============== FOLIO SCHEMAS ==============
+
+class FolioEntryCreate(BaseModel):
+    """Folio posting schema (amount is positive except for adjustments)"""
+    entry_type: str = Field(..., max_length=20)  # charge, payment, refund, adjustment, deposit
+    amount: float
+    category: Optional[str] = Field(None, max_length=30)  # minibar, restaurant, late_checkout, ...
+    description: Optional[str] = Field(None, max_length=255)
+    payment_method: Optional[str] = Field(None, max_length=20)  # payments, deposits and refunds only
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "entry_type": "charge",
+                "amount": 75000,
+                "category": "minibar",
+                "description": "2x soft drink, 1x snack"
+            }
+        }
+
+
+class FolioReversal(BaseModel):
+    """Folio entry reversal schema"""
+    reason: Optional[str] = Field(None, max_length=255)
+
+
+# ============== BATCH SCHEMAS ==============
+
+class BatchSubRequest(BaseModel):
+    """One read-only sub-request of a batch"""
+    id: Optional[str] = Field(None, max_length=50)  # Echoed back to match results; defaults to the index
+    method: str = Field("GET", max_length=10)
+    path: str = Field(..., max_length=2000)  # Path with query string, e.g. /api/dashboard/revenue?period=week
+
+
+class BatchRequest(BaseModel):
+    """Batch of read-only sub-requests executed in one request"""
+    requests: List[BatchSubRequest] = Field(..., min_length=1, max_length=20)
+    consistent: bool = False  # Run all sub-requests in one read-only snapshot transaction
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "requests": [
+                    {"id": "today", "path": "/api/dashboard/today"},
+                    {"id": "metrics", "path": "/api/dashboard/metrics"},
+                    {"id": "revenue", "path": "/api/dashboard/revenue?period=week"}
+                ],
+                "consistent": True
+            }
+        }
+
+
 # ============== ERROR SCHEMAS ==============
 
 class ErrorResponse(BaseModel):
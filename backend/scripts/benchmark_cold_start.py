@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark Cold Start
+Measures import-to-first-response time of the API in fresh Python
+processes (what a Cloud Run cold start pays before serving):
+
+- import: `import app` (modules, routers, engine)
+- startup: lifespan, i.e. the schema version check (schema_migrations.py)
+- first response: GET /api through the full middleware stack
+
+For comparison each run also times Base.metadata.create_all() against the
+same database, which the app used to run twice (import + lifespan).
+
+Runs against a throwaway SQLite database unless --database-url is given.
+
+Usage:
+    python scripts/benchmark_cold_start.py
+    python scripts/benchmark_cold_start.py --runs 10 --database-url postgresql://...
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+backend_path = Path(__file__).parent.parent
+
+CHILD = """
+import json, sys, time
+from fastapi.testclient import TestClient  # test client import is not part of the app's cold start
+
+started = time.perf_counter()
+import app as application
+imported = time.perf_counter()
+with TestClient(application.app) as client:
+    ready = time.perf_counter()
+    response = client.get("/api")
+    responded = time.perf_counter()
+assert response.status_code == 200, response.text
+
+from database import engine
+from models import Base
+create_all_started = time.perf_counter()
+Base.metadata.create_all(bind=engine)
+create_all = time.perf_counter() - create_all_started
+
+print(json.dumps({
+    "import": imported - started,
+    "startup": ready - imported,
+    "first_response": responded - ready,
+    "total": responded - started,
+    "create_all": create_all,
+}))
+"""
+
+
+def run_once(database_url: str) -> dict:
+    env = {**os.environ, "DATABASE_URL": database_url, "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=backend_path, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run(database_url: str, runs: int):
+    run_once(database_url)  # creates and stamps the schema; not measured
+
+    samples = [run_once(database_url) for _ in range(runs)]
+    median = {key: statistics.median(s[key] for s in samples) for key in samples[0]}
+
+    print(f"📊 Cold start, median of {runs} fresh processes (ms)\n")
+    print(f"   import app            {median['import'] * 1000:8.1f}")
+    print(f"   startup (lifespan)    {median['startup'] * 1000:8.1f}")
+    print(f"   first response        {median['first_response'] * 1000:8.1f}")
+    print(f"   import → response     {median['total'] * 1000:8.1f}")
+    print(f"\n   create_all() x2 (previous startup work) {median['create_all'] * 2000:8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure import-to-first-response time")
+    parser.add_argument("--runs", type=int, default=5, help="Measured runs (fresh processes)")
+    parser.add_argument("--database-url", help="Database to start against (default: temporary SQLite file)")
+    args = parser.parse_args()
+
+    if args.database_url:
+        run(args.database_url, args.runs)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            run(f"sqlite:///{tmp}/cold_start.db", args.runs)
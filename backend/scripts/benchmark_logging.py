@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark Logging Under a Slow Sink
+Measures request latency (p50/p99) of a small endpoint with
+RequestInstrumentationMiddleware writing one access-log line per request
+to a sink that takes --sink-delay-ms per record (a stalled stdout pipe or
+a slow disk):
+
+- baseline: fast sink (/dev/null) behind the log queue
+- sync: the slow sink attached directly to the logger (the previous setup)
+- queued: the slow sink behind BoundedQueueHandler + QueueListener
+
+Also reports how many records the bounded queue dropped.
+
+Usage:
+    python scripts/benchmark_logging.py
+    python scripts/benchmark_logging.py --requests 2000 --sink-delay-ms 20 --queue-size 500
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import queue
+import statistics
+import sys
+import time
+from logging.handlers import QueueListener
+from pathlib import Path
+
+# Add backend directory to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from error_handlers import (  # noqa: E402
+    BoundedQueueHandler, RequestInstrumentationMiddleware, StructuredFormatter, logger, stop_logging,
+)
+
+
+class SlowStreamHandler(logging.StreamHandler):
+    """StreamHandler that takes `delay` seconds per record"""
+
+    def __init__(self, stream, delay: float):
+        super().__init__(stream)
+        self.delay = delay
+
+    def emit(self, record):
+        time.sleep(self.delay)
+        super().emit(record)
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestInstrumentationMiddleware)
+
+    @app.get("/api/rooms/{room_id}")
+    async def room(room_id: int):
+        return {"id": room_id, "status": "available"}
+
+    return app
+
+
+async def measure(requests: int) -> list:
+    """Per-request latencies in seconds"""
+    transport = httpx.ASGITransport(app=build_app())
+    latencies = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/api/rooms/1")
+        for i in range(requests):
+            started = time.perf_counter()
+            response = await client.get(f"/api/rooms/{i}")
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200
+    return latencies
+
+
+def run_case(name: str, sink: logging.Handler, queued: bool, requests: int, queue_size: int):
+    sink.setFormatter(StructuredFormatter())
+    listener = None
+    if queued:
+        handler = BoundedQueueHandler(queue.Queue(maxsize=queue_size))
+        listener = QueueListener(handler.queue, sink)
+        listener.start()
+        logger.handlers = [handler]
+    else:
+        handler = None
+        logger.handlers = [sink]
+
+    latencies = sorted(asyncio.run(measure(requests)))
+    if listener is not None:
+        listener.stop()
+
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    dropped = f"{handler.dropped:>6} dropped" if handler else ""
+    print(f"   {name:<10} p50 {p50:8.2f} ms   p99 {p99:8.2f} ms   {dropped}")
+
+
+def run(requests: int, sink_delay_ms: float, queue_size: int):
+    stop_logging()  # the app's own listener is not part of the measurement
+    logger.propagate = False
+    devnull = open(os.devnull, "w")
+    delay = sink_delay_ms / 1000
+
+    print(f"📊 {requests} requests, sink delay {sink_delay_ms} ms/record, queue size {queue_size}\n")
+    run_case("baseline", logging.StreamHandler(devnull), True, requests, queue_size)
+    run_case("sync", SlowStreamHandler(devnull, delay), False, requests, queue_size)
+    run_case("queued", SlowStreamHandler(devnull, delay), True, requests, queue_size)
+    devnull.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Request latency with a slow log sink")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--sink-delay-ms", type=float, default=5.0)
+    parser.add_argument("--queue-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    run(args.requests, args.sink_delay_ms, args.queue_size)
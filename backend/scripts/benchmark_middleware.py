@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark Request Middleware
+Compares requests/sec of a small JSON endpoint through:
+
+- bare: no middleware
+- legacy: the previous RequestLoggingMiddleware + PerformanceLoggingMiddleware
+  (two BaseHTTPMiddleware layers, two log lines per request), reproduced
+  below for reference
+- asgi: RequestInstrumentationMiddleware (error_handlers.py)
+
+Requests are sent in process through httpx's ASGI transport (no network
+or server), so differences between the stacks are middleware overhead. Log output goes
+through the real StructuredFormatter into /dev/null.
+
+Usage:
+    python scripts/benchmark_middleware.py
+    python scripts/benchmark_middleware.py --requests 20000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add backend directory to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from error_handlers import RequestInstrumentationMiddleware, StructuredFormatter, logger  # noqa: E402
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request_id = request.headers.get("X-Request-ID", str(datetime.utcnow().timestamp()))
+        client = request.client.host if request.client else "unknown"
+        logger.info(f"Request: {request.method} {request.url.path}", extra={
+            "request_id": request_id, "method": request.method, "path": request.url.path,
+            "query_params": dict(request.query_params), "client": client,
+        })
+        response = await call_next(request)
+        logger.info(f"Response: {request.method} {request.url.path} - {response.status_code}", extra={
+            "request_id": request_id, "method": request.method, "path": request.url.path,
+            "status_code": response.status_code, "client": client,
+        })
+        return response
+
+
+class LegacyPerformanceLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        if process_time > 1.0:
+            logger.warning(f"Slow Request: {request.method} {request.url.path} took {process_time:.2f}s")
+        response.headers["X-Process-Time"] = str(process_time)
+        return response
+
+
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/rooms/{room_id}")
+    async def room(room_id: int):
+        return {"id": room_id, "room_number": f"{room_id:03d}", "status": "available"}
+
+    if stack == "legacy":
+        app.add_middleware(LegacyRequestLoggingMiddleware)
+        app.add_middleware(LegacyPerformanceLoggingMiddleware)
+    elif stack == "asgi":
+        app.add_middleware(RequestInstrumentationMiddleware)
+    return app
+
+
+async def measure(app, requests: int, concurrency: int) -> float:
+    """Requests per second"""
+    transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/api/rooms/1")  # build the middleware stack
+        per_worker = requests // concurrency
+
+        async def worker(offset):
+            for i in range(per_worker):
+                response = await client.get(f"/api/rooms/{offset + i}", params={"page": 1})
+                assert response.status_code == 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(w * per_worker) for w in range(concurrency)))
+        return per_worker * concurrency / (time.perf_counter() - started)
+
+
+def run(requests: int, concurrency: int, rounds: int):
+    devnull = open(os.devnull, "w")
+    handler = logging.StreamHandler(devnull)
+    handler.setFormatter(StructuredFormatter())
+    logger.handlers = [handler]
+
+    print(f"📊 {requests} requests, concurrency {concurrency}, best of {rounds}\n")
+    results = {}
+    for stack in ("bare", "legacy", "asgi"):
+        app = build_app(stack)
+        results[stack] = max(asyncio.run(measure(app, requests, concurrency)) for _ in range(rounds))
+        print(f"   {stack:<8} {results[stack]:10,.0f} req/s")
+
+    print(f"\n✅ asgi vs legacy: {results['asgi'] / results['legacy']:.2f}x requests/sec")
+    devnull.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark request middleware overhead")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    run(args.requests, args.concurrency, args.rounds)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark List Serialization
+Compares rows/sec for a list page serialized the ORM way (load objects,
+to_dict(), jsonable_encoder, json.dumps - what the endpoints used to do)
+against the Core column sets + FastJSONResponse encoder in serializers.py.
+
+Runs against a throwaway SQLite database seeded with synthetic rows, so it
+never touches DATABASE_URL.
+
+Usage:
+    python scripts/benchmark_serializers.py                 # 1,000-row pages
+    python scripts/benchmark_serializers.py --page-size 500 --rows 20000 --repeat 10
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import joinedload, sessionmaker  # noqa: E402
+
+from models import Base, Guest, Payment, Reservation, Room, RoomType, User  # noqa: E402
+from routes.rooms_router import _format_room_response  # noqa: E402
+from serializers import (  # noqa: E402
+    dumps, fetch_rows, select_guests, select_payments, select_reservations, select_rooms,
+)
+
+
+def seed(db, rows: int):
+    """Insert `rows` rooms, guests, reservations and payments (Core bulk inserts)"""
+    db.execute(insert(User), [{"id": 1, "username": "bench", "email": "bench@example.com",
+                               "password_hash": "x", "full_name": "Bench", "role": "admin"}])
+    db.execute(insert(RoomType), [{"id": 1, "name": "Standard", "code": "STD", "default_rate": 500000,
+                                   "amenities": "wifi,tv"}])
+    now = datetime.utcnow()
+    db.execute(insert(Room), [{"id": i, "room_number": f"R{i}", "floor": i % 10, "room_type_id": 1,
+                               "status": "available", "created_at": now, "updated_at": now}
+                              for i in range(1, rows + 1)])
+    db.execute(insert(Guest), [{"id": i, "full_name": f"Guest {i}", "email": f"guest{i}@example.com",
+                                "phone": f"08{i:09d}", "birth_date": date(1980, 1, 1) + timedelta(days=i % 9000),
+                                "created_at": now, "updated_at": now}
+                               for i in range(1, rows + 1)])
+    db.execute(insert(Reservation), [{
+        "id": i, "confirmation_number": f"BEN{i:07d}", "guest_id": i, "room_type_id": 1, "room_id": i,
+        "check_in_date": date(2026, 1, 1), "check_out_date": date(2026, 1, 3), "rate_per_night": 500000,
+        "number_of_nights": 2, "subtotal": 1000000, "total_amount": 1000000, "total_paid": 250000,
+        "balance": 750000, "status": "checked_in", "checked_in_by": 1, "checked_in_at": now,
+        "created_by": 1, "created_at": now, "updated_at": now,
+    } for i in range(1, rows + 1)])
+    db.execute(insert(Payment), [{
+        "id": i, "reservation_id": i, "payment_date": date(2026, 1, 1), "amount": 250000,
+        "payment_method": "cash", "payment_type": "downpayment", "reference_number": f"REF{i}",
+        "created_by": 1, "created_at": now, "updated_at": now,
+    } for i in range(1, rows + 1)])
+    db.commit()
+
+
+def orm_page(db, model, options, formatter, page_size: int) -> bytes:
+    objects = db.query(model).options(*options).order_by(model.id).limit(page_size).all()
+    return json.dumps(jsonable_encoder({"items": [formatter(obj) for obj in objects]})).encode("utf-8")
+
+
+def core_page(db, statement, model, page_size: int) -> bytes:
+    return dumps({"items": fetch_rows(db, statement.order_by(model.id).limit(page_size))})
+
+
+def measure(session_factory, render, repeat: int) -> float:
+    """Best-of-`repeat` seconds for one page, each run in a fresh session"""
+    best = None
+    for _ in range(repeat):
+        db = session_factory()
+        try:
+            started = time.perf_counter()
+            render(db)
+            elapsed = time.perf_counter() - started
+        finally:
+            db.close()
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(rows: int, page_size: int, repeat: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine)
+
+        db = session_factory()
+        seed(db, rows)
+        db.close()
+
+        cases = (
+            ("rooms", Room, (joinedload(Room.room_type),), _format_room_response, select_rooms()),
+            ("guests", Guest, (), lambda g: g.to_dict(), select_guests()),
+            ("reservations", Reservation,
+             (joinedload(Reservation.guest), joinedload(Reservation.room), joinedload(Reservation.checked_in_by_user)),
+             lambda r: r.to_dict(), select_reservations()),
+            ("payments", Payment, (), lambda p: p.to_dict(), select_payments()),
+        )
+
+        print(f"📊 {page_size}-row pages, best of {repeat} (rows/sec)\n")
+        print(f"   {'endpoint':<14}{'ORM + to_dict':>16}{'Core + dumps':>16}{'speedup':>10}")
+        for name, model, options, formatter, statement in cases:
+            orm = measure(session_factory, lambda s: orm_page(s, model, options, formatter, page_size), repeat)
+            core = measure(session_factory, lambda s: core_page(s, statement, model, page_size), repeat)
+            print(f"   {name:<14}{page_size / orm:>16,.0f}{page_size / core:>16,.0f}{orm / core:>9.1f}x")
+
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark list endpoint serialization")
+    parser.add_argument("--rows", type=int, default=5000, help="Rows seeded per table")
+    parser.add_argument("--page-size", type=int, default=1000, help="Rows per page")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    run(args.rows, min(args.page_size, args.rows), args.repeat)
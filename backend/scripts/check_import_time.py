@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Import-time Budget
+Runs `python -X importtime -c "import app"` in fresh processes and fails
+(exit code 1) when the API's cold import regresses:
+
+- the median cumulative import time of `app` exceeds the budget, or
+- a module that must stay lazy is imported (NumPy is loaded by pricing.py
+  on first use, the database driver when the engine is first used).
+
+Also prints the slowest modules so a regression can be traced.
+
+Usage:
+    python scripts/check_import_time.py                    # budget from IMPORT_BUDGET_MS (default 1200)
+    python scripts/check_import_time.py --budget-ms 800 --runs 5 --top 25
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+backend_path = Path(__file__).parent.parent
+
+DEFAULT_BUDGET_MS = 1200
+LAZY_MODULES = ("numpy", "psycopg2", "bcrypt")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(output: str) -> dict:
+    """module -> (self microseconds, cumulative microseconds) from -X importtime output"""
+    modules = {}
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if match:
+            modules[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return modules
+
+
+def import_once() -> dict:
+    """Timings of one cold `import app`, plus whether the engine was created"""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app, database; print(database._engine is None)"],
+        cwd=backend_path, env=env, capture_output=True, text=True, check=True,
+    )
+    modules = parse_importtime(result.stderr)
+    modules["<engine deferred>"] = result.stdout.strip().endswith("True")
+    return modules
+
+
+def check(budget_ms: float, runs: int, top: int) -> list:
+    """Return the list of budget violations (empty when within budget)"""
+    samples = [import_once() for _ in range(runs)]
+    app_ms = statistics.median(s["app"][1] for s in samples) / 1000
+    last = samples[-1]
+
+    print(f"📊 import app: {app_ms:.0f} ms (median of {runs}, budget {budget_ms:.0f} ms)\n")
+    slowest = sorted(((v[0], name) for name, v in last.items() if isinstance(v, tuple)), reverse=True)[:top]
+    for self_us, name in slowest:
+        print(f"   {self_us / 1000:7.1f} ms  {name}")
+
+    violations = []
+    if app_ms > budget_ms:
+        violations.append(f"import app took {app_ms:.0f} ms (budget {budget_ms:.0f} ms)")
+    for name in LAZY_MODULES:
+        if name in last:
+            violations.append(f"{name} is imported at startup; import it where it is used")
+    if not last["<engine deferred>"]:
+        violations.append("the database engine is created at import time; use database.get_engine()")
+    return violations
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail when the API's import time exceeds its budget")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS)))
+    parser.add_argument("--runs", type=int, default=3, help="Fresh processes to measure (median is used)")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    args = parser.parse_args()
+
+    problems = check(args.budget_ms, args.runs, args.top)
+    if problems:
+        print("\n❌ Startup budget exceeded:")
+        for problem in problems:
+            print(f"   - {problem}")
+        sys.exit(1)
+    print("\n✅ Within startup budget")
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+Generate Synthetic Data
+Fills an empty database with a deterministic, realistic hotel history for
+load and performance testing: rooms, guests, reservations and payments
+over several years. The same --seed and sizes always produce the same rows.
+
+- Rooms are spread over floors and room types (60% STD, 25% DLX, 10% SUI,
+  5% PNT); each room's stays follow each other through the period, so
+  stays overlap only when there are more reservations than room-nights.
+- Returning guests are favoured (guest ids are skewed towards the first
+  guests), rates follow weekend and high-season uplifts, statuses follow
+  the --as-of date (checked_out / checked_in / confirmed, some cancelled).
+- Payments split each reservation's paid amount; total_paid and balance
+  are written consistent with balances.py, so reconcile_balances.py
+  reports no drift.
+
+Rows are generated in chunks and written with COPY on PostgreSQL
+(executemany INSERTs elsewhere), one transaction per chunk, with explicit
+ids; sequences are reset and tables analyzed afterwards. Room types,
+booking channels and a loader user are created if missing. Folio entries
+are not generated.
+
+Usage:
+    python scripts/generate_synthetic_data.py --scale small
+    python scripts/generate_synthetic_data.py --scale large --database-url postgresql://...
+    python scripts/generate_synthetic_data.py --rooms 200 --guests 50000 --reservations 200000 \\
+        --payments 400000 --years 3 --seed 7
+"""
+
+import argparse
+import csv
+import io
+import math
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import create_engine, func, insert, select, text  # noqa: E402
+
+from balances import payment_contribution  # noqa: E402
+from models import BookingChannel, Guest, Payment, Reservation, Room, RoomType, User  # noqa: E402
+
+SCALES = {
+    "small": {"rooms": 50, "guests": 2_000, "reservations": 10_000, "payments": 20_000, "years": 2},
+    "medium": {"rooms": 500, "guests": 100_000, "reservations": 500_000, "payments": 1_000_000, "years": 5},
+    "large": {"rooms": 2_000, "guests": 1_000_000, "reservations": 5_000_000, "payments": 10_000_000, "years": 5},
+}
+
+DEFAULT_START_DATE = date(2021, 1, 1)
+LOADER_USERNAME = "synthetic_loader"
+
+# (code, name, default rate, adults, children, max occupancy, share of rooms)
+ROOM_TYPES = [
+    ("STD", "Standard", 500000, 2, 1, 3, 60),
+    ("DLX", "Deluxe", 750000, 2, 2, 4, 25),
+    ("SUI", "Suite", 1200000, 3, 2, 5, 10),
+    ("PNT", "Penthouse", 2000000, 4, 2, 6, 5),
+]
+# (code, name, channel type, share of bookings)
+BOOKING_CHANNELS = [
+    ("direct", "Direct Booking", "direct", 40),
+    ("traveloka", "Traveloka", "ota", 25),
+    ("tiket", "Tiket.com", "ota", 15),
+    ("booking", "Booking.com", "ota", 15),
+    ("other", "Other", "direct", 5),
+]
+VIEW_TYPES = ["city", "garden", "pool", "mountain"]
+FIRST_NAMES = [
+    "Adi", "Agus", "Ayu", "Bambang", "Budi", "Dewi", "Dian", "Eko", "Fajar", "Fitri", "Gita", "Hadi",
+    "Indah", "Joko", "Kartika", "Lestari", "Made", "Nyoman", "Putri", "Rina", "Sari", "Siti", "Teguh",
+    "Wayan", "Yuni", "Anna", "David", "Emma", "Hiroshi", "James", "Li", "Lucas", "Maria", "Mei",
+    "Noah", "Olivia", "Sophie", "Thomas", "Wei", "Yuki",
+]
+LAST_NAMES = [
+    "Santoso", "Wijaya", "Saputra", "Hidayat", "Kusuma", "Pratama", "Setiawan", "Nugroho", "Halim",
+    "Gunawan", "Susanto", "Wibowo", "Lim", "Tan", "Tanaka", "Suzuki", "Smith", "Brown", "Jansen",
+    "de Vries", "Muller", "Wang", "Chen", "Nguyen", "Kim", "Martin", "Taylor", "Wilson",
+]
+NATIONALITIES = [
+    ("Indonesia", 70), ("Singapore", 5), ("Malaysia", 5), ("Australia", 5), ("Japan", 4),
+    ("China", 4), ("United States", 3), ("Netherlands", 2), ("Germany", 2),
+]
+NIGHTS = [(1, 30), (2, 30), (3, 18), (4, 9), (5, 6), (7, 5), (14, 2)]
+PAYMENT_METHODS = [
+    ("cash", 25), ("bank_transfer", 30), ("credit_card", 20), ("debit_card", 10), ("e_wallet", 15),
+]
+HIGH_SEASON_MONTHS = (6, 7, 8, 12)
+CHECK_IN_HOUR = 14
+CHECK_OUT_HOUR = 11
+
+
+@dataclass
+class Plan:
+    rooms: int
+    guests: int
+    reservations: int
+    payments: int
+    years: int
+    seed: int
+    start_date: date
+    as_of: date
+    batch_size: int
+
+    @property
+    def end_date(self) -> date:
+        return self.start_date + timedelta(days=365 * self.years)
+
+
+def _rng(seed: int, table: str) -> random.Random:
+    """Independent stream per table, so each table is the same whatever else changes"""
+    return random.Random(f"{seed}:{table}")
+
+
+def _weighted(rng: random.Random, choices: list):
+    return rng.choices([c[0] for c in choices], weights=[c[-1] for c in choices])[0]
+
+
+def _money(value) -> Decimal:
+    """Round to whole thousands of rupiah"""
+    return Decimal(int(round(value / 1000.0)) * 1000)
+
+
+# ============== WRITER ==============
+
+class Writer:
+    """COPY on PostgreSQL, executemany INSERT elsewhere; one transaction per chunk"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.postgresql = engine.dialect.name == "postgresql"
+        self.counts = {}
+
+    def write(self, table, columns: list, rows: list, connection=None):
+        if not rows:
+            return
+        if connection is None:
+            with self.engine.begin() as connection:
+                self._write(connection, table, columns, rows)
+        else:
+            self._write(connection, table, columns, rows)
+        self.counts[table.name] = self.counts.get(table.name, 0) + len(rows)
+
+    def _write(self, connection, table, columns: list, rows: list):
+        if self.postgresql:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(rows)  # None -> empty unquoted field -> NULL
+            buffer.seek(0)
+            cursor = connection.connection.cursor()
+            cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        else:
+            connection.execute(insert(table), [dict(zip(columns, row)) for row in rows])
+
+    def finish(self, tables: list):
+        """Move id sequences past the generated ids and refresh planner statistics"""
+        if not self.postgresql:
+            return
+        with self.engine.begin() as connection:
+            for table in tables:
+                connection.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                    f"(SELECT COALESCE(MAX(id), 1) FROM {table.name}))"
+                ))
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            for table in tables:
+                connection.execute(text(f"ANALYZE {table.name}"))
+
+
+# ============== REFERENCE DATA ==============
+
+def ensure_reference_data(engine) -> dict:
+    """Room types, booking channels and the loader user (created when missing)"""
+    now = datetime(2020, 12, 31)
+    with engine.begin() as connection:
+        room_types = {row.code: row for row in connection.execute(select(RoomType.__table__))}
+        missing = [rt for rt in ROOM_TYPES if rt[0] not in room_types]
+        if missing:
+            connection.execute(insert(RoomType.__table__), [
+                {"code": code, "name": name, "default_rate": rate, "base_capacity_adults": adults,
+                 "base_capacity_children": children, "max_occupancy": occupancy, "is_active": True,
+                 "created_at": now, "updated_at": now}
+                for code, name, rate, adults, children, occupancy, _ in missing
+            ])
+            room_types = {row.code: row for row in connection.execute(select(RoomType.__table__))}
+
+        channels = {row.code: row for row in connection.execute(select(BookingChannel.__table__))}
+        missing = [ch for ch in BOOKING_CHANNELS if ch[0] not in channels]
+        if missing:
+            connection.execute(insert(BookingChannel.__table__), [
+                {"code": code, "name": name, "channel_type": channel_type, "is_enabled": True,
+                 "created_at": now, "updated_at": now}
+                for code, name, channel_type, _ in missing
+            ])
+            channels = {row.code: row for row in connection.execute(select(BookingChannel.__table__))}
+
+        user_id = connection.execute(select(User.id).where(User.username == LOADER_USERNAME)).scalar()
+        if user_id is None:
+            user_id = connection.execute(insert(User.__table__).values(
+                username=LOADER_USERNAME, password_hash="!", full_name="Synthetic Data Loader",
+                role="user", status="inactive", created_at=now, updated_at=now,
+            )).inserted_primary_key[0]
+
+    return {"room_types": room_types, "channels": channels, "user_id": user_id}
+
+
+# ============== GENERATORS ==============
+
+ROOM_COLUMNS = ["id", "room_number", "floor", "room_type_id", "status", "view_type", "is_active",
+                "created_at", "updated_at"]
+GUEST_COLUMNS = ["id", "full_name", "email", "phone", "phone_country_code", "id_type", "id_number",
+                 "nationality", "birth_date", "is_vip", "preferred_room_type_id", "created_at", "updated_at"]
+RESERVATION_COLUMNS = [
+    "id", "confirmation_number", "guest_id", "check_in_date", "check_out_date", "room_type_id", "room_id",
+    "adults", "children", "rate_per_night", "number_of_nights", "subtotal", "discount_amount", "total_amount",
+    "total_paid", "balance", "deposit_amount", "status", "booking_source", "booking_channel_id", "created_by",
+    "checked_in_by", "checked_in_at", "checked_out_at", "is_archived", "created_at", "updated_at",
+]
+PAYMENT_COLUMNS = ["id", "reservation_id", "payment_date", "amount", "payment_method", "payment_type",
+                   "reference_number", "created_by", "is_refund", "is_voided", "has_proof", "created_at",
+                   "updated_at"]
+
+
+def generate_rooms(plan: Plan, reference: dict) -> list:
+    """(room row, room type code) for every room"""
+    rng = _rng(plan.seed, "rooms")
+    per_floor = 50 if plan.rooms > 500 else 20
+    created = datetime.combine(plan.start_date, datetime.min.time()) - timedelta(days=30)
+    rooms = []
+    for index in range(plan.rooms):
+        floor, number = divmod(index, per_floor)
+        code = _weighted(rng, ROOM_TYPES)
+        rooms.append(((
+            index + 1, f"{floor + 1}{number + 1:02d}", floor + 1, reference["room_types"][code].id,
+            "available", rng.choice(VIEW_TYPES), True, created, created,
+        ), code))
+    return rooms
+
+
+def generate_guests(plan: Plan, reference: dict):
+    """Guest rows in chunks of batch_size"""
+    rng = _rng(plan.seed, "guests")
+    type_ids = [rt.id for rt in reference["room_types"].values()]
+    span_seconds = (plan.end_date - plan.start_date).days * 86400
+    chunk = []
+    for guest_id in range(1, plan.guests + 1):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        nationality = _weighted(rng, NATIONALITIES)
+        indonesian = nationality == "Indonesia"
+        created = datetime.combine(plan.start_date, datetime.min.time()) + timedelta(seconds=rng.randrange(span_seconds))
+        chunk.append((
+            guest_id, f"{first} {last}", f"{first}.{last}.{guest_id}@example.com".lower().replace(" ", ""),
+            f"8{rng.randrange(10**9, 10**10)}", "+62" if indonesian else "+1",
+            "ktp" if indonesian else "passport", f"{rng.randrange(10**15, 10**16)}",
+            nationality, date(1950, 1, 1) + timedelta(days=rng.randrange(365 * 55)),
+            rng.random() < 0.02, rng.choice(type_ids) if rng.random() < 0.1 else None, created, created,
+        ))
+        if len(chunk) >= plan.batch_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _payments_for(rng, plan: Plan, reference: dict, reservation: dict, count: int, next_id: int) -> list:
+    """`count` payments splitting the amount paid so far (downpayment first)"""
+    total, status = reservation["total_amount"], reservation["status"]
+    if status in ("checked_out", "checked_in"):
+        paid = total
+    else:
+        paid = min(total, _money(float(total) * 0.3))  # confirmed / cancelled: downpayment only
+    payments = []
+    remaining = paid
+    for n in range(count):
+        if n == count - 1:
+            amount = remaining
+        elif n == 0 and count > 1:
+            amount = min(remaining, _money(float(paid) * 0.3))
+        else:
+            amount = min(remaining, _money(float(paid - payments[0][3]) / (count - 1)))
+        remaining -= amount
+        if n == 0 and count > 1:
+            payment_type = "downpayment"
+            paid_on = reservation["created_at"].date()
+        else:
+            payment_type = "full" if paid == total else "downpayment"
+            paid_on = min(reservation["check_out_date"], plan.as_of) if paid == total else reservation["created_at"].date()
+        created = datetime.combine(paid_on, datetime.min.time()) + timedelta(hours=9 + n)
+        payments.append((
+            next_id + n, reservation["id"], paid_on, amount, _weighted(rng, PAYMENT_METHODS), payment_type,
+            f"TRX{next_id + n:012d}", reference["user_id"], False, rng.random() < 0.005,
+            rng.random() < 0.4, created, created,
+        ))
+    return payments
+
+
+def generate_reservations(plan: Plan, reference: dict, rooms: list):
+    """(reservation rows, payment rows) in chunks of batch_size reservations"""
+    rng = _rng(plan.seed, "reservations")
+    payment_rng = _rng(plan.seed, "payments")
+    type_rates = {code: rt.default_rate for code, rt in reference["room_types"].items()}
+    type_occupancy = {code: rt.max_occupancy or 2 for code, rt in reference["room_types"].items()}
+    channels = [(reference["channels"][code].id, reference["channels"][code].name, share)
+                for code, _, _, share in BOOKING_CHANNELS]
+
+    span_days = (plan.end_date - plan.start_date).days
+    per_room = max(1, math.ceil(plan.reservations / max(plan.rooms, 1)))
+    slot = span_days / per_room  # days between consecutive stays in one room
+    base_payments, extra_payments = divmod(plan.payments, max(plan.reservations, 1))
+    next_payment_id = 1
+
+    reservations, payments = [], []
+    for index in range(plan.reservations):
+        room_row, type_code = rooms[index % plan.rooms]
+        sequence = index // plan.rooms
+        nights = _weighted(rng, NIGHTS)
+        if slot >= 1:
+            nights = min(nights, max(1, int(slot)))
+        check_in = plan.start_date + timedelta(days=int(sequence * slot))
+        check_out = check_in + timedelta(days=nights)
+
+        rate = float(Decimal(type_rates[type_code]))
+        if check_in.weekday() >= 4:
+            rate *= 1.2
+        if check_in.month in HIGH_SEASON_MONTHS:
+            rate *= 1.25
+        rate_per_night = _money(rate)
+        subtotal = rate_per_night * nights
+        discount = _money(float(subtotal) * 0.1) if rng.random() < 0.1 else Decimal(0)
+        total = subtotal - discount
+
+        if check_out <= plan.as_of:
+            status = "cancelled" if rng.random() < 0.07 else "checked_out"
+        elif check_in <= plan.as_of:
+            status = "checked_in"
+        else:
+            status = "cancelled" if rng.random() < 0.05 else "confirmed"
+
+        channel_id, channel_name, _ = rng.choices(channels, weights=[c[2] for c in channels])[0]
+        created = datetime.combine(check_in, datetime.min.time()) - timedelta(
+            days=rng.randrange(0, 90), minutes=rng.randrange(24 * 60))
+        checked_in_at = checked_out_at = checked_in_by = None
+        if status in ("checked_in", "checked_out"):
+            checked_in_at = datetime.combine(check_in, datetime.min.time()) + timedelta(
+                hours=CHECK_IN_HOUR, minutes=rng.randrange(240))
+            checked_in_by = reference["user_id"]
+        if status == "checked_out":
+            checked_out_at = datetime.combine(check_out, datetime.min.time()) + timedelta(
+                hours=CHECK_OUT_HOUR, minutes=-rng.randrange(120))
+
+        reservation = {
+            "id": index + 1, "total_amount": total, "status": status, "created_at": created,
+            "check_out_date": check_out,
+        }
+        count = base_payments + (1 if index < extra_payments else 0)
+        reservation_payments = _payments_for(payment_rng, plan, reference, reservation, count, next_payment_id)
+        next_payment_id += count
+        total_paid = sum(payment_contribution(p[3], p[8], p[9]) for p in reservation_payments)
+
+        reservations.append((
+            index + 1, f"SYN{index + 1:010d}", 1 + int(plan.guests * rng.random() ** 2), check_in, check_out,
+            reference["room_types"][type_code].id, room_row[0], rng.randint(1, type_occupancy[type_code] - 1),
+            rng.choice((0, 0, 0, 1, 2)), rate_per_night, nights, subtotal, discount, total,
+            total_paid, total - total_paid, Decimal(0), status, channel_name, channel_id, reference["user_id"],
+            checked_in_by, checked_in_at, checked_out_at, False, created, checked_out_at or checked_in_at or created,
+        ))
+        payments.extend(reservation_payments)
+
+        if len(reservations) >= plan.batch_size:
+            yield reservations, payments
+            reservations, payments = [], []
+    if reservations:
+        yield reservations, payments
+
+
+# ============== RUN ==============
+
+def _require_empty(engine):
+    with engine.connect() as connection:
+        for model in (Room, Guest, Reservation, Payment):
+            if connection.execute(select(func.count()).select_from(model)).scalar():
+                raise SystemExit(f"❌ Table {model.__tablename__} is not empty; generate into an empty database")
+
+
+def _progress(label: str, done: int, total: int, started: float):
+    elapsed = time.perf_counter() - started
+    print(f"   {label:<13} {done:>12,} / {total:,}  ({done / elapsed if elapsed else 0:,.0f} rows/s)", flush=True)
+
+
+def generate(engine, plan: Plan) -> dict:
+    """Generate the plan into `engine`; returns rows written per table"""
+    from schema_migrations import ensure_schema
+
+    ensure_schema(engine)
+    _require_empty(engine)
+    writer = Writer(engine)
+    reference = ensure_reference_data(engine)
+
+    print(f"📊 Generating into {engine.dialect.name} (seed {plan.seed}, "
+          f"{plan.start_date} .. {plan.end_date}, as of {plan.as_of})\n")
+
+    started = time.perf_counter()
+    rooms = generate_rooms(plan, reference)
+    writer.write(Room.__table__, ROOM_COLUMNS, [row for row, _ in rooms])
+    _progress("rooms", plan.rooms, plan.rooms, started)
+
+    started = time.perf_counter()
+    for chunk in generate_guests(plan, reference):
+        writer.write(Guest.__table__, GUEST_COLUMNS, chunk)
+    _progress("guests", writer.counts.get("guests", 0), plan.guests, started)
+
+    started = time.perf_counter()
+    for reservations, payments in generate_reservations(plan, reference, rooms):
+        with engine.begin() as connection:
+            writer.write(Reservation.__table__, RESERVATION_COLUMNS, reservations, connection)
+            writer.write(Payment.__table__, PAYMENT_COLUMNS, payments, connection)
+        if writer.counts["reservations"] % (plan.batch_size * 50) < plan.batch_size:
+            _progress("reservations", writer.counts["reservations"], plan.reservations, started)
+    _progress("reservations", writer.counts.get("reservations", 0), plan.reservations, started)
+    _progress("payments", writer.counts.get("payments", 0), plan.payments, started)
+
+    writer.finish([Room.__table__, Guest.__table__, Reservation.__table__, Payment.__table__])
+    return writer.counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic hotel history")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small", help="Preset sizes (default small)")
+    parser.add_argument("--rooms", type=int)
+    parser.add_argument("--guests", type=int)
+    parser.add_argument("--reservations", type=int)
+    parser.add_argument("--payments", type=int)
+    parser.add_argument("--years", type=int)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--start-date", type=date.fromisoformat, default=DEFAULT_START_DATE)
+    parser.add_argument("--as-of", type=date.fromisoformat,
+                        help="Date statuses are relative to (default: 90 days before the end)")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Rows per chunk / transaction")
+    parser.add_argument("--database-url", help="Target database (default: DATABASE_URL)")
+    args = parser.parse_args()
+
+    sizes = {key: getattr(args, key) if getattr(args, key) is not None else value
+             for key, value in SCALES[args.scale].items()}
+    plan = Plan(seed=args.seed, start_date=args.start_date, as_of=args.as_of, batch_size=args.batch_size, **sizes)
+    if plan.as_of is None:
+        plan.as_of = plan.end_date - timedelta(days=90)
+
+    if args.database_url:
+        target = create_engine(args.database_url)
+    else:
+        from database import get_engine
+        target = get_engine()
+
+    run_started = time.perf_counter()
+    counts = generate(target, plan)
+    print(f"\n✅ Generated {sum(counts.values()):,} rows in {time.perf_counter() - run_started:.1f}s")
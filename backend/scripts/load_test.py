@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Load Test
+Drives the API with concurrent virtual users running a weighted front-desk
+workload, then reports throughput and latency percentiles per endpoint and
+writes them to a JSON report that can be diffed between commits.
+
+Workload (default weights, --mix to change):
+
+- availability: GET /api/reservations/availability for random dates
+- guest_search: GET /api/guests?search= by a known guest name
+- dashboard: GET /api/dashboard/today or /summary
+- create_reservation: POST /api/reservations in the next 60 days
+- post_payment: POST /api/payments on a reservation created by the run
+- check_in: POST /api/reservations/{id}/check-in into a free room
+- check_out: POST /api/reservations/{id}/check-out of a checked-in stay
+
+Payments, check-ins and check-outs only touch reservations the run itself
+created; until one exists those users create a reservation instead.
+
+Targets:
+
+- in process (default): the app runs in this process behind httpx's ASGI
+  transport against --database-url / DATABASE_URL. An empty database is
+  seeded with generate_synthetic_data.py (rooms and guests only) and the
+  load test user is created if missing. Client and server share one event
+  loop, so absolute numbers are lower than against a server; use it to
+  compare commits.
+- --base-url: a running server (uvicorn/gunicorn over localhost). The
+  database must already hold rooms and guests and --username must exist.
+
+Requests made during setup (login, discovering rooms and guests) are not
+measured. Errors are non-2xx responses plus timeouts/connection errors
+(reported as status "error").
+
+Usage:
+    python scripts/load_test.py
+    python scripts/load_test.py --duration 60 --concurrency 50 --output before.json
+    python scripts/load_test.py --requests 5000 --mix availability=50,dashboard=30,guest_search=20
+    python scripts/load_test.py --base-url http://localhost:8000 --username admin --password admin123
+    python scripts/load_test.py --output after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Add backend directory to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+import httpx  # noqa: E402
+
+WORKLOAD = {
+    "availability": 30,
+    "guest_search": 20,
+    "dashboard": 15,
+    "create_reservation": 12,
+    "post_payment": 10,
+    "check_in": 7,
+    "check_out": 6,
+}
+PAYMENT_METHODS = ["cash", "credit_card", "debit_card", "bank_transfer", "e_wallet"]
+LOADTEST_USERNAME = "loadtest"
+LOADTEST_PASSWORD = "loadtest123"
+SEED_ROOMS = 40
+SEED_GUESTS = 500
+
+
+def percentile(ordered: list, pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil
+    return ordered[int(rank) - 1]
+
+
+class Recorder:
+    """Latencies and status codes per endpoint label"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def record(self, label: str, seconds: float, status):
+        self.latencies[label].append(seconds)
+        self.statuses[label][str(status)] += 1
+
+    @staticmethod
+    def _summary(latencies: list, statuses: Counter, elapsed: float) -> dict:
+        ordered = sorted(latencies)
+        ms = [value * 1000 for value in ordered]
+        return {
+            "requests": len(ordered),
+            "errors": sum(count for status, count in statuses.items() if not status.startswith("2")),
+            "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": {
+                "mean": round(sum(ms) / len(ms), 2) if ms else 0.0,
+                "p50": round(percentile(ms, 50), 2),
+                "p95": round(percentile(ms, 95), 2),
+                "p99": round(percentile(ms, 99), 2),
+                "max": round(ms[-1], 2) if ms else 0.0,
+            },
+            "status_codes": dict(sorted(statuses.items())),
+        }
+
+    def summary(self, elapsed: float) -> dict:
+        endpoints = {
+            label: self._summary(self.latencies[label], self.statuses[label], elapsed)
+            for label in sorted(self.latencies)
+        }
+        everything = [value for values in self.latencies.values() for value in values]
+        statuses = sum(self.statuses.values(), Counter())
+        return {"total": self._summary(everything, statuses, elapsed), "endpoints": endpoints}
+
+
+class FrontDesk:
+    """What the virtual users know about the hotel; shared, mutated between awaits only"""
+
+    def __init__(self, room_types: list, free_rooms: dict, guest_ids: list, search_terms: list):
+        self.room_types = room_types
+        self.free_rooms = free_rooms  # room type id -> [room id]
+        self.guest_ids = guest_ids
+        self.search_terms = search_terms
+        self.confirmed = []  # (reservation id, room type id, total amount)
+        self.in_house = []  # (reservation id, room type id, room id)
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, desk: FrontDesk, mix: dict, seed: int):
+        self.client = client
+        self.desk = desk
+        self.scenarios = list(mix)
+        self.weights = [mix[name] for name in self.scenarios]
+        self.seed = seed
+        self.recorder = Recorder()
+        self.today = date.today()
+        self.deadline = None
+        self.remaining = None
+
+    async def request(self, label: str, method: str, url: str, **kwargs):
+        """Send one measured request; the response, or None on a transport error"""
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.record(label, time.perf_counter() - started, "error")
+            return None
+        self.recorder.record(label, time.perf_counter() - started, response.status_code)
+        return response
+
+    # ============== SCENARIOS ==============
+
+    async def availability(self, rng):
+        check_in = self.today + timedelta(days=rng.randint(0, 90))
+        await self.request("GET /api/reservations/availability", "GET", "/api/reservations/availability", params={
+            "room_type_id": rng.choice(self.desk.room_types),
+            "check_in_date": check_in.isoformat(),
+            "check_out_date": (check_in + timedelta(days=rng.randint(1, 5))).isoformat(),
+        })
+
+    async def guest_search(self, rng):
+        await self.request("GET /api/guests?search", "GET", "/api/guests",
+                           params={"search": rng.choice(self.desk.search_terms), "limit": 20})
+
+    async def dashboard(self, rng):
+        path = rng.choice(("/api/dashboard/today", "/api/dashboard/summary"))
+        await self.request(f"GET {path}", "GET", path)
+
+    async def create_reservation(self, rng):
+        room_type_id = rng.choice(self.desk.room_types)
+        check_in = self.today + timedelta(days=rng.randint(0, 60))
+        response = await self.request("POST /api/reservations", "POST", "/api/reservations", json={
+            "guest_id": rng.choice(self.desk.guest_ids),
+            "room_type_id": room_type_id,
+            "check_in_date": check_in.isoformat(),
+            "check_out_date": (check_in + timedelta(days=rng.randint(1, 4))).isoformat(),
+            "adults": rng.randint(1, 2),
+        })
+        if response is not None and response.status_code == 201:
+            created = response.json()
+            self.desk.confirmed.append((created["id"], room_type_id, float(created["total_amount"])))
+
+    async def post_payment(self, rng):
+        if not self.desk.confirmed:
+            return await self.create_reservation(rng)
+        reservation_id, _, total = rng.choice(self.desk.confirmed)
+        await self.request("POST /api/payments", "POST", "/api/payments", json={
+            "reservation_id": reservation_id,
+            "amount": max(1000, round(total * rng.choice((0.3, 0.5)), -3)),
+            "payment_date": self.today.isoformat(),
+            "payment_method": rng.choice(PAYMENT_METHODS),
+            "payment_type": "downpayment",
+        })
+
+    async def check_in(self, rng):
+        candidates = [i for i, (_, room_type_id, _) in enumerate(self.desk.confirmed)
+                      if self.desk.free_rooms.get(room_type_id)]
+        if not candidates:
+            return await self.create_reservation(rng)
+        reservation_id, room_type_id, _ = self.desk.confirmed.pop(rng.choice(candidates))
+        rooms = self.desk.free_rooms[room_type_id]
+        room_id = rooms.pop(rng.randrange(len(rooms)))
+        response = await self.request("POST /api/reservations/{id}/check-in", "POST",
+                                      f"/api/reservations/{reservation_id}/check-in", params={"room_id": room_id})
+        if response is not None and response.status_code == 200:
+            self.desk.in_house.append((reservation_id, room_type_id, room_id))
+        else:
+            rooms.append(room_id)
+
+    async def check_out(self, rng):
+        if not self.desk.in_house:
+            return await self.check_in(rng)
+        reservation_id, room_type_id, room_id = self.desk.in_house.pop(rng.randrange(len(self.desk.in_house)))
+        response = await self.request("POST /api/reservations/{id}/check-out", "POST",
+                                      f"/api/reservations/{reservation_id}/check-out")
+        if response is not None and response.status_code == 200:
+            self.desk.free_rooms[room_type_id].append(room_id)
+
+    # ============== RUN ==============
+
+    def _more(self) -> bool:
+        if self.remaining is not None:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+        return time.perf_counter() < self.deadline
+
+    async def user(self, index: int, think_time: float):
+        rng = random.Random(f"{self.seed}:{index}")
+        while self._more():
+            scenario = rng.choices(self.scenarios, weights=self.weights)[0]
+            await getattr(self, scenario)(rng)
+            if think_time:
+                await asyncio.sleep(rng.uniform(0, 2 * think_time))
+
+    async def run(self, concurrency: int, duration: float, requests: int = None, think_time: float = 0.0) -> float:
+        """Run the users until the duration or request budget is spent; elapsed seconds"""
+        self.remaining = requests
+        started = time.perf_counter()
+        self.deadline = started + duration
+        await asyncio.gather(*(self.user(index, think_time) for index in range(concurrency)))
+        return time.perf_counter() - started
+
+
+# ============== SETUP ==============
+
+def ensure_user(username: str, password: str):
+    """Create the load test user in the in-process database if missing"""
+    from database import SessionLocal
+    from models import User
+
+    db = SessionLocal()
+    try:
+        if db.query(User).filter(User.username == username).first() is None:
+            user = User(username=username, full_name="Load Test", role="user", status="active")
+            user.set_password(password)
+            db.add(user)
+            db.commit()
+    finally:
+        db.close()
+
+
+def ensure_seed_data(seed: int):
+    """Seed rooms and guests with the synthetic data generator when the database has none"""
+    from sqlalchemy import func, select
+
+    from database import get_engine
+    from generate_synthetic_data import DEFAULT_START_DATE, Plan, generate
+    from models import Room
+
+    engine = get_engine()
+    with engine.connect() as connection:
+        if connection.execute(select(func.count()).select_from(Room)).scalar():
+            return
+    generate(engine, Plan(rooms=SEED_ROOMS, guests=SEED_GUESTS, reservations=0, payments=0, years=1, seed=seed,
+                          start_date=DEFAULT_START_DATE, as_of=DEFAULT_START_DATE, batch_size=1000))
+    print()
+
+
+async def discover(client: httpx.AsyncClient) -> FrontDesk:
+    """Room types, free rooms and guests through the API (not measured)"""
+    room_types = (await client.get("/api/rooms/types")).json()["room_types"]
+    free_rooms = defaultdict(list)
+    skip = 0
+    while True:
+        page = (await client.get("/api/rooms", params={
+            "fields": "id,room_type_id,status", "skip": skip, "limit": 1000,
+        })).json()
+        for room in page["rooms"]:
+            if room["status"] == "available":
+                free_rooms[room["room_type_id"]].append(room["id"])
+        skip += len(page["rooms"])
+        if not page["rooms"] or skip >= page["total"]:
+            break
+    guests = (await client.get("/api/guests", params={"fields": "id,full_name", "limit": 100})).json()["guests"]
+
+    if not room_types or not free_rooms or not guests:
+        raise SystemExit("❌ The database needs room types, rooms and guests; "
+                         "seed it with scripts/generate_synthetic_data.py")
+    search_terms = sorted({guest["full_name"].split()[0] for guest in guests})
+    return FrontDesk([rt["id"] for rt in room_types], free_rooms, [guest["id"] for guest in guests], search_terms)
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str):
+    response = await client.post("/api/auth/login", json={"username": username, "password": password})
+    if response.status_code != 200:
+        raise SystemExit(f"❌ Login as {username} failed ({response.status_code}): {response.text}")
+    client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+
+async def run_load_test(args, mix: dict) -> tuple:
+    """(client, summary) for the configured target"""
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout,
+                                   limits=httpx.Limits(max_connections=args.concurrency))
+        lifespan = None
+    else:
+        if args.database_url:
+            os.environ["DATABASE_URL"] = args.database_url
+        from app import app
+
+        lifespan = app.router.lifespan_context(app)
+        await lifespan.__aenter__()  # creates / migrates the schema
+        ensure_seed_data(args.seed)
+        ensure_user(args.username, args.password)
+        transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+        client = httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout)
+
+    try:
+        await login(client, args.username, args.password)
+        desk = await discover(client)
+        test = LoadTest(client, desk, mix, args.seed)
+        print(f"📊 {args.concurrency} users, "
+              f"{f'{args.requests} requests' if args.requests else f'{args.duration:g}s'}, "
+              f"{len(desk.guest_ids)} guests, {sum(map(len, desk.free_rooms.values()))} free rooms\n")
+        elapsed = await test.run(args.concurrency, args.duration, args.requests, args.think_time)
+        return elapsed, test.recorder.summary(elapsed)
+    finally:
+        await client.aclose()
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+
+
+# ============== REPORT ==============
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=backend_path,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_summary(summary: dict):
+    print(f"   {'endpoint':<42} {'req':>7} {'err':>5} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8}  (ms)")
+    rows = list(summary["endpoints"].items()) + [("TOTAL", summary["total"])]
+    for label, stats in rows:
+        latency = stats["latency_ms"]
+        print(f"   {label:<42} {stats['requests']:>7} {stats['errors']:>5} {stats['throughput_rps']:>8.1f} "
+              f"{latency['p50']:>8.1f} {latency['p95']:>8.1f} {latency['p99']:>8.1f}")
+
+
+def print_comparison(baseline: dict, report: dict):
+    """Throughput and p50/p95/p99 change per endpoint against an earlier report"""
+    def change(before, after):
+        return f"{(after - before) / before * 100:+7.1f}%" if before else "      -"
+
+    print(f"\n📊 Compared with {baseline['run'].get('commit') or 'baseline'}"
+          f" ({baseline['run'].get('started_at', '?')})\n")
+    print(f"   {'endpoint':<42} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    before_endpoints = dict(baseline["endpoints"], TOTAL=baseline["total"])
+    after_endpoints = dict(report["endpoints"], TOTAL=report["total"])
+    for label, after in after_endpoints.items():
+        before = before_endpoints.get(label)
+        if before is None:
+            print(f"   {label:<42} (new)")
+            continue
+        print(f"   {label:<42} {change(before['throughput_rps'], after['throughput_rps']):>8} " + " ".join(
+            f"{change(before['latency_ms'][p], after['latency_ms'][p]):>8}" for p in ("p50", "p95", "p99")))
+
+
+def parse_mix(value: str) -> dict:
+    mix = dict(WORKLOAD)
+    if value:
+        mix = {name: 0 for name in WORKLOAD}
+        for item in value.split(","):
+            name, _, weight = item.partition("=")
+            if name.strip() not in WORKLOAD:
+                raise argparse.ArgumentTypeError(f"unknown scenario {name!r} (one of {', '.join(WORKLOAD)})")
+            mix[name.strip()] = float(weight or 1)
+    mix = {name: weight for name, weight in mix.items() if weight > 0}
+    if not mix:
+        raise argparse.ArgumentTypeError("the mix needs at least one scenario with a positive weight")
+    return mix
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the API with a front-desk workload mix")
+    parser.add_argument("--base-url", help="Running server to test (default: the app in process)")
+    parser.add_argument("--database-url", help="In-process database (default: DATABASE_URL)")
+    parser.add_argument("--username", default=LOADTEST_USERNAME)
+    parser.add_argument("--password", default=LOADTEST_PASSWORD)
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users (default 20)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run (default 30)")
+    parser.add_argument("--requests", type=int, help="Stop after this many requests instead of --duration")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="Mean seconds a user waits between requests (default 0: closed loop)")
+    parser.add_argument("--mix", type=parse_mix, default=dict(WORKLOAD),
+                        help="Scenario weights, e.g. availability=50,dashboard=10 (default: built-in mix)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--output", default="load_test_report.json", help="JSON report path")
+    parser.add_argument("--compare", help="Earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    started_at = datetime.now().isoformat(timespec="seconds")
+    elapsed, summary = asyncio.run(run_load_test(args, args.mix))
+    report = {
+        "run": {
+            "commit": git_commit(),
+            "started_at": started_at,
+            "target": args.base_url or "in-process",
+            "concurrency": args.concurrency,
+            "duration_s": round(elapsed, 2),
+            "request_budget": args.requests,
+            "think_time_s": args.think_time,
+            "seed": args.seed,
+            "mix": args.mix,
+        },
+        **summary,
+    }
+
+    print_summary(summary)
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\n✅ {summary['total']['requests']} requests in {elapsed:.1f}s "
+          f"({summary['total']['throughput_rps']:.1f} req/s), report written to {output}")
+
+    if args.compare:
+        print_comparison(json.loads(Path(args.compare).read_text()), report)
@@ -1,244 +1,385 @@
+#!/usr/bin/env python3
 """
-Migration script to transfer data from SQLite to PostgreSQL
-Run this script to migrate all data from kos.db to the PostgreSQL database
+Migrate SQLite to PostgreSQL
+Copies every table of the models (Base.metadata.sorted_tables) from a
+SQLite database into PostgreSQL, then checks that the copy matches the source.
+
+- Streaming: rows are read in primary-key order, --chunk-size at a time
+  (keyset pagination, never a whole table in memory), and written with COPY
+  (executemany INSERT on other targets). Each chunk is one transaction.
+- Parallel: up to --workers tables load at once; a table starts when
+  every table it references has finished, so foreign keys hold throughout.
+- Resumable: each chunk's transaction also records the table's last copied
+  id in the target's data_migration_progress table. A re-run after a
+  failure or Ctrl-C continues where every table stopped.
+- Sequences: id sequences are moved past the copied ids, and the tables are
+  analyzed.
+- Verification: row counts and a SHA-256 checksum of every table's rows
+  (normalized values, in id order) are compared between source and target.
+  The progress table is dropped once everything matches. The exit status
+  is 1 on any mismatch.
+
+Only columns present in both the source table and the model are copied.
+Model columns the source lacks get their defaults, so an older SQLite
+file still loads. The target schema is created with the versioned
+migrations (schema_migrations.py). If that happens in this run, the demo
+rows of 004_insert_mock_data.sql are cleared first. Otherwise the target
+tables must be empty, or --truncate must be given.
+
+Usage:
+    python scripts/migrate_to_postgres.py --source sqlite:///./hotel.db --target postgresql://...
+    python scripts/migrate_to_postgres.py --target postgresql://... --workers 8 --chunk-size 50000
+    python scripts/migrate_to_postgres.py --target postgresql://... --truncate     # start over
+    python scripts/migrate_to_postgres.py --target postgresql://... --verify-only
 """
 
+import argparse
+import hashlib
+import io
 import os
 import sys
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
-from models import Base, User, Room, Tenant, Payment, Expense, RoomHistory
-from datetime import datetime
-
-# Load environment variables
-load_dotenv()
-
-# Get database URLs
-SQLITE_URL = "sqlite:///./kos.db"
-POSTGRES_URL = os.getenv('DATABASE_URL')
-
-if not POSTGRES_URL or 'sqlite' in POSTGRES_URL.lower():
-    print("❌ Error: DATABASE_URL in .env must be set to PostgreSQL connection string")
-    print("   Current DATABASE_URL:", POSTGRES_URL)
-    sys.exit(1)
-
-if '[YOUR-PASSWORD]' in POSTGRES_URL:
-    print("❌ Error: Please replace [YOUR-PASSWORD] in .env with your actual database password")
-    sys.exit(1)
-
-print("🔄 Starting migration from SQLite to PostgreSQL...")
-print(f"📍 Source: {SQLITE_URL}")
-print(f"📍 Target: {POSTGRES_URL.split('@')[0].split('://')[0]}://***@{POSTGRES_URL.split('@')[1]}")
-
-# Create engines
-try:
-    sqlite_engine = create_engine(SQLITE_URL, connect_args={"check_same_thread": False})
-    postgres_engine = create_engine(POSTGRES_URL, pool_pre_ping=True)
-
-    # Test PostgreSQL connection
-    with postgres_engine.connect() as conn:
-        conn.execute(text("SELECT 1"))
-    print("✅ Successfully connected to PostgreSQL database")
-
-except Exception as e:
-    print(f"❌ Database connection error: {e}")
-    sys.exit(1)
-
-# Create session makers
-SQLiteSession = sessionmaker(bind=sqlite_engine)
-PostgresSession = sessionmaker(bind=postgres_engine)
-
-def migrate_data():
-    """Migrate all data from SQLite to PostgreSQL"""
-
-    # Create all tables in PostgreSQL
-    print("\n📋 Creating tables in PostgreSQL...")
-    Base.metadata.create_all(bind=postgres_engine)
-    print("✅ Tables created successfully")
-
-    # Create sessions
-    sqlite_session = SQLiteSession()
-    postgres_session = PostgresSession()
-
-    try:
-        # Clear existing data in PostgreSQL (optional - comment out if you want to keep existing data)
-        print("\n🗑️  Clearing existing data in PostgreSQL...")
-        for table in reversed(Base.metadata.sorted_tables):
-            postgres_session.execute(table.delete())
-        postgres_session.commit()
-        print("✅ Existing data cleared")
-
-        # Migrate Users
-        print("\n👤 Migrating users...")
-        users = sqlite_session.query(User).all()
-        for user in users:
-            new_user = User(
-                id=user.id,
-                username=user.username,
-                password_hash=user.password_hash,
-                email=user.email,
-                created_at=user.created_at
-            )
-            postgres_session.merge(new_user)
-        postgres_session.commit()
-        print(f"✅ Migrated {len(users)} users")
-
-        # Migrate Rooms
-        print("\n🏠 Migrating rooms...")
-        rooms = sqlite_session.query(Room).all()
-        for room in rooms:
-            new_room = Room(
-                id=room.id,
-                room_number=room.room_number,
-                floor=room.floor,
-                room_type=room.room_type,
-                monthly_rate=room.monthly_rate,
-                status=room.status,
-                amenities=room.amenities,
-                created_at=room.created_at,
-                updated_at=room.updated_at
-            )
-            postgres_session.merge(new_room)
-        postgres_session.commit()
-        print(f"✅ Migrated {len(rooms)} rooms")
-
-        # Migrate Tenants
-        print("\n👥 Migrating tenants...")
-        tenants = sqlite_session.query(Tenant).all()
-        for tenant in tenants:
-            new_tenant = Tenant(
-                id=tenant.id,
-                name=tenant.name,
-                phone=tenant.phone,
-                email=tenant.email,
-                id_number=tenant.id_number,
-                move_in_date=tenant.move_in_date,
-                move_out_date=tenant.move_out_date,
-                current_room_id=tenant.current_room_id,
-                status=tenant.status,
-                notes=tenant.notes,
-                created_at=tenant.created_at,
-                updated_at=tenant.updated_at
-            )
-            postgres_session.merge(new_tenant)
-        postgres_session.commit()
-        print(f"✅ Migrated {len(tenants)} tenants")
-
-        # Migrate Payments
-        print("\n💰 Migrating payments...")
-        payments = sqlite_session.query(Payment).all()
-        for payment in payments:
-            new_payment = Payment(
-                id=payment.id,
-                tenant_id=payment.tenant_id,
-                amount=payment.amount,
-                due_date=payment.due_date,
-                paid_date=payment.paid_date,
-                status=payment.status,
-                payment_method=payment.payment_method,
-                receipt_number=payment.receipt_number,
-                period_months=payment.period_months,
-                notes=payment.notes,
-                created_at=payment.created_at,
-                updated_at=payment.updated_at
-            )
-            postgres_session.merge(new_payment)
-        postgres_session.commit()
-        print(f"✅ Migrated {len(payments)} payments")
-
-        # Migrate Expenses
-        print("\n💸 Migrating expenses...")
-        expenses = sqlite_session.query(Expense).all()
-        for expense in expenses:
-            new_expense = Expense(
-                id=expense.id,
-                date=expense.date,
-                category=expense.category,
-                amount=expense.amount,
-                description=expense.description,
-                receipt_url=expense.receipt_url,
-                created_at=expense.created_at,
-                updated_at=expense.updated_at
-            )
-            postgres_session.merge(new_expense)
-        postgres_session.commit()
-        print(f"✅ Migrated {len(expenses)} expenses")
-
-        # Migrate Room History
-        print("\n📜 Migrating room history...")
-        room_histories = sqlite_session.query(RoomHistory).all()
-        for history in room_histories:
-            new_history = RoomHistory(
-                id=history.id,
-                room_id=history.room_id,
-                tenant_id=history.tenant_id,
-                move_in_date=history.move_in_date,
-                move_out_date=history.move_out_date,
-                created_at=history.created_at
-            )
-            postgres_session.merge(new_history)
-        postgres_session.commit()
-        print(f"✅ Migrated {len(room_histories)} room history records")
-
-        # Update sequences for PostgreSQL
-        print("\n🔢 Updating PostgreSQL sequences...")
-        tables_with_sequences = [
-            ('users', 'users_id_seq'),
-            ('rooms', 'rooms_id_seq'),
-            ('tenants', 'tenants_id_seq'),
-            ('payments', 'payments_id_seq'),
-            ('expenses', 'expenses_id_seq'),
-            ('room_history', 'room_history_id_seq')
-        ]
-
-        for table_name, sequence_name in tables_with_sequences:
-            try:
-                # Get max ID from table
-                result = postgres_session.execute(text(f"SELECT COALESCE(MAX(id), 0) FROM {table_name}"))
-                max_id = result.scalar()
-
-                # Set sequence to max_id + 1
-                postgres_session.execute(text(f"SELECT setval('{sequence_name}', {max_id + 1}, false)"))
-                postgres_session.commit()
-                print(f"✅ Updated {sequence_name} to {max_id + 1}")
-            except Exception as e:
-                print(f"⚠️  Warning: Could not update sequence {sequence_name}: {e}")
-
-        print("\n" + "="*60)
-        print("✅ Migration completed successfully!")
-        print("="*60)
-        print("\n📊 Summary:")
-        print(f"   - Users: {len(users)}")
-        print(f"   - Rooms: {len(rooms)}")
-        print(f"   - Tenants: {len(tenants)}")
-        print(f"   - Payments: {len(payments)}")
-        print(f"   - Expenses: {len(expenses)}")
-        print(f"   - Room History: {len(room_histories)}")
-        print("\n🎉 Your data has been successfully migrated to PostgreSQL!")
-        print("💡 Your application is now using PostgreSQL database.")
-
-    except Exception as e:
-        print(f"\n❌ Migration failed: {e}")
-        postgres_session.rollback()
-        raise
-    finally:
-        sqlite_session.close()
-        postgres_session.close()
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
 
+# Add backend directory to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
 
-if __name__ == "__main__":
-    try:
-        # Confirm before migration
-        print("\n⚠️  WARNING: This will clear existing data in the PostgreSQL database and replace it with SQLite data.")
-        response = input("Do you want to continue? (yes/no): ")
+from sqlalchemy import (  # noqa: E402
+    BigInteger, Column, DateTime, MetaData, String, Table, create_engine, func, insert, inspect, select, text,
+    update,
+)
+from sqlalchemy.engine import make_url  # noqa: E402
+
+from models import Base  # noqa: E402
+
+DEFAULT_SOURCE = "sqlite:///./hotel.db"
+
+_progress_metadata = MetaData()
+migration_progress = Table(
+    "data_migration_progress",
+    _progress_metadata,
+    Column("table_name", String(100), primary_key=True),
+    Column("last_id", BigInteger, nullable=False),
+    Column("rows_copied", BigInteger, nullable=False),
+    Column("completed_at", DateTime),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+_print_lock = threading.Lock()
+
+
+def say(message: str):
+    with _print_lock:
+        print(message, flush=True)
+
+
+def create(url: str, pool_size: int):
+    if make_url(url).get_backend_name() == "sqlite":
+        # Parallel writers wait for SQLite's file lock instead of failing
+        return create_engine(url, connect_args={"check_same_thread": False, "timeout": 60}, pool_size=pool_size)
+    return create_engine(url, pool_pre_ping=True, pool_size=pool_size)
+
+
+# ============== PLAN ==============
+
+@dataclass
+class TablePlan:
+    table: Table
+    columns: list  # copied: in both the source table and the model
+    defaults: dict = field(default_factory=dict)  # model-only column -> default
+    source_rows: int = 0
 
-        if response.lower() in ['yes', 'y']:
-            migrate_data()
+    @property
+    def name(self) -> str:
+        return self.table.name
+
+
+def _default_for(column):
+    """Python-side value for a model column the source lacks"""
+    default = column.default
+    if default is None or not (default.is_scalar or default.is_callable):
+        return None
+    return default.arg(None) if default.is_callable else default.arg
+
+
+def plan_tables(source) -> tuple:
+    """(table plans in dependency order, notes about skipped tables and columns)"""
+    inspector = inspect(source)
+    source_tables = set(inspector.get_table_names())
+    plans, notes = [], []
+    for table in Base.metadata.sorted_tables:
+        if [c.name for c in table.primary_key] != ["id"]:
+            raise SystemExit(f"❌ {table.name} has no single-column id primary key to page by")
+        if table.name not in source_tables:
+            notes.append(f"{table.name}: not in the source, skipped")
+            continue
+        source_columns = {c["name"] for c in inspector.get_columns(table.name)}
+        columns = [c.name for c in table.columns if c.name in source_columns]
+        plan = TablePlan(table, columns)
+        for column in table.columns:
+            if column.name in source_columns:
+                continue
+            plan.defaults[column.name] = _default_for(column)
+            if plan.defaults[column.name] is None and not column.nullable and column.server_default is None:
+                raise SystemExit(f"❌ {table.name}.{column.name} is required but missing from the source")
+            notes.append(f"{table.name}.{column.name}: not in the source, filled with its default")
+        for name in sorted(source_columns - {c.name for c in table.columns}):
+            notes.append(f"{table.name}.{name}: not in the model, skipped")
+        with source.connect() as connection:
+            plan.source_rows = connection.execute(select(func.count()).select_from(table)).scalar()
+        plans.append(plan)
+    for name in sorted(source_tables - set(Base.metadata.tables) - {"schema_migrations"}):
+        notes.append(f"{name}: not a model table, skipped")
+    return plans, notes
+
+
+# ============== TARGET ==============
+
+def clear_tables(target, plans: list):
+    names = [plan.name for plan in plans]
+    with target.begin() as connection:
+        if target.dialect.name == "postgresql":
+            connection.execute(text(f"TRUNCATE {', '.join(names)} RESTART IDENTITY CASCADE"))
         else:
-            print("❌ Migration cancelled by user")
-    except KeyboardInterrupt:
-        print("\n❌ Migration cancelled by user")
-    except Exception as e:
-        print(f"\n❌ Fatal error: {e}")
+            for name in reversed(names):
+                connection.execute(text(f"DELETE FROM {name}"))
+    _progress_metadata.drop_all(target)
+
+
+def prepare_target(target, plans: list, truncate: bool) -> dict:
+    """Create or resume the progress table; {table name: progress row}"""
+    from schema_migrations import upgrade
+
+    fresh = not set(inspect(target).get_table_names()) & {plan.name for plan in plans}
+    upgrade(target)  # PostgreSQL: the versioned SQL migrations; otherwise create_all()
+    if truncate or fresh:
+        clear_tables(target, plans)  # a schema created just now only holds the demo rows of 004_insert_mock_data.sql
+
+    if inspect(target).has_table(migration_progress.name):
+        with target.connect() as connection:
+            progress = {row.table_name: row._asdict() for row in connection.execute(select(migration_progress))}
+        done = sum(1 for row in progress.values() if row["completed_at"])
+        say(f"🔄 Resuming: {done} of {len(plans)} tables done, "
+            f"{sum(row['rows_copied'] for row in progress.values()):,} rows already copied")
+    else:
+        with target.connect() as connection:
+            filled = [plan.name for plan in plans
+                      if connection.execute(select(func.count()).select_from(plan.table)).scalar()]
+        if filled:
+            raise SystemExit(f"❌ Target tables are not empty ({', '.join(filled)}); "
+                             "pass --truncate to replace their rows")
+        progress = {}
+
+    missing = [{"table_name": plan.name, "last_id": 0, "rows_copied": 0, "completed_at": None,
+                "updated_at": datetime.utcnow()} for plan in plans if plan.name not in progress]
+    _progress_metadata.create_all(target)
+    if missing:
+        with target.begin() as connection:
+            connection.execute(insert(migration_progress), missing)
+        progress.update({row["table_name"]: row for row in missing})
+    return progress
+
+
+def _copy_field(value) -> str:
+    """One COPY csv field: NULL unquoted, every value quoted (so '' stays an empty string)"""
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        value = "t" if value else "f"
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def write_rows(connection, table: Table, columns: list, rows: list):
+    """COPY on PostgreSQL, executemany INSERT elsewhere"""
+    if connection.dialect.name == "postgresql":
+        buffer = io.StringIO("".join(",".join(map(_copy_field, row)) + "\n" for row in rows))
+        cursor = connection.connection.cursor()
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buffer,
+        )
+    else:
+        connection.execute(insert(table), [dict(zip(columns, row)) for row in rows])
+
+
+def copy_table(source, target, plan: TablePlan, progress: dict, chunk_size: int):
+    """Copy one table chunk by chunk from its checkpoint"""
+    if progress["completed_at"]:
+        return
+    table = plan.table
+    columns = plan.columns + list(plan.defaults)
+    defaults = tuple(plan.defaults.values())
+    query = select(*(table.c[name] for name in plan.columns)).order_by(table.c.id).limit(chunk_size)
+    id_index = plan.columns.index("id")
+    last_id, copied = progress["last_id"], progress["rows_copied"]
+    started, reported = time.perf_counter(), time.perf_counter()
+
+    with source.connect() as reader:
+        while True:
+            rows = reader.execute(query.where(table.c.id > last_id)).all()
+            if not rows:
+                break
+            last_id = rows[-1][id_index]
+            with target.begin() as writer:
+                write_rows(writer, table, columns, [tuple(row) + defaults for row in rows])
+                writer.execute(update(migration_progress).where(migration_progress.c.table_name == plan.name).values(
+                    last_id=last_id, rows_copied=copied + len(rows), updated_at=datetime.utcnow(),
+                ))
+            copied += len(rows)
+            if time.perf_counter() - reported > 10:
+                reported = time.perf_counter()
+                say(f"   … {plan.name:<20} {copied:>12,} / {plan.source_rows:,}")
+
+    with target.begin() as writer:
+        writer.execute(update(migration_progress).where(migration_progress.c.table_name == plan.name).values(
+            completed_at=datetime.utcnow(), updated_at=datetime.utcnow(),
+        ))
+    elapsed = time.perf_counter() - started
+    say(f"   ✅ {plan.name:<20} {copied:>12,} rows  ({(copied - progress['rows_copied']) / elapsed:,.0f} rows/s)")
+
+
+def run_in_dependency_order(plans: list, workers: int, job):
+    """Run job(plan) for every plan once every table it references has finished"""
+    pending = {plan.name: plan for plan in plans}
+    requires = {
+        plan.name: {fk.column.table.name for fk in plan.table.foreign_keys} & set(pending) - {plan.name}
+        for plan in plans
+    }
+    finished = set()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = {}
+        while pending or running:
+            for name in [name for name in pending if requires[name] <= finished]:
+                running[pool.submit(job, pending.pop(name))] = name
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                future.result()  # a failed table stops the run; its checkpoint stays for the re-run
+                finished.add(name)
+
+
+def reset_sequences(target, plans: list):
+    """Move id sequences past the copied ids and refresh planner statistics"""
+    if target.dialect.name != "postgresql":
+        return
+    with target.begin() as connection:
+        for plan in plans:
+            connection.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{plan.name}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {plan.name}), 0) + 1, false)"
+            ))
+    with target.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for plan in plans:
+            connection.execute(text(f"ANALYZE {plan.name}"))
+
+
+# ============== VERIFY ==============
+
+def _canonical(value, column_type) -> str:
+    """Dialect-independent text of a value (SQLite returns floats for NUMERIC, 0/1 for booleans)"""
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (Decimal, float)):
+        scale = getattr(column_type, "scale", None)
+        value = Decimal(str(value))
+        return str(value.quantize(Decimal(1).scaleb(-scale)) if scale is not None else value.normalize())
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def table_checksum(engine, plan: TablePlan, chunk_size: int) -> tuple:
+    """(row count, SHA-256 of the copied columns of every row in id order)"""
+    table = plan.table
+    types = [table.c[name].type for name in plan.columns]
+    query = select(*(table.c[name] for name in plan.columns)).order_by(table.c.id).limit(chunk_size)
+    id_index = plan.columns.index("id")
+    digest, count, last_id = hashlib.sha256(), 0, None
+    with engine.connect() as connection:
+        while True:
+            rows = connection.execute(query if last_id is None else query.where(table.c.id > last_id)).all()
+            if not rows:
+                break
+            for row in rows:
+                digest.update("\x1f".join(map(_canonical, row, types)).encode() + b"\x1e")
+            count += len(rows)
+            last_id = rows[-1][id_index]
+    return count, digest.hexdigest()
+
+
+def verify(source, target, plans: list, workers: int, chunk_size: int) -> list:
+    """(table, source count, target count, checksums match) per table"""
+    def check(plan):
+        (source_count, source_sum), (target_count, target_sum) = (
+            table_checksum(engine, plan, chunk_size) for engine in (source, target)
+        )
+        return plan.name, source_count, target_count, source_sum == target_sum
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(check, plans))
+
+
+# ============== RUN ==============
+
+def migrate(source, target, workers: int = 4, chunk_size: int = 10_000, truncate: bool = False,
+            verify_only: bool = False) -> bool:
+    """Copy (unless verify_only) and verify; True when every table matches"""
+    plans, notes = plan_tables(source)
+    for note in notes:
+        say(f"⚠️  {note}")
+    say(f"\n📊 {len(plans)} tables, {sum(plan.source_rows for plan in plans):,} rows, "
+        f"{workers} workers, chunks of {chunk_size:,}\n")
+
+    if not verify_only:
+        started = time.perf_counter()
+        progress = prepare_target(target, plans, truncate)
+        run_in_dependency_order(
+            plans, workers, lambda plan: copy_table(source, target, plan, progress[plan.name], chunk_size),
+        )
+        reset_sequences(target, plans)
+        say(f"\n✅ Copied in {time.perf_counter() - started:.1f}s")
+
+    say("\n📊 Verifying row counts and checksums...\n")
+    results = verify(source, target, plans, workers, chunk_size)
+    for name, source_count, target_count, match in results:
+        ok = match and source_count == target_count
+        say(f"   {'✅' if ok else '❌'} {name:<20} {source_count:>12,} → {target_count:<12,} "
+            f"{'checksum ok' if ok else 'MISMATCH'}")
+
+    ok = all(match and source_count == target_count for _, source_count, target_count, match in results)
+    if ok and not verify_only:
+        _progress_metadata.drop_all(target)
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Copy the SQLite database into PostgreSQL and verify it")
+    parser.add_argument("--source", default=DEFAULT_SOURCE, help=f"Source database (default {DEFAULT_SOURCE})")
+    parser.add_argument("--target", default=os.getenv("DATABASE_URL"), help="Target database (default: DATABASE_URL)")
+    parser.add_argument("--workers", type=int, default=4, help="Tables loaded in parallel (default 4)")
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="Rows per chunk / transaction")
+    parser.add_argument("--truncate", action="store_true", help="Empty the target tables and start over")
+    parser.add_argument("--verify-only", action="store_true", help="Only compare row counts and checksums")
+    args = parser.parse_args()
+
+    if not args.target or args.target == args.source:
+        raise SystemExit("❌ Set --target (or DATABASE_URL) to the PostgreSQL database to migrate into")
+
+    source_engine = create(args.source, args.workers + 1)
+    target_engine = create(args.target, args.workers + 1)
+    say(f"🔄 {make_url(args.source).render_as_string(hide_password=True)} → "
+        f"{make_url(args.target).render_as_string(hide_password=True)}")
+    if target_engine.dialect.name != "postgresql":
+        say("⚠️  Target is not PostgreSQL: rows are written with executemany INSERTs instead of COPY")
+
+    if not migrate(source_engine, target_engine, args.workers, args.chunk_size, args.truncate, args.verify_only):
+        print("\n❌ Source and target differ")
         sys.exit(1)
+    print("\n✅ Source and target match")
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Prune Sync Tombstones
+Deletes sync_tombstones rows older than SYNC_TOMBSTONE_RETENTION_DAYS (see
+sync.py). Clients whose sync token is older than that get a full snapshot, so
+the rows are no longer needed. Run it daily, e.g. from cron:
+
+    15 3 * * *  cd /path/to/backend && python scripts/prune_sync_tombstones.py
+
+Usage:
+    python scripts/prune_sync_tombstones.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from database import SessionLocal  # noqa: E402
+from sync import SYNC_TOMBSTONE_RETENTION_DAYS, prune_tombstones  # noqa: E402
+
+
+def prune() -> int:
+    """Delete expired tombstones; returns the number deleted"""
+    db = SessionLocal()
+    try:
+        deleted = prune_tombstones(db)
+        print(f"✅ Deleted {deleted} tombstone(s) older than {SYNC_TOMBSTONE_RETENTION_DAYS} days")
+        return deleted
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    prune()
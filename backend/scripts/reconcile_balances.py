@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Reconcile Reservation Balances
+Recomputes total_paid/balance for every reservation from its payments and
+reports (or, with --fix, repairs) rows whose stored values have drifted.
+
+Usage:
+    python scripts/reconcile_balances.py          # report only, exit code 1 on drift
+    python scripts/reconcile_balances.py --fix    # write the recomputed values
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from database import SessionLocal  # noqa: E402
+from balances import find_balance_drift, fix_balance_drift  # noqa: E402
+
+
+def reconcile(fix: bool = False) -> int:
+    """Report drifted reservations; returns the number found"""
+    db = SessionLocal()
+    try:
+        drift = find_balance_drift(db)
+
+        if not drift:
+            print("✅ All reservation balances match their payments")
+            return 0
+
+        print(f"⚠️  {len(drift)} reservation(s) with drifted balances:\n")
+        for row in drift:
+            print(
+                f"   #{row['reservation_id']} {row['confirmation_number']}: "
+                f"total_paid {row['stored_total_paid']} -> {row['expected_total_paid']}, "
+                f"balance {row['stored_balance']} -> {row['expected_balance']}"
+            )
+
+        if fix:
+            fixed = fix_balance_drift(db, drift)
+            print(f"\n✅ Fixed {fixed} reservation(s)")
+
+        return len(drift)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile stored reservation balances with payments")
+    parser.add_argument("--fix", action="store_true", help="Write the recomputed values")
+    args = parser.parse_args()
+
+    found = reconcile(fix=args.fix)
+    sys.exit(1 if found and not args.fix else 0)
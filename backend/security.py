@@ -5,6 +5,7 @@ Simple security utilities for authentication
 import secrets
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+from urllib.parse import unquote_plus
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
@@ -15,16 +16,27 @@ active_tokens = {}
 # Token expiration time (in minutes)
 TOKEN_EXPIRE_MINUTES = 60 * 16  # 16 hours (shift-based expiration)
 
+# Single-use tickets for EventSource streams, which cannot send headers;
+# short-lived so a ticket that ends up in a URL or log is worthless
+stream_tickets = {}
+STREAM_TICKET_SECONDS = 60
+
+# Query parameters whose values are never written to logs or profiles
+SENSITIVE_QUERY_PARAMS = {"access_token", "token", "ticket", "api_key", "password"}
+REDACTED = "[REDACTED]"
+
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
-def create_access_token(user_id: int, username: str) -> str:
+def create_access_token(user_id: int, username: str, role: str = "user") -> str:
     """Create a simple access token with expiration"""
     token = secrets.token_urlsafe(32)
     expires_at = datetime.now(timezone.utc) + timedelta(minutes=TOKEN_EXPIRE_MINUTES)
     active_tokens[token] = {
         "user_id": user_id,
         "username": username,
+        "role": role,
         "expires_at": expires_at
     }
     return token
@@ -52,6 +64,40 @@ def revoke_token(token: str):
         del active_tokens[token]
 
 
+def create_stream_ticket(user_data: dict) -> str:
+    """Create a single-use ticket that opens one event stream as this user"""
+    now = datetime.now(timezone.utc)
+    for ticket in [t for t, data in stream_tickets.items() if now > data["expires_at"]]:
+        stream_tickets.pop(ticket, None)
+    ticket = secrets.token_urlsafe(32)
+    stream_tickets[ticket] = {
+        **{key: value for key, value in user_data.items() if key != "expires_at"},
+        "expires_at": now + timedelta(seconds=STREAM_TICKET_SECONDS),
+    }
+    return ticket
+
+
+def redeem_stream_ticket(ticket: str) -> Optional[dict]:
+    """User data of a valid ticket; the ticket cannot be used again"""
+    ticket_data = stream_tickets.pop(ticket, None)
+    if not ticket_data or datetime.now(timezone.utc) > ticket_data["expires_at"]:
+        return None
+    return ticket_data
+
+
+def redact_query_string(query_string: bytes) -> str:
+    """Query string for logs, with credential parameter values replaced"""
+    text = query_string.decode("latin-1")
+    lowered = text.lower()
+    if not any(name in lowered for name in SENSITIVE_QUERY_PARAMS):
+        return text
+    parts = []
+    for part in text.split("&"):
+        name, _, _ = part.partition("=")
+        parts.append(f"{name}={REDACTED}" if unquote_plus(name).lower() in SENSITIVE_QUERY_PARAMS else part)
+    return "&".join(parts)
+
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """Get current user from token"""
     token = credentials.credentials
@@ -65,3 +111,38 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         )
 
     return user_data
+
+
+async def get_stream_user(
+    ticket: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+) -> dict:
+    """
+    Get current user for streaming endpoints. Browsers' EventSource cannot
+    send headers, so a single-use ?ticket= (POST /api/events/ticket) is
+    accepted instead; the session token never goes in the URL.
+    """
+    if credentials:
+        user_data = verify_token(credentials.credentials)
+    else:
+        user_data = redeem_stream_ticket(ticket) if ticket else None
+
+    if not user_data:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return user_data
+
+
+async def require_admin(current_user: dict = Depends(get_current_user)) -> dict:
+    """Get current user, who must have the admin role"""
+    if current_user.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin role required",
+        )
+
+    return current_user
@@ -0,0 +1,248 @@
+"""
+Direct-to-JSON serializers for list endpoints
+
+The ORM path for a list page (load Room/Guest/... objects with their
+relationships, call to_dict() with float()/isoformat() per field, then
+jsonable_encoder) spends most of its time on object hydration. The list
+endpoints instead run one Core select of exactly the columns their
+response needs - numeric columns cast to float and related names
+outer-joined in SQL - and hand the row dicts to FastJSONResponse, which
+encodes dates and datetimes natively with orjson.
+
+Each ColumnSet produces the same keys and values as the matching
+to_dict() / _format_room_response(); test_serializers.py keeps them in step.
+A ?fields=a,b,c query parameter narrows the projection, and joins whose
+columns were not requested are left out of the statement entirely.
+scripts/benchmark_serializers.py measures rows/sec for both paths.
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+from fastapi import HTTPException
+from fastapi.responses import Response
+from sqlalchemy import Float, cast, func, select
+from sqlalchemy.orm import Session, aliased
+
+from models import Expense, Guest, Payment, Reservation, Room, RoomType, User
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to the stdlib encoder
+    orjson = None
+
+
+def _as_float(column, default=None):
+    """Numeric column as float in SQL (NULL -> default when given)"""
+    value = cast(column, Float)
+    return func.coalesce(value, default) if default is not None else value
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    """Encode to JSON bytes (orjson when installed)"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_json_default)
+    return json.dumps(content, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded with dumps(), skipping jsonable_encoder"""
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+# ============== COLUMN SETS ==============
+
+class ColumnSet:
+    """
+    The response columns of one list endpoint: name -> SQL expression, plus
+    the outer joins each column needs. select() builds a statement with only
+    the requested columns and only the joins those columns use.
+    """
+
+    def __init__(self, base, columns: dict, joins: Optional[dict] = None, column_joins: Optional[dict] = None):
+        self.base = base
+        self.columns = columns
+        self.joins = joins or {}  # join name -> (target, onclause)
+        self.column_joins = column_joins or {}  # column name -> join name
+
+    def parse_fields(self, fields: Optional[str]) -> Optional[list]:
+        """Validate a ?fields=a,b,c value; None means every column ("id" is always included)"""
+        if not fields:
+            return None
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = sorted(requested - self.columns.keys())
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(self.columns)}",
+            )
+        return [name for name in self.columns if name in requested or name == "id"]
+
+    def select(self, fields: Optional[str] = None):
+        names = self.parse_fields(fields) or list(self.columns)
+        statement = select(*(self.columns[name].label(name) for name in names)).select_from(self.base)
+        needed = {self.column_joins[name] for name in names if name in self.column_joins}
+        for join_name, (target, onclause) in self.joins.items():
+            if join_name in needed:
+                statement = statement.outerjoin(target, onclause)
+        return statement
+
+
+ROOMS = ColumnSet(
+    Room,
+    {
+        "id": Room.id,
+        "room_number": Room.room_number,
+        "floor": Room.floor,
+        "room_type_id": Room.room_type_id,
+        "room_type": RoomType.code,
+        "room_type_name": RoomType.name,
+        "status": Room.status,
+        "view_type": Room.view_type,
+        "notes": Room.notes,
+        "custom_rate": _as_float(func.nullif(Room.custom_rate, 0)),
+        "nightly_rate": _as_float(func.coalesce(func.nullif(Room.custom_rate, 0), RoomType.default_rate)),
+        "amenities": RoomType.amenities,
+        "is_active": Room.is_active,
+        "created_at": Room.created_at,
+        "updated_at": Room.updated_at,
+    },
+    joins={"room_type": (RoomType, RoomType.id == Room.room_type_id)},
+    column_joins={name: "room_type" for name in ("room_type", "room_type_name", "nightly_rate", "amenities")},
+)
+
+GUESTS = ColumnSet(
+    Guest,
+    {
+        name: getattr(Guest, name)
+        for name in (
+            "id", "full_name", "email", "phone", "phone_country_code", "id_type", "id_number",
+            "nationality", "birth_date", "notes", "is_vip", "preferred_room_type_id", "created_at", "updated_at",
+        )
+    },
+)
+
+_checked_in_by_user = aliased(User)
+_reservation_guest = aliased(Guest)
+_reservation_room = aliased(Room)
+
+RESERVATIONS = ColumnSet(
+    Reservation,
+    {
+        "id": Reservation.id,
+        "confirmation_number": Reservation.confirmation_number,
+        "guest_id": Reservation.guest_id,
+        "guest_name": _reservation_guest.full_name,
+        "check_in_date": Reservation.check_in_date,
+        "check_out_date": Reservation.check_out_date,
+        "room_type_id": Reservation.room_type_id,
+        "room_id": Reservation.room_id,
+        "room_number": _reservation_room.room_number,
+        "adults": Reservation.adults,
+        "children": Reservation.children,
+        "rate_per_night": _as_float(Reservation.rate_per_night, 0),
+        "number_of_nights": Reservation.number_of_nights,
+        "subtotal": _as_float(Reservation.subtotal, 0),
+        "discount_amount": _as_float(Reservation.discount_amount, 0),
+        "discount_id": Reservation.discount_id,
+        "total_amount": _as_float(Reservation.total_amount, 0),
+        "deposit_amount": _as_float(Reservation.deposit_amount, 0),
+        "special_requests": Reservation.special_requests,
+        "status": Reservation.status,
+        "booking_source": Reservation.booking_source,
+        "total_paid": _as_float(Reservation.total_paid, 0),
+        "balance": _as_float(func.coalesce(
+            Reservation.balance, Reservation.total_amount - func.coalesce(Reservation.total_paid, 0),
+        )),
+        "checked_in_at": Reservation.checked_in_at,
+        "checked_in_by": Reservation.checked_in_by,
+        "checked_in_by_name": _checked_in_by_user.username,
+        "checked_out_at": Reservation.checked_out_at,
+        "deposit_returned_at": Reservation.deposit_returned_at,
+        "created_at": Reservation.created_at,
+        "updated_at": Reservation.updated_at,
+    },
+    joins={
+        "guest": (_reservation_guest, _reservation_guest.id == Reservation.guest_id),
+        "room": (_reservation_room, _reservation_room.id == Reservation.room_id),
+        "checked_in_by_user": (_checked_in_by_user, _checked_in_by_user.id == Reservation.checked_in_by),
+    },
+    column_joins={"guest_name": "guest", "room_number": "room", "checked_in_by_name": "checked_in_by_user"},
+)
+
+PAYMENTS = ColumnSet(
+    Payment,
+    {
+        "id": Payment.id,
+        "reservation_id": Payment.reservation_id,
+        "payment_date": Payment.payment_date,
+        "amount": _as_float(Payment.amount, 0),
+        "payment_method": Payment.payment_method,
+        "payment_type": Payment.payment_type,
+        "reference_number": Payment.reference_number,
+        "transaction_id": Payment.transaction_id,
+        "notes": Payment.notes,
+        "is_refund": Payment.is_refund,
+        "refund_reason": Payment.refund_reason,
+        "is_voided": Payment.is_voided,
+        "has_proof": Payment.has_proof,
+        "created_by": Payment.created_by,
+        "created_at": Payment.created_at,
+        "updated_at": Payment.updated_at,
+    },
+)
+
+EXPENSES = ColumnSet(
+    Expense,
+    {
+        "id": Expense.id,
+        "date": Expense.date,
+        "category": Expense.category,
+        "amount": _as_float(Expense.amount, 0),
+        "description": Expense.description,
+        "receipt_url": Expense.receipt_url,
+        "created_at": Expense.created_at,
+        "updated_at": Expense.updated_at,
+    },
+)
+
+
+def select_rooms(fields: Optional[str] = None):
+    return ROOMS.select(fields)
+
+
+def select_guests(fields: Optional[str] = None):
+    return GUESTS.select(fields)
+
+
+def select_reservations(fields: Optional[str] = None):
+    return RESERVATIONS.select(fields)
+
+
+def select_payments(fields: Optional[str] = None):
+    return PAYMENTS.select(fields)
+
+
+def select_expenses(fields: Optional[str] = None):
+    return EXPENSES.select(fields)
+
+
+def fetch_rows(db: Session, statement) -> list:
+    """Execute a select and return plain dicts keyed by column label"""
+    result = db.execute(statement)
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
@@ -0,0 +1,163 @@
+"""
+Delta sync for frontend stores
+
+GET /api/sync?since=<token> returns the rooms, reservations, guests and
+payments created or updated since the token (via the indexed updated_at
+columns) plus tombstones for rows deleted since then, so a store can patch
+its cached list instead of reloading it.
+
+Rows are read with the column-only selects from serializers.py and paged by
+id, SYNC_PAGE_SIZE rows per response across all stores. While a response
+carries a cursor the client requests ?cursor=<cursor> for the next page; the
+last page has cursor=null and the token to use as `since` next time.
+Tombstones are sent with the first page.
+
+Tokens are opaque to clients: the server time (in microseconds) the first
+page of the previous sync was read, minus SYNC_OVERLAP_SECONDS. They are
+clock-based, not a commit sequence: updated_at is stamped by the writer when
+it flushes, so a transaction that commits more than SYNC_OVERLAP_SECONDS
+after writing a row (or an app server whose clock lags by as much) can have
+that row missed until its next update. The overlap is therefore generous and
+configurable; rows near the boundary are sent twice, so clients apply
+changes as upserts.
+
+Deletions of synced models are recorded in sync_tombstones from a session
+event (in the same transaction as the delete). Tombstones older than
+SYNC_TOMBSTONE_RETENTION_DAYS are pruned by scripts/prune_sync_tombstones.py
+(run it daily from cron); a client whose token is older than that gets a full
+snapshot with reset=true. GET /api/sync itself never writes.
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.orm import Session
+
+from models import Guest, Payment, Reservation, Room, SyncTombstone
+from serializers import fetch_rows, select_guests, select_payments, select_reservations, select_rooms
+
+SYNC_OVERLAP_SECONDS = int(os.getenv("SYNC_OVERLAP_SECONDS", "300"))
+SYNC_TOMBSTONE_RETENTION_DAYS = 30
+SYNC_PAGE_SIZE = int(os.getenv("SYNC_PAGE_SIZE", "1000"))
+
+# Store name -> (model, select of the columns its list endpoint returns)
+SYNC_MODELS = {
+    "rooms": (Room, select_rooms),
+    "reservations": (Reservation, select_reservations),
+    "guests": (Guest, select_guests),
+    "payments": (Payment, select_payments),
+}
+_TABLE_TO_STORE = {model.__tablename__: name for name, (model, _) in SYNC_MODELS.items()}
+
+
+class InvalidSyncToken(ValueError):
+    """Raised for tokens and cursors that were not issued by this endpoint"""
+
+
+def encode_token(moment: datetime) -> str:
+    return str(int((moment - datetime(1970, 1, 1)).total_seconds() * 1_000_000))
+
+
+def decode_token(token: str) -> datetime:
+    try:
+        return datetime(1970, 1, 1) + timedelta(microseconds=int(token))
+    except (TypeError, ValueError, OverflowError):
+        raise InvalidSyncToken(f"Invalid sync token: {token!r}")
+
+
+def encode_cursor(started_at: datetime, since: Optional[datetime], store: str, last_id: int) -> str:
+    since_part = encode_token(since) if since is not None else ""
+    return f"{encode_token(started_at)}:{since_part}:{store}:{last_id}"
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Returns (started_at, since, store, last_id)"""
+    try:
+        started_part, since_part, store, last_id = cursor.split(":")
+        if store not in SYNC_MODELS:
+            raise ValueError(store)
+        return (
+            decode_token(started_part),
+            decode_token(since_part) if since_part else None,
+            store,
+            int(last_id),
+        )
+    except (AttributeError, TypeError, ValueError):
+        raise InvalidSyncToken(f"Invalid sync cursor: {cursor!r}")
+
+
+@event.listens_for(Session, "after_flush")
+def _record_tombstones(session, flush_context):
+    """Write a tombstone for every deleted row of a synced model"""
+    rows = [
+        {"table_name": obj.__tablename__, "row_id": obj.id, "deleted_at": datetime.utcnow()}
+        for obj in session.deleted
+        if obj.__tablename__ in _TABLE_TO_STORE
+    ]
+    if rows:
+        session.connection().execute(insert(SyncTombstone), rows)
+
+
+def prune_tombstones(db: Session, now: Optional[datetime] = None) -> int:
+    """Delete expired tombstones and commit; returns the number deleted"""
+    cutoff = (now or datetime.utcnow()) - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS)
+    result = db.execute(delete(SyncTombstone).where(SyncTombstone.deleted_at < cutoff))
+    db.commit()
+    return result.rowcount
+
+
+def collect_changes(db: Session, since: Optional[datetime], cursor: Optional[str] = None) -> dict:
+    """
+    One page of the rows changed and deleted since a moment (everything if
+    since is None), continuing from cursor when given.
+    """
+    if cursor:
+        started_at, since, cursor_store, last_id = decode_cursor(cursor)
+        reset = since is None
+    else:
+        started_at = datetime.utcnow()
+        reset = since is None or since < started_at - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS)
+        if reset:
+            since = None
+        cursor_store, last_id = next(iter(SYNC_MODELS)), 0
+
+    changes = {name: [] for name in SYNC_MODELS}
+    next_cursor = None
+    remaining = SYNC_PAGE_SIZE
+    stores = list(SYNC_MODELS)
+    for name in stores[stores.index(cursor_store):]:
+        model, select_columns = SYNC_MODELS[name]
+        after_id = last_id if name == cursor_store else 0
+        statement = select_columns().where(model.id > after_id)
+        if since is not None:
+            statement = statement.where(model.updated_at >= since)
+        # One row past the page tells whether this store has more
+        rows = fetch_rows(db, statement.order_by(model.id).limit(remaining + 1))
+        changes[name] = rows[:remaining]
+        if len(rows) > remaining:
+            resume_after = rows[remaining - 1]["id"] if remaining else after_id
+            next_cursor = encode_cursor(started_at, since, name, resume_after)
+            break
+        remaining -= len(rows)
+
+    deleted = {name: [] for name in SYNC_MODELS}
+    if since is not None and not cursor:
+        tombstones = db.execute(
+            select(SyncTombstone.table_name, SyncTombstone.row_id)
+            .where(SyncTombstone.deleted_at >= since)
+            .order_by(SyncTombstone.id)
+        ).all()
+        for table_name, row_id in tombstones:
+            store = _TABLE_TO_STORE.get(table_name)
+            if store:
+                deleted[store].append(row_id)
+
+    return {
+        "token": None if next_cursor else encode_token(started_at - timedelta(seconds=SYNC_OVERLAP_SECONDS)),
+        "cursor": next_cursor,
+        "reset": reset,
+        "changes": changes,
+        "deleted": deleted,
+    }